@@ -0,0 +1,196 @@
+"""
+Tests to ensure that the ForwardingView passes bodies along without holding them in memory
+"""
+import os
+import io
+import typing
+import resource
+import threading
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.http.response import StreamingHttpResponse
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+
+from forwarding import ForwardingConfiguration
+from forwarding import ForwardingView
+from forwarding.views import CHUNK_SIZE
+from forwarding.views import strip_hop_by_hop_headers
+
+
+BODY_SIZE: typing.Final[int] = int(os.environ.get("FORWARDING_TEST_BODY_SIZE", 2 * 1024 ** 3))
+"""The number of bytes to send through the proxy in each direction"""
+
+ALLOWED_MEMORY_GROWTH: typing.Final[int] = 64 * 1024 ** 2
+"""The most that the peak memory of the process may grow while a body passes through the proxy"""
+
+
+def get_peak_memory() -> int:
+    """
+    Returns:
+        The most memory that this process has held at one time, in bytes
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ZeroStream(io.RawIOBase):
+    """
+    A readable stream of a set number of zeros that never holds more than one read's worth in memory
+    """
+    def __init__(self, length: int):
+        self.remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.remaining)
+        buffer[:size] = bytes(size)
+        self.remaining -= size
+        return size
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Streams a large body for GET requests and counts the bytes of the body for PUT requests
+    """
+    protocol_version = "HTTP/1.1"
+    connections: typing.Set[typing.Tuple[str, int]] = set()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        StubHandler.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(BODY_SIZE))
+        self.send_header("Keep-Alive", "timeout=5")
+        self.send_header("X-Stub", "streamed")
+        self.end_headers()
+
+        block = bytes(1024 ** 2)
+        remaining = BODY_SIZE
+        while remaining > 0:
+            size = min(len(block), remaining)
+            self.wfile.write(block[:size] if size < len(block) else block)
+            remaining -= size
+
+    def do_PUT(self):
+        StubHandler.connections.add(self.client_address)
+        remaining = int(self.headers["Content-Length"])
+        received = 0
+
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 1024 ** 2))
+            if not chunk:
+                break
+            received += len(chunk)
+            remaining -= len(chunk)
+
+        content = str(received).encode()
+        self.send_response(201)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class TestForwardingView(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        StubHandler.connections.clear()
+        configuration = ForwardingConfiguration(
+            name="Stub",
+            route="stub",
+            url="127.0.0.1",
+            port=self.server.server_address[1],
+            read_timeout=30,
+            retries=0
+        )
+        self.view = ForwardingView.view_from_configuration(configuration)
+        self.factory = RequestFactory()
+
+    def test_download_is_streamed(self):
+        peak_memory = get_peak_memory()
+
+        for _ in range(2):
+            response = self.view(self.factory.get("/stub/data"), extra_path="data")
+
+            self.assertIsInstance(response, StreamingHttpResponse)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Length"], str(BODY_SIZE))
+            self.assertEqual(response["X-Stub"], "streamed")
+            self.assertFalse(response.has_header("Keep-Alive"))
+
+            received = 0
+            for chunk in response.streaming_content:
+                received += len(chunk)
+            response.close()
+
+            self.assertEqual(received, BODY_SIZE)
+
+        self.assertLess(get_peak_memory() - peak_memory, ALLOWED_MEMORY_GROWTH)
+
+        # Both requests should have gone through the same kept-alive connection
+        self.assertEqual(len(StubHandler.connections), 1)
+
+    def test_upload_is_streamed(self):
+        peak_memory = get_peak_memory()
+
+        environ = self.factory._base_environ(
+            PATH_INFO="/stub/data",
+            REQUEST_METHOD="PUT",
+            CONTENT_TYPE="application/octet-stream",
+            CONTENT_LENGTH=str(BODY_SIZE),
+            HTTP_CONNECTION="close, X-Private",
+            HTTP_X_PRIVATE="secret",
+            **{"wsgi.input": io.BufferedReader(ZeroStream(BODY_SIZE), buffer_size=CHUNK_SIZE)}
+        )
+        response = self.view(WSGIRequest(environ), extra_path="data")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(b"".join(response.streaming_content), str(BODY_SIZE).encode())
+        self.assertLess(get_peak_memory() - peak_memory, ALLOWED_MEMORY_GROWTH)
+
+    def test_unreachable_target(self):
+        configuration = ForwardingConfiguration(
+            name="Nowhere",
+            route="nowhere",
+            url="127.0.0.1",
+            port=1,
+            connect_timeout=1,
+            retries=0
+        )
+        view = ForwardingView.view_from_configuration(configuration)
+        response = view(self.factory.get("/nowhere"))
+        self.assertEqual(response.status_code, 502)
+
+    def test_strip_hop_by_hop_headers(self):
+        headers = {
+            "Connection": "keep-alive, X-Private",
+            "Keep-Alive": "timeout=5",
+            "Transfer-Encoding": "chunked",
+            "Upgrade": "websocket",
+            "X-Private": "secret",
+            "Content-Type": "application/json",
+            "Cookie": "sessionid=abc",
+        }
+        self.assertEqual(
+            strip_hop_by_hop_headers(headers),
+            {"Content-Type": "application/json", "Cookie": "sessionid=abc"}
+        )
@@ -1,15 +1,17 @@
 """
 Defines websocket consumers used to communicate information through redis pubsub instances
 """
+import asyncio
 import typing
 import json
 import inspect
 import abc
 
 import redis.client
-from asgiref.sync import async_to_sync
-from redis.client import PubSub
-from redis.client import PubSubWorkerThread
+from asgiref.sync import sync_to_async
+
+from dmod.redis.pubsub import PubSubMultiplexer
+from dmod.redis.pubsub import Subscription
 
 from maas_experiment import application_values
 from maas_experiment import logging as common_logging
@@ -46,19 +48,28 @@ class RedisConsumer(SocketConsumer, abc.ABC):
         password = password or application_values.CHANNEL_PASSWORD
         username = username or application_values.CHANNEL_USERNAME
 
+        self.__connection_arguments: typing.Dict[str, typing.Any] = {
+            "host": host,
+            "port": port,
+            "db": db,
+            "password": password,
+            "username": username,
+        }
+
         # Connect to Redis
-        self.__redis_connection: redis.Redis = utilities.get_redis_connection(
-            host=host,
-            port=port,
-            db=db,
-            password=password,
-            username=username
-        )
+        self.__redis_connection: redis.Redis = utilities.get_redis_connection(**self.__connection_arguments)
 
     @property
     def redis_connection(self) -> redis.Redis:
         return self.__redis_connection
 
+    @property
+    def pubsub_multiplexer(self) -> PubSubMultiplexer:
+        """
+        The process-wide pubsub multiplexer for this consumer's redis instance. Only available within the event loop
+        """
+        return utilities.get_pubsub_multiplexer(**self.__connection_arguments)
+
     def get_connection_string(self) -> typing.Optional[str]:
         connection_parameters: typing.Dict[str, typing.Any] = dict()
 
@@ -102,52 +113,68 @@ class RedisConsumer(SocketConsumer, abc.ABC):
 
 
 class PubSubConsumer(RedisConsumer):
-    def process_incoming_message(self, message: typing.Union[str, bytes, dict]):
+    """
+    A websocket consumer that relays messages from redis channels to handlers
+
+    Subscriptions go through the process-wide pubsub multiplexer, so every connected consumer shares a single redis
+    connection rather than each opening its own connection and listener thread
+    """
+    async def process_incoming_message(self, message: typing.Union[str, bytes, dict]):
         for handler in self._incoming_message_handlers:
             try:
-                result: typing.Optional[typing.Coroutine, typing.Any] = handler(message)
+                if inspect.iscoroutinefunction(handler):
+                    result: typing.Optional[typing.Coroutine, typing.Any] = await handler(message)
+                else:
+                    # Synchronous handlers may block or call back into async code, so keep them off the event loop
+                    result: typing.Optional[typing.Coroutine, typing.Any] = await sync_to_async(
+                        handler,
+                        thread_sensitive=False
+                    )(message)
 
                 while inspect.isawaitable(result):
-                    synchronous_result_handler = async_to_sync(result)
-                    result = synchronous_result_handler()
+                    result = await result
             except Exception as processing_exception:
                 common_logging.error(f"Failed to process an incoming message", exception=processing_exception)
 
+    async def forward_subscribed_messages(self):
+        """
+        Pass every message received through the subscription to the incoming message handlers until unsubscribed
+        """
+        async for message in self.__subscription:
+            await self.process_incoming_message(message)
+
     def get_group(self) -> str:
         return get_group_key(self.__channel_name)
 
     def get_incoming_message_handlers(self) -> typing.Iterable[INCOMING_MESSAGE_HANDLER]:
         return self._incoming_message_handlers
 
-    def subscribe(self):
-        self.__publisher_and_subscriber = self.__redis_connection.pubsub()
-
-        group_handlers: typing.Dict[str, typing.Callable] = {
-            self.get_group(): self.process_incoming_message
-        }
+    async def subscribe(self):
+        channels: typing.List[str] = [self.get_group()]
 
         additional_channels = self.scope_data.keyword_arguments.get("additional_channels")
 
         if additional_channels:
             if isinstance(additional_channels, str):
-                group_handlers[additional_channels] = self.process_incoming_message
+                channels.append(additional_channels)
             elif isinstance(additional_channels, typing.Iterable):
-                group_handlers.update({
-                    str(channel): self.process_incoming_message
-                    for channel in additional_channels
-                })
+                channels.extend(str(channel) for channel in additional_channels)
             else:
                 common_logging.warn(
                     f"Cannot add additional channels ({str(additional_channels)}) "
                     f"to a newly connected {self.__class__.__name__}"
                 )
 
-        self.__publisher_and_subscriber.subscribe(**group_handlers)
-        self.__listener = self.__publisher_and_subscriber.run_in_thread(sleep_time=0.001)
+        self.__subscription = await self.pubsub_multiplexer.subscribe(*channels)
+        self.__forwarder = asyncio.get_running_loop().create_task(self.forward_subscribed_messages())
 
-    def unsubscribe(self):
+    async def unsubscribe(self):
         try:
-            self.__listener.stop()
+            if self.__subscription is not None:
+                await self.__subscription.close()
+
+            if self.__forwarder is not None:
+                self.__forwarder.cancel()
         except Exception as e:
             common_logging.error(
                 f"Could not formally stop the execution of the listener for {str(self)}",
@@ -158,10 +185,10 @@ class PubSubConsumer(RedisConsumer):
         if bytes_data:
             text_data = bytes_data.decode()
 
-        self.redis_connection.publish(self.get_group(), text_data)
+        await self.pubsub_multiplexer.publish(self.get_group(), text_data)
 
         for channel in self.__additional_channels:
-            self.redis_connection.publish(channel, text_data)
+            await self.pubsub_multiplexer.publish(channel, text_data)
 
     def record_additional_channels(self):
         additional_channels = self.scope_data.keyword_arguments.get("additional_channels")
@@ -170,7 +197,7 @@ class PubSubConsumer(RedisConsumer):
             if isinstance(additional_channels, str):
                 self.__additional_channels.append(additional_channels)
             elif isinstance(additional_channels, typing.Iterable):
-                self.__additional_channels.append(additional_channels)
+                self.__additional_channels.extend(str(channel) for channel in additional_channels)
             else:
                 common_logging.warn(
                     f"Could not add additional channels ({str(additional_channels)}) "
@@ -189,8 +216,8 @@ class PubSubConsumer(RedisConsumer):
 
         self.__response_type = response_type
         self.__channel_name = channel
-        self.__listener: typing.Optional[PubSubWorkerThread] = None
-        self.__publisher_and_subscriber: typing.Optional[PubSub] = None
+        self.__subscription: typing.Optional[Subscription] = None
+        self.__forwarder: typing.Optional[asyncio.Task] = None
         self.set("response_type", response_type)
         self.set("channel_name", channel)
         self._incoming_message_handlers: typing.List[INCOMING_MESSAGE_HANDLER] = incoming_message_handlers or list()
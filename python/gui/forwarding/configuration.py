@@ -12,6 +12,21 @@ PATTERN_PARAMETERS = [
     "(?P<extra_path>.+)"
 ]
 
+DEFAULT_CONNECT_TIMEOUT: typing.Final[float] = 10.0
+"""The number of seconds to wait for a connection to the target service before giving up"""
+
+DEFAULT_READ_TIMEOUT: typing.Final[float] = 300.0
+"""The number of seconds to wait between bytes from the target service before giving up"""
+
+DEFAULT_RETRIES: typing.Final[int] = 2
+"""The number of times a failed connection to the target service will be attempted again"""
+
+DEFAULT_RETRY_BACKOFF: typing.Final[float] = 0.5
+"""The factor used to determine how long to wait between retries"""
+
+DEFAULT_POOL_SIZE: typing.Final[int] = 10
+"""The number of connections to the target service that may be kept open for reuse"""
+
 
 # TODO: This is most likely a prime candidate for Pydantic
 class ForwardingConfiguration:
@@ -102,6 +117,11 @@ class ForwardingConfiguration:
         path: str = None,
         use_ssl: bool = None,
         certificate_path: str = None,
+        connect_timeout: float = None,
+        read_timeout: float = None,
+        retries: int = None,
+        retry_backoff: float = None,
+        pool_size: int = None,
         **kwargs
     ):
         self.__name = name
@@ -111,6 +131,11 @@ class ForwardingConfiguration:
         self.__path = path
         self.__use_ssl = use_ssl or False
         self.__certificate_path = certificate_path
+        self.__connect_timeout = float(connect_timeout) if connect_timeout is not None else DEFAULT_CONNECT_TIMEOUT
+        self.__read_timeout = float(read_timeout) if read_timeout is not None else DEFAULT_READ_TIMEOUT
+        self.__retries = int(retries) if retries is not None else DEFAULT_RETRIES
+        self.__retry_backoff = float(retry_backoff) if retry_backoff is not None else DEFAULT_RETRY_BACKOFF
+        self.__pool_size = int(pool_size) if pool_size is not None else DEFAULT_POOL_SIZE
 
     @property
     def name(self) -> str:
@@ -140,6 +165,41 @@ class ForwardingConfiguration:
     def path(self) -> typing.Optional[str]:
         return self.__path
 
+    @property
+    def connect_timeout(self) -> float:
+        """
+        The number of seconds to wait for a connection to the target service
+        """
+        return self.__connect_timeout
+
+    @property
+    def read_timeout(self) -> float:
+        """
+        The number of seconds to wait between bytes sent from the target service
+        """
+        return self.__read_timeout
+
+    @property
+    def retries(self) -> int:
+        """
+        The number of times to try again if the target service could not be reached
+        """
+        return self.__retries
+
+    @property
+    def retry_backoff(self) -> float:
+        """
+        The factor used to determine how long to wait between retries
+        """
+        return self.__retry_backoff
+
+    @property
+    def pool_size(self) -> int:
+        """
+        The number of connections to the target service that may be kept open for reuse
+        """
+        return self.__pool_size
+
     @property
     def route_pattern(self) -> str:
         pattern = self.route
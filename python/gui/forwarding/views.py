@@ -2,17 +2,193 @@
 Defines a view used to send basic REST requests and response to and from another service
 """
 import os
+import threading
 import typing
 import pathlib
 import ssl
 
 import requests
+import requests.adapters
+import urllib3.exceptions
+from urllib3.util.retry import Retry
 
 from django.views.generic import View
 from django.http.request import HttpRequest
 from django.http.response import HttpResponse
+from django.http.response import HttpResponseBase
+from django.http.response import StreamingHttpResponse
 
 from .configuration import ForwardingConfiguration
+from .configuration import DEFAULT_CONNECT_TIMEOUT
+from .configuration import DEFAULT_READ_TIMEOUT
+from .configuration import DEFAULT_RETRIES
+from .configuration import DEFAULT_RETRY_BACKOFF
+from .configuration import DEFAULT_POOL_SIZE
+
+
+CHUNK_SIZE: typing.Final[int] = 64 * 1024
+"""The number of bytes to pass along at a time when streaming a body"""
+
+HOP_BY_HOP_HEADERS: typing.Final[typing.FrozenSet[str]] = frozenset({
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+})
+"""Headers that only apply to a single connection and must not be passed along by a proxy (RFC 9110 7.6.1)"""
+
+RETRY_STATUSES: typing.Final[typing.Tuple[int, ...]] = (502, 503, 504)
+"""Statuses from the target service that indicate that a request may be attempted again"""
+
+_SESSIONS: typing.Dict[typing.Tuple, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def strip_hop_by_hop_headers(headers: typing.Mapping[str, str]) -> typing.Dict[str, str]:
+    """
+    Remove headers that only pertain to a single connection
+
+    Args:
+        headers: The headers from an incoming request or response
+
+    Returns:
+        The headers that may be passed along to the next connection
+    """
+    # The Connection header may name further headers that only pertain to the current connection
+    connection_headers = {
+        name.strip().lower()
+        for value in [headers.get("Connection") or headers.get("connection") or ""]
+        for name in value.split(",")
+        if name.strip()
+    }
+    excluded_headers = HOP_BY_HOP_HEADERS.union(connection_headers)
+
+    return {
+        key: value
+        for key, value in headers.items()
+        if key.lower() not in excluded_headers
+    }
+
+
+def get_forwarding_session(
+    target_connection_url: str,
+    retries: int = DEFAULT_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    pool_size: int = DEFAULT_POOL_SIZE
+) -> requests.Session:
+    """
+    Get the session shared by every request forwarded to the given target so that connections may be kept alive
+    and reused
+
+    Args:
+        target_connection_url: The URL of the target service
+        retries: The number of times a failed connection will be attempted again
+        retry_backoff: The factor used to determine how long to wait between retries
+        pool_size: The number of connections that may be kept open for reuse
+
+    Returns:
+        A session with a connection pool dedicated to the target
+    """
+    key = (target_connection_url, retries, retry_backoff, pool_size)
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+
+        if session is None:
+            retry = Retry(
+                total=retries,
+                connect=retries,
+                read=retries,
+                status=retries,
+                backoff_factor=retry_backoff,
+                status_forcelist=RETRY_STATUSES,
+                raise_on_status=False,
+            )
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size,
+                max_retries=retry,
+                pool_block=False,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSIONS[key] = session
+
+    return session
+
+
+class RequestBodyStream:
+    """
+    A read-only view of an incoming request's body that lets it be sent along in pieces rather than all at once
+    """
+    def __init__(self, request: HttpRequest, length: int):
+        """
+        Constructor
+
+        Args:
+            request: The request whose body will be read
+            length: The declared length of the body
+        """
+        self.__request = request
+        self.__length = length
+        self.__position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.__length - self.__position
+        else:
+            size = min(size, self.__length - self.__position)
+
+        if size <= 0:
+            return b""
+
+        data = self.__request.read(size)
+        self.__position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, position: int, whence: int = os.SEEK_SET) -> int:
+        # The body may only be read once, so it can only be 'rewound' if nothing has been read yet
+        if whence != os.SEEK_SET or position != self.__position:
+            raise OSError("The body of a forwarded request cannot be rewound")
+        return self.__position
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            yield chunk
+
+
+def stream_response_content(response: requests.Response) -> typing.Iterator[bytes]:
+    """
+    Pass along the body of a response from the target service as it arrives
+
+    Args:
+        response: A response from the target service whose content has not been read
+
+    Returns:
+        The pieces of the response body, exactly as they were sent
+    """
+    try:
+        # Content is passed along encoded so that the forwarded Content-Encoding and Content-Length remain correct
+        yield from response.raw.stream(CHUNK_SIZE, decode_content=False)
+    finally:
+        response.close()
 
 
 class ForwardingView(View):
@@ -31,7 +207,12 @@ class ForwardingView(View):
             target_host_path=configuration.path,
             target_host_port=configuration.port,
             use_ssl=configuration.use_ssl,
-            certificate_path=configuration.certificate_path
+            certificate_path=configuration.certificate_path,
+            connect_timeout=configuration.connect_timeout,
+            read_timeout=configuration.read_timeout,
+            retries=configuration.retries,
+            retry_backoff=configuration.retry_backoff,
+            pool_size=configuration.pool_size
         )
 
         return interface
@@ -44,6 +225,11 @@ class ForwardingView(View):
         target_host_path: str = None,
         use_ssl: bool = False,
         certificate_path: typing.Union[str, pathlib.Path] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        pool_size: int = DEFAULT_POOL_SIZE,
         *args,
         **kwargs
     ):
@@ -58,6 +244,11 @@ class ForwardingView(View):
             target_host_path: An additional path on the target service to the desired socket endpoint
             use_ssl: Whether to utilize SSL on the websocket connection
             certificate_path: The path to an SSL certificate to use if SSL is to be employed
+            connect_timeout: The number of seconds to wait for a connection to the target
+            read_timeout: The number of seconds to wait between bytes sent from the target
+            retries: The number of times to try again if the target could not be reached
+            retry_backoff: The factor used to determine how long to wait between retries
+            pool_size: The number of connections to the target that may be kept open for reuse
         """
         super().__init__(*args, **kwargs)
         self.__target_host_name: str = target_host_name
@@ -71,6 +262,11 @@ class ForwardingView(View):
 
         self._certificate_path: str = str(certificate_path) if certificate_path else None
         self._ssl_context: typing.Optional[ssl.SSLContext] = None
+        self.__connect_timeout = connect_timeout
+        self.__read_timeout = read_timeout
+        self.__retries = retries
+        self.__retry_backoff = retry_backoff
+        self.__pool_size = pool_size
 
     @property
     def target_host_name(self) -> str:
@@ -163,12 +359,76 @@ class ForwardingView(View):
 
         return self._ssl_context
 
-    def _action(self, method: str, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        # Can't use request.headers.copy because that'll prevent future mutation
-        headers = {key: value for key, value in request.headers.items()}
+    @property
+    def connect_timeout(self) -> float:
+        """
+        The number of seconds to wait for a connection to the target service
+        """
+        return self.__connect_timeout
+
+    @property
+    def read_timeout(self) -> float:
+        """
+        The number of seconds to wait between bytes sent from the target service
+        """
+        return self.__read_timeout
+
+    @property
+    def retries(self) -> int:
+        """
+        The number of times to try again if the target service could not be reached
+        """
+        return self.__retries
+
+    @property
+    def retry_backoff(self) -> float:
+        """
+        The factor used to determine how long to wait between retries
+        """
+        return self.__retry_backoff
+
+    @property
+    def pool_size(self) -> int:
+        """
+        The number of connections to the target service that may be kept open for reuse
+        """
+        return self.__pool_size
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        The pooled session used to communicate with the target service
+        """
+        return get_forwarding_session(
+            target_connection_url=self.target_connection_url,
+            retries=self.__retries,
+            retry_backoff=self.__retry_backoff,
+            pool_size=self.__pool_size
+        )
+
+    def _get_request_body(self, request: HttpRequest) -> typing.Optional[typing.Union[bytes, RequestBodyStream]]:
+        """
+        Get the body to send along to the target service
+
+        Args:
+            request: The incoming request
+
+        Returns:
+            The data to send to the target service, read as it is sent if the body has a declared length
+        """
+        content_length = request.headers.get("Content-Length")
+
+        if content_length:
+            return RequestBodyStream(request, int(content_length))
+
+        # Without a declared length, there's no telling where the body ends without reading it
+        return request.body or None
 
-        if "Content-Length" in headers and headers['Content-Length'] == "":
-            headers['Content-Length'] = str(len(request.body))
+    def _action(self, method: str, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        headers = strip_hop_by_hop_headers(request.headers)
+
+        # The length of the body is determined by what is actually sent
+        headers.pop("Content-Length", None)
 
         if "extra_path" in kwargs:
             url = os.path.join(self.target_connection_url, kwargs['extra_path'])
@@ -178,18 +438,33 @@ class ForwardingView(View):
         forward_args = dict(
             method=method,
             url=url,
-            data=request.body,
+            data=self._get_request_body(request),
             headers=headers,
             cookies=request.COOKIES.copy(),
-            verify=self.ssl_context
+            verify=self.certificate_path if self.ssl_context else True,
+            timeout=(self.__connect_timeout, self.__read_timeout),
+            stream=True,
+            allow_redirects=False,
         )
-        with requests.request(**forward_args) as response:
-            forward_response = HttpResponse(
-                content=response.content,
-                status=response.status_code,
-                headers=response.headers
+
+        try:
+            response = self.session.request(**forward_args)
+        except requests.Timeout as timeout_error:
+            return HttpResponse(
+                content=f"{self.target_host_name} did not respond in time: {timeout_error}",
+                status=504
+            )
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as request_error:
+            return HttpResponse(
+                content=f"{self.target_host_name} could not be reached: {request_error}",
+                status=502
             )
-            return forward_response
+
+        return StreamingHttpResponse(
+            streaming_content=stream_response_content(response),
+            status=response.status_code,
+            headers=strip_hop_by_hop_headers(response.headers)
+        )
 
     def get(self, request: HttpRequest, *args, **kwargs):
         return self._action("get", request, *args, **kwargs)
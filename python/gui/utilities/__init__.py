@@ -7,6 +7,7 @@ from .common import now
 from .common import string_might_be_json
 from .common import make_message_serializable
 from .communication import get_redis_connection
+from .communication import get_pubsub_multiplexer
 from .code import CodeView
 from .code import CodeViews
 from .rendering import Payload
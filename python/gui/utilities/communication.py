@@ -6,19 +6,23 @@ import typing
 
 import redis
 
+from dmod.redis.pubsub import PubSubMultiplexer
+from dmod.redis.pubsub import get_multiplexer
+
 from maas_experiment import application_values
 
 
-def get_redis_connection(
+def get_connection_arguments(
     host: str = None,
     port: int = None,
     db: str = None,
     password: str = None,
     username: str = None,
     **kwargs
-) -> redis.Redis:
+) -> typing.Dict[str, typing.Any]:
     """
-    Forms a connection to a redis instance. If fields are not supplied, values fall back to environment configuration
+    Determine the arguments needed to connect to a redis instance. If fields are not supplied, values fall back to
+    environment configuration
 
     Args:
         host: The optional host to connect to
@@ -29,7 +33,7 @@ def get_redis_connection(
         **kwargs:
 
     Returns:
-        A connection to a redis instance
+        Keyword arguments for a redis client
     """
     construction_arguments = {
         "host": host or application_values.REDIS_HOST,
@@ -46,6 +50,70 @@ def get_redis_connection(
     if username or application_values.REDIS_USERNAME:
         construction_arguments['username'] = username or application_values.REDIS_USERNAME
 
+    return construction_arguments
+
+
+def get_pubsub_multiplexer(
+    host: str = None,
+    port: int = None,
+    db: str = None,
+    password: str = None,
+    username: str = None,
+    **kwargs
+) -> PubSubMultiplexer:
+    """
+    Get the pubsub multiplexer shared by everything in this process that listens to the described redis instance.
+    If fields are not supplied, values fall back to environment configuration
+
+    Must be called from within a running event loop
+
+    Args:
+        host: The optional host to connect to
+        port: The optional port to connect to
+        db: The optional redis db to connect to
+        password: The optional password to use when connecting to the instance
+        username: The optional username to use when connecting
+        **kwargs:
+
+    Returns:
+        The shared pubsub multiplexer for the redis instance
+    """
+    return get_multiplexer(
+        **get_connection_arguments(host=host, port=port, db=db, password=password, username=username, **kwargs)
+    )
+
+
+def get_redis_connection(
+    host: str = None,
+    port: int = None,
+    db: str = None,
+    password: str = None,
+    username: str = None,
+    **kwargs
+) -> redis.Redis:
+    """
+    Forms a connection to a redis instance. If fields are not supplied, values fall back to environment configuration
+
+    Args:
+        host: The optional host to connect to
+        port: The optional port to connect to
+        db: The optional redis db to connect to
+        password: The optional password to use when connecting to the instance
+        username: The optional username to use when connecting
+        **kwargs:
+
+    Returns:
+        A connection to a redis instance
+    """
+    construction_arguments = get_connection_arguments(
+        host=host,
+        port=port,
+        db=db,
+        password=password,
+        username=username,
+        **kwargs
+    )
+
     try:
         return redis.Redis(**construction_arguments)
     except Exception as e:
@@ -1,15 +1,120 @@
 import datetime
 import logging
-from typing import Optional
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from redis.client import Pipeline
+from redis.exceptions import RedisError
 
 from dmod.communication import FullAuthSession, Session, SessionManager
 from dmod.redis import RedisBacked
+from dmod.redis.pubsub import BackgroundListener, listen_in_background
+
+
+class _SessionCache:
+    """
+    Process-local, thread-safe cache of sessions by id, bounded in both size (evicting the least recently used) and in
+    how long (in seconds) an entry may be used before it must be re-read.
+
+    Reverse lookups of session ids by secret and by username are cached alongside.  Sessions are copied on the way in
+    and out, so callers' changes to session objects never alter cached entries.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[int, Tuple[FullAuthSession, float]] = OrderedDict()
+        self._ids_by_secret: Dict[str, int] = dict()
+        self._ids_by_user: Dict[str, int] = dict()
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    def get(self, session_id: int) -> Optional[FullAuthSession]:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self.invalidate(session_id)
+                return None
+            self._entries.move_to_end(session_id)
+            return entry[0].copy()
+
+    def get_id_by_secret(self, session_secret: str) -> Optional[int]:
+        with self._lock:
+            return self._ids_by_secret.get(session_secret)
+
+    def get_id_by_user(self, username: str) -> Optional[int]:
+        with self._lock:
+            return self._ids_by_user.get(username)
+
+    def put(self, session: FullAuthSession):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[session.session_id] = (session.copy(), time.monotonic() + self._ttl)
+            self._entries.move_to_end(session.session_id)
+            self._ids_by_secret[session.session_secret] = session.session_id
+            self._ids_by_user[session.user] = session.session_id
+            while len(self._entries) > self._max_size:
+                self.invalidate(next(iter(self._entries)))
+
+    def touch(self, session_id: int, last_accessed: datetime.datetime):
+        """ Update the last access time of a cached session, without changing when the entry must be re-read. """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry[0].last_accessed = last_accessed
+
+    def invalidate(self, session_id: int):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return
+            session = entry[0]
+            if self._ids_by_secret.get(session.session_secret) == session_id:
+                del self._ids_by_secret[session.session_secret]
+            if self._ids_by_user.get(session.user) == session_id:
+                del self._ids_by_user[session.user]
+
+    def invalidate_secret_lookups(self):
+        with self._lock:
+            self._ids_by_secret.clear()
+
+    def invalidate_user_lookups(self):
+        with self._lock:
+            self._ids_by_user.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_secret.clear()
+            self._ids_by_user.clear()
 
 
 # TODO: add something to periodically scrub sessions due to some expiring criteria
 class RedisBackendSessionManager(SessionManager, RedisBacked):
+    """
+    Session manager persisting sessions in Redis, with a process-local cache of sessions and leases on refreshes.
+
+    Looked-up sessions are cached (see ``session_cache_size`` and ``session_cache_ttl``), so that validating the session
+    of an authenticated request does not normally need any Redis round trips.  Cached entries are invalidated when
+    their records change in Redis, by any process, through Redis keyspace event notifications; the cache TTL bounds how
+    long a revoked or changed session may still be served from the cache if notifications are missed or unavailable.
+
+    Refreshes of a session's last access time are leased: after a refresh is written to Redis, later refreshes of the
+    same session from this process only update the cached session until the lease interval has passed.  Persisted
+    last access times may therefore lag by up to the lease interval, which should be much shorter than the session
+    timeout.
+    """
     _LOGGER = None
     _SESSION_KEY_PREFIX = 'session:'
     _SESSION_HASH_SUBKEY_SECRET = 'secret'
@@ -65,8 +170,40 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
     #def get_user_key_prefix(cls):
     #    return cls._USER_KEY_PREFIX
 
+    _KEYSPACE_EVENT_FLAGS = 'Eghxe'
+    """ Keyspace notification flags for keyevent notifications of generic, hash, expired, and evicted events. """
+    _INVALIDATING_EVENTS = ('del', 'hset', 'hdel', 'expired', 'evicted')
+    """ Keyevent notifications that invalidate cached entries for their key. """
+
     def __init__(self, redis_host: Optional[str] = None, redis_port: Optional[int] = None,
-                 redis_pass: Optional[str] = None):
+                 redis_pass: Optional[str] = None, session_cache_size: int = 1024, session_cache_ttl: float = 30.0,
+                 refresh_lease_seconds: float = 60.0, enable_keyspace_notifications: bool = True,
+                 invalidation_connection_factory: Optional[Callable[..., Any]] = None):
+        """
+        Initialize this instance.
+
+        Parameters
+        ----------
+        redis_host : Optional[str]
+            The Redis host, or ``None`` for the default.
+        redis_port : Optional[int]
+            The Redis port, or ``None`` for the default.
+        redis_pass : Optional[str]
+            The Redis password, or ``None`` for the default.
+        session_cache_size : int
+            The maximum number of sessions to cache, with ``0`` disabling caching.
+        session_cache_ttl : float
+            The maximum seconds a cached session is used before it is re-read from Redis, which bounds how long a
+            revoked session may still be seen as valid if invalidation notifications are not received.
+        refresh_lease_seconds : float
+            The minimum seconds between writes of a session's refreshed last access time to Redis.
+        enable_keyspace_notifications : bool
+            Whether to turn on the Redis keyspace notifications used to invalidate cached sessions, if not already on;
+            when ``False``, notifications are used only if Redis has already been configured to send them.
+        invalidation_connection_factory : Optional[Callable[..., Any]]
+            Optional callable to create the asynchronous Redis client used to receive invalidation notifications,
+            defaulting to ::class:`redis.asyncio.Redis`.
+        """
         super().__init__(redis_host=redis_host, redis_port=redis_port, redis_pass=redis_pass)
 
         self._next_session_id_key = 'next_session_id'
@@ -87,6 +224,95 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
                                                 self._session_redis_hash_subkey_created,
                                                 self._session_redis_hash_subkey_last_accessed}
 
+        self._session_cache = _SessionCache(max_size=session_cache_size, ttl=session_cache_ttl)
+        self._refresh_lease_seconds = refresh_lease_seconds
+        # Monotonic times until which the leases on writing refreshes of sessions are held, by session id
+        self._refresh_leases: Dict[int, float] = dict()
+        self._refresh_leases_lock = RLock()
+
+        self._invalidation_listener: Optional[BackgroundListener] = None
+        if self._session_cache.enabled:
+            self._invalidation_listener = self._listen_for_invalidations(enable_keyspace_notifications,
+                                                                         invalidation_connection_factory)
+
+    def _listen_for_invalidations(self, enable_notifications: bool,
+                                  connection_factory: Optional[Callable[..., Any]]) -> Optional[BackgroundListener]:
+        """
+        Start listening for keyevent notifications that invalidate cached sessions, returning ``None`` on failure.
+
+        Without notifications, cached sessions are only re-read from Redis once their entries expire.
+        """
+        if enable_notifications:
+            try:
+                try:
+                    current_flags = self.redis.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+                except RedisError:
+                    current_flags = ''
+                missing_flags = ''.join(f for f in self._KEYSPACE_EVENT_FLAGS if f not in current_flags)
+                if missing_flags:
+                    self.redis.config_set('notify-keyspace-events', current_flags + missing_flags)
+            except RedisError as e:
+                self.get_logger().warning(f"Could not enable Redis keyspace notifications ({e!s}); cached sessions "
+                                          f"will only be re-read after expiring")
+        connection_kwargs = {k: v for k, v in self.redis.connection_pool.connection_kwargs.items()
+                             if k in ('host', 'port', 'db', 'username', 'password')}
+        channels = [f"__keyevent@{connection_kwargs.get('db', 0)}__:{event}" for event in self._INVALIDATING_EVENTS]
+        try:
+            return listen_in_background(channels, self._handle_invalidation, connection_factory=connection_factory,
+                                        **connection_kwargs)
+        except Exception as e:
+            self.get_logger().warning(f"Could not listen for session invalidations ({e.__class__.__name__}: {e!s}); "
+                                      f"cached sessions will only be re-read after expiring")
+            return None
+
+    def _handle_invalidation(self, message: dict):
+        key = message.get('data')
+        if isinstance(key, bytes):
+            key = key.decode()
+        if not isinstance(key, str):
+            return
+        if key.startswith(self.get_session_key_prefix()):
+            try:
+                self._session_cache.invalidate(int(key[len(self.get_session_key_prefix()):]))
+            except ValueError:
+                pass
+        elif key == self._all_session_secrets_hash_key:
+            self._session_cache.invalidate_secret_lookups()
+        elif key == self._all_users_hash_key:
+            self._session_cache.invalidate_user_lookups()
+
+    def _acquire_refresh_lease(self, session_id: int) -> bool:
+        """
+        Acquire the lease on writing a refresh of the given session, if it is not already held.
+
+        Returns
+        -------
+        bool
+            Whether the lease was acquired, in which case the refresh should be written.
+        """
+        now = time.monotonic()
+        with self._refresh_leases_lock:
+            if self._refresh_leases.get(session_id, 0.0) > now:
+                return False
+            self._refresh_leases[session_id] = now + self._refresh_lease_seconds
+            # Keep expired leases from accumulating
+            if len(self._refresh_leases) > 1024 and len(self._refresh_leases) > 2 * len(self._session_cache):
+                self._refresh_leases = {sid: t for sid, t in self._refresh_leases.items() if t > now}
+            return True
+
+    def _release_refresh_lease(self, session_id: int):
+        with self._refresh_leases_lock:
+            self._refresh_leases.pop(session_id, None)
+
+    def close(self):
+        """
+        Stop listening for invalidation notifications, and clear cached sessions.
+        """
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.stop(timeout=5)
+            self._invalidation_listener = None
+        self._session_cache.clear()
+
     def _write_session_via_pipeline(self, session: FullAuthSession, pipeline: Optional[Pipeline] = None,
                                     write_attr_subkeys: Optional[set] = None):
         """
@@ -145,6 +371,8 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
             self.get_logger().error('Encountered {} instance: {}'.format(e.__class__.__name__, str(e)))
             raise e
         finally:
+            # The persisted record may no longer match any cached copy
+            self._session_cache.invalidate(session.session_id)
             if did_internal_init_pipeline:
                 pipeline.reset()
 
@@ -195,32 +423,61 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
                 pipeline.hset(self._all_session_secrets_hash_key, session.session_secret, session.session_id)
                 pipeline.hset(self._all_users_hash_key, session.user, session.session_id)
 
+                self._session_cache.put(session)
                 return session
             except Exception as e:
                 self.get_logger().error('Encountered {} instance: {}'.format(e.__class__.__name__, str(e)))
                 raise e
 
     def lookup_session_by_id(self, session_id: int) -> Optional[FullAuthSession]:
+        cached = self._session_cache.get(session_id)
+        if cached is not None:
+            return cached
         record_hash = self.redis.hgetall(self.get_key_for_session_by_id(session_id))
         # Comes back from Redis as a dict, perhaps empty if nothing is found for this session id
         if record_hash is None or len(record_hash) == 0:
             return None
-        return FullAuthSession(session_id=session_id,
-                               session_secret=record_hash[self._session_redis_hash_subkey_secret],
-                               created=record_hash[self._session_redis_hash_subkey_created],
-                               ip_address=record_hash[self._session_redis_hash_subkey_ip_address],
-                               user=record_hash[self._session_redis_hash_subkey_user],
-                               last_accessed=record_hash[self._session_redis_hash_subkey_last_accessed])
+        session = FullAuthSession(session_id=session_id,
+                                  session_secret=record_hash[self._session_redis_hash_subkey_secret],
+                                  created=record_hash[self._session_redis_hash_subkey_created],
+                                  ip_address=record_hash[self._session_redis_hash_subkey_ip_address],
+                                  user=record_hash[self._session_redis_hash_subkey_user],
+                                  last_accessed=record_hash[self._session_redis_hash_subkey_last_accessed])
+        self._session_cache.put(session)
+        return session
 
     def lookup_session_by_secret(self, session_secret: str) -> Optional[FullAuthSession]:
+        cached_id = self._session_cache.get_id_by_secret(session_secret)
+        if cached_id is not None:
+            cached = self._session_cache.get(cached_id)
+            if cached is not None and cached.session_secret == session_secret:
+                return cached
         session_id: Optional[str] = self.redis.hget(self._all_session_secrets_hash_key, session_secret)
         return None if session_id is None else self.lookup_session_by_id(int(session_id))
 
     def lookup_session_by_username(self, username: str) -> Optional[FullAuthSession]:
+        cached_id = self._session_cache.get_id_by_user(username)
+        if cached_id is not None:
+            cached = self._session_cache.get(cached_id)
+            if cached is not None and cached.user == username:
+                return cached
         session_id: Optional[str] = self.redis.hget(self._all_users_hash_key, username)
         return None if session_id is None else self.lookup_session_by_id(int(session_id))
 
     def refresh_session(self, session: Session) -> bool:
+        """
+        Refresh the last access time of a valid session, writing it to Redis at most once per lease interval.
+
+        Parameters
+        ----------
+        session : Session
+            The session to refresh, which has its last access time updated if it is refreshed.
+
+        Returns
+        -------
+        bool
+            Whether the session is valid and was refreshed.
+        """
         if session.is_expired():
             return False
         looked_up = self.lookup_session_by_id(session.session_id)
@@ -229,12 +486,21 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
         new_last_accessed = datetime.datetime.now()
         looked_up.last_accessed = new_last_accessed
         # TODO(later): consider adding a maximum session time to cap refreshes
+        if not self._acquire_refresh_lease(session.session_id):
+            # A refresh within the lease interval has already been written, so just refresh the cached session
+            self._session_cache.touch(session.session_id, new_last_accessed)
+            session.last_accessed = new_last_accessed
+            return True
         attr_write_set = {self._session_redis_hash_subkey_last_accessed}
         pipeline = self.redis.pipeline()
         try:
             self._write_session_via_pipeline(session=looked_up, pipeline=pipeline, write_attr_subkeys=attr_write_set)
+            self._session_cache.put(looked_up)
             session.last_accessed = new_last_accessed
             return True
+        except Exception:
+            self._release_refresh_lease(session.session_id)
+            raise
         finally:
             pipeline.reset()
 
@@ -247,6 +513,22 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
         pipeline.hdel(self._all_users_hash_key, session.user)
 
         pipeline.execute()
+        self._session_cache.invalidate(session.session_id)
+        self._release_refresh_lease(session.session_id)
 
-    def user_has_valid_session(self, username: str):
-        pass
+    def user_has_valid_session(self, username: str) -> bool:
+        """
+        Whether a user has an unexpired session, answered from cached sessions when possible.
+
+        Parameters
+        ----------
+        username : str
+            The user's name.
+
+        Returns
+        -------
+        bool
+            Whether the user has an unexpired session.
+        """
+        session = self.lookup_session_by_username(username)
+        return session is not None and not session.is_expired()
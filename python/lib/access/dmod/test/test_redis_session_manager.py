@@ -0,0 +1,217 @@
+import datetime
+import time
+import unittest
+
+from collections import Counter
+from typing import Callable
+from unittest.mock import patch
+
+from ..access.redis_session_manager import FullAuthSession, RedisBackendSessionManager
+from dmod.redis import RedisBacked
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class CountingRedis(fakeredis.FakeRedis if fakeredis is not None else object):
+    """
+    Fake Redis client that counts the commands and pipelines sent through it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.command_counts = Counter()
+
+    def execute_command(self, *args, **options):
+        self.command_counts[args[0]] += 1
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, *args, **kwargs):
+        self.command_counts['PIPELINE'] += 1
+        return super().pipeline(*args, **kwargs)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestRedisBackendSessionManager(unittest.TestCase):
+
+    REVOCATION_BOUND_SECONDS = 5.0
+    """ The bound within which revocation by another instance is expected to be seen via notifications. """
+
+    def setUp(self) -> None:
+        self.server = fakeredis.FakeServer()
+        self.clients = []
+        client_patch = patch.object(RedisBacked, '_init_redis_client', self._create_client)
+        client_patch.start()
+        self.addCleanup(client_patch.stop)
+        self.ip_address = '127.0.0.1'
+        self.username = 'test_user'
+
+    def _create_client(self, *args, **kwargs) -> CountingRedis:
+        client = CountingRedis(server=self.server, decode_responses=True)
+        self.clients.append(client)
+        return client
+
+    def _create_manager(self, **kwargs) -> RedisBackendSessionManager:
+        kwargs.setdefault('invalidation_connection_factory',
+                          lambda **kw: fakeredis.FakeAsyncRedis(server=self.server, decode_responses=True))
+        manager = RedisBackendSessionManager(redis_host='localhost', redis_port=6379, redis_pass='', **kwargs)
+        self.addCleanup(manager.close)
+        return manager
+
+    def _redis_op_count(self, manager: RedisBackendSessionManager) -> int:
+        return sum(manager.redis.command_counts.values())
+
+    def _reset_op_count(self, manager: RedisBackendSessionManager):
+        manager.redis.command_counts.clear()
+
+    def _wait_for(self, condition: Callable[[], bool], timeout: float) -> float:
+        """ Wait for a condition to hold, returning the seconds waited, or failing if it doesn't within the timeout. """
+        start = time.monotonic()
+        while not condition():
+            if time.monotonic() - start > timeout:
+                self.fail(f"Condition not met within {timeout} seconds")
+            time.sleep(0.01)
+        return time.monotonic() - start
+
+    def test_lookup_session_by_secret_1_a(self):
+        """ Test that repeated lookups of a session by secret make no Redis round trips once it is cached. """
+        manager = self._create_manager()
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        # Let notifications of the create's writes be handled, then prime the cache
+        time.sleep(0.2)
+        manager.lookup_session_by_secret(session.session_secret)
+        self._reset_op_count(manager)
+        for _ in range(100):
+            self.assertTrue(session.full_equals(manager.lookup_session_by_secret(session.session_secret)))
+        self.assertEqual(self._redis_op_count(manager), 0)
+
+    def test_lookup_session_by_id_1_a(self):
+        """ Test that changes to a looked up session don't change the cached session. """
+        manager = self._create_manager()
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        looked_up = manager.lookup_session_by_id(session.session_id)
+        looked_up.session_secret = 'changed'
+        self.assertEqual(manager.lookup_session_by_id(session.session_id).session_secret, session.session_secret)
+
+    def test_lookup_session_by_id_2_a(self):
+        """ Test that the least recently used sessions are evicted once the cache is full. """
+        manager = self._create_manager(session_cache_size=2)
+        sessions = [manager.create_session(ip_address=self.ip_address, username=f"user_{i}") for i in range(3)]
+        time.sleep(0.2)
+        for s in sessions:
+            manager.lookup_session_by_id(s.session_id)
+        self._reset_op_count(manager)
+        manager.lookup_session_by_id(sessions[2].session_id)
+        self.assertEqual(self._redis_op_count(manager), 0)
+        manager.lookup_session_by_id(sessions[0].session_id)
+        self.assertEqual(self._redis_op_count(manager), 1)
+
+    def test_refresh_session_1_a(self):
+        """ Test that steady-state authenticated requests (lookup and refresh) make almost no Redis round trips. """
+        manager = self._create_manager(refresh_lease_seconds=60)
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        time.sleep(0.2)
+        request_count = 100
+        self._reset_op_count(manager)
+        for _ in range(request_count):
+            looked_up = manager.lookup_session_by_secret(session.session_secret)
+            self.assertTrue(manager.refresh_session(looked_up))
+        # One write of the refresh, plus possibly a re-read after the notification of that write is handled
+        self.assertLessEqual(self._redis_op_count(manager) / request_count, 0.05)
+
+    def test_refresh_session_1_b(self):
+        """ Test that refreshes within the lease interval are written to Redis only once. """
+        manager = self._create_manager(refresh_lease_seconds=60)
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        for _ in range(10):
+            self.assertTrue(manager.refresh_session(session))
+        self.assertEqual(manager.redis.command_counts['PIPELINE'], 2)
+
+    def test_refresh_session_1_c(self):
+        """ Test that a coalesced refresh still updates the session and the cached session. """
+        manager = self._create_manager(refresh_lease_seconds=60)
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        self.assertTrue(manager.refresh_session(session))
+        before = datetime.datetime.now()
+        self.assertTrue(manager.refresh_session(session))
+        self.assertGreaterEqual(session.last_accessed, before)
+        self.assertTrue(session.full_equals(manager.lookup_session_by_id(session.session_id)))
+
+    def test_refresh_session_1_d(self):
+        """ Test that refreshes are written again once the lease interval has passed. """
+        manager = self._create_manager(refresh_lease_seconds=0.1)
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        self.assertTrue(manager.refresh_session(session))
+        time.sleep(0.2)
+        self.assertTrue(manager.refresh_session(session))
+        self.assertEqual(manager.redis.command_counts['PIPELINE'], 3)
+
+    def test_refresh_session_2_a(self):
+        """ Test that a session revoked by another instance can't be refreshed once the revocation propagates. """
+        manager = self._create_manager()
+        other_manager = self._create_manager()
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        self.assertTrue(manager.refresh_session(session))
+        other_manager.remove_session(session)
+        self._wait_for(lambda: not manager.refresh_session(session), timeout=self.REVOCATION_BOUND_SECONDS)
+
+    def test_remove_session_1_a(self):
+        """ Test that a session revoked by another instance propagates to lookups within the bound. """
+        manager = self._create_manager()
+        other_manager = self._create_manager()
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        self.assertIsNotNone(manager.lookup_session_by_secret(session.session_secret))
+        other_manager.remove_session(session)
+        self._wait_for(lambda: manager.lookup_session_by_secret(session.session_secret) is None,
+                       timeout=self.REVOCATION_BOUND_SECONDS)
+        self.assertIsNone(manager.lookup_session_by_id(session.session_id))
+
+    def test_remove_session_1_b(self):
+        """ Test that without notifications, revocation by another instance propagates within the cache TTL. """
+        manager = self._create_manager(session_cache_ttl=0.5, enable_keyspace_notifications=False)
+        other_manager = self._create_manager(session_cache_ttl=0.5, enable_keyspace_notifications=False)
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        self.assertIsNotNone(manager.lookup_session_by_secret(session.session_secret))
+        other_manager.remove_session(session)
+        waited = self._wait_for(lambda: manager.lookup_session_by_secret(session.session_secret) is None, timeout=2.0)
+        self.assertLessEqual(waited, 1.0)
+
+    def test_remove_session_1_c(self):
+        """ Test that a session removed through the same instance is immediately no longer found. """
+        manager = self._create_manager()
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        manager.lookup_session_by_id(session.session_id)
+        manager.remove_session(session)
+        self.assertIsNone(manager.lookup_session_by_id(session.session_id))
+        self.assertFalse(manager.user_has_valid_session(self.username))
+
+    def test_user_has_valid_session_1_a(self):
+        """ Test that a user with a current session has a valid session, answered without Redis round trips. """
+        manager = self._create_manager()
+        manager.create_session(ip_address=self.ip_address, username=self.username)
+        time.sleep(0.2)
+        self.assertTrue(manager.user_has_valid_session(self.username))
+        self._reset_op_count(manager)
+        self.assertTrue(manager.user_has_valid_session(self.username))
+        self.assertEqual(self._redis_op_count(manager), 0)
+
+    def test_user_has_valid_session_1_b(self):
+        """ Test that a user without a session does not have a valid session. """
+        manager = self._create_manager()
+        self.assertFalse(manager.user_has_valid_session(self.username))
+
+    def test_user_has_valid_session_1_c(self):
+        """ Test that a user with only an expired session does not have a valid session. """
+        manager = self._create_manager()
+        session = manager.create_session(ip_address=self.ip_address, username=self.username)
+        expired = FullAuthSession(session_id=session.session_id, session_secret=session.session_secret,
+                                  created=session.created, ip_address=session.ip_address, user=session.user,
+                                  last_accessed=datetime.datetime.now() - datetime.timedelta(days=1))
+        manager._write_session_via_pipeline(expired)
+        self.assertFalse(manager.user_has_valid_session(self.username))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,5 @@
+"""
+Reproducible benchmarks of DMOD hot paths, run on seeded synthetic data without any external services.
+"""
+from ._version import __version__
+from .runner import compare, discover_suites, run, time_benchmark
@@ -0,0 +1,336 @@
+"""
+Seeded generators of synthetic data for benchmarks.
+
+Every generator takes a ``seed`` and produces identical output for identical arguments, so that benchmark results from
+different runs (and machines) measure the same work.
+"""
+import math
+import random
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy
+import pandas
+
+from dmod.core.meta_data import DataDomain, DataFormat, DiscreteRestriction, StandardDatasetIndex, TimeRange
+
+DEFAULT_BEGIN = datetime(2016, 1, 1)
+""" The default start of generated time series. """
+
+AORC_FORCING_COLUMNS: Tuple[str, ...] = ("time", "APCP_surface", "DLWRF_surface", "DSWRF_surface", "PRES_surface",
+                                         "SPFH_2maboveground", "TMP_2maboveground", "UGRD_10maboveground",
+                                         "VGRD_10maboveground", "precip_rate")
+""" The columns of AORC forcing CSV files, as used by ngen. """
+
+
+def create_hydrofabric(catchment_count: int, seed: int = 0, max_branch_distance: int = 50):
+    """
+    Create a synthetic dendritic hydrofabric, where catchment ``cat-0`` drains to the terminal nexus ``tnx-0``.
+
+    Every other catchment ``cat-<i>`` drains to the inflow nexus ``nex-<j>`` of a randomly selected catchment
+    ``cat-<j>``, for some ``j < i``.
+
+    Parameters
+    ----------
+    catchment_count : int
+        The number of catchments.
+    seed : int
+        The seed for randomly connecting catchments.
+    max_branch_distance : int
+        The maximum difference between the indices of connected catchments, which controls the depth of the network.
+
+    Returns
+    -------
+    MappedGraphHydrofabric
+        The synthetic hydrofabric.
+    """
+    from hypy import Catchment, HydroLocation, Nexus
+    from dmod.modeldata.hydrofabric import MappedGraphHydrofabric
+
+    rng = random.Random(seed)
+    graph: Dict[str, Union[Catchment, Nexus]] = dict()
+    nexus_contrib_cats: Dict[str, Set[str]] = {"tnx-0": {"cat-0"}}
+    cat_to: Dict[str, str] = {"cat-0": "tnx-0"}
+
+    for i in range(catchment_count):
+        graph[f"cat-{i}"] = Catchment(catchment_id=f"cat-{i}", params=dict())
+        if i > 0:
+            to_nex_id = f"nex-{rng.randrange(max(0, i - max_branch_distance), i)}"
+            cat_to[f"cat-{i}"] = to_nex_id
+            nexus_contrib_cats.setdefault(to_nex_id, set()).add(f"cat-{i}")
+
+    cat_from = {f"cat-{nex_id[4:]}": nex_id for nex_id in nexus_contrib_cats if nex_id != "tnx-0"}
+
+    for nex_id, contributing in nexus_contrib_cats.items():
+        receiving = [graph[f"cat-{nex_id[4:]}"]] if nex_id != "tnx-0" else []
+        graph[nex_id] = Nexus(nexus_id=nex_id, hydro_location=HydroLocation(realized_nexus=nex_id),
+                              receiving_catchments=receiving,
+                              contributing_catchments=[graph[cid] for cid in sorted(contributing)])
+    for cat_id, nex_id in cat_to.items():
+        graph[cat_id]._outflow = graph[nex_id]
+    for cat_id, nex_id in cat_from.items():
+        graph[cat_id]._inflow = graph[nex_id]
+
+    roots = frozenset(cid for cid in graph if cid.startswith("cat-") and cid not in cat_from)
+    return MappedGraphHydrofabric(hydrofabric_object_graph=graph, roots=roots)
+
+
+def write_geopackage_hydrofabric(path: Union[str, Path], divide_count: int, seed: int = 0,
+                                max_branch_distance: int = 50) -> Path:
+    """
+    Write a synthetic dendritic GeoPackage hydrofabric, with ``divides`` and ``nexus`` layers.
+
+    The network is connected like that of ::func:`create_hydrofabric`, with divide ``cat-0`` draining to the terminal
+    nexus ``tnx-0``, and each other divide ``cat-<i>`` draining to the nexus ``nex-<j>`` upstream of a randomly selected
+    divide ``cat-<j>``, for some ``j < i``.  Divides are square polygons on a grid, and nexuses are points at their
+    corners.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        The GeoPackage file to write, which must not already exist.
+    divide_count : int
+        The number of divides.
+    seed : int
+        The seed for randomly connecting divides.
+    max_branch_distance : int
+        The maximum difference between the indices of connected divides, which controls the depth of the network.
+
+    Returns
+    -------
+    Path
+        The written file.
+    """
+    import geopandas
+    import shapely
+
+    rng = numpy.random.default_rng(seed)
+    indices = numpy.arange(divide_count)
+    # The first entry is unused, since cat-0 drains to the terminal nexus
+    to_indices = numpy.maximum(indices - rng.integers(1, max_branch_distance + 1, divide_count), 0)
+
+    divide_ids = pandas.Series(indices).map("cat-{}".format)
+    to_nexus_ids = pandas.Series(to_indices[1:]).map("nex-{}".format)
+    to_nexus_ids = pandas.concat([pandas.Series(["tnx-0"]), to_nexus_ids], ignore_index=True)
+
+    width = math.ceil(math.sqrt(divide_count))
+    x, y = (indices % width).astype(float), (indices // width).astype(float)
+    divides = geopandas.GeoDataFrame({"divide_id": divide_ids, "toid": to_nexus_ids,
+                                      "areasqkm": rng.uniform(1.0, 50.0, divide_count), "type": "network"},
+                                     geometry=shapely.box(x, y, x + 1, y + 1), crs="EPSG:5070")
+
+    nexus_indices = numpy.unique(to_indices[1:])
+    nexus = geopandas.GeoDataFrame({"id": pandas.Series(nexus_indices).map("nex-{}".format),
+                                    "toid": pandas.Series(nexus_indices).map("cat-{}".format), "type": "nexus"},
+                                   geometry=shapely.points(x[nexus_indices], y[nexus_indices]), crs="EPSG:5070")
+    terminal = geopandas.GeoDataFrame({"id": ["tnx-0"], "toid": [None], "type": ["terminal"]},
+                                      geometry=shapely.points([x[0]], [y[0]]), crs="EPSG:5070")
+    nexus = pandas.concat([nexus, terminal], ignore_index=True)
+
+    path = Path(path)
+    divides.to_file(path, layer="divides", driver="GPKG", engine="pyogrio")
+    nexus.to_file(path, layer="nexus", driver="GPKG", engine="pyogrio", append=True)
+    return path
+
+
+def create_aorc_forcing(hours: int, seed: int = 0, begin: datetime = DEFAULT_BEGIN) -> pandas.DataFrame:
+    """
+    Create an hourly AORC-like forcing time series for a single catchment.
+
+    Values follow plausible diurnal and synoptic cycles with seeded noise, rather than being physically consistent.
+
+    Parameters
+    ----------
+    hours : int
+        The number of hourly time steps.
+    seed : int
+        The seed for random variation.
+    begin : datetime
+        The time of the first time step.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The forcing time series, with the columns of ::data:`AORC_FORCING_COLUMNS`.
+    """
+    rng = numpy.random.default_rng(seed)
+    steps = numpy.arange(hours)
+    diurnal = numpy.sin(2 * math.pi * (steps % 24) / 24 - math.pi / 2)
+    synoptic = numpy.sin(2 * math.pi * steps / (24 * 5))
+
+    # Precipitation falls in occasional events, with rates in kg m-2 per hour
+    raining = rng.random(hours) < 0.08
+    precip = numpy.where(raining, rng.gamma(shape=0.8, scale=2.0, size=hours), 0.0)
+
+    frame = pandas.DataFrame({
+        "time": pandas.date_range(begin, periods=hours, freq="h").strftime("%Y-%m-%d %H:%M:%S"),
+        "APCP_surface": precip,
+        "DLWRF_surface": 300 + 30 * synoptic + rng.normal(0, 5, hours),
+        "DSWRF_surface": numpy.clip(600 * diurnal, 0, None) * rng.uniform(0.6, 1.0, hours),
+        "PRES_surface": 100_000 + 800 * synoptic + rng.normal(0, 50, hours),
+        "SPFH_2maboveground": 0.008 + 0.002 * synoptic + rng.normal(0, 0.0005, hours),
+        "TMP_2maboveground": 283 + 6 * diurnal + 4 * synoptic + rng.normal(0, 0.5, hours),
+        "UGRD_10maboveground": rng.normal(1.5, 2.0, hours),
+        "VGRD_10maboveground": rng.normal(0.5, 2.0, hours),
+        "precip_rate": precip / 3600,
+    })
+    return frame[list(AORC_FORCING_COLUMNS)]
+
+
+def write_aorc_forcing_csvs(directory: Union[str, Path], catchment_ids: Sequence[str], hours: int, seed: int = 0,
+                            begin: datetime = DEFAULT_BEGIN) -> List[Path]:
+    """
+    Write an AORC-like forcing CSV file for each of some catchments, named ``<catchment_id>.csv``.
+
+    Parameters
+    ----------
+    directory : Union[str, Path]
+        The existing directory in which to write files.
+    catchment_ids : Sequence[str]
+        The ids of the catchments for which to write files.
+    hours : int
+        The number of hourly time steps in each file.
+    seed : int
+        The seed for random variation, with each catchment's series seeded from it and the catchment's position.
+    begin : datetime
+        The time of the first time step.
+
+    Returns
+    -------
+    List[Path]
+        The written files, in the order of ``catchment_ids``.
+    """
+    paths = []
+    for i, catchment_id in enumerate(catchment_ids):
+        path = Path(directory).joinpath(f"{catchment_id}.csv")
+        create_aorc_forcing(hours=hours, seed=seed * 1_000_003 + i, begin=begin).to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def create_catchment_domains(count: int, catchments_per_domain: int, seed: int = 0, hours: int = 24 * 30,
+                             begin: datetime = DEFAULT_BEGIN) -> List[DataDomain]:
+    """
+    Create AORC CSV data domains over one shared time range, each for a random group of catchments.
+
+    Groups are drawn from a pool of catchments a few times larger than a single group, so that the domains overlap
+    somewhat, as those of datasets for nearby regions would.
+
+    Parameters
+    ----------
+    count : int
+        The number of domains.
+    catchments_per_domain : int
+        The number of catchments in each domain.
+    seed : int
+        The seed for randomly grouping catchments.
+    hours : int
+        The number of hours in the shared time range.
+    begin : datetime
+        The start of the shared time range.
+
+    Returns
+    -------
+    List[DataDomain]
+        The domains.
+    """
+    rng = random.Random(seed)
+    pool = [f"cat-{i}" for i in range(catchments_per_domain * max(4, count // 4))]
+    time_range = TimeRange(begin=begin, end=begin + timedelta(hours=hours))
+    return [DataDomain(data_format=DataFormat.AORC_CSV, continuous_restrictions=[time_range],
+                       discrete_restrictions=[DiscreteRestriction(variable=StandardDatasetIndex.CATCHMENT_ID,
+                                                                  values=rng.sample(pool, catchments_per_domain))])
+            for _ in range(count)]
+
+
+def create_observation_prediction_pairs(length: int, seed: int = 0, begin: datetime = DEFAULT_BEGIN,
+                                        observed_label: str = "observed",
+                                        predicted_label: str = "predicted") -> pandas.DataFrame:
+    """
+    Create paired hourly streamflow observations and predictions, as evaluations score.
+
+    Observations are a seasonal baseflow with randomly timed storm hydrographs; predictions are the observations with a
+    seeded bias, lag, and noise.
+
+    Parameters
+    ----------
+    length : int
+        The number of hourly values.
+    seed : int
+        The seed for random variation.
+    begin : datetime
+        The time of the first value.
+    observed_label : str
+        The name of the observations column.
+    predicted_label : str
+        The name of the predictions column.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The paired values, indexed by time.
+    """
+    rng = numpy.random.default_rng(seed)
+    steps = numpy.arange(length)
+    observed = 20 + 10 * numpy.sin(2 * math.pi * steps / (24 * 365))
+
+    storm_count = max(1, length // (24 * 10))
+    for start, peak in zip(rng.integers(0, length, storm_count), rng.gamma(2.0, 15.0, storm_count)):
+        after = steps[start:] - start
+        observed[start:] += peak * (after / 6.0) * numpy.exp(1 - after / 6.0)
+
+    predicted = numpy.roll(observed, int(rng.integers(0, 4))) * rng.uniform(0.8, 1.2) + rng.normal(0, 2.0, length)
+    index = pandas.date_range(begin, periods=length, freq="h", name="date")
+    return pandas.DataFrame({observed_label: observed, predicted_label: numpy.clip(predicted, 0, None)}, index=index)
+
+
+def create_jobs(count: int, seed: int = 0, statuses: Optional[Sequence] = None) -> list:
+    """
+    Create a population of requested jobs of varying sizes, in a mix of statuses.
+
+    Parameters
+    ----------
+    count : int
+        The number of jobs.
+    seed : int
+        The seed for randomly choosing job sizes and statuses.
+    statuses : Optional[Sequence[JobStatus]]
+        The statuses from which each job's status is chosen, by default a mix of active and finished statuses.
+
+    Returns
+    -------
+    List[RequestedJob]
+        The jobs.
+    """
+    from dmod.communication import NWMRequest, SchedulerRequestMessage
+    from dmod.scheduler.job import JobExecPhase, JobExecStep, JobStatus, RequestedJob
+
+    if statuses is None:
+        statuses = [JobStatus(JobExecPhase.MODEL_EXEC, step) for step in
+                    (JobExecStep.AWAITING_ALLOCATION, JobExecStep.AWAITING_ALLOCATION, JobExecStep.RUNNING,
+                     JobExecStep.RUNNING, JobExecStep.COMPLETED, JobExecStep.FAILED)]
+
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        model_request = NWMRequest.factory_init_from_deserialized_json({
+            "allocation_paradigm": "ROUND_ROBIN",
+            "cpu_count": 1,
+            "job_type": "nwm",
+            "request_body": {"nwm": {"config_data_id": str(i), "data_requirements": [{
+                "category": "CONFIG",
+                "domain": {"continuous": [], "data_format": "NWM_CONFIG",
+                           "discrete": [{"values": [str(i)], "variable": "DATA_ID"}]},
+                "is_input": True}]}},
+            "session_secret": f"{rng.getrandbits(256):064x}"})
+        scheduler_request = SchedulerRequestMessage(model_request=model_request, user_id=f"user-{rng.randrange(10)}",
+                                                    cpus=rng.choice([1, 2, 4, 8, 16, 32]),
+                                                    mem=rng.choice([500_000, 1_000_000, 4_000_000]),
+                                                    allocation_paradigm=rng.choice(["single-node", "fill-nodes",
+                                                                                    "round-robin"]))
+        job = RequestedJob(job_request=scheduler_request)
+        job.set_status(rng.choice(statuses))
+        jobs.append(job)
+    return jobs
@@ -0,0 +1,168 @@
+"""
+A filesystem-backed stand-in for the object store client used by the object store dataset manager.
+
+This lets data management and transfer paths be benchmarked offline, without a running object store, while still
+exercising the manager's own logic.  Only the parts of the client API used by the manager are supported.
+"""
+import io
+import shutil
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+from unittest.mock import patch
+
+
+class _Bucket:
+
+    __slots__ = ["name", "creation_date"]
+
+    def __init__(self, name: str, creation_date: datetime):
+        self.name = name
+        self.creation_date = creation_date
+
+
+class _Object:
+
+    __slots__ = ["bucket_name", "object_name", "size"]
+
+    def __init__(self, bucket_name: str, object_name: str, size: Optional[int] = None):
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.size = size
+
+
+class _Response:
+    """ Response to an object read, with the attributes and methods of the HTTP responses of the real client. """
+
+    __slots__ = ["data"]
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def read(self) -> bytes:
+        return self.data
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+class FilesystemObjectStore:
+    """
+    Stand-in for a ``minio.Minio`` client, storing buckets as directories and objects as files beneath a root directory.
+
+    Parameters
+    ----------
+    root : Union[str, Path]
+        The directory under which buckets are stored, which is created if necessary.
+    """
+
+    def __init__(self, root: Union[str, Path], *args, **kwargs):
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def _bucket_dir(self, bucket_name: str, must_exist: bool = True) -> Path:
+        bucket_dir = self._root.joinpath(bucket_name)
+        if must_exist and not bucket_dir.is_dir():
+            raise RuntimeError(f"No such bucket {bucket_name}")
+        return bucket_dir
+
+    def _object_path(self, bucket_name: str, object_name: str) -> Path:
+        return self._bucket_dir(bucket_name).joinpath(object_name)
+
+    def _write(self, bucket_name: str, object_name: str, data: bytes) -> _Object:
+        path = self._object_path(bucket_name, object_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return _Object(bucket_name, object_name, len(data))
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        return self._bucket_dir(bucket_name, must_exist=False).is_dir()
+
+    def make_bucket(self, bucket_name: str, *args, **kwargs):
+        bucket_dir = self._bucket_dir(bucket_name, must_exist=False)
+        if bucket_dir.exists():
+            raise RuntimeError(f"Bucket {bucket_name} already exists")
+        bucket_dir.mkdir()
+
+    def list_buckets(self) -> List[_Bucket]:
+        return [_Bucket(d.name, datetime.fromtimestamp(d.stat().st_mtime))
+                for d in sorted(self._root.iterdir()) if d.is_dir()]
+
+    def remove_bucket(self, bucket_name: str):
+        bucket_dir = self._bucket_dir(bucket_name)
+        if any(bucket_dir.iterdir()):
+            raise RuntimeError(f"Bucket {bucket_name} is not empty")
+        bucket_dir.rmdir()
+
+    def list_objects(self, bucket_name: str, prefix: Optional[str] = None, recursive: bool = False) -> Iterator[_Object]:
+        bucket_dir = self._bucket_dir(bucket_name)
+        files = bucket_dir.rglob("*") if recursive else bucket_dir.iterdir()
+        for path in sorted(files):
+            name = path.relative_to(bucket_dir).as_posix()
+            if prefix is not None and not name.startswith(prefix):
+                continue
+            if path.is_file():
+                yield _Object(bucket_name, name, path.stat().st_size)
+            elif not recursive:
+                yield _Object(bucket_name, f"{name}/")
+
+    def put_object(self, bucket_name: str, object_name: str, data, length: int, *args, **kwargs) -> _Object:
+        return self._write(bucket_name, object_name, data.read() if length < 0 else data.read(length))
+
+    def fput_object(self, bucket_name: str, object_name: str, file_path: str, *args, **kwargs) -> _Object:
+        return self._write(bucket_name, object_name, Path(file_path).read_bytes())
+
+    def get_object(self, bucket_name: str, object_name: str, offset: int = 0, length: int = 0,
+                   *args, **kwargs) -> _Response:
+        path = self._object_path(bucket_name, object_name)
+        if not path.is_file():
+            raise RuntimeError(f"No such object {object_name} in bucket {bucket_name}")
+        with path.open("rb") as file:
+            file.seek(offset)
+            return _Response(file.read(length) if length else file.read())
+
+    def compose_object(self, bucket_name: str, object_name: str, sources: list, *args, **kwargs) -> _Object:
+        data = io.BytesIO()
+        for source in sources:
+            data.write(self._object_path(source.bucket_name, source.object_name).read_bytes())
+        return self._write(bucket_name, object_name, data.getvalue())
+
+    def remove_object(self, bucket_name: str, object_name: str, *args, **kwargs):
+        self._object_path(bucket_name, object_name).unlink(missing_ok=True)
+
+    def remove_objects(self, bucket_name: str, delete_object_list: Iterable, *args, **kwargs) -> Iterator:
+        for delete_object in delete_object_list:
+            self.remove_object(bucket_name, delete_object.name)
+        return iter(())
+
+    def clear(self):
+        """ Remove all buckets and objects. """
+        shutil.rmtree(self._root)
+        self._root.mkdir(parents=True)
+
+
+def create_dataset_manager(root: Union[str, Path]):
+    """
+    Create an object store dataset manager that is backed by a ::class:`FilesystemObjectStore`.
+
+    Parameters
+    ----------
+    root : Union[str, Path]
+        The directory under which the manager's buckets are stored, reloading any datasets already there.
+
+    Returns
+    -------
+    ObjectStoreDatasetManager
+        The dataset manager.
+    """
+    from dmod.modeldata.data import object_store_manager
+
+    with patch.object(object_store_manager, "Minio", lambda *args, **kwargs: FilesystemObjectStore(root)):
+        manager = object_store_manager.ObjectStoreDatasetManager(obj_store_host_str="localhost:9000")
+    if manager.errors:
+        raise manager.errors[0]
+    return manager
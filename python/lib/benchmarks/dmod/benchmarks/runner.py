@@ -0,0 +1,333 @@
+"""
+Discovery, timing, and baseline comparison of benchmark suites.
+
+Suites follow the conventions of ``asv``: a suite is a class in a module of the ::mod:`dmod.benchmarks.suites` package,
+with a ``setup`` method to prepare (untimed) state, an optional ``teardown`` method, and one or more ``time_<name>``
+methods that are each timed.  Suites may also have ``track_<name>`` methods, which return a measured value (e.g., memory
+use) to record and compare in place of a time, in the unit given by the method's optional ``unit`` attribute.  Suites may
+set these class attributes to control how they are run:
+
+``repeat``
+    How many timing samples to take for each benchmark.
+``number``
+    How many calls make up a sample, which is chosen automatically when not set.
+``regression_threshold``
+    Relative slowdown over the baseline beyond which the suite's benchmarks count as regressions.
+"""
+import importlib
+import inspect
+import json
+import logging
+import pkgutil
+import platform
+import statistics
+import sys
+import time
+
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
+
+from ._version import __version__
+
+DEFAULT_REPEAT = 5
+""" The default number of timing samples per benchmark. """
+
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+""" The default relative slowdown over the baseline beyond which a benchmark counts as a regression. """
+
+MIN_SAMPLE_SECONDS = 0.05
+""" The minimum duration of a sample when choosing the number of calls per sample automatically. """
+
+SUITES_PACKAGE = "dmod.benchmarks.suites"
+""" The package in which suite modules are discovered. """
+
+
+def discover_suites(package: str = SUITES_PACKAGE) -> Iterator[Tuple[str, Type]]:
+    """
+    Discover benchmark suites in the modules of a package.
+
+    Modules that cannot be imported, typically because an optional dependency of the library they benchmark is not
+    installed, are skipped with a warning.
+
+    Parameters
+    ----------
+    package : str
+        The name of the package in which to discover suites.
+
+    Returns
+    -------
+    Iterator[Tuple[str, Type]]
+        The qualified names (``<module>.<class>``, relative to the package) and classes of discovered suites.
+    """
+    for module_info in sorted(pkgutil.iter_modules(importlib.import_module(package).__path__), key=lambda m: m.name):
+        try:
+            module = importlib.import_module(f"{package}.{module_info.name}")
+        except ImportError as e:
+            logging.warning(f"Skipping benchmarks in {module_info.name} after failing to import it: {e!s}")
+            continue
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__ and not name.startswith("_") and any(_benchmark_methods(cls)):
+                yield f"{module_info.name}.{name}", cls
+
+
+def _benchmark_methods(suite: Type) -> List[str]:
+    return sorted(n for n, m in inspect.getmembers(suite, inspect.isfunction) if n.startswith(("time_", "track_")))
+
+
+def time_benchmark(suite: Type, method_name: str, repeat: Optional[int] = None,
+                   number: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Time a benchmark method of a suite.
+
+    A fresh suite instance is set up (and afterward torn down) for each benchmark, with the time spent doing so not
+    counted.  When not given or set on the suite, the number of calls per sample is chosen so a sample takes at least
+    ::data:`MIN_SAMPLE_SECONDS`.
+
+    Parameters
+    ----------
+    suite : Type
+        The suite class.
+    method_name : str
+        The name of the ``time_`` method to time.
+    repeat : Optional[int]
+        Optional number of samples to take, overriding that of the suite.
+    number : Optional[int]
+        Optional number of calls per sample, overriding that of the suite.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The benchmark results, including the ``min`` and ``median`` per-call times in seconds.
+    """
+    repeat = repeat or getattr(suite, "repeat", DEFAULT_REPEAT)
+    number = number or getattr(suite, "number", None)
+    instance = suite()
+    if hasattr(instance, "setup"):
+        instance.setup()
+    try:
+        func = getattr(instance, method_name)
+        if number is None:
+            number = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(number):
+                    func()
+                if time.perf_counter() - start >= MIN_SAMPLE_SECONDS or number >= 1_000_000:
+                    break
+                number *= 10
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown()
+    return {"min": min(samples), "median": statistics.median(samples), "repeat": repeat, "number": number,
+            "regression_threshold": getattr(suite, "regression_threshold", None)}
+
+
+def track_benchmark(suite: Type, method_name: str) -> Dict[str, Any]:
+    """
+    Record the value returned by a tracking benchmark method of a suite.
+
+    As with timed benchmarks, a fresh suite instance is set up (and afterward torn down) for the benchmark.
+
+    Parameters
+    ----------
+    suite : Type
+        The suite class.
+    method_name : str
+        The name of the ``track_`` method to call.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The benchmark results, including the returned ``value`` and its ``unit``.
+    """
+    instance = suite()
+    if hasattr(instance, "setup"):
+        instance.setup()
+    try:
+        func = getattr(instance, method_name)
+        value = func()
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown()
+    return {"value": value, "unit": getattr(func, "unit", None),
+            "regression_threshold": getattr(suite, "regression_threshold", None)}
+
+
+def _value(result: Dict[str, Any]) -> float:
+    """ The value by which a benchmark result is compared: the ``min`` time, or the value of a tracking benchmark. """
+    return result["value"] if "value" in result else result["min"]
+
+
+def run(patterns: Sequence[str] = ("*",), package: str = SUITES_PACKAGE, repeat: Optional[int] = None,
+        number: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run the discovered benchmarks with names matching any of some glob patterns.
+
+    Parameters
+    ----------
+    patterns : Sequence[str]
+        Glob patterns for the names of benchmarks to run, which have the form ``<module>.<class>.<method>``.
+    package : str
+        The name of the package in which to discover suites.
+    repeat : Optional[int]
+        Optional number of samples to take of every benchmark, overriding that of suites.
+    number : Optional[int]
+        Optional number of calls per sample of every benchmark, overriding that of suites.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The results, with information about the machine and run, and a ``benchmarks`` mapping of names to results.
+    """
+    results = dict()
+    for suite_name, suite in discover_suites(package):
+        for method_name in _benchmark_methods(suite):
+            name = f"{suite_name}.{method_name}"
+            if any(fnmatch(name, p) for p in patterns):
+                logging.info(f"Running {name}")
+                if method_name.startswith("track_"):
+                    results[name] = track_benchmark(suite, method_name)
+                else:
+                    results[name] = time_benchmark(suite, method_name, repeat=repeat, number=number)
+    return {"version": __version__, "created": datetime.now().isoformat(), "python": platform.python_version(),
+            "machine": {"node": platform.node(), "platform": platform.platform(), "processor": platform.processor()},
+            "benchmarks": results}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare results to a baseline, by the ratio of their ``min`` per-call times, or of tracked values.
+
+    Minimums are compared because they are the least affected by other activity on the machine.  Benchmarks only in
+    one of the results and baseline are ignored.
+
+    Parameters
+    ----------
+    results : Dict[str, Any]
+        The results of a run.
+    baseline : Dict[str, Any]
+        The results of an earlier run to compare against.
+    threshold : float
+        The relative slowdown beyond which a benchmark counts as a regression, for suites that don't set their own.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        A comparison for each benchmark in both, with the ``name``, ``baseline`` and ``current`` times, ``ratio``, and
+        whether it was a ``regression``.
+    """
+    comparisons = []
+    for name, current in sorted(results["benchmarks"].items()):
+        if name not in baseline["benchmarks"]:
+            continue
+        before = _value(baseline["benchmarks"][name])
+        ratio = _value(current) / before if before > 0 else float("inf")
+        allowed = current.get("regression_threshold") or threshold
+        comparisons.append({"name": name, "baseline": before, "current": _value(current), "ratio": ratio,
+                            "unit": current.get("unit"), "regression": ratio > 1 + allowed})
+    return comparisons
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f}{unit}"
+    return f"{seconds / 1e-9:.1f}ns"
+
+
+def _format_value(value: float, unit: Optional[str]) -> str:
+    return _format_seconds(value) if unit is None else f"{value:.3f}{unit}"
+
+
+def _load(path: Union[str, Path]) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def _save(results: Dict[str, Any], path: Union[str, Path]):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+def _handle_args(argv: Optional[Sequence[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m dmod.benchmarks",
+                                     description="Run DMOD benchmarks on seeded synthetic data, optionally failing "
+                                                 "when slower than a saved baseline.")
+    parser.add_argument("--filter", "-k", dest="patterns", action="append", default=None,
+                        help="Glob pattern for <module>.<class>.<method> names of benchmarks to run (repeatable)")
+    parser.add_argument("--repeat", type=int, default=None, help="Number of samples to take of each benchmark")
+    parser.add_argument("--number", type=int, default=None, help="Number of calls per sample of each benchmark")
+    parser.add_argument("--output", "-o", type=Path, default=None, help="File to which to write results as JSON")
+    parser.add_argument("--baseline", "-b", type=Path, default=None,
+                        help="JSON results file of an earlier run to compare against")
+    parser.add_argument("--save-baseline", dest="save_baseline", action="store_true",
+                        help="Write results to the baseline file, rather than comparing against it")
+    parser.add_argument("--threshold", "-t", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Relative slowdown beyond which a benchmark is a regression (default: %(default)s)")
+    parser.add_argument("--list", dest="list_only", action="store_true", help="List benchmarks without running them")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run benchmarks from the command line.
+
+    Parameters
+    ----------
+    argv : Optional[Sequence[str]]
+        Optional command line arguments, by default those of the process.
+
+    Returns
+    -------
+    int
+        The exit code, which is ``1`` when any benchmark regressed compared to the baseline and ``0`` otherwise.
+    """
+    args = _handle_args(argv)
+    patterns = args.patterns or ["*"]
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.list_only:
+        for suite_name, suite in discover_suites():
+            for method_name in _benchmark_methods(suite):
+                if any(fnmatch(f"{suite_name}.{method_name}", p) for p in patterns):
+                    print(f"{suite_name}.{method_name}")
+        return 0
+
+    results = run(patterns, repeat=args.repeat, number=args.number)
+    if args.output is not None:
+        _save(results, args.output)
+
+    if args.baseline is None:
+        for name, result in results["benchmarks"].items():
+            if "value" in result:
+                print(f"{name:<64} {_format_value(result['value'], result['unit']):>12}")
+            else:
+                print(f"{name:<64} {_format_seconds(result['min']):>12} {_format_seconds(result['median']):>12}")
+        return 0
+    elif args.save_baseline or not args.baseline.exists():
+        _save(results, args.baseline)
+        print(f"Saved baseline of {len(results['benchmarks'])} benchmarks to {args.baseline}")
+        return 0
+
+    comparisons = compare(results, _load(args.baseline), threshold=args.threshold)
+    for c in comparisons:
+        flag = "REGRESSION" if c["regression"] else ""
+        print(f"{c['name']:<64} {_format_value(c['baseline'], c['unit']):>12} "
+              f"{_format_value(c['current'], c['unit']):>12} "
+              f"{c['ratio']:>7.2f}x {flag}")
+    regressions = [c for c in comparisons if c["regression"]]
+    if regressions:
+        print(f"{len(regressions)} of {len(comparisons)} benchmarks regressed compared to {args.baseline}",
+              file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,5 @@
+"""
+Benchmark suites, with a module for each benchmarked library.
+
+See ::mod:`dmod.benchmarks.runner` for the conventions suites follow.
+"""
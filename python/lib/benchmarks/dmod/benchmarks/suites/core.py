@@ -0,0 +1,59 @@
+"""
+Benchmarks of data domain algebra and serialization in ::mod:`dmod.core`.
+"""
+import json
+
+from dmod.core.data_domain_detectors import merge_domains_balanced
+from dmod.core.dataset import Dataset, DatasetType
+from dmod.core.meta_data import DataCategory, DataDomain, DataRequirement
+
+from ..generators import create_catchment_domains
+
+
+class DataDomainAlgebra:
+    """ Merging, subtracting, and checking containment of catchment data domains. """
+
+    domain_count = 64
+    catchments_per_domain = 200
+
+    def setup(self):
+        self.domains = create_catchment_domains(self.domain_count, self.catchments_per_domain, seed=1)
+        self.merged = merge_domains_balanced(self.domains)
+
+    def time_merge_domains(self):
+        DataDomain.merge_domains(self.domains[0], self.domains[1])
+
+    def time_merge_domains_balanced(self):
+        merge_domains_balanced(self.domains)
+
+    def time_subtract_domains(self):
+        DataDomain.subtract_domains(self.merged, self.domains[0])
+
+    def time_contains(self):
+        for domain in self.domains:
+            self.merged.contains(domain)
+
+
+class SerializableRoundTrip:
+    """ Serializing and deserializing common messages and metadata objects. """
+
+    def setup(self):
+        domain = create_catchment_domains(1, 1_000, seed=2)[0]
+        self.domain_dict = domain.to_dict()
+        self.requirement = DataRequirement(category=DataCategory.FORCING, domain=domain, is_input=True)
+        self.requirement_json = self.requirement.to_json()
+        self.dataset = Dataset(name="forcing", category=DataCategory.FORCING, data_domain=domain,
+                               dataset_type=DatasetType.OBJECT_STORE, access_location="forcing", is_read_only=True)
+        self.dataset_json = self.dataset.to_json()
+
+    def time_data_domain_round_trip(self):
+        DataDomain.factory_init_from_deserialized_json(self.domain_dict).to_dict()
+
+    def time_data_requirement_to_json(self):
+        self.requirement.to_json()
+
+    def time_data_requirement_parse(self):
+        DataRequirement.factory_init_from_deserialized_json(json.loads(self.requirement_json))
+
+    def time_dataset_round_trip(self):
+        Dataset.factory_init_from_deserialized_json(json.loads(self.dataset_json)).to_json()
@@ -0,0 +1,36 @@
+"""
+Benchmarks of scoring evaluations with ::mod:`dmod.metrics`.
+"""
+from dmod.metrics import metric as metrics, scoring
+from dmod.metrics.threshold import Threshold
+
+from ..generators import create_observation_prediction_pairs
+
+
+class ScoringSchemeScore:
+    """ Scoring a year of hourly predictions with a typical mix of metrics and flow thresholds. """
+
+    length = 24 * 365
+
+    def setup(self):
+        self.pairs = create_observation_prediction_pairs(self.length, seed=3)
+        self.thresholds = [Threshold(name=name, value=value, weight=weight, observed_value_key="observed",
+                                     predicted_value_key="predicted")
+                           for name, value, weight in (("low", 15, 1), ("median", 25, 2), ("high", 60, 5))]
+        self.truth_tables = metrics.categorical.TruthTables(self.pairs["observed"], self.pairs["predicted"],
+                                                            self.thresholds)
+        self.scheme = scoring.ScoringScheme([
+            metrics.PearsonCorrelationCoefficient(1),
+            metrics.KlingGuptaEfficiency(1),
+            metrics.NormalizedNashSutcliffeEfficiency(1),
+            metrics.ProbabilityOfDetection(1),
+            metrics.FalseAlarmRatio(1),
+            metrics.EquitableThreatScore(1),
+        ])
+
+    def time_score(self):
+        self.scheme.score(pairs=self.pairs, observed_value_label="observed", predicted_value_label="predicted",
+                          thresholds=self.thresholds, truth_tables=self.truth_tables)
+
+    def time_truth_tables(self):
+        metrics.categorical.TruthTables(self.pairs["observed"], self.pairs["predicted"], self.thresholds)
@@ -0,0 +1,121 @@
+"""
+Benchmarks of hydrofabric traversal and subsetting in ::mod:`dmod.modeldata`.
+"""
+import gc
+import os
+import random
+import resource
+import tempfile
+
+from pathlib import Path
+from typing import Dict
+
+from dmod.modeldata.hydrofabric import GeoPackageHydrofabric, HydrofabricCache
+from dmod.modeldata.subset import SubsetHandler
+from dmod.modeldata.subset.subset_handler import BasicSubsetValidator
+
+from ..generators import create_hydrofabric, write_geopackage_hydrofabric
+
+GEOPACKAGE_DIVIDES_ENV_VAR = "DMOD_BENCHMARK_HYDROFABRIC_DIVIDES"
+""" Environment variable to override the number of divides in the synthetic GeoPackage of cache benchmarks. """
+
+_geopackages: Dict[int, Path] = dict()
+""" Synthetic GeoPackages already written by this process, by divide count, since writing large ones is slow. """
+
+_geopackages_dir = None
+
+
+def _get_geopackage(divide_count: int) -> Path:
+    global _geopackages_dir
+    if divide_count not in _geopackages:
+        if _geopackages_dir is None:
+            _geopackages_dir = tempfile.TemporaryDirectory()
+        path = Path(_geopackages_dir.name).joinpath(f"hydrofabric-{divide_count}.gpkg")
+        _geopackages[divide_count] = write_geopackage_hydrofabric(path, divide_count, seed=7)
+    return _geopackages[divide_count]
+
+
+def _rss_mib() -> float:
+    """ The current resident set size of this process, in MiB, or the peak on platforms without ``/proc``. """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+class HydrofabricTraversal:
+    """ Upstream subsetting and subset validation over a synthetic hydrofabric. """
+
+    catchment_count = 20_000
+
+    def setup(self):
+        self.hydrofabric = create_hydrofabric(self.catchment_count, seed=4)
+        self.handler = SubsetHandler(self.hydrofabric)
+        self.validator = BasicSubsetValidator(self.hydrofabric)
+        rng = random.Random(4)
+        self.outlets = [f"cat-{rng.randrange(self.catchment_count // 100)}" for _ in range(10)]
+        # Build the upstream index ahead of timing, as a long-running service would have done
+        self.subset = self.handler.get_upstream_subset(self.outlets)
+
+    def time_get_upstream_subset(self):
+        self.handler.get_upstream_subset(self.outlets)
+
+    def time_get_upstream_subset_limited(self):
+        self.handler.get_upstream_subset(self.outlets, link_limit=20)
+
+    def time_validate(self):
+        self.validator.invalid_reason(self.subset)
+
+
+class HydrofabricCacheLoad:
+    """
+    Cold (converting and caching) versus warm (memory-mapped) loads of a large synthetic GeoPackage hydrofabric.
+
+    Loads include getting all catchment ids and the roots, as a service initializing from the hydrofabric would.  The
+    divide count is ``800_000`` (about the size of CONUS), unless overridden by ::data:`GEOPACKAGE_DIVIDES_ENV_VAR`.
+    """
+
+    repeat = 3
+    number = 1
+
+    def setup(self):
+        self.geopackage = _get_geopackage(int(os.environ.get(GEOPACKAGE_DIVIDES_ENV_VAR, 800_000)))
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = HydrofabricCache(self._tmp_dir.name)
+        self._load()
+
+    def teardown(self):
+        self._tmp_dir.cleanup()
+
+    def _load(self) -> GeoPackageHydrofabric:
+        hydrofabric = GeoPackageHydrofabric.from_file(self.geopackage, cache=self.cache)
+        hydrofabric.get_all_catchment_ids()
+        hydrofabric.roots
+        return hydrofabric
+
+    def _load_rss_increase(self) -> float:
+        gc.collect()
+        before = _rss_mib()
+        hydrofabric = self._load()
+        increase = _rss_mib() - before
+        del hydrofabric
+        return increase
+
+    def time_cold_load(self):
+        self.cache.clear()
+        self._load()
+
+    def time_warm_load(self):
+        self._load()
+
+    def track_cold_load_rss(self) -> float:
+        self.cache.clear()
+        return self._load_rss_increase()
+
+    track_cold_load_rss.unit = "MiB"
+
+    def track_warm_load_rss(self) -> float:
+        return self._load_rss_increase()
+
+    track_warm_load_rss.unit = "MiB"
@@ -0,0 +1,45 @@
+"""
+Benchmarks of persisting and querying jobs through ::mod:`dmod.scheduler`, backed by an in-process Redis stand-in.
+"""
+from unittest.mock import patch
+
+import fakeredis
+
+from dmod.redis import RedisBacked
+from dmod.scheduler.job import JobExecPhase, JobExecStep, JobStatus
+from dmod.scheduler.job.job_util import RedisBackedJobUtil
+
+from ..generators import create_jobs
+
+
+class RedisBackedJobUtilSuite:
+    """ Saving, retrieving, and querying a population of jobs. """
+
+    job_count = 500
+
+    def setup(self):
+        server = fakeredis.FakeServer()
+        self._client_patch = patch.object(RedisBacked, "_init_redis_client",
+                                          lambda *args, **kwargs: fakeredis.FakeRedis(server=server,
+                                                                                      decode_responses=True))
+        self._client_patch.start()
+        self.job_util = RedisBackedJobUtil(redis_host="localhost", redis_port=6379, redis_pass="")
+        self.jobs = create_jobs(self.job_count, seed=5)
+        for job in self.jobs:
+            self.job_util.save_job(job)
+        self.running = JobStatus(JobExecPhase.MODEL_EXEC, JobExecStep.RUNNING)
+
+    def teardown(self):
+        self._client_patch.stop()
+
+    def time_save_job(self):
+        self.job_util.save_job(self.jobs[0])
+
+    def time_retrieve_job(self):
+        self.job_util.retrieve_job(self.jobs[1].job_id)
+
+    def time_get_all_active_jobs(self):
+        self.job_util.get_all_active_jobs()
+
+    def time_get_jobs_for_status(self):
+        self.job_util.get_jobs_for_status(self.running)
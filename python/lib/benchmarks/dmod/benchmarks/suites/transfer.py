@@ -0,0 +1,55 @@
+"""
+Benchmarks of chunked data transfer from datasets in ::mod:`dmod.modeldata`, backed by a filesystem object store.
+"""
+import os
+import tempfile
+
+from uuid import uuid4
+
+from dmod.communication.data_transmit_message import DataTransmitMessage
+from dmod.core.meta_data import DataCategory, DataDomain, DataFormat, DiscreteRestriction, StandardDatasetIndex
+
+from ..generators import write_aorc_forcing_csvs
+from ..object_store import create_dataset_manager
+
+
+class ChunkedDatasetTransfer:
+    """ Reading forcing files from a dataset in chunks, and wrapping the chunks in transmit messages. """
+
+    catchment_count = 20
+    hours = 24 * 90
+    chunk_size = 1024
+    """ The size of the chunks sent by the data service. """
+
+    def setup(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        forcing_dir = f"{self._tmp_dir.name}/forcing"
+        catchment_ids = [f"cat-{i}" for i in range(self.catchment_count)]
+        os.mkdir(forcing_dir)
+        write_aorc_forcing_csvs(forcing_dir, catchment_ids, hours=self.hours, seed=6)
+
+        self.manager = create_dataset_manager(f"{self._tmp_dir.name}/store")
+        domain = DataDomain(data_format=DataFormat.AORC_CSV, discrete_restrictions=[
+            DiscreteRestriction(variable=StandardDatasetIndex.CATCHMENT_ID, values=catchment_ids)])
+        self.manager.create(name="forcing", category=DataCategory.FORCING, domain=domain, is_read_only=False)
+        self.manager.add_data("forcing", dest="", domain=domain, source=forcing_dir)
+        self.item_name = "cat-0.csv"
+        self.item_size = len(self.manager.get_data("forcing", self.item_name))
+
+    def teardown(self):
+        self._tmp_dir.cleanup()
+
+    def time_get_data(self):
+        self.manager.get_data("forcing", self.item_name)
+
+    def time_get_data_chunked(self):
+        for offset in range(0, self.item_size, self.chunk_size):
+            self.manager.get_data("forcing", self.item_name, offset=offset, length=self.chunk_size)
+
+    def time_transmit_messages(self):
+        data = self.manager.get_data("forcing", self.item_name)
+        series_uuid = uuid4()
+        for offset in range(0, len(data), self.chunk_size):
+            chunk = data[offset:offset + self.chunk_size]
+            DataTransmitMessage(data=chunk, series_uuid=series_uuid,
+                                is_last=offset + self.chunk_size >= len(data)).to_json()
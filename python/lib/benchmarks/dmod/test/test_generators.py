@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+
+import pandas
+
+from dmod.core.meta_data import StandardDatasetIndex
+
+from ..benchmarks import generators
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_create_aorc_forcing_0_a(self):
+        """ Test that forcing series have the AORC columns and are the same for the same seed. """
+        forcing = generators.create_aorc_forcing(hours=48, seed=7)
+        self.assertEqual(tuple(forcing.columns), generators.AORC_FORCING_COLUMNS)
+        self.assertEqual(len(forcing), 48)
+        self.assertEqual(forcing["time"].iloc[1], "2016-01-01 01:00:00")
+        pandas.testing.assert_frame_equal(forcing, generators.create_aorc_forcing(hours=48, seed=7))
+        self.assertFalse(forcing.equals(generators.create_aorc_forcing(hours=48, seed=8)))
+
+    def test_write_aorc_forcing_csvs_0_a(self):
+        """ Test that a file is written for each catchment, with reproducible contents. """
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            paths = generators.write_aorc_forcing_csvs(first, ["cat-1", "cat-2"], hours=24, seed=1)
+            again = generators.write_aorc_forcing_csvs(second, ["cat-1", "cat-2"], hours=24, seed=1)
+            self.assertEqual([p.name for p in paths], ["cat-1.csv", "cat-2.csv"])
+            self.assertEqual([p.read_text() for p in paths], [p.read_text() for p in again])
+            self.assertNotEqual(paths[0].read_text(), paths[1].read_text())
+
+    def test_write_geopackage_hydrofabric_0_a(self):
+        """ Test that a written GeoPackage is a connected hydrofabric with a single root-to-terminal outlet. """
+        from dmod.modeldata.hydrofabric import GeoPackageHydrofabric
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = generators.write_geopackage_hydrofabric(f"{tmp_dir}/hydrofabric.gpkg", divide_count=200, seed=5)
+            hydrofabric = GeoPackageHydrofabric.from_file(path)
+        self.assertEqual(len(hydrofabric.get_all_catchment_ids()), 200)
+        self.assertEqual(hydrofabric.get_catchment_by_id("cat-0").outflow.id, "tnx-0")
+        self.assertTrue(all(hydrofabric.is_nexus_recognized(c.outflow.id)
+                            for c in map(hydrofabric.get_catchment_by_id, ["cat-1", "cat-150", "cat-199"])))
+
+    def test_create_catchment_domains_0_a(self):
+        """ Test that domains are reproducible and restricted to the requested number of catchments. """
+        domains = generators.create_catchment_domains(count=8, catchments_per_domain=10, seed=2)
+        again = generators.create_catchment_domains(count=8, catchments_per_domain=10, seed=2)
+        self.assertEqual([d.to_dict() for d in domains], [d.to_dict() for d in again])
+        self.assertTrue(all(len(d.discrete_restrictions[StandardDatasetIndex.CATCHMENT_ID].values) == 10 for d in domains))
+
+    def test_create_observation_prediction_pairs_0_a(self):
+        """ Test that paired series are reproducible, hourly, and non-negative. """
+        pairs = generators.create_observation_prediction_pairs(length=24 * 30, seed=3)
+        pandas.testing.assert_frame_equal(pairs, generators.create_observation_prediction_pairs(length=24 * 30, seed=3))
+        self.assertEqual(list(pairs.columns), ["observed", "predicted"])
+        self.assertEqual(pairs.index.freqstr, "h")
+        self.assertTrue((pairs >= 0).all().all())
+
+    def test_create_jobs_0_a(self):
+        """ Test that job populations are reproducible apart from their generated ids. """
+        jobs = generators.create_jobs(count=10, seed=4)
+        again = generators.create_jobs(count=10, seed=4)
+        self.assertEqual([(j.cpu_count, j.memory_size, j.status) for j in jobs],
+                         [(j.cpu_count, j.memory_size, j.status) for j in again])
+        self.assertGreater(len({j.status for j in jobs}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
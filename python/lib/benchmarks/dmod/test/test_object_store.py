@@ -0,0 +1,50 @@
+import io
+import tempfile
+import unittest
+
+from dmod.core.meta_data import DataCategory, DataDomain, DataFormat, DiscreteRestriction, StandardDatasetIndex
+
+from ..benchmarks.object_store import FilesystemObjectStore, create_dataset_manager
+
+
+class TestFilesystemObjectStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        self.store = FilesystemObjectStore(self._tmp_dir.name)
+
+    def test_get_object_0_a(self):
+        """ Test that objects may be read whole or in ranges. """
+        self.store.make_bucket("bucket")
+        self.store.put_object("bucket", "dir/item", io.BytesIO(b"0123456789"), length=10)
+        self.assertEqual(self.store.get_object("bucket", "dir/item").data, b"0123456789")
+        self.assertEqual(self.store.get_object("bucket", "dir/item", offset=3, length=4).data, b"3456")
+        self.assertEqual([o.object_name for o in self.store.list_objects("bucket", recursive=True)], ["dir/item"])
+        self.assertEqual([o.object_name for o in self.store.list_objects("bucket")], ["dir/"])
+
+    def test_remove_bucket_0_a(self):
+        """ Test that only empty buckets may be removed. """
+        self.store.make_bucket("bucket")
+        self.store.put_object("bucket", "item", io.BytesIO(b"x"), length=1)
+        self.assertRaises(RuntimeError, self.store.remove_bucket, "bucket")
+        self.store.remove_object("bucket", "item")
+        self.store.remove_bucket("bucket")
+        self.assertFalse(self.store.bucket_exists("bucket"))
+
+    def test_create_dataset_manager_0_a(self):
+        """ Test that a dataset manager backed by the store can create datasets, add data, and reload them. """
+        domain = DataDomain(data_format=DataFormat.AORC_CSV, discrete_restrictions=[
+            DiscreteRestriction(variable=StandardDatasetIndex.CATCHMENT_ID, values=["cat-1"])])
+        manager = create_dataset_manager(self._tmp_dir.name)
+        manager.create(name="forcing", category=DataCategory.FORCING, domain=domain, is_read_only=False)
+        self.assertTrue(manager.add_data("forcing", dest="cat-1.csv", domain=domain, data=b"time,precip_rate\n"))
+        self.assertEqual(manager.get_data("forcing", "cat-1.csv", offset=5, length=6), b"precip")
+
+        reloaded = create_dataset_manager(self._tmp_dir.name)
+        self.assertEqual(list(reloaded.datasets), ["forcing"])
+        self.assertIn("cat-1.csv", reloaded.list_files("forcing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
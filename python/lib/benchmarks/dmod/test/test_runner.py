@@ -0,0 +1,97 @@
+import io
+import json
+import tempfile
+import unittest
+
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from ..benchmarks import runner
+
+
+class Sleeper:
+    """ Suite whose benchmark duration is controlled through a class attribute. """
+
+    repeat = 2
+    number = 1
+    work = 100
+
+    def setup(self):
+        self.values = list(range(self.work))
+
+    def time_sum(self):
+        sum(self.values)
+
+
+class TestRunner(unittest.TestCase):
+
+    def _results(self, **mins) -> dict:
+        return {"benchmarks": {name: {"min": value, "median": value, "regression_threshold": None}
+                               for name, value in mins.items()}}
+
+    def test_discover_suites_0_a(self):
+        """ Test that suites for each benchmarked library are discovered. """
+        modules = {name.split(".")[0] for name, _ in runner.discover_suites()}
+        self.assertTrue({"core", "metrics", "modeldata", "scheduler", "transfer"}.issuperset(modules))
+        self.assertIn("core", modules)
+
+    def test_time_benchmark_0_a(self):
+        """ Test that benchmarks are timed with the suite's repeat and number settings. """
+        result = runner.time_benchmark(Sleeper, "time_sum")
+        self.assertEqual((result["repeat"], result["number"]), (2, 1))
+        self.assertLessEqual(result["min"], result["median"])
+
+    def test_time_benchmark_0_b(self):
+        """ Test that the number of calls per sample is chosen automatically when not set. """
+        with patch.object(Sleeper, "number", None):
+            result = runner.time_benchmark(Sleeper, "time_sum", repeat=1)
+        self.assertGreater(result["number"], 1)
+
+    def test_track_benchmark_0_a(self):
+        """ Test that tracking benchmarks record the returned value and the method's unit. """
+        class Tracker:
+            def track_size(self):
+                return 3.0
+
+            track_size.unit = "MiB"
+
+        self.assertEqual(runner.track_benchmark(Tracker, "track_size"),
+                         {"value": 3.0, "unit": "MiB", "regression_threshold": None})
+
+    def test_compare_0_c(self):
+        """ Test that tracked values are compared like times. """
+        results = {"benchmarks": {"a": {"value": 13.0, "unit": "MiB", "regression_threshold": None}}}
+        baseline = {"benchmarks": {"a": {"value": 10.0, "unit": "MiB", "regression_threshold": None}}}
+        self.assertTrue(runner.compare(results, baseline, threshold=0.25)[0]["regression"])
+
+    def test_compare_0_a(self):
+        """ Test that only slowdowns beyond the threshold count as regressions. """
+        comparisons = runner.compare(self._results(a=1.2, b=1.3, c=0.5, new=1.0),
+                                     self._results(a=1.0, b=1.0, c=1.0, old=1.0), threshold=0.25)
+        self.assertEqual([(c["name"], c["regression"]) for c in comparisons],
+                         [("a", False), ("b", True), ("c", False)])
+
+    def test_compare_0_b(self):
+        """ Test that a suite's own regression threshold overrides the default. """
+        results = self._results(a=1.2)
+        results["benchmarks"]["a"]["regression_threshold"] = 0.1
+        self.assertTrue(runner.compare(results, self._results(a=1.0), threshold=0.25)[0]["regression"])
+
+    def test_main_0_a(self):
+        """ Test saving a baseline, then failing on a later regression against it. """
+        with tempfile.TemporaryDirectory() as tmp_dir, redirect_stdout(io.StringIO()), \
+                redirect_stderr(io.StringIO()):
+            baseline = Path(tmp_dir).joinpath("baseline.json")
+            with patch.object(runner, "run", return_value=self._results(a=1.0)):
+                self.assertEqual(runner.main(["--baseline", str(baseline), "--save-baseline"]), 0)
+            self.assertEqual(json.loads(baseline.read_text())["benchmarks"]["a"]["min"], 1.0)
+            with patch.object(runner, "run", return_value=self._results(a=1.1)):
+                self.assertEqual(runner.main(["--baseline", str(baseline)]), 0)
+            with patch.object(runner, "run", return_value=self._results(a=1.5)):
+                self.assertEqual(runner.main(["--baseline", str(baseline)]), 1)
+                self.assertEqual(runner.main(["--baseline", str(baseline), "--threshold", "0.6"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
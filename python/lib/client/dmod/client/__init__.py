@@ -1 +1,32 @@
+import importlib
+
 name = 'client'
+
+# Public names, by the module that provides them; these are imported when first accessed (see PEP 562), so that
+# importing this package (e.g., to run the CLI) doesn't import every module of the client and all of its dependencies
+_LAZY_ATTRIBUTES = {
+    'ClientConfig': '.client_config',
+    'ConnectionConfig': '.client_config',
+    'DmodClient': '.dmod_client',
+    'determine_transport_client_type': '.dmod_client',
+    'run_domain_detection': '.dmod_client',
+    'ClientDataCollectionDomainDetector': '.domain_detectors',
+    'ClientUniversalItemDomainDetector': '.domain_detectors',
+    'DataServiceClient': '.request_clients',
+    'JobClient': '.request_clients',
+}
+
+__all__ = ['name', *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(attr_name: str):
+    if attr_name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {attr_name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[attr_name], __name__), attr_name)
+    # Cache in the module namespace, so later accesses don't go through this function
+    globals()[attr_name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(__all__))
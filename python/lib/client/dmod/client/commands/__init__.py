@@ -0,0 +1,57 @@
+"""
+Registry of the commands of the DMOD CLI client.
+
+Each command is implemented in its own module within this package, which is only imported when the command is used, so
+that running one command does not pay to import the (sometimes heavy) dependencies of the others.  A command module
+provides two functions:
+
+``add_arguments(parser)``
+    Add the command's arguments, and any nested subcommands, to the command's ::class:`argparse.ArgumentParser`.
+``execute(args, client)``
+    Execute the command for parsed arguments, using a ::class:`DmodClient`.
+"""
+import importlib
+
+from types import ModuleType
+from typing import Dict, NamedTuple
+
+
+class CommandInfo(NamedTuple):
+    """ Registration details of a CLI command. """
+    module: str
+    """ The name of the command's module, relative to this package. """
+    description: str
+    """ A short description of the command, for help messages. """
+
+
+COMMANDS: Dict[str, CommandInfo] = {
+    'config': CommandInfo('config', "Print or validate the client config."),
+    'dataset': CommandInfo('dataset', "Perform various dataset-related actions."),
+    'exec': CommandInfo('workflow', "Request execution of a job workflow."),
+    'jobs': CommandInfo('jobs', "Query and control jobs."),
+}
+""" Registered CLI commands, by command name. """
+
+
+def load_command(name: str) -> ModuleType:
+    """
+    Import and return the module implementing a registered command.
+
+    Parameters
+    ----------
+    name : str
+        The name of the command.
+
+    Returns
+    -------
+    ModuleType
+        The module implementing the command.
+
+    Raises
+    ------
+    ValueError
+        If there is no registered command with the given name.
+    """
+    if name not in COMMANDS:
+        raise ValueError("Unsupported command {}".format(name))
+    return importlib.import_module(f"{__name__}.{COMMANDS[name].module}")
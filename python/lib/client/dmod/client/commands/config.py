@@ -0,0 +1,30 @@
+"""
+The ``config`` command, which allows for various operations related to config.
+"""
+import argparse
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..dmod_client import DmodClient
+
+
+def add_arguments(command_parser: argparse.ArgumentParser):
+    """
+    Handle setup of arg parsing for 'config' command.
+
+    Parameters
+    ----------
+    command_parser : argparse.ArgumentParser
+        The parser for the 'config' command itself.
+    """
+    command_parser.add_argument('action', choices=['print', 'validate'], help='Specify action to perform on the config')
+
+
+def execute(parsed_args, client: 'DmodClient'):
+    if parsed_args.action == 'print':
+        client.print_config()
+    elif parsed_args.action == 'validate':
+        client.validate_config()
+    else:
+        raise RuntimeError("Bad client command action '{}'".format(parsed_args.action))
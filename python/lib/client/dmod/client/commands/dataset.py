@@ -0,0 +1,134 @@
+"""
+The ``dataset`` command, which allows for various operations related to datasets.
+"""
+import argparse
+import json
+import sys
+
+from dmod.core.exception import DmodRuntimeError
+from dmod.core.meta_data import ContinuousRestriction, DataCategory, DataFormat, DiscreteRestriction
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..dmod_client import DmodClient
+
+
+def add_arguments(command_parser: argparse.ArgumentParser):
+    """
+    Handle setup of arg parsing for 'dataset' command.
+
+    Parameters
+    ----------
+    command_parser : argparse.ArgumentParser
+        The parser for the 'dataset' command itself, to which nested subparsers for dataset actions will be added.
+    """
+    # Subparser under the dataset command's parser for handling the different actions that might be done relating to a
+    # dataset (e.g., creation or uploading of data)
+    action_subparsers = command_parser.add_subparsers(dest='action')
+    action_subparsers.required = True
+
+    dataset_categories = [e for e in DataCategory]
+    dataset_formats = [e for e in DataFormat]
+
+    # Nested parser for the 'create' action, with required argument for dataset name, category, and format
+    parser_create = action_subparsers.add_parser('create', description="Create a new dataset.")
+    parser_create.add_argument('name', help='Specify the name of the dataset to create.')
+    parser_create.add_argument('--paths', dest='upload_paths', type=Path, nargs='+',
+                               help='Specify files/directories to upload.')
+    parser_create.add_argument('--data-root', dest='data_root', type=Path,
+                               help='Relative data root directory, used to adjust the names for uploaded items.')
+    c_json_form = '{"variable": "<variable_name>", "begin": "<value>", "end": "<value>"}'
+    d_json_form = '{"variable": "<variable_name>", "values": [<value>, ...]}'
+    c_restrict_help_str = 'Specify continuous domain restriction as (simplified) serialized JSON - {}'
+    d_restrict_help_str = 'Specify discrete domain restriction as (simplified) serialized JSON - {}'
+    # TODO: need to test that this works as expected
+    parser_create.add_argument('--continuous-restriction', type=lambda s: ContinuousRestriction(**json.loads(s)),
+                               dest='continuous_restrictions', nargs='*', help=c_restrict_help_str.format(c_json_form))
+    parser_create.add_argument('--discrete-restriction', type=lambda s: DiscreteRestriction(**json.loads(s)),
+                               dest='discrete_restrictions', nargs='*', help=d_restrict_help_str.format(d_json_form))
+    parser_create.add_argument('--format', dest='data_format', choices=dataset_formats, type=DataFormat.get_for_name,
+                               metavar=f"{{{', '.join(f.name for f in dataset_formats)}}}", help='Specify dataset domain format.')
+    parser_create.add_argument('--domain-json', dest='domain_file', type=Path, help='Deserialize the dataset domain from a file.')
+    parser_create.add_argument('category', type=DataCategory.get_for_name, choices=dataset_categories,
+                               metavar=f"{{{', '.join(c.name.lower() for c in dataset_categories)}", help='Specify dataset category.')
+
+    # Nested parser for the 'delete' action, with required argument for dataset name
+    parser_delete = action_subparsers.add_parser('delete', description="Delete a specified (entire) dataset.")
+    parser_delete.add_argument('name', help='Specify the name of the dataset to delete.')
+
+    # Nested parser for the 'domain' action, with required argument for path to the data to detect over
+    parser_domain = action_subparsers.add_parser('domain', description="Ops related to DataDomains and detection.")
+    domain_command_subparsers = parser_domain.add_subparsers(dest="domain_command")
+    detect_domain_parser = domain_command_subparsers.add_parser('detect',
+                                                                description="Detect DataDomain for local data for a dataset.")
+    detect_domain_parser.add_argument('path', type=Path,
+                                      help="Specify a data file or path containing several data files.")
+
+    show_detectors = domain_command_subparsers.add_parser('list_detectors',
+                                                          description="List the domain detector subclasses that are available.")
+
+    # Nested parser for the 'upload' action, with required args for dataset name and files to upload
+    parser_upload = action_subparsers.add_parser('upload', description="Upload local files to a dataset.")
+    parser_upload.add_argument('--data-root', dest='data_root', type=Path,
+                               help='Relative data root directory, used to adjust the names for uploaded items.')
+    parser_upload.add_argument('dataset_name', help='Specify the name of the desired dataset.')
+    parser_upload.add_argument('paths', type=Path, nargs='+', help='Specify files or directories to upload.')
+
+    # Nested parser for the 'download' action, with required args for dataset name and files to upload
+    parser_download = action_subparsers.add_parser('download', description="Download some or all items from a dataset.")
+    parser_download.add_argument('--items', dest='item_names', nargs='+',
+                                 help='Specify files/items within dataset to download.')
+    parser_download.add_argument('dataset_name', help='Specify the name of the desired dataset.')
+    parser_download.add_argument('dest_dir', type=Path, help='Specify local destination directory to save to.')
+
+    # Nested parser for the 'state' action
+    parser_list = action_subparsers.add_parser('state', description="Get dataset state.")
+    parser_list.add_argument('dataset_name', help='Specify the dataset name')
+
+    # Nested parser for the 'list_datasets' action
+    parser_list = action_subparsers.add_parser('list', description="List available datasets.")
+    parser_list.add_argument('--category', dest='category', choices=dataset_categories, type=DataCategory.get_for_name,
+                             metavar=f"{{{', '.join(c.name.lower() for c in dataset_categories)}", help='Specify the category of dataset to list')
+
+    # Nested parser for the 'list_items' action
+    parser_list = action_subparsers.add_parser('items', description="List items within a specified dataset.")
+    parser_list.add_argument('dataset_name', help='Specify the dataset for which to list items')
+
+
+def _run_domain_command(args):
+    from ..dmod_client import run_domain_detection
+    from ..domain_detectors import ClientUniversalItemDomainDetector
+
+    if args.domain_command == 'detect':
+        try:
+            domain = run_domain_detection(paths=args.path)
+            print({"success": True, "domain": f"{domain.to_json()}"})
+        except DmodRuntimeError as e:
+            print({"success": False, "reason": f"{e.__class__.__name__}", "message": f"{e!s}"})
+        except Exception as e:
+            print(f"ERROR - Encountered {e.__class__.__name__} detecting domain: {e!s}")
+            exit(1)
+    elif args.domain_command == "list_detectors":
+        all_names = [d.__name__ for d in ClientUniversalItemDomainDetector.get_default_detectors()]
+        print({"success": True, "detector_names": all_names})
+    else:
+        raise NotImplementedError(f"Unrecognized domain command '{args.domain_command!s}'")
+
+
+def execute(args, client: 'DmodClient'):
+    if args.action == 'domain':
+        _run_domain_command(args)
+    else:
+        from dmod.communication.client import get_or_create_eventloop
+
+        async_loop = get_or_create_eventloop()
+        try:
+            result = async_loop.run_until_complete(client.data_service_action(**(vars(args))))
+            print(result)
+        except (ValueError, NotImplementedError) as e:
+            print(str(e))
+            sys.exit(1)
+        except Exception as e:
+            print("ERROR: Encountered {} - {}".format(e.__class__.__name__, str(e)))
+            sys.exit(1)
@@ -0,0 +1,65 @@
+"""
+The ``jobs`` command, which allows for various query and control actions regarding jobs.
+"""
+import argparse
+import sys
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..dmod_client import DmodClient
+
+
+def add_arguments(command_parser: argparse.ArgumentParser):
+    """
+    Handle setup of arg parsing for 'jobs' command.
+
+    Parameters
+    ----------
+    command_parser : argparse.ArgumentParser
+        The parser for the 'jobs' command itself, to which nested subparsers for job actions will be added.
+    """
+    # Subparser under the jobs command's parser for handling the different query or control that might be run
+    job_command_subparsers = command_parser.add_subparsers(dest='job_command')
+    job_command_subparsers.required = True
+
+    # Nested parser for the 'list' action
+    parser_list_jobs = job_command_subparsers.add_parser('list')
+    parser_list_jobs.add_argument('--active', dest='jobs_list_active_only', action='store_true',
+                                  help='List only jobs with "active" status')
+
+    # Nested parser for the 'info' action
+    parser_job_info = job_command_subparsers.add_parser('info')
+    parser_job_info.add_argument('--status-only', dest="status_only", action='store_true',
+                                 help='Only include job exec status, not full state')
+    parser_job_info.add_argument('job_id', help='The id of the job for which to retrieve job state info')
+
+    # Nested parser for the 'release' action
+    parser_job_release = job_command_subparsers.add_parser('release')
+    parser_job_release.add_argument('job_id', help='The id of the job for which to release resources')
+
+    # Nested parser for the 'status' action
+    parser_job_status = job_command_subparsers.add_parser('status')
+    parser_job_status.add_argument('job_id', help='The id of the job for which to retrieve status')
+
+    # Nested parser for the 'stop' action
+    parser_job_stop = job_command_subparsers.add_parser('stop')
+    parser_job_stop.add_argument('job_id', help='The id of the job to stop')
+
+
+def execute(args, client: 'DmodClient'):
+    from dmod.communication.client import get_or_create_eventloop
+
+    async_loop = get_or_create_eventloop()
+    try:
+        result = async_loop.run_until_complete(client.job_command(**(vars(args))))
+        print(result)
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+    except NotImplementedError as e:
+        print(str(e))
+        sys.exit(1)
+    except Exception as e:
+        print("ERROR: Encountered {} - {}".format(e.__class__.__name__, str(e)))
+        sys.exit(1)
@@ -0,0 +1,174 @@
+"""
+The ``exec`` command, which allows for various workflow executions.
+"""
+import argparse
+import sys
+
+from dmod.core.execution import AllocationParadigm
+from dmod.core.meta_data import DataDomain, TimeRange
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..dmod_client import DmodClient
+
+
+def _create_ngen_based_exec_parser(subcommand_container: Any, parser_name: str,
+                                   default_alloc_paradigm: AllocationParadigm) -> argparse.ArgumentParser:
+    """
+    Helper function to create a nested parser under the ``exec`` command for different NextGen-related workflows.
+
+    Parameters
+    ----------
+    subcommand_container
+        The ``workflow`` subcommand "special action object" created by ::method:`ArgumentParser.add_subparsers`, which
+        is a child of the ``exec`` parser, and to which the new nested parser is to be added.
+    parser_name : str
+        The name to give to the new parser to be added.
+    default_alloc_paradigm : AllocationParadigm
+        The default ::class:`AllocationParadigm` value to use when adding the ``--allocation-paradigm`` argument to the
+        parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The newly created and associated subparser.
+    """
+    new_parser = subcommand_container.add_parser(parser_name)
+    new_parser.add_argument('--worker-version', dest='worker_version', default="latest",
+                            help="Specify version of worker (e.g., Docker image tag) to use.")
+    new_parser.add_argument('--partition-config-data-id', dest='partition_cfg_data_id', default=None,
+                            help='Provide data_id for desired partition config dataset.')
+    paradigms = [p for p in AllocationParadigm]
+    new_parser.add_argument('--allocation-paradigm',
+                            dest='allocation_paradigm',
+                            type=AllocationParadigm.get_from_name,
+                            choices=paradigms,
+                            default=default_alloc_paradigm,
+                            metavar=f"{{{', '.join(p.name.lower() for p in paradigms)}",
+                            help='Specify job resource allocation paradigm to use.')
+    new_parser.add_argument('--catchment-ids', dest='catchments', nargs='+', help='Specify catchment subset.')
+    new_parser.add_argument('--forcings-data-id', dest='forcings_data_id', help='Specify catchment subset.')
+
+    date_format = DataDomain.get_datetime_str_format()
+    print_date_format = 'YYYY-mm-dd HH:MM:SS'
+
+    new_parser.add_argument('time_range', type=TimeRange.parse_from_string,
+                            help='Model time range ({} to {})'.format(print_date_format, print_date_format))
+    new_parser.add_argument('hydrofabric_data_id', help='Identifier of dataset of required hydrofabric')
+    new_parser.add_argument('hydrofabric_uid', help='Unique identifier of required hydrofabric')
+    new_parser.add_argument('composite_config_data_id', help='Identifier of composite config dataset with required configs')
+    new_parser.add_argument('cpu_count', type=int, help='Provide the desired number of processes for the execution')
+    new_parser.add_argument('memory', type=int, help='Provide the desired amount of memory (bytes) for the execution')
+
+    return new_parser
+
+
+def add_arguments(command_parser: argparse.ArgumentParser):
+    """
+    Handle setup of arg parsing for 'exec' command.
+
+    Parameters
+    ----------
+    command_parser : argparse.ArgumentParser
+        The parser for the 'exec' command itself, to which nested subparsers for different workflows will be added.
+
+    See Also
+    ----------
+    _create_ngen_based_exec_subparser
+    """
+    # Subparser under the exec command's parser for handling the different job workflows that might be started
+    workflow_subparsers = command_parser.add_subparsers(dest='workflow')
+    workflow_subparsers.required = True
+
+    # Add some parsers to deserialize a request from a JSON string, or ...
+    parser_from_json = workflow_subparsers.add_parser("from_json")
+    #parser_from_json.add_argument('--partition-config-data-id', dest='partition_cfg_data_id', default=None,
+    #                                      help='Provide data_id for desired partition config dataset.')
+    parser_from_json.add_argument('job_type', choices=['ngen', 'ngen_cal'],
+                                  help="Set type of for request object so it is deserialized correctly")
+    parser_from_json.add_argument('request_json',
+                                  help='JSON string for exec request object to use to start a job')
+    # ... from JSON contained within a file
+    parser_from_file = workflow_subparsers.add_parser("from_file")
+    parser_from_file.add_argument('job_type', choices=['ngen', 'ngen_cal'],
+                                  help="Set type of for request object so it is deserialized correctly")
+    parser_from_file.add_argument('request_file', type=Path,
+                                  help='Path to file containing JSON exec request object to use to start a job')
+
+    # Nested parser for the 'ngen' action
+    parser_ngen = _create_ngen_based_exec_parser(subcommand_container=workflow_subparsers, parser_name='ngen',
+                                                 default_alloc_paradigm=AllocationParadigm.get_default_selection())
+
+    # TODO: default alloc paradigm needs to be GROUPED_SINGLE_NODE once that has been approved and added
+    # Nested parser for the 'ngen_cal' action, which is very similar to the 'ngen' parser
+    parser_ngen_cal = _create_ngen_based_exec_parser(subcommand_container=workflow_subparsers, parser_name='ngen_cal',
+                                                     default_alloc_paradigm=AllocationParadigm.get_default_selection())
+
+    # Calibration parser needs a few more calibration-specific items
+    def positive_int(arg_val: str):
+        try:
+            arg_as_int = int(arg_val)
+        except ValueError:
+            raise argparse.ArgumentTypeError("Non-integer value '%s' provided when positive integer expected" % arg_val)
+        if arg_as_int <= 0:
+            raise argparse.ArgumentTypeError("Invalid value '%s': expected integer greater than 0" % arg_val)
+        return arg_as_int
+
+    def model_calibration_param(arg_val: str):
+        split_arg = arg_val.split(',')
+        try:
+            if len(split_arg) != 4:
+                raise RuntimeError
+            # Support float args in any order by sorting, since min, max, and other/init will always be self-evident
+            float_values = sorted([float(split_arg[i]) for i in [1, 2, 3]])
+            # Return is (param, (min, max, init))
+            return split_arg[0], (float_values[0], float_values[2], float_values[1])
+        except:
+            raise argparse.ArgumentTypeError("Invalid arg '%s'; format must be <str>,<float>,<float>,<float>" % arg_val)
+
+    parser_ngen_cal.add_argument('--calibrated-param', dest='model_cal_params', type=model_calibration_param,
+                                 nargs='+', metavar='PARAM_NAME,MIN_VAL,MAX_VAL,INIT_VAL',
+                                 help='Description of parameters to calibrate, as comma delimited string')
+
+    parser_ngen_cal.add_argument('--job-name', default=None, dest='job_name', help='Optional job name.')
+    # TODO (later): add more choices once available
+    parser_ngen_cal.add_argument('--strategy', default='estimation', dest='cal_strategy_type',
+                                 choices=['estimation'], help='The ngen_cal calibration strategy.')
+    # TODO (later): need to add other supported algorithms (there should be a few more now)
+    parser_ngen_cal.add_argument('--algorithm', type=str, default='dds', dest='cal_strategy_algorithm',
+                                 choices=['dds'], help='The ngen_cal parameter search algorithm.')
+    parser_ngen_cal.add_argument('--objective-function', default='nnse', dest='cal_strategy_objective_func',
+                                 choices=["kling_gupta", "nnse", "custom", "single_peak", "volume"],
+                                 help='The ngen_cal objective function.')
+    parser_ngen_cal.add_argument('--is-objective-func-minimized', type=bool, default=True,
+                                 dest='is_objective_func_minimized',
+                                 help='Whether the target of objective function is minimized or maximized.')
+    parser_ngen_cal.add_argument('--iterations', type=positive_int, default=100, dest='iterations',
+                                 help='The number of ngen_cal iterations.')
+    # TODO (later): in the future, figure out how to best handle this kind of scenario
+    #parser_ngen_cal.add_argument('--is-restart', action='store_true', dest='is_restart',
+    #                             help='Whether this is restarting a previous job.')
+    #ngen calibration strategies include
+    #uniform: Each catchment shares the same parameter space, evaluates at one observable nexus
+    #independet: Each catchment upstream of observable nexus gets its own permuated parameter space, evalutates at one observable nexus
+    #explicit: only calibrates basins in the realization_config with a "calibration" definition and an observable nexus
+    # TODO: add this kind of information to the help message
+    parser_ngen_cal.add_argument('--model-strategy', default='uniform', dest='model_strategy',
+                                 choices=["uniform", "independent", "explicit"],
+                                 help='The model calibration strategy used by ngen_cal.')
+
+
+def execute(args, client: 'DmodClient'):
+    from dmod.communication.client import get_or_create_eventloop
+
+    async_loop = get_or_create_eventloop()
+    try:
+        result = async_loop.run_until_complete(client.execute_job(**(vars(args))))
+        print(result)
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+    except Exception as e:
+        print(f"Encounted {e.__class__.__name__}: {str(e)}")
+        sys.exit(1)
@@ -6,13 +6,14 @@ from dmod.core.common import get_subclasses
 from dmod.core.exception import DmodRuntimeError
 from dmod.core.serializable import BasicResultIndicator, ResultIndicator
 from dmod.core.meta_data import DataDomain, DiscreteRestriction, StandardDatasetIndex
-from .request_clients import DataServiceClient, JobClient
 from .client_config import ClientConfig
 from pathlib import Path
-from typing import List, Literal, Optional, Type, Union
+from typing import TYPE_CHECKING, List, Literal, Optional, Type, Union
 
 from functools import reduce
-from .domain_detectors import ClientDataCollectionDomainDetector, ClientUniversalItemDomainDetector
+
+if TYPE_CHECKING:
+    from .request_clients import DataServiceClient, JobClient
 
 
 def determine_transport_client_type(protocol: str,
@@ -75,6 +76,9 @@ def run_domain_detection(paths: Union[Path, List[Path]], data_id: Optional[str]
     DmodRuntimeError
         If detection is unsuccessful.
     """
+    # Detectors are imported here since they depend on modeldata, which is slow to import and otherwise unneeded
+    from .domain_detectors import ClientDataCollectionDomainDetector, ClientUniversalItemDomainDetector
+
     def _detect(p: Path):
         if p.is_dir():
             return ClientDataCollectionDomainDetector(data_collection=p, collection_name=data_id).detect()
@@ -224,8 +228,10 @@ class DmodClient:
             raise NotImplementedError(f"Impl of supported data action {action} not yet in {self.__class__.__name__}")
 
     @property
-    def data_service_client(self) -> DataServiceClient:
+    def data_service_client(self) -> 'DataServiceClient':
         if self._data_service_client is None:
+            from .request_clients import DataServiceClient
+
             # NOTE: request service is bypassed if data service config has been specified and is active
             if self.client_config.data_service is not None and self.client_config.data_service.active:
                 t_client_type = determine_transport_client_type(self.client_config.data_service.endpoint_protocol)
@@ -242,8 +248,10 @@ class DmodClient:
         return self._data_service_client
 
     @property
-    def job_client(self) -> JobClient:
+    def job_client(self) -> 'JobClient':
         if self._job_client is None:
+            from .request_clients import JobClient
+
             self._job_client = JobClient(transport_client=self._get_transport_client(), auth_client=self._auth_client)
         return self._job_client
 
@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-import aiohttp
 import mimetypes
 import ssl
 from dmod.communication import (AuthClient, InvalidMessageResponse, ManagementAction, NGENRequest, NGENRequestResponse,
@@ -15,10 +14,14 @@ from dmod.core.exception import DmodRuntimeError
 from dmod.core.meta_data import DataCategory, DataDomain
 from dmod.core.serializable import BasicResultIndicator, ResultIndicator
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple, Type, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import json
 
+if TYPE_CHECKING:
+    # Only needed for transfers over HTTP, so imported when actually used, to keep the CLI quick to start
+    import aiohttp
+
 #import logging
 #logger = logging.getLogger("gui_log")
 
@@ -355,7 +358,7 @@ class DataTransferAgent(ABC):
 
 
 class HttpDataTransferAgent(DataTransferAgent):
-    def __init__(self, http_client: aiohttp.ClientSession, ssl_context: Optional[ssl.SSLContext] = None):
+    def __init__(self, http_client: 'aiohttp.ClientSession', ssl_context: Optional[ssl.SSLContext] = None):
         self.http_client = http_client
         self.ssl_context = ssl_context
 
@@ -372,6 +375,8 @@ class HttpDataTransferAgent(DataTransferAgent):
                 message=f"File {source!s} does not exist",
             )
 
+        import aiohttp
+
         content_type, _ = mimetypes.guess_type(source)
         form_data = aiohttp.FormData()
         with source.open() as fp:
@@ -619,13 +624,13 @@ class DataServiceClient:
         transport_client: TransportLayerClient,
         auth_client: Optional[AuthClient] = None,
         *args,
-        http_client: Optional[aiohttp.ClientSession] = None,
+        http_client: Optional['aiohttp.ClientSession'] = None,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
         self._transport_client: TransportLayerClient = transport_client
         self._auth_client: Optional[AuthClient] = auth_client
-        self._http_client: Optional[aiohttp.ClientSession] = http_client
+        self._http_client: Optional['aiohttp.ClientSession'] = http_client
 
     async def _process_request(self, request: DatasetManagementMessage) -> DatasetManagementResponse:
         """
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from typing import Set, Tuple
+
+
+class TestCliStartup(unittest.TestCase):
+    """
+    Tests of the import-time cost of lightweight CLI commands, as measured with ``python -X importtime``.
+    """
+
+    STARTUP_BUDGET_ENV_VAR = 'DMOD_CLIENT_STARTUP_BUDGET_SECONDS'
+    """ Environment variable to override the import-time budget, e.g., for slow hosts. """
+
+    DEFAULT_STARTUP_BUDGET_SECONDS = 1.0
+
+    HEAVY_MODULES = ('aiohttp', 'dmod.modeldata', 'geopandas', 'pandas')
+    """ Modules that lightweight commands should never import. """
+
+    _MARKER = 'dmod-client-startup-test'
+
+    def setUp(self) -> None:
+        self.config_file = Path(__file__).parent.joinpath("testing_config.json")
+        self.budget = float(os.environ.get(self.STARTUP_BUDGET_ENV_VAR, self.DEFAULT_STARTUP_BUDGET_SECONDS))
+
+    def _profile_imports(self, script: str) -> Tuple[Set[str], int]:
+        """
+        Run a script in a new interpreter with ``-X importtime``, returning the modules it imported and the total time.
+
+        Only imports after interpreter startup (including any ``sitecustomize``) are included.  Note that modules
+        imported through ::func:`importlib.import_module` are not reported by ``-X importtime`` (though the imports
+        they make are), so the imported modules are instead taken from ``sys.modules`` once the script has run.
+
+        Returns
+        -------
+        Tuple[Set[str], int]
+            The names of modules imported by the script, and the total time in microseconds spent importing them.
+        """
+        script = (f"import sys; sys.stderr.write('{self._MARKER}\\n'); sys.stderr.flush(); before = set(sys.modules)\n"
+                  f"{script}\n"
+                  f"print('\\n'.join(set(sys.modules) - before))\n")
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        total = 0
+        for line in result.stderr.split(f'{self._MARKER}\n', 1)[1].splitlines():
+            if not line.startswith('import time:') or line.count('|') != 2:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            # Nested imports are indented, so top-level ones account for all time
+            if cumulative.strip().isdigit() and not name[1:].startswith(' '):
+                total += int(cumulative)
+        return set(result.stdout.split()), total
+
+    def _assert_lightweight(self, modules: Set[str], total: int):
+        self.assertEqual([m for m in self.HEAVY_MODULES if m in modules], [])
+        self.assertLess(total / 1e6, self.budget)
+
+    def test_config_command_0_a(self):
+        """ Test that running the config print command stays within the import-time budget. """
+        modules, total = self._profile_imports(
+            "import contextlib, io\n"
+            "from dmod.client.__main__ import main\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            f"    main(['--client-config', {str(self.config_file)!r}, 'config', 'print'])")
+        self.assertIn('dmod.client.dmod_client', modules)
+        self._assert_lightweight(modules, total)
+
+    def test_jobs_command_0_a(self):
+        """ Test that parsing and dispatching to a jobs command, with its client, stays within the budget. """
+        modules, total = self._profile_imports(
+            "from dmod.client.__main__ import _handle_args\n"
+            "from dmod.client.commands import load_command\n"
+            "args = _handle_args(['jobs', 'status', '1'])\n"
+            "load_command(args.command)\n"
+            "from dmod.client import DmodClient, JobClient")
+        self.assertIn('dmod.client.commands.jobs', modules)
+        self.assertNotIn('dmod.client.commands.dataset', modules)
+        self._assert_lightweight(modules, total)
+
+    def test_client_package_0_a(self):
+        """ Test that importing the client package itself imports none of its modules. """
+        modules, _ = self._profile_imports("import dmod.client")
+        self.assertEqual([m for m in modules if m.startswith('dmod.client.')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from .maas_request import get_available_models, get_available_outputs, get_distr
     ModelExecRequest, ModelExecRequestResponse, NWMRequest, NWMRequestResponse, Scalar, NGENRequest, \
     NGENRequestResponse, NgenCalibrationRequest, NgenCalibrationResponse, NGENRequestBody
 from .message import AbstractInitRequest, MessageEventType, Message, Response, InvalidMessage, InvalidMessageResponse, \
-    InitRequestResponseReason
+    InitRequestResponseReason, CORRELATION_ID_KEY, DEPENDS_ON_KEY
 from .metadata_message import MetadataPurpose, MetadataMessage, MetadataResponse
 from .partition_request import PartitionRequest, PartitionResponse
 from .request_handler import AbstractRequestHandler
@@ -7,14 +7,15 @@ from abc import ABC, abstractmethod
 from asyncio import AbstractEventLoop
 from deprecated import deprecated
 from pathlib import Path
-from typing import Generic, List, Optional, Type, TypeVar, Union
+from typing import Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
+from uuid import uuid4
 
 import websockets
 
 from dmod.core.exception import DmodRuntimeError
 
 from .maas_request import ExternalRequest, ExternalRequestResponse
-from .message import AbstractInitRequest, Response
+from .message import AbstractInitRequest, CORRELATION_ID_KEY, DEPENDS_ON_KEY, Response
 from .partition_request import PartitionResponse
 from .dataset_management_message import DatasetManagementResponse
 from .scheduler_request import SchedulerRequestResponse
@@ -539,11 +540,17 @@ class RequestClient:
     optional parameter to ::method:`async_make_request`.  A default response class type can also be supplied to an
     instance during init, which is used by ::method:`async_make_request` if a class type is not provided.  One of the
     two must be set for ::method:`async_make_request` to function.
+
+    By default, each request is sent and its response received before the connection may be used for anything else.
+    Instances may instead be initialized to multiplex requests, for services that support correlation ids (see
+    ::data:`CORRELATION_ID_KEY`).  Requests are then tagged with such ids and may be made concurrently over a single
+    connection of a ::class:`ConnectionContextClient`, with a shared reader matching each response to its request.
     """
 
     def __init__(self, *,
                  transport_client: TransportLayerClient,
                  default_response_type: Optional[Type[Response]] = None,
+                 multiplexed: bool = False,
                  **kwargs):
         """
         Initialize.
@@ -554,10 +561,20 @@ class RequestClient:
             The client for handling the underlying raw OSI transport layer communications with the service.
         default_response_type: Optional[Type[Response]]
             Optional class type for responses, to use when no response class param is given when making a request.
+        multiplexed: bool
+            Whether to tag requests with correlation ids and allow concurrent requests over one connection, which
+            requires the transport client be a ::class:`ConnectionContextClient` (``False`` by default).
         kwargs
         """
+        if multiplexed and not isinstance(transport_client, ConnectionContextClient):
+            raise TypeError(f"Multiplexed {self.__class__.__name__} requires a {ConnectionContextClient.__name__} "
+                            f"transport client, but got {transport_client.__class__.__name__}")
         self._transport_client = transport_client
         self._default_response_type: Optional[Type[Response]] = default_response_type
+        self._multiplexed = multiplexed
+        self._pending_responses: Dict[str, asyncio.Future] = dict()
+        """ Futures for the serialized responses to in-flight multiplexed requests, keyed by correlation id. """
+        self._response_reader: Optional[asyncio.Task] = None
 
     def _process_request_response(self, response_str: str, response_type: Optional[ResponseTypes] = None) -> Response:
         """
@@ -607,13 +624,85 @@ class RequestClient:
                                    f"`{response_str}`")
         return response_object
 
-    async def async_make_request(self, message: AbstractInitRequest, response_type: Optional[ResponseTypes] = None) -> Response:
+    async def _read_multiplexed_responses(self):
+        """
+        Receive responses over the connection, completing the future of the request with each's correlation id.
+
+        Reading continues for as long as there are requests awaiting responses.  If receiving fails (e.g., because the
+        connection closed), every request still awaiting a response fails with the same error.
+        """
+        while self._pending_responses:
+            try:
+                serialized_response = await self._transport_client._connection_recv()
+            except Exception as e:
+                for future in self._pending_responses.values():
+                    if not future.done():
+                        future.set_exception(e)
+                self._pending_responses.clear()
+                return
+            try:
+                correlation_id = json.loads(serialized_response).get(CORRELATION_ID_KEY)
+            except Exception:
+                correlation_id = None
+            future = self._pending_responses.pop(correlation_id, None) if isinstance(correlation_id, str) else None
+            if future is None:
+                logger.warning(f"{self.__class__.__name__} discarding response without a pending correlation id: "
+                               f"`{serialized_response[:200]}`")
+            elif not future.done():
+                future.set_result(serialized_response)
+
+    async def _async_send_multiplexed(self, message: AbstractInitRequest, correlation_id: str,
+                                      depends_on: Sequence[str]) -> str:
+        """
+        Send a request tagged with a correlation id over the shared connection, and return its serialized response.
+
+        Parameters
+        ----------
+        message : AbstractInitRequest
+            The request message object.
+        correlation_id : str
+            The correlation id for the request, which must not be that of another in-flight request.
+        depends_on : Sequence[str]
+            The correlation ids of earlier requests the service must finish handling before handling this one.
+
+        Returns
+        -------
+        str
+            The serialized response to the request.
+        """
+        if correlation_id in self._pending_responses:
+            raise DmodRuntimeError(f"{self.__class__.__name__} already has a request in flight with correlation id "
+                                   f"{correlation_id}")
+        serial_request = message.to_dict()
+        serial_request[CORRELATION_ID_KEY] = correlation_id
+        if depends_on:
+            serial_request[DEPENDS_ON_KEY] = list(depends_on)
+
+        # Hold the connection open (within its context) until the response is received
+        async with self._transport_client:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_responses[correlation_id] = future
+            try:
+                if self._response_reader is None or self._response_reader.done():
+                    self._response_reader = asyncio.create_task(self._read_multiplexed_responses())
+                await self._transport_client._connection_send(json.dumps(serial_request, sort_keys=True))
+                return await future
+            finally:
+                if self._pending_responses.get(correlation_id) is future:
+                    del self._pending_responses[correlation_id]
+
+    async def async_make_request(self, message: AbstractInitRequest, response_type: Optional[ResponseTypes] = None,
+                                 correlation_id: Optional[str] = None,
+                                 depends_on: Optional[Union[str, Sequence[str]]] = None) -> Response:
         """
         Async send a request message object and return the received response.
 
         Send (within Python's async functionality) the appropriate type of request :class:`Message` for this client
         implementation type and return the response as a corresponding, appropriate :class:`Response` instance.
 
+        For multiplexed instances, concurrent calls share a single connection, and the service may respond to them in
+        any order, except that a request will not be handled before the requests it depends on.
+
         Parameters
         ----------
         message : AbstractInitRequest
@@ -621,6 +710,12 @@ class RequestClient:
         response_type: Optional[ResponseTypes]
             One or more optional class types for the response that, if ``None`` (the default) is replaced with the
             default provided at initialization.
+        correlation_id: Optional[str]
+            For multiplexed instances, an optional correlation id for the request, by default a new random id; ignored
+            otherwise.
+        depends_on: Optional[Union[str, Sequence[str]]]
+            For multiplexed instances, the optional correlation id(s) of earlier requests that the service must finish
+            handling before this request; ignored otherwise.
 
         Returns
         -------
@@ -642,7 +737,13 @@ class RequestClient:
                 response_type = self._default_response_type
 
         # Send the request and get the service response
-        serialized_response = await self._transport_client.async_send(data=str(message), await_response=True)
+        if self._multiplexed:
+            depends_on = (depends_on, ) if isinstance(depends_on, str) else tuple(depends_on or ())
+            serialized_response = await self._async_send_multiplexed(message=message,
+                                                                     correlation_id=correlation_id or uuid4().hex,
+                                                                     depends_on=depends_on)
+        else:
+            serialized_response = await self._transport_client.async_send(data=str(message), await_response=True)
         if serialized_response is None:
             raise ValueError(f'Serialized response from {self.__class__.__name__} async message was `None`')
 
@@ -978,7 +1079,9 @@ class ExternalRequestClient(RequestClient):
         self._info = None
 
     async def async_make_request(self, message: ExternalRequest,
-                                 response_type: Optional[Type[ExternalRequestResponse]] = None) -> ExternalRequestResponse:
+                                 response_type: Optional[Type[ExternalRequestResponse]] = None,
+                                 correlation_id: Optional[str] = None,
+                                 depends_on: Optional[Union[str, Sequence[str]]] = None) -> ExternalRequestResponse:
         """
         Async send a request message object and return the received response.
 
@@ -992,6 +1095,10 @@ class ExternalRequestClient(RequestClient):
         response_type: Optional[Type[ExternalRequestResponse]]
             An optional class type for the response that, if ``None`` (the default) is replaced with the default
             provided at initialization.
+        correlation_id: Optional[str]
+            For multiplexed instances, an optional correlation id for the request.
+        depends_on: Optional[Union[str, Sequence[str]]]
+            For multiplexed instances, the optional correlation id(s) of earlier requests this request depends on.
 
         Returns
         -------
@@ -1002,7 +1109,8 @@ class ExternalRequestClient(RequestClient):
             response_type = self._default_response_type
 
         if await self._auth_client.apply_auth(message):
-            return await super().async_make_request(message, response_type=response_type)
+            return await super().async_make_request(message, response_type=response_type,
+                                                    correlation_id=correlation_id, depends_on=depends_on)
         else:
             reason = f'{self.__class__.__name__} Request Auth Failure'
             msg = f'{self.__class__.__name__} async_make_request could not apply auth to {message.__class__.__name__}'
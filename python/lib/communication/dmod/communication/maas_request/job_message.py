@@ -121,6 +121,38 @@ class JobInfoResponse(Response):
         return value
 
 
+class JobWatchRequest(ExternalRequest):
+    """
+    Message for requesting updates on changes to the status of an existing job, starting after some version.
+
+    Each status change of a job has a version, counting the job's status changes so far.  A client that has received
+    updates up to some version (e.g., before losing its connection) can use this type of request to resume receiving
+    them, without missing or repeating any.  A successful :class:`JobWatchResponse` is followed by an
+    :class:`UpdateMessage` for each subsequent change, for as long as the job is active.
+    """
+
+    event_type: ClassVar[MessageEventType] = MessageEventType.SCHEDULER_REQUEST
+
+    job_id: str = Field(description="The identifier of the job of interest.")
+    after_version: int = Field(ge=0, description="The version of the last status change already received.")
+
+    @classmethod
+    def factory_init_correct_response_subtype(cls, json_obj: dict) -> "JobWatchResponse":
+        return JobWatchResponse.factory_init_from_deserialized_json(json_obj)
+
+
+class JobWatchResponse(Response):
+    """
+    Response to a :class:`JobWatchRequest`, indicating whether updates on changes to the job will follow.
+    """
+
+    response_to_type: ClassVar[Type[AbstractInitRequest]] = JobWatchRequest
+    """ The type of :class:`AbstractInitRequest` for which this type is the response. """
+
+    job_id: str = Field(description="The identifier of the job of interest.")
+    after_version: int = Field(ge=0, description="The version of the last status change already received.")
+
+
 class JobListRequest(ExternalRequest):
     """
     Message for requesting a list of existing jobs.
@@ -5,6 +5,16 @@ from pydantic import Field
 from dmod.core.serializable import BasicResultIndicator, Serializable
 from dmod.core.enum import PydanticEnum
 
+CORRELATION_ID_KEY = "correlation_id"
+"""
+Key for an optional, client-generated id added to a serialized request, which the service adds to its response.
+
+Since the key is not a field of any message type, it is ignored when deserializing messages.  Services that support it
+may handle requests carrying such ids concurrently, returning responses in the order they complete.
+"""
+
+DEPENDS_ON_KEY = "depends_on"
+""" Key for the optional correlation ids of earlier requests that must be handled before a serialized request. """
 
 #FIXME make an independent enum of model request types???
 class MessageEventType(PydanticEnum):
@@ -9,6 +9,7 @@ Currently, a WebSocketInterface implementing asyncio event handling acros SSL
 connections is provided, with an abstract listener method required by subclasses.
 
 """
+import os
 import typing
 
 from abc import ABC, abstractmethod
@@ -23,6 +24,7 @@ from .dataset_management_message import MaaSDatasetManagementMessage
 from .message import AbstractInitRequest,MessageEventType, InvalidMessage
 from .session import Session, SessionInitMessage
 from .validator import SessionInitMessageJsonValidator
+from dmod.core import telemetry
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Type
 from websockets import WebSocketServerProtocol
@@ -79,6 +81,9 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         """
         return asyncio.get_event_loop()
 
+    METRICS_PORT_ENV_VAR = 'DMOD_METRICS_PORT'
+    """ Environment variable for the port on which to serve metrics, when no port is passed at initialization. """
+
     def __del__(self):
         try:
             if self._loop.is_running():
@@ -94,6 +99,7 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         cert_pem: typing.Optional[Path] = None,
         priv_key_pem: typing.Optional[Path] = None,
         use_ssl: bool = True,
+        metrics_port: typing.Optional[int] = None,
         *args,
         **kwargs
     ):
@@ -134,6 +140,11 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
 
         priv_key_pem: Optional[Path]
             Specific path to SSL private key file, overriding using file with default name in SSL directory
+
+        metrics_port: Optional[int]
+            Port on which to serve the process's metrics over plain HTTP, separately from the websocket port, with
+            ``None`` falling back to the port in the ::attribute:`METRICS_PORT_ENV_VAR` environment variable, and
+            metrics not served at all if that is not set either; this port is meant for internal scraping only
         """
         self._listen_host = listen_host.strip() if isinstance(listen_host, str) else None
         # TODO: consider printing/logging warning (or switching to error) in case of bad argument type
@@ -184,6 +195,14 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
             # in practice it is more like 2x
             close_timeout=5
         )
+
+        if metrics_port is None and os.environ.get(self.METRICS_PORT_ENV_VAR):
+            metrics_port = int(os.environ[self.METRICS_PORT_ENV_VAR])
+        self._metrics_server = None
+        if metrics_port is not None:
+            self._metrics_server = telemetry.start_http_server(int(metrics_port), host=self._listen_host or '')
+            logging.info(f"Serving metrics for {self.__class__.__name__} on port {metrics_port}")
+
         self._requested_tasks = []
         self._scheduled_tasks = []
 
@@ -395,6 +414,9 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         logging.info(f"Cancelling {len(tasks)} pending tasks")
         # wait for tasks to cancel
         await asyncio.gather(*tasks, return_exceptions=True)
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server = None
         self.loop.stop()
 
 
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import unittest
+from typing import Dict, List, Optional, Union
+
+from ..communication import CORRELATION_ID_KEY, DEPENDS_ON_KEY, RequestClient
+from ..communication.client import ConnectionContextClient
+from ..communication.maas_request.job_message import JobInfoRequest, JobInfoResponse
+
+
+class MockConnectionClient(ConnectionContextClient[asyncio.Queue]):
+    """
+    Mock connection client for a service that answers each request after a delay given by its job id, in seconds.
+    """
+
+    @classmethod
+    def get_endpoint_protocol_str(cls, use_secure_connection: bool = True) -> str:
+        return "mock"
+
+    def __init__(self):
+        super().__init__(endpoint_host='', endpoint_port=8888)
+        self.connections_opened = 0
+        self.received: List[dict] = []
+
+    def _get_endpoint_uri(self) -> str:
+        return ''
+
+    async def _establish_connection(self) -> asyncio.Queue:
+        self.connections_opened += 1
+        return asyncio.Queue()
+
+    async def _close_connection(self):
+        pass
+
+    async def _respond(self, request: dict, queue: asyncio.Queue):
+        await asyncio.sleep(float(request['job_id']))
+        response = JobInfoResponse(success=True, reason='Retrieved', job_id=request['job_id'],
+                                   job_state={'status': 'x'}).to_dict()
+        response[CORRELATION_ID_KEY] = request[CORRELATION_ID_KEY]
+        queue.put_nowait(json.dumps(response))
+
+    async def _connection_send(self, data: Union[str, bytearray]):
+        request = json.loads(data)
+        self.received.append(request)
+        asyncio.create_task(self._respond(request, self.connection))
+
+    async def _connection_recv(self) -> Optional[str]:
+        return await self.connection.get()
+
+
+class TestRequestClientMultiplexing(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.transport = MockConnectionClient()
+        self.client = RequestClient(transport_client=self.transport, default_response_type=JobInfoResponse,
+                                    multiplexed=True)
+
+    async def test_async_make_request_0_a(self):
+        """ Test that concurrent requests share one connection, with responses matched to requests by id. """
+        delays = ['0.3', '0.01', '0.2', '0.1']
+        responses = await asyncio.gather(*[self.client.async_make_request(JobInfoRequest(job_id=d)) for d in delays])
+
+        self.assertEqual([r.job_id for r in responses], delays)
+        self.assertEqual(self.transport.connections_opened, 1)
+        self.assertEqual(len({r[CORRELATION_ID_KEY] for r in self.transport.received}), len(delays))
+        self.assertEqual(self.client._pending_responses, dict())
+        self.assertEqual(self.transport.active_connections, 0)
+
+    async def test_async_make_request_0_b(self):
+        """ Test that correlation ids and dependencies are included with requests. """
+        first = asyncio.create_task(self.client.async_make_request(JobInfoRequest(job_id='0.1'), correlation_id='a'))
+        await asyncio.sleep(0)
+        second = await self.client.async_make_request(JobInfoRequest(job_id='0'), correlation_id='b', depends_on='a')
+        await first
+
+        self.assertEqual(second.job_id, '0')
+        self.assertEqual([r[CORRELATION_ID_KEY] for r in self.transport.received], ['a', 'b'])
+        self.assertNotIn(DEPENDS_ON_KEY, self.transport.received[0])
+        self.assertEqual(self.transport.received[1][DEPENDS_ON_KEY], ['a'])
+
+    def test_init_0_a(self):
+        """ Test that multiplexing requires a transport client that maintains a connection. """
+        from .test_scheduler_client import MockTransportLayerClient
+        self.assertRaises(TypeError, RequestClient, transport_client=MockTransportLayerClient(), multiplexed=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import unittest
+import urllib.error
+import urllib.request
+
+from typing import List, Type
+from unittest.mock import patch
+
+from dmod.core import telemetry
+from ..communication.message import AbstractInitRequest
+from ..communication.websocket_interface import WebSocketInterface
+
+
+class MetricsTestWebSocketInterface(WebSocketInterface):
+
+    @classmethod
+    def get_parseable_request_types(cls) -> List[Type[AbstractInitRequest]]:
+        return []
+
+    async def listener(self, websocket):
+        pass
+
+
+class TestWebSocketMetrics(unittest.IsolatedAsyncioTestCase):
+
+    def _create_interface(self, **kwargs) -> MetricsTestWebSocketInterface:
+        interface = MetricsTestWebSocketInterface(listen_host='127.0.0.1', port=0, use_ssl=False, **kwargs)
+        if interface._metrics_server is not None:
+            self.addCleanup(interface._metrics_server.shutdown)
+        return interface
+
+    def _get(self, port: int, path: str):
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+            return response.headers['Content-Type'], response.read().decode()
+
+    async def test_metrics_port_0_a(self):
+        """ Test that metrics may be scraped from the separate metrics port of an in-process service. """
+        interface = self._create_interface(metrics_port=0)
+        port = interface._metrics_server.server_address[1]
+        telemetry.counter('dmod_test_websocket_scrapes_total', 'Scrapes by the websocket metrics test').inc()
+        with telemetry.span('test_websocket_metrics'):
+            pass
+
+        content_type, body = await asyncio.to_thread(self._get, port, telemetry.METRICS_PATH)
+
+        self.assertEqual(content_type, telemetry.CONTENT_TYPE)
+        self.assertIn('dmod_test_websocket_scrapes_total 1.0\n', body)
+        self.assertIn('dmod_span_duration_seconds_count{span="test_websocket_metrics"} 1\n', body)
+
+    async def test_metrics_port_0_b(self):
+        """ Test that paths other than the metrics path are not served from the metrics port. """
+        interface = self._create_interface(metrics_port=0)
+        port = interface._metrics_server.server_address[1]
+        with self.assertRaises(urllib.error.HTTPError):
+            await asyncio.to_thread(self._get, port, '/')
+
+    async def test_metrics_port_1_a(self):
+        """ Test that metrics are not served unless a metrics port is configured. """
+        with patch.dict(os.environ):
+            os.environ.pop(WebSocketInterface.METRICS_PORT_ENV_VAR, None)
+            interface = self._create_interface()
+        self.assertIsNone(interface._metrics_server)
+
+    async def test_metrics_port_1_b(self):
+        """ Test that the metrics port may be configured through the environment. """
+        with patch.dict(os.environ, {WebSocketInterface.METRICS_PORT_ENV_VAR: '0'}):
+            interface = self._create_interface()
+        self.assertIsNotNone(interface._metrics_server)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1 +1 @@
-__version__ = '0.20.0'
+__version__ = '0.23.0'
@@ -4,6 +4,8 @@ Provides a mechanism for tracking the execution of processes and their consumpti
 from __future__ import annotations
 
 import enum
+import heapq
+import itertools
 import os
 import typing
 import threading
@@ -12,7 +14,7 @@ import logging
 
 from concurrent import futures
 from datetime import timedelta
-from time import sleep
+from time import monotonic
 
 from .base import T
 from .base import ObjectManagerScope
@@ -85,10 +87,17 @@ class MonitorSignal(enum.Enum):
 
 class FutureMonitor:
     """
-    Iterates over future objects to see when it is ok to end the extended scope for shared values
+    Watches future objects to see when it is ok to end the extended scope for shared values
+
+    Completed futures are dispatched to the monitoring thread through their done callbacks, so the thread sleeps until
+    there is actually something to do no matter how many futures are being watched. Futures that are given a timeout
+    are tracked through a heap of deadlines so that only the earliest deadline needs to be checked.
     """
     _DEFAULT_POLL_INTERVAL: float = 1.0
-    """The number of seconds to wait before polling for the internal queue"""
+    """
+    The number of seconds that used to be waited between polls. Kept for compatibility; completions are now dispatched
+    as soon as they happen
+    """
 
     @property
     def class_name(self) -> str:
@@ -112,10 +121,20 @@ class FutureMonitor:
         elif isinstance(timeout, timedelta):
             timeout = timeout.total_seconds()
 
-        self._queue: queue.Queue[futures.Future] = queue.Queue()
-        self.__size: int = 0
-        self.__scopes: typing.List[typing.Tuple[ObjectManagerScope, futures.Future]] = []
-        """A list of scopes and the task that marks them as complete"""
+        self._queue: queue.Queue[typing.Union[futures.Future, MonitorSignal, object]] = queue.Queue()
+        """Completed futures and signals that the monitoring thread needs to act upon"""
+
+        self.__pending: typing.Set[futures.Future] = set()
+        """Futures that are being watched but have not been handled yet"""
+
+        self.__deadlines: typing.List[typing.Tuple[float, int, futures.Future]] = []
+        """A heap of the times at which pending futures will be considered to have timed out"""
+
+        self.__deadline_counter: typing.Iterator[int] = itertools.count()
+        """Breaks ties between identical deadlines so that futures never need to be compared"""
+
+        self.__scopes: typing.Dict[futures.Future, ObjectManagerScope] = {}
+        """A mapping from tasks to the scopes that they mark as complete"""
 
         self._callback = callback
         self._on_error = on_error
@@ -176,7 +195,8 @@ class FutureMonitor:
         """
         The number of items being monitored
         """
-        return self.__size
+        with self.__lock:
+            return len(self.__pending)
 
     def __len__(self):
         return self.size
@@ -184,16 +204,109 @@ class FutureMonitor:
     @property
     def __should_be_monitoring(self) -> bool:
         """
-        Whether the monitor should still be polling
+        Whether the monitor should still be waiting on futures
 
-        This should monitor if it's either accepting items to monitor or it has items left to iterate through
+        This should monitor if it's either accepting items to monitor or it has items left to wait on
         """
         with self.__lock:
-            return self.accepting_futures or self._queue.qsize() != 0
+            return self.accepting_futures or len(self.__pending) != 0 or self._queue.qsize() != 0
+
+    def __future_completed(self, future_result: futures.Future):
+        """
+        Done callback that hands a finished future over to the monitoring thread
+
+        Args:
+            future_result: The future that just finished
+        """
+        self._queue.put_nowait(future_result)
+
+    def __seconds_until_next_deadline(self) -> typing.Optional[float]:
+        """
+        Get the number of seconds until the earliest pending future times out
+
+        Returns:
+            The number of seconds until the next deadline or None if no pending future has a deadline
+        """
+        with self.__lock:
+            # Throw out deadlines for futures that have already been handled
+            while self.__deadlines and self.__deadlines[0][2] not in self.__pending:
+                heapq.heappop(self.__deadlines)
+
+            if not self.__deadlines:
+                return None
+
+            return max(self.__deadlines[0][0] - monotonic(), 0.0)
+
+    def __expire_futures(self):
+        """
+        Stop waiting on every pending future whose deadline has passed
+        """
+        now = monotonic()
+        expired_futures: typing.List[futures.Future] = []
+
+        with self.__lock:
+            while self.__deadlines and self.__deadlines[0][0] <= now:
+                _, _, future_result = heapq.heappop(self.__deadlines)
+
+                if future_result in self.__pending:
+                    self.__pending.discard(future_result)
+                    expired_futures.append(future_result)
+
+        for future_result in expired_futures:
+            scope = self.find_scope(future_result)
+            self.logger.error(
+                f"{self}: An operation{f' within the {scope.name} scope' if scope else ''} did not complete in time. "
+                f"It will no longer be monitored."
+            )
+            future_result.cancel()
+            self.end_scope(future_result=future_result)
+
+    def __handle_completed_future(self, future_result: futures.Future):
+        """
+        Fetch the result of a finished future, call the callback if it didn't error, record the error if it did, and
+        clean up any associated scope information
+
+        Args:
+            future_result: A future that has finished
+        """
+        with self.__lock:
+            if future_result not in self.__pending:
+                # This has already been handled, most likely because it timed out
+                return
+
+            self.__pending.discard(future_result)
+
+        scope = self.find_scope(future_result)
+
+        try:
+            value = future_result.result()
+            if self._callback:
+                try:
+                    self._callback(value)
+                except BaseException as e:
+                    self.logger.error(
+                        f"Encountered an error when executing the callback "
+                        f"'{self._callback.__qualname__}' with a process result in a {self.class_name}",
+                        exc_info=e
+                    )
+        except BaseException as e:
+            # An error here indicates that the operation that spawned the Future threw an exception.
+            #   This will record the error from within that operation instead of breaking the loop
+            if scope:
+                self.logger.error(f"Encountered error within the {scope} scope:")
+
+            self.logger.error(msg=str(e), exc_info=e)
+
+            if scope:
+                # Add information about the scope to help identify what the operation failed on
+                self.logger.error(f"Scope '{scope.name}' created at:{os.linesep}{scope.started_at}")
+
+        # Failure or not, we want to remove any sort of scope information
+        self.end_scope(future_result=future_result)
 
     def _monitor(self) -> bool:
         """
-        Loop through the job results in the queue and delete them when processing has completed
+        Wait for watched futures to complete and clean up after them as they do
 
         Returns:
             True if the function ended with no issues
@@ -203,87 +316,66 @@ class FutureMonitor:
         self.logger.info(f"{self}: Beginning to monitor")
         while self.__should_be_monitoring:
             try:
-                # Block to check if the loop should be exitted based on a current kill state
-                with self.__lock:
-                    if self.monitor_should_be_killed:
-                        monitoring_succeeded = False
-                        break
+                if self.monitor_should_be_killed:
+                    monitoring_succeeded = False
+                    break
 
-                    future_result: typing.Union[futures.Future, object] = self._queue.get(
-                        timeout=self._timeout
-                    )
-                    self.__size -= 1
+                seconds_until_deadline = self.__seconds_until_next_deadline()
+
+                if seconds_until_deadline is None or seconds_until_deadline > self._timeout:
+                    wait_seconds = self._timeout
+                else:
+                    wait_seconds = seconds_until_deadline
+
+                try:
+                    item: typing.Union[futures.Future, MonitorSignal, object] = self._queue.get(timeout=wait_seconds)
+                except queue.Empty:
+                    self.__expire_futures()
+
+                    with self.__lock:
+                        has_pending_futures = len(self.__pending) != 0
 
-                if future_result in MonitorSignal.values():
-                    if future_result == MonitorSignal.KILL:
+                    # Nothing coming through is expected while futures are still running
+                    if has_pending_futures or seconds_until_deadline is not None:
+                        continue
+
+                    # Receiving the empty exception here means that it's been a while since anything was added,
+                    # meaning that it might be left hanging after other operations have ended. End everything here to
+                    # make sure there aren't orphanned operations
+                    self.logger.warning(f"A {self.class_name} is no longer being written to. Ending monitoring")
+                    monitoring_succeeded = False
+                    break
+
+                if item in MonitorSignal.values():
+                    if item == MonitorSignal.KILL:
                         monitoring_succeeded = False
                         self.__killed = True
                         break
 
-                    if future_result == MonitorSignal.STOP:
+                    if item == MonitorSignal.STOP:
                         self.__stopping = True
+                    elif item == MonitorSignal.PING:
+                        # Something new is being watched, so make sure that its deadline is accounted for
+                        self.__expire_futures()
 
                     continue
 
                 # This is just junk if it isn't a job result, so acknowledge it and move to the next item
-                if not isinstance(future_result, futures.Future):
+                if not isinstance(item, futures.Future):
                     self.logger.error(
                         f"Found an invalid value in a {self.class_name}:"
-                        f"{future_result} must be either a future or one of "
+                        f"{item} must be either a future or one of "
                         f"{', '.join(str(value) for value in MonitorSignal)}, "
-                        f"but received a {type(future_result)}"
+                        f"but received a {type(item)}"
                     )
                     continue
 
-                # If the process is done, fetch the result, call the callback if it didn't error,
-                #   record the error if it did, and clean up any associated scope information
-                if future_result.done():
-                    scope = self.find_scope(future_result)
-
-                    try:
-                        value = future_result.result()
-                        if self._callback:
-                            try:
-                                self._callback(value)
-                            except BaseException as e:
-                                self.logger.error(
-                                    f"Encountered an error when executing the callback "
-                                    f"'{self._callback.__qualname__}' with a process result in a {self.class_name}",
-                                    exc_info=e
-                                )
-                    except BaseException as e:
-                        # An error here indicates that the operation that spawned the Future threw an exception.
-                        #   This will record the error from within that operation instead of breaking the loop
-                        if scope:
-                            self.logger.error(f"Encountered error within the {scope} scope:")
-
-                        self.logger.error(msg=str(e), exc_info=e)
-
-                        if scope:
-                            # Add information about the scope to help identify what the operation failed on
-                            self.logger.error(f"Scope '{scope.name}' created at:{os.linesep}{scope.started_at}")
-
-                    # Failure or not, we want to remove any sort of scope information
-                    self.end_scope(future_result=future_result)
-                else:
-                    # Otherwise put the process data back in the queue to check again later
-                    self._queue.put_nowait(future_result)
-                    self.__size += 1
-            except queue.Empty:
-                # Receiving the empty exception here means that it's been a while since anything was added,
-                # meaning that it might be left hanging after other operations have ended. End everything here to
-                # make sure there aren't orphanned operations
-                self.logger.warning(f"A {self.class_name} is no longer being written to. Ending monitoring")
-                monitoring_succeeded = False
-                break
+                self.__handle_completed_future(item)
             except BaseException as exception:
                 self.logger.error(msg="Error Encountered while monitoring shared values", exc_info=exception)
                 monitoring_succeeded = False
                 break
 
-            # Wait a little bit before polling again to allow for work to continue
-            sleep(self.__poll_interval)
-
         self.logger.info(f"No longer monitoring within {self}")
         self.__cleanup()
         return monitoring_succeeded
@@ -306,11 +398,7 @@ class FutureMonitor:
             A scope that belongs to the given job
         """
         with self.__lock:
-            for scope, result in self.__scopes:
-                if result == future_result:
-                    return scope
-
-        return None
+            return self.__scopes.get(future_result)
 
     def end_scope(self, future_result: futures.Future):
         """
@@ -320,11 +408,10 @@ class FutureMonitor:
             future_result: The Future result that belongs to a scope
         """
         with self.__lock:
-            for index, (scope, result) in enumerate(self.__scopes):
-                if result == future_result:
-                    self.__scopes.pop(index)
-                    scope.end_scope()
-                    break
+            scope = self.__scopes.pop(future_result, None)
+
+        if scope is not None:
+            scope.end_scope()
 
     def start(self):
         """
@@ -375,7 +462,6 @@ class FutureMonitor:
             wait_seconds: The number of seconds to wait
         """
         self.__killed = True
-        self.__size = 0
 
         if not self.__thread:
             return
@@ -397,47 +483,69 @@ class FutureMonitor:
             f"{self.class_name} #{id(self)} has been killed."
         )
 
-    def add(self, scope: typing.Optional[ObjectManagerScope], value: typing.Union[futures.Future, object]):
+    def add(
+        self,
+        scope: typing.Optional[ObjectManagerScope],
+        value: typing.Union[futures.Future, object],
+        timeout: typing.Union[Seconds, timedelta] = None
+    ):
         """
         Add a process result to monitor
 
         Args:
             scope: The scope that the result is attributed to
             value: The result of the process using the scope
+            timeout: How long to wait for the result before giving up on it. Results are waited on indefinitely
+                if not given
         """
         if not self.__thread or not self.__thread.is_alive():
             self.logger.debug(f"No thread is running in {self}.")
             self.start()
             self.logger.debug(f"Started monitoring in {self}")
 
-        with self.__lock:
-            try:
-                self.logger.debug(f"Adding a process to the queue for a {self.class_name}...")
+        if isinstance(timeout, timedelta):
+            timeout = timeout.total_seconds()
+
+        try:
+            if not isinstance(value, futures.Future):
+                # Signals (and anything invalid) are handed straight to the monitoring thread
                 self._queue.put_nowait(value)
-                self.__size += 1
-                self.logger.debug(f"Added a process to the queue for a {self.class_name}.")
+                return
+
+            self.logger.debug(f"Adding a process to a {self.class_name}...")
+            with self.__lock:
+                self.__pending.add(value)
+
                 if isinstance(scope, ObjectManagerScope):
-                    self.__scopes.append((scope, value))
-            except:
-                self.logger.error(f"Failed to add a process to a {self.class_name}")
+                    self.__scopes[value] = scope
+
+                if timeout is not None:
+                    heapq.heappush(
+                        self.__deadlines,
+                        (monotonic() + float(timeout), next(self.__deadline_counter), value)
+                    )
+
+            # Wake the monitoring thread so that it accounts for the new deadline and resets its idle timer
+            self._queue.put_nowait(MonitorSignal.PING)
+
+            # This will be called immediately if the future has already finished
+            value.add_done_callback(self.__future_completed)
+            self.logger.debug(f"Added a process to a {self.class_name}.")
+        except:
+            self.logger.error(f"Failed to add a process to a {self.class_name}")
 
     def __cleanup(self):
         """
         Remove everything associated with a completed monitoring operation
         """
         with self.__lock:
-            while not self._queue.empty():
-                try:
-                    entry = self._queue.get(timeout=self._timeout)
-                    if isinstance(entry, futures.Future) and entry.running():
-                        entry.cancel()
-                except queue.Empty:
-                    pass
-                except TimeoutError:
-                    pass
+            for entry in self.__pending:
+                if entry.running():
+                    entry.cancel()
 
             self._queue = queue.Queue()
-            self.__size = 0
+            self.__pending.clear()
+            self.__deadlines.clear()
             self.__scopes.clear()
 
     def __str__(self):
@@ -11,6 +11,8 @@ import os
 from multiprocessing import managers
 
 from .base import is_property
+from .shared_memory import RELEASE_SHARED_MEMORY
+from .shared_memory import SharedMemoryPayload
 from ..common.protocols import LoggerProtocol
 
 TypeOfRemoteObject = typing.Union[typing.Type[managers.BaseProxy], type]
@@ -50,6 +52,23 @@ Suffix for how proxies are to be named - naming proxies programmatically will en
 """
 
 
+class DMODProxy(managers.BaseProxy):
+    """
+    The base for generated proxies - reads large array-like results from shared memory rather than unpickling them
+    """
+    def _callmethod(self, methodname, args=(), kwds={}):
+        result = super()._callmethod(methodname, args, kwds)
+
+        if isinstance(result, SharedMemoryPayload):
+            # The server keeps the segment alive until it is released; arrays built on it here keep it mapped
+            try:
+                return result.load()
+            finally:
+                super()._callmethod(RELEASE_SHARED_MEMORY, (result.name,))
+
+        return result
+
+
 def form_proxy_name(cls: type) -> str:
     """
     Programmatically form a name for a proxy class
@@ -221,7 +240,7 @@ def make_proxy_type(
     #   Invoke that here for dynamic class creation
     proxy_type: TypeOfRemoteObject = type(
         name,
-        (managers.BaseProxy,),
+        (DMODProxy,),
         new_class_members
     )
 
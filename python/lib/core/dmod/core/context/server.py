@@ -18,6 +18,9 @@ from traceback import format_exc
 from ..decorators import version_range
 
 from .base import is_property
+from .proxy import DMODProxy
+from .shared_memory import RELEASE_SHARED_MEMORY
+from .shared_memory import SharedMemoryRegistry
 
 # DISCLAIMER: Look at the implementation of `managers.Server` prior to modification for reference. The only function
 # changed here is in `serve_client` and even then it's not much. For this to work, it needs to be as close the the
@@ -32,7 +35,74 @@ from .base import is_property
 class DMODObjectServer(managers.Server):
     """
     A multiprocessing object server that may serve non-callable values
+
+    Large array-like results of calls on objects whose proxies are `DMODProxy`s are sent through shared memory
+    rather than being pickled
     """
+    def __init__(self, registry, address, authkey, serializer):
+        super().__init__(registry, address, authkey, serializer)
+        self.shared_memory = SharedMemoryRegistry()
+        self.__shared_memory_identifiers: typing.Set[str] = set()
+
+    def fallback_release_shared_memory(self, conn, ident, obj, name: str) -> int:
+        """
+        Release the reference that a proxy held on a shared memory segment
+        """
+        return self.shared_memory.release(name)
+
+    fallback_mapping = dict(managers.Server.fallback_mapping)
+    fallback_mapping[RELEASE_SHARED_MEMORY] = fallback_release_shared_memory
+
+    def create(self, c, typeid, /, *args, **kwds):
+        """
+        Create a new shared object and return its id
+
+        Objects whose proxies can read from shared memory are noted so that their results may be sent through it
+        """
+        ident, exposed = super().create(c, typeid, *args, **kwds)
+
+        proxy_type = self.registry[typeid][-1]
+        if isinstance(proxy_type, type) and issubclass(proxy_type, DMODProxy):
+            with self.mutex:
+                self.__shared_memory_identifiers.add(ident)
+
+        return ident, exposed
+
+    def decref(self, c, ident):
+        super().decref(c, ident)
+
+        with self.mutex:
+            if ident not in self.id_to_refcount:
+                self.__shared_memory_identifiers.discard(ident)
+
+    def prepare_result(self, ident: str, result):
+        """
+        Get what should be sent back to a proxy as the result of a call
+
+        Args:
+            ident: The identifier of the object that was called
+            result: The result of the call
+
+        Returns:
+            A description of the result within shared memory if it should be sent that way, otherwise the result
+        """
+        if ident in self.__shared_memory_identifiers:
+            return self.shared_memory.prepare_result(result)
+        return result
+
+    def shutdown(self, c):
+        """
+        Unlink all shared memory that is still held and shut down this process
+        """
+        self.shared_memory.close()
+        super().shutdown(c)
+
+    def serve_forever(self):
+        try:
+            super().serve_forever()
+        finally:
+            self.shared_memory.close()
+
     def serve_client(self, conn):
         """
         Handle requests from the proxies in a particular process/thread
@@ -115,7 +185,8 @@ class DMODObjectServer(managers.Server):
                         token = managers.Token(typeid, self.address, rident)
                         msg = ('#PROXY', (rexposed, token))
                     else:
-                        msg = ('#RETURN', result)
+                        # This diverges to send large array-like results through shared memory
+                        msg = ('#RETURN', self.prepare_result(object_identifier, result))
 
             # Everything that follows is from the vanilla implementation
             except AttributeError:
@@ -0,0 +1,496 @@
+"""
+Defines how large array-like results are handed from an object server to its proxies through shared memory
+
+Results that would otherwise be pickled, sent through a pipe, and unpickled are instead written into a shared memory
+segment once by the server. Only a small description of where each buffer lives within the segment is sent back to
+the proxy, which builds arrays directly on top of the shared buffers rather than copying them.
+
+Raw numpy buffers are used rather than a serialization format such as Arrow IPC so that no dependency beyond numpy
+and pandas is needed. Neither of those is required; if they aren't installed nothing is ever sent through shared
+memory.
+"""
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import os
+import sys
+import threading
+import typing
+import uuid
+
+from multiprocessing import shared_memory
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+SHARED_MEMORY_THRESHOLD_VARIABLE: typing.Final[str] = "DMOD_SHARED_MEMORY_THRESHOLD"
+"""The environment variable that may override the smallest number of bytes that will be sent through shared memory"""
+
+DEFAULT_SHARED_MEMORY_THRESHOLD: typing.Final[int] = 1024 * 1024
+"""The smallest number of bytes that will be sent through shared memory if not overridden"""
+
+SEGMENT_PREFIX: typing.Final[str] = "dmod_"
+"""The prefix for the names of every shared memory segment created for results"""
+
+RELEASE_SHARED_MEMORY: typing.Final[str] = "#RELEASE_SHARED_MEMORY"
+"""The name of the server operation that a proxy calls once it has attached to a shared memory segment"""
+
+_ALIGNMENT: typing.Final[int] = 64
+"""The byte boundary that each buffer in a segment starts on"""
+
+
+def get_shared_memory_threshold() -> int:
+    """
+    Get the smallest number of bytes that a result must have to be sent through shared memory
+
+    The value may be set through the `DMOD_SHARED_MEMORY_THRESHOLD` environment variable. A value of 0 or less turns
+    the use of shared memory off.
+
+    Returns:
+        The smallest number of bytes that a result must have to be sent through shared memory
+    """
+    threshold = os.environ.get(SHARED_MEMORY_THRESHOLD_VARIABLE)
+
+    if threshold is None or not threshold.strip():
+        return DEFAULT_SHARED_MEMORY_THRESHOLD
+
+    return int(float(threshold))
+
+
+def _is_shareable_array(value) -> bool:
+    """
+    Args:
+        value: The value to check
+
+    Returns:
+        Whether the value is a numpy array whose raw buffer holds all of its data
+    """
+    return numpy is not None and isinstance(value, numpy.ndarray) and not value.dtype.hasobject
+
+
+def _is_shareable_column(column) -> bool:
+    """
+    Args:
+        column: A pandas series
+
+    Returns:
+        Whether the values of the series may be written to shared memory as a plain numpy array
+    """
+    return isinstance(column.dtype, numpy.dtype) and not column.dtype.hasobject
+
+
+def get_shareable_size(value) -> int:
+    """
+    Get the number of bytes of a value that may be sent through shared memory
+
+    Args:
+        value: A value that might be sent through shared memory
+
+    Returns:
+        The number of bytes that may be sent through shared memory; 0 if the value may not be shared at all
+    """
+    if _is_shareable_array(value):
+        return value.nbytes
+
+    if pandas is None:
+        return 0
+
+    if isinstance(value, pandas.Series):
+        return value.values.nbytes if _is_shareable_column(value) else 0
+
+    if isinstance(value, pandas.DataFrame) and value.columns.is_unique:
+        return sum(
+            column.values.nbytes
+            for _, column in value.items()
+            if _is_shareable_column(column)
+        )
+
+    return 0
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+@dataclasses.dataclass(frozen=True)
+class BufferLayout:
+    """
+    Where an array lives within a shared memory segment
+    """
+    offset: int
+    """The number of bytes from the start of the segment to the start of the array"""
+
+    shape: typing.Tuple[int, ...]
+    """The shape of the array"""
+
+    dtype: str
+    """The numpy description of the type of the array"""
+
+    def create_array(self, buffer) -> numpy.ndarray:
+        """
+        Create an array that reads from and writes to the given buffer
+
+        Args:
+            buffer: The buffer of the shared memory segment
+
+        Returns:
+            An array backed by the buffer
+        """
+        dtype = numpy.dtype(self.dtype)
+        count = int(numpy.prod(self.shape))
+
+        # `frombuffer` holds onto the buffer for as long as the array lives, which keeps the segment from being closed
+        # out from underneath it
+        return numpy.frombuffer(buffer, dtype=dtype, count=count, offset=self.offset).reshape(self.shape)
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedMemoryPayload:
+    """
+    A description of an array-like result that was written to shared memory
+
+    This is what is sent through the pipe in place of the result itself
+    """
+    name: str
+    """The name of the shared memory segment"""
+
+    kind: typing.Literal["ndarray", "series", "frame"]
+    """The type of object that was shared"""
+
+    buffers: typing.Tuple[typing.Tuple[typing.Hashable, BufferLayout], ...]
+    """The layout of each array in the segment, along with the name of the column it came from"""
+
+    index: typing.Any = None
+    """The index of the shared series or frame"""
+
+    columns: typing.Any = None
+    """The names of the columns of a shared frame, or the name of a shared series"""
+
+    unshared_columns: typing.Optional[typing.Mapping[typing.Hashable, typing.Any]] = None
+    """Columns of a frame whose values could not be put into shared memory and were pickled instead"""
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes of data in shared memory
+        """
+        return sum(int(numpy.prod(layout.shape)) * numpy.dtype(layout.dtype).itemsize for _, layout in self.buffers)
+
+    def load(self):
+        """
+        Attach to the shared memory segment and build the shared object on top of it without copying its data
+
+        Returns:
+            The object that was shared
+        """
+        segment = _ATTACHED_SEGMENTS.attach(self.name)
+        arrays = {column_name: layout.create_array(segment.buf) for column_name, layout in self.buffers}
+
+        if self.kind == "ndarray":
+            return arrays[None]
+
+        if self.kind == "series":
+            return pandas.Series(arrays[self.columns], index=self.index, name=self.columns, copy=False)
+
+        frame_data = {
+            column_name: arrays[column_name] if column_name in arrays else self.unshared_columns[column_name]
+            for column_name in self.columns
+        }
+        frame = pandas.DataFrame(frame_data, index=self.index, copy=False)
+        frame.columns = self.columns
+        return frame
+
+
+def _create_segment(size: int) -> shared_memory.SharedMemory:
+    return shared_memory.SharedMemory(name=f"{SEGMENT_PREFIX}{uuid.uuid4().hex[:24]}", create=True, size=max(size, 1))
+
+
+def _write_arrays(
+    arrays: typing.Sequence[typing.Tuple[typing.Hashable, numpy.ndarray]]
+) -> typing.Tuple[shared_memory.SharedMemory, typing.Tuple[typing.Tuple[typing.Hashable, BufferLayout], ...]]:
+    """
+    Copy arrays into a new shared memory segment
+
+    Args:
+        arrays: Each array to copy along with the name it should be referenced by
+
+    Returns:
+        The new segment and where each array was written within it
+    """
+    layouts: typing.List[typing.Tuple[typing.Hashable, BufferLayout]] = []
+    size = 0
+
+    for name, array in arrays:
+        offset = _align(size)
+        layouts.append((name, BufferLayout(offset=offset, shape=tuple(array.shape), dtype=array.dtype.str)))
+        size = offset + array.nbytes
+
+    segment = _create_segment(size)
+
+    try:
+        for (_, array), (_, layout) in zip(arrays, layouts):
+            layout.create_array(segment.buf)[...] = array
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+
+    return segment, tuple(layouts)
+
+
+class SharedMemoryRegistry:
+    """
+    Creates and keeps track of the shared memory segments that an object server has handed out
+
+    Each segment is reference counted; it is unlinked once every holder has released it. Processes that have already
+    attached to a segment may keep using it after it has been unlinked - the memory is returned to the system once the
+    last of them lets go of it.
+    """
+    def __init__(self, threshold: int = None):
+        """
+        Constructor
+
+        Args:
+            threshold: The smallest number of bytes that will be sent through shared memory. Taken from the
+                environment if not given. A value of 0 or less turns the use of shared memory off
+        """
+        self.__threshold = get_shared_memory_threshold() if threshold is None else threshold
+        self.__segments: typing.Dict[str, typing.Tuple[shared_memory.SharedMemory, int]] = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def threshold(self) -> int:
+        """
+        The smallest number of bytes that will be sent through shared memory
+        """
+        return self.__threshold
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether anything may be sent through shared memory
+        """
+        return self.__threshold > 0 and numpy is not None
+
+    def should_share(self, value) -> bool:
+        """
+        Args:
+            value: A result that may be sent through shared memory
+
+        Returns:
+            Whether the value should be sent through shared memory rather than pickled
+        """
+        return self.enabled and get_shareable_size(value) >= self.__threshold
+
+    def share(self, value) -> SharedMemoryPayload:
+        """
+        Write a value into a new shared memory segment
+
+        The segment starts with one reference, which belongs to whoever receives the returned payload
+
+        Args:
+            value: The array, series, or frame to share
+
+        Returns:
+            A description of where the data for the value may be found
+        """
+        index = None
+        columns = None
+        unshared_columns = None
+
+        if _is_shareable_array(value):
+            kind = "ndarray"
+            arrays = [(None, value)]
+        elif isinstance(value, pandas.Series):
+            kind = "series"
+            columns = value.name
+            index = value.index
+            arrays = [(value.name, value.values)]
+        elif isinstance(value, pandas.DataFrame):
+            kind = "frame"
+            columns = value.columns
+            index = value.index
+            arrays = [
+                (column_name, column.values)
+                for column_name, column in value.items()
+                if _is_shareable_column(column)
+            ]
+            unshared_columns = {
+                column_name: column
+                for column_name, column in value.items()
+                if not _is_shareable_column(column)
+            }
+        else:
+            raise TypeError(f"Cannot send a {type(value)} through shared memory")
+
+        segment, layouts = _write_arrays(arrays)
+
+        with self.__lock:
+            self.__segments[segment.name] = (segment, 1)
+
+        return SharedMemoryPayload(
+            name=segment.name,
+            kind=kind,
+            buffers=layouts,
+            index=index,
+            columns=columns,
+            unshared_columns=unshared_columns
+        )
+
+    def prepare_result(self, value):
+        """
+        Get what should be sent back to a proxy for a result
+
+        Args:
+            value: The result of a call on a shared object
+
+        Returns:
+            A payload describing the value in shared memory if it is large enough, otherwise the value itself
+        """
+        return self.share(value) if self.should_share(value) else value
+
+    def acquire(self, name: str) -> int:
+        """
+        Add a reference to a segment
+
+        Args:
+            name: The name of the segment
+
+        Returns:
+            The number of references to the segment
+        """
+        with self.__lock:
+            if name not in self.__segments:
+                raise KeyError(f"There is no shared memory segment named '{name}' to acquire")
+
+            segment, reference_count = self.__segments[name]
+            self.__segments[name] = (segment, reference_count + 1)
+            return reference_count + 1
+
+    def release(self, name: str) -> int:
+        """
+        Remove a reference to a segment, unlinking it if nothing else refers to it
+
+        Args:
+            name: The name of the segment
+
+        Returns:
+            The number of references left on the segment
+        """
+        with self.__lock:
+            if name not in self.__segments:
+                return 0
+
+            segment, reference_count = self.__segments[name]
+            reference_count -= 1
+
+            if reference_count > 0:
+                self.__segments[name] = (segment, reference_count)
+                return reference_count
+
+            del self.__segments[name]
+
+        _destroy_segment(segment)
+        return 0
+
+    def close(self):
+        """
+        Unlink every segment regardless of how many references remain
+        """
+        with self.__lock:
+            segments = [segment for segment, _ in self.__segments.values()]
+            self.__segments.clear()
+
+        for segment in segments:
+            _destroy_segment(segment)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__segments
+
+    def __len__(self) -> int:
+        return len(self.__segments)
+
+
+def _destroy_segment(segment: shared_memory.SharedMemory):
+    segment.close()
+
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class _AttachedSegments:
+    """
+    Keeps segments that this process has attached to open for as long as arrays are built on top of them
+
+    A segment cannot be closed while arrays still use its buffer, so segments are held here and closed once nothing
+    uses them anymore.
+    """
+    def __init__(self):
+        self.__segments: typing.List[shared_memory.SharedMemory] = []
+        self.__lock = threading.Lock()
+
+    def attach(self, name: str) -> shared_memory.SharedMemory:
+        """
+        Open an existing segment
+
+        Args:
+            name: The name of the segment
+
+        Returns:
+            The opened segment
+        """
+        self.prune()
+
+        if sys.version_info >= (3, 13):
+            segment = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            segment = shared_memory.SharedMemory(name=name)
+
+            # Versions of python before 3.13 track attached segments as if they were created here, which would
+            # unlink them when this process ends even though the creating process owns them
+            if os.name == "posix":
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(getattr(segment, "_name"), "shared_memory")
+
+        with self.__lock:
+            self.__segments.append(segment)
+
+        return segment
+
+    def prune(self) -> int:
+        """
+        Close every segment that no longer has arrays built on top of it
+
+        Returns:
+            The number of segments still open
+        """
+        with self.__lock:
+            remaining: typing.List[shared_memory.SharedMemory] = []
+
+            for segment in self.__segments:
+                try:
+                    segment.close()
+                except BufferError:
+                    remaining.append(segment)
+
+            self.__segments = remaining
+            return len(remaining)
+
+    def __len__(self) -> int:
+        return len(self.__segments)
+
+
+_ATTACHED_SEGMENTS = _AttachedSegments()
+"""The shared memory segments that this process has attached to in order to read results"""
+
+atexit.register(_ATTACHED_SEGMENTS.prune)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 from abc import ABC, abstractmethod
-from functools import reduce
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Generic, TypeVar, Union, Dict, Iterable, Type, Set, List, Optional
+from threading import Lock
+from typing import Any, Callable, Generic, Hashable, TypeVar, Union, Dict, Iterable, Type, Sequence, Set, List, \
+    Optional, Tuple
 
 from .common.reader import ReadSeeker
 from .dataset import Dataset
@@ -14,6 +19,185 @@ from .meta_data import DataDomain, DataFormat, StandardDatasetIndex, DiscreteRes
 DataItem = TypeVar('DataItem', bound=Union[bytes, ReadSeeker, Path])
 DataCollection = TypeVar('DataCollection', bound=Union[Dataset, Dict[str, Union[bytes, ReadSeeker]], Path])
 
+ItemFingerprint = Tuple[int, Optional[Union[int, str]], str]
+""" Type for item fingerprints: (size in bytes, modification time in ns or ETag, digest of the item's content). """
+
+
+def merge_domains_balanced(domains: Sequence[DataDomain]) -> DataDomain:
+    """
+    Merge a sequence of domains using a balanced, pairwise tree reduction.
+
+    Domains are merged with :method:`DataDomain.merge_domains`, with the relative order of the operands preserved.  In
+    contrast to a left fold, each intermediate merge combines domains of similar size, so the merged restriction value
+    collections do not need to be rebuilt over and over as they grow.
+
+    Parameters
+    ----------
+    domains: Sequence[DataDomain]
+        The domains to merge.
+
+    Returns
+    -------
+    DataDomain
+        The merged domain.
+
+    Raises
+    ------
+    ValueError
+        If ``domains`` is empty or if any two domains cannot be merged.
+    """
+    if len(domains) == 0:
+        raise ValueError("Cannot merge an empty collection of domains")
+    level = list(domains)
+    while len(level) > 1:
+        next_level = [DataDomain.merge_domains(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2 == 1:
+            next_level.append(level[-1])
+        level = next_level
+    return level[0]
+
+
+class DomainDetectionCache:
+    """
+    Thread-safe, size-bounded cache of previously detected item domains.
+
+    Entries are keyed by a :class:`Hashable` that should include an :class:`ItemFingerprint` for the data item.  A
+    fingerprint consists of the item's size, its modification time (or an ETag-style version tag, when one is known),
+    and a digest of the item's content.  When there is a modification time or version tag, the digest only covers the
+    first and last bytes of the item, which lets an unchanged item be recognized without reading it in full; otherwise,
+    the digest covers all of the item's content.  Domains are copied on the way in and out, so callers are free to
+    modify what they receive.
+    """
+
+    _EDGE_DIGEST_SIZE: int = 64 * 1024
+    """ Number of bytes from each of the start and end of a versioned item that are included in its fingerprint. """
+
+    _READ_CHUNK_SIZE: int = 1024 * 1024
+    """ Number of bytes read at a time when digesting the full content of a stream item. """
+
+    @classmethod
+    def _digest_stream(cls, stream: ReadSeeker, size: int, full: bool) -> str:
+        """
+        Digest the content of a stream, either in full or just its first and last bytes, leaving it at the start.
+        """
+        digest = hashlib.sha1()
+        stream.seek(0)
+        if full or size <= 2 * cls._EDGE_DIGEST_SIZE:
+            chunk = stream.read(cls._READ_CHUNK_SIZE)
+            while chunk:
+                digest.update(chunk)
+                chunk = stream.read(cls._READ_CHUNK_SIZE)
+        else:
+            digest.update(stream.read(cls._EDGE_DIGEST_SIZE))
+            stream.seek(size - cls._EDGE_DIGEST_SIZE)
+            digest.update(stream.read(cls._EDGE_DIGEST_SIZE))
+        stream.seek(0)
+        return digest.hexdigest()
+
+    @classmethod
+    def fingerprint(cls, item: DataItem, version_tag: Optional[str] = None) -> Optional[ItemFingerprint]:
+        """
+        Compute a fingerprint for a data item.
+
+        Only the first and last bytes of file items, and of other items for which a version tag is provided, are read.
+        Other items are digested in full, since nothing else distinguishes versions of an item with the same size.
+
+        Parameters
+        ----------
+        item: DataItem
+            The data item.
+        version_tag: Optional[str]
+            Optional version tag (e.g., an object store ETag), used in place of a modification time when provided.
+
+        Returns
+        -------
+        Optional[ItemFingerprint]
+            The fingerprint of the item, or ``None`` if one could not be computed for the item.
+        """
+        try:
+            if isinstance(item, Path):
+                stat = item.stat()
+                with item.open('rb') as f:
+                    digest = cls._digest_stream(f, stat.st_size, full=False)
+                return stat.st_size, version_tag or stat.st_mtime_ns, digest
+            elif isinstance(item, bytes):
+                if version_tag is None or len(item) <= 2 * cls._EDGE_DIGEST_SIZE:
+                    digest = hashlib.sha1(item)
+                else:
+                    digest = hashlib.sha1(item[:cls._EDGE_DIGEST_SIZE])
+                    digest.update(item[-cls._EDGE_DIGEST_SIZE:])
+                return len(item), version_tag, digest.hexdigest()
+            elif isinstance(item, ReadSeeker):
+                size = item.seek(0, os.SEEK_END)
+                return size, version_tag, cls._digest_stream(item, size, full=version_tag is None)
+        except OSError as e:
+            logging.debug(f"Could not fingerprint {item.__class__.__name__} item due to {e.__class__.__name__}: {e!s}")
+        return None
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        max_entries: int
+            The maximum number of cached domains, after which the least recently used entries are evicted.
+        """
+        self._max_entries: int = max_entries
+        self._entries: OrderedDict[Hashable, DataDomain] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """ Remove all cached entries. """
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: Hashable) -> Optional[DataDomain]:
+        """
+        Get a copy of the cached domain for the given key, if there is one.
+
+        Parameters
+        ----------
+        key: Hashable
+            The cache key.
+
+        Returns
+        -------
+        Optional[DataDomain]
+            A copy of the cached domain, or ``None`` if nothing is cached for the key.
+        """
+        with self._lock:
+            domain = self._entries.get(key)
+            if domain is None:
+                return None
+            self._entries.move_to_end(key)
+        return domain.copy(deep=True)
+
+    def put(self, key: Hashable, domain: DataDomain):
+        """
+        Cache (a copy of) a detected domain.
+
+        Parameters
+        ----------
+        key: Hashable
+            The cache key.
+        domain: DataDomain
+            The detected domain to cache.
+        """
+        domain = domain.copy(deep=True)
+        with self._lock:
+            self._entries[key] = domain
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+_default_detection_cache = DomainDetectionCache()
+""" Process-wide default cache used by collection detectors not explicitly given one. """
+
 
 class AbstractDomainDetector(ABC):
     """ Abstraction for something that will automatically detect a :class:`DataDomain` for some data. """
@@ -96,6 +280,18 @@ class ItemDataDomainDetector(AbstractDomainDetector, ABC):
         self._decode_format = decode_format
         """ A decoder format sometimes used when reading data item in order to get metadata. """
 
+    @property
+    def item(self) -> DataItem:
+        """
+        The data item for which a domain will be detected.
+
+        Returns
+        -------
+        DataItem
+            The data item for which a domain will be detected.
+        """
+        return self._item
+
 
 class AbstractUniversalItemDomainDetector(ItemDataDomainDetector, ABC):
     """
@@ -330,7 +526,23 @@ class AbstractDataCollectionDomainDetector(AbstractDomainDetector, Generic[U], A
     """
 
     # TODO: (later) add mechanism for more intelligent hinting at what kinds of detectors to use
-    def __init__(self, *, data_collection: DataCollection, collection_name: Optional[str] = None):
+    def __init__(self, *, data_collection: DataCollection, collection_name: Optional[str] = None,
+                 detection_cache: Optional[DomainDetectionCache] = None, max_workers: Optional[int] = None):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        data_collection: DataCollection
+            The collection of data items for which a domain will be detected.
+        collection_name: Optional[str]
+            Optional name for collection, which is important when domains involve a ``data_id`` restriction.
+        detection_cache: Optional[DomainDetectionCache]
+            Cache of previously detected item domains (by default, a process-wide shared cache is used).
+        max_workers: Optional[int]
+            Maximum number of threads used to detect item domains concurrently (default determined by
+            :class:`ThreadPoolExecutor`).
+        """
         if isinstance(data_collection, Path) and not data_collection.is_dir():
             raise ValueError(f"{self.__class__.__name__} initialized with a path require this path to be a directory.")
         if isinstance(data_collection, Dataset) and data_collection.manager is None:
@@ -347,6 +559,36 @@ class AbstractDataCollectionDomainDetector(AbstractDomainDetector, Generic[U], A
         """
         if collection_name is None and isinstance(data_collection, Dataset):
             self._collection_name = data_collection.name
+        self._detection_cache: DomainDetectionCache = (_default_detection_cache if detection_cache is None
+                                                       else detection_cache)
+        """ Cache of previously detected item domains, checked before dispatching to item detectors. """
+        self._max_workers: Optional[int] = max_workers
+
+    def _detect_item(self, item_name: str, detector: U) -> DataDomain:
+        """
+        Detect the domain of a single item, using the instance's detection cache when possible.
+
+        Parameters
+        ----------
+        item_name: str
+            The name of the item.
+        detector: U
+            The initialized detector object for the item.
+
+        Returns
+        -------
+        DataDomain
+            The detected domain of the item.
+        """
+        fingerprint = DomainDetectionCache.fingerprint(detector.item)
+        if fingerprint is None:
+            return detector.detect()
+        key = (detector.__class__.__qualname__, item_name, fingerprint)
+        domain = self._detection_cache.get(key)
+        if domain is None:
+            domain = detector.detect()
+            self._detection_cache.put(key, domain)
+        return domain
 
     def detect(self, **_) -> DataDomain:
         """
@@ -355,10 +597,12 @@ class AbstractDataCollectionDomainDetector(AbstractDomainDetector, Generic[U], A
         Notes
         -----
         Detection is performed by merging individual item domains detected using :class:`U` instances.  This type does
-        not influence the details of how individual domains detections are performed by :class:`U` objects.  The
-        subsequent merging is performed by reducing individual item domains using :method:`DataDomain.merge_domains`.
-        The order of the items processed when reducing is based on the order of results of a call to
-        :method:`get_item_detectors`.
+        not influence the details of how individual domains detections are performed by :class:`U` objects, but it
+        does check the instance's :class:`DomainDetectionCache` for a previous detection of an unchanged item before
+        dispatching to a :class:`U` object, and it runs item detections concurrently in a thread pool.  The subsequent
+        merging is performed by a balanced tree reduction of individual item domains (see
+        :func:`merge_domains_balanced`).  The order of the items processed when reducing is based on the order of
+        results of a call to :method:`get_item_detectors`.
 
         Returns
         -------
@@ -370,7 +614,12 @@ class AbstractDataCollectionDomainDetector(AbstractDomainDetector, Generic[U], A
         DmodRuntimeError
             If it was not possible to properly detect the domain.
         """
-        domain = reduce(DataDomain.merge_domains, [det.detect() for _, det in self.get_item_detectors().items()])
+        item_detectors = self.get_item_detectors()
+        if len(item_detectors) == 0:
+            raise DmodRuntimeError(f"{self.__class__.__name__} found no items in data collection to detect")
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            domains = list(executor.map(lambda name_and_det: self._detect_item(*name_and_det), item_detectors.items()))
+        domain = merge_domains_balanced(domains)
         # If this domain has a format with a self-reference to dataset id, and we have a name, then set that restriction
         if StandardDatasetIndex.DATA_ID in domain.data_format.indices_to_fields().keys() and self._collection_name:
             domain.discrete_restrictions[StandardDatasetIndex.DATA_ID] = DiscreteRestriction(
@@ -344,6 +344,8 @@ class Dataset(Serializable):
         """
         self.expires = new_expires
         self.last_updated = datetime.now()
+        if self._manager is not None:
+            self._manager.notify_lifecycle_listeners(self)
 
     @property
     def archive_name(self) -> Optional[str]:
@@ -631,6 +633,8 @@ class DatasetManager(ABC):
         """ All linked dataset users, keyed by each user's UUID. """
         self._errors = []
         """ A property attribute to hold errors encountered during operations. """
+        self._lifecycle_listeners: List[Callable[[Dataset], Any]] = []
+        """ Callables notified whenever the lifetime or usage of one of this instance's datasets changes. """
 
     @abstractmethod
     def add_data(self, dataset_name: str, dest: str, domain: DataDomain, data: Optional[Union[bytes, Reader]] = None,
@@ -735,7 +739,48 @@ class DatasetManager(ABC):
         """
         if expires_on is None:
             expires_on = datetime.now() + timedelta(days=1)
-        return self.create(expires_on=expires_on, **kwargs)
+        dataset = self.create(expires_on=expires_on, **kwargs)
+        self.notify_lifecycle_listeners(dataset)
+        return dataset
+
+    def add_lifecycle_listener(self, listener: Callable[[Dataset], Any]):
+        """
+        Add a callable to be notified whenever the lifetime or usage of one of this instance's datasets changes.
+
+        Listeners are passed the affected dataset when a temporary dataset is created, when a dataset's expire time is
+        changed, and when a user is linked to or unlinked from a dataset.
+
+        Parameters
+        ----------
+        listener : Callable[[Dataset], Any]
+            The callable to notify.
+        """
+        if listener not in self._lifecycle_listeners:
+            self._lifecycle_listeners.append(listener)
+
+    def remove_lifecycle_listener(self, listener: Callable[[Dataset], Any]):
+        """
+        Stop notifying a previously added lifecycle listener.
+
+        Parameters
+        ----------
+        listener : Callable[[Dataset], Any]
+            The callable that should no longer be notified.
+        """
+        if listener in self._lifecycle_listeners:
+            self._lifecycle_listeners.remove(listener)
+
+    def notify_lifecycle_listeners(self, dataset: Dataset):
+        """
+        Notify all lifecycle listeners that the lifetime or usage of the given dataset has changed.
+
+        Parameters
+        ----------
+        dataset : Dataset
+            The dataset that changed.
+        """
+        for listener in self._lifecycle_listeners:
+            listener(dataset)
 
     @abstractmethod
     def delete(self, dataset: Dataset, **kwargs) -> bool:
@@ -979,6 +1024,7 @@ class DatasetManager(ABC):
         self._dataset_usage[dataset.name].add(user.uuid)
         self._dataset_users[user.uuid] = user
         user.datasets_and_managers[dataset.name] = self
+        self.notify_lifecycle_listeners(dataset)
         return True
 
     @abstractmethod
@@ -1104,6 +1150,7 @@ class DatasetManager(ABC):
             self._dataset_users.pop(user.uuid)
 
         user.datasets_and_managers.pop(dataset.name)
+        self.notify_lifecycle_listeners(dataset)
 
         return True
 
@@ -0,0 +1,805 @@
+"""
+Lightweight telemetry for DMOD services: counters, gauges, histograms and spans.
+
+Metrics are kept in a ::class:`MetricsRegistry` (by default the module-level ::data:`REGISTRY`) and rendered in the
+Prometheus text exposition format, which services expose on a ``/metrics`` endpoint.  The implementation has no
+dependencies beyond the standard library and is meant to be cheap enough for hot paths: updating an existing metric
+child costs a lock acquisition and an addition, so instrumented code should bind labeled children once (via
+::method:`_MetricFamily.labels`) and reuse them when it can.
+
+Spans time a block of code, recording its duration in the ``dmod_span_duration_seconds`` histogram (labeled by span
+name) and tracking the enclosing span through a context variable.  When ::function:`enable_opentelemetry` has been
+called and the ``opentelemetry-api`` package is installed, spans are also started as OpenTelemetry spans and registry
+metrics are reported through OpenTelemetry observable instruments.
+
+Metrics are served over HTTP with ::class:`PrometheusASGIApp`, for ASGI applications, or by the standalone server from
+::function:`start_http_server`, which the websocket services use when configured with a separate, internal metrics port.
+"""
+import contextvars
+import re
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+""" The content type of the Prometheus text exposition format. """
+
+METRICS_PATH = "/metrics"
+""" The conventional path at which services serve their metrics. """
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                                      10.0, 30.0, 60.0, 300.0)
+""" Default histogram bucket upper bounds, in seconds, spanning sub-millisecond calls to multi-minute jobs. """
+
+SPAN_DURATION_METRIC = "dmod_span_duration_seconds"
+SPAN_ERRORS_METRIC = "dmod_span_errors_total"
+
+_NAME_PATTERN = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+_LABEL_NAME_PATTERN = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape_label_value(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _CounterChild:
+    """ A single labeled time series of a ::class:`Counter`. """
+
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """
+        Increment the counter.
+
+        Parameters
+        ----------
+        amount : float
+            The non-negative amount to add, by default ``1``.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts")
+        # Explicit acquire and release, rather than ``with``, is notably cheaper on hot paths
+        self._lock.acquire()
+        try:
+            self._value += amount
+        finally:
+            self._lock.release()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _GaugeChild:
+    """ A single labeled time series of a ::class:`Gauge`. """
+
+    __slots__ = ('_value', '_lock')
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        self._lock.acquire()
+        try:
+            self._value += amount
+        finally:
+            self._lock.release()
+
+    def dec(self, amount: float = 1.0):
+        self._lock.acquire()
+        try:
+            self._value -= amount
+        finally:
+            self._lock.release()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    """ A single labeled time series of a ::class:`Histogram`. """
+
+    __slots__ = ('_upper_bounds', '_bucket_counts', '_sum', '_count', '_lock')
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        # The last count is for observations above every bound
+        self._bucket_counts = [0] * (len(upper_bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        Record an observation.
+
+        Parameters
+        ----------
+        value : float
+            The observed value, e.g., a duration in seconds.
+        """
+        index = bisect_left(self._upper_bounds, value)
+        self._lock.acquire()
+        try:
+            self._bucket_counts[index] += 1
+            self._sum += value
+            self._count += 1
+        finally:
+            self._lock.release()
+
+    def time(self) -> '_Timer':
+        """
+        Get a context manager that observes the number of seconds spent within it.
+
+        Returns
+        -------
+        _Timer
+            A context manager that observes the seconds spent within it.
+        """
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative_counts(self) -> List[int]:
+        """
+        Get the cumulative count of observations less than or equal to each bucket bound, ending with ``+Inf``.
+
+        Returns
+        -------
+        List[int]
+            The cumulative count for each bucket, ending with the total count.
+        """
+        with self._lock:
+            counts = list(self._bucket_counts)
+        total = 0
+        for i, count in enumerate(counts):
+            total += count
+            counts[i] = total
+        return counts
+
+
+class _Timer:
+    """ Context manager observing the seconds spent within it in a histogram. """
+
+    __slots__ = ('_histogram', '_start')
+
+    def __init__(self, histogram: _HistogramChild):
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> '_Timer':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class _MetricFamily(ABC):
+    """
+    Abstract base for a named metric, made up of one child time series for each combination of label values.
+
+    Families without label names act as their single child, so e.g. ``counter.inc()`` may be called directly.
+    """
+
+    type_name: str = None
+    """ The metric type, as named in the Prometheus exposition format. """
+
+    def __init__(self, name: str, description: str = '', label_names: Sequence[str] = ()):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        name : str
+            The metric name.
+        description : str
+            Help text describing the metric.
+        label_names : Sequence[str]
+            The names of the labels distinguishing the metric's time series.
+        """
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid metric name '{name}'")
+        for label_name in label_names:
+            if not _LABEL_NAME_PATTERN.match(label_name) or label_name.startswith('__') or label_name == 'le':
+                raise ValueError(f"Invalid label name '{label_name}' for metric '{name}'")
+        self.name = name
+        self.description = description
+        self.label_names: Tuple[str, ...] = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.label_names:
+            self._default_child = self._get_or_create_child(())
+
+    @abstractmethod
+    def _create_child(self):
+        pass
+
+    def _get_or_create_child(self, key: Tuple[str, ...]):
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._create_child()
+        return child
+
+    def labels(self, *values: Any, **kw_values: Any):
+        """
+        Get the child time series for the given label values, creating it if needed.
+
+        Label values are given either positionally, in the order of ::attribute:`label_names`, or by name.
+
+        Returns
+        -------
+        Union[_CounterChild, _GaugeChild, _HistogramChild]
+            The child time series for the label values, of the type corresponding to this metric's type.
+        """
+        if not kw_values:
+            child = self._children.get(values)
+            if child is not None:
+                return child
+        elif values:
+            raise ValueError("Label values must be given all by position or all by name")
+        else:
+            try:
+                values = tuple(kw_values[n] for n in self.label_names)
+            except KeyError as e:
+                raise ValueError(f"Missing value for label {e} of metric '{self.name}'") from e
+        if len(values) != len(self.label_names) or len(kw_values) > len(self.label_names):
+            raise ValueError(f"Metric '{self.name}' expects values for labels {self.label_names}")
+        return self._get_or_create_child(tuple(str(v) for v in values))
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        """
+        Get a snapshot of the label values and child of each of this metric's time series.
+
+        Returns
+        -------
+        List[Tuple[Tuple[str, ...], Any]]
+            Pairs of label values and the corresponding child time series.
+        """
+        with self._lock:
+            return list(self._children.items())
+
+    @abstractmethod
+    def _render_samples(self, lines: List[str]):
+        pass
+
+    def render(self) -> str:
+        """
+        Render the metric in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The rendered metric, ending in a newline.
+        """
+        lines = [f"# HELP {self.name} {_escape_help(self.description)}"] if self.description else []
+        lines.append(f"# TYPE {self.name} {self.type_name}")
+        self._render_samples(lines)
+        return '\n'.join(lines) + '\n'
+
+
+class Counter(_MetricFamily):
+    """
+    A metric whose value only ever increases, such as a count of handled requests.
+    """
+
+    type_name = 'counter'
+
+    def _create_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default_child.inc(amount)
+
+    def _render_samples(self, lines: List[str]):
+        for values, child in self.children():
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(child.value)}")
+
+
+class Gauge(_MetricFamily):
+    """
+    A metric whose value may go up and down, such as a queue depth.
+    """
+
+    type_name = 'gauge'
+
+    def _create_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default_child.set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default_child.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default_child.dec(amount)
+
+    def _render_samples(self, lines: List[str]):
+        for values, child in self.children():
+            lines.append(f"{self.name}{_format_labels(self.label_names, values)} {_format_value(child.value)}")
+
+
+class Histogram(_MetricFamily):
+    """
+    A metric that counts observations, such as durations, in buckets of configurable upper bounds.
+    """
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, description: str = '', label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        name : str
+            The metric name.
+        description : str
+            Help text describing the metric.
+        label_names : Sequence[str]
+            The names of the labels distinguishing the metric's time series.
+        buckets : Sequence[float]
+            The upper bounds of the buckets, with an implied final bound of ``+Inf``.
+        """
+        upper_bounds = tuple(sorted(float(b) for b in buckets if b != float('inf')))
+        if not upper_bounds:
+            raise ValueError(f"Histogram '{name}' requires at least one finite bucket bound")
+        self.upper_bounds: Tuple[float, ...] = upper_bounds
+        super().__init__(name=name, description=description, label_names=label_names)
+
+    def _create_child(self) -> _HistogramChild:
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._default_child.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default_child.time()
+
+    def _render_samples(self, lines: List[str]):
+        bounds = [_format_value(b) for b in self.upper_bounds] + ['+Inf']
+        for values, child in self.children():
+            for bound, count in zip(bounds, child.cumulative_counts()):
+                labels = _format_labels(self.label_names, values, extra=('le', bound))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+
+
+_M = TypeVar('_M', bound=_MetricFamily)
+
+
+class MetricsRegistry:
+    """
+    A collection of uniquely named metrics, which can be rendered together for scraping.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _MetricFamily] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[_MetricFamily], None]] = []
+
+    def _get_or_create(self, metric_type: Type[_M], name: str, description: str, label_names: Sequence[str],
+                       **kwargs) -> _M:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = metric_type(name, description, label_names, **kwargs)
+                    listeners = list(self._listeners)
+                else:
+                    listeners = []
+            for listener in listeners:
+                listener(metric)
+        if not isinstance(metric, metric_type) or metric.label_names != tuple(label_names):
+            raise ValueError(f"Metric '{name}' is already registered as a {metric.type_name} with labels "
+                             f"{metric.label_names}")
+        return metric
+
+    def counter(self, name: str, description: str = '', label_names: Sequence[str] = ()) -> Counter:
+        """
+        Get the counter with the given name, registering it if needed.
+
+        Parameters
+        ----------
+        name : str
+            The metric name, which by convention ends in ``_total``.
+        description : str
+            Help text describing the metric.
+        label_names : Sequence[str]
+            The names of the labels distinguishing the metric's time series.
+
+        Returns
+        -------
+        Counter
+            The registered counter.
+        """
+        return self._get_or_create(Counter, name, description, label_names)
+
+    def gauge(self, name: str, description: str = '', label_names: Sequence[str] = ()) -> Gauge:
+        """
+        Get the gauge with the given name, registering it if needed.
+
+        Parameters
+        ----------
+        name : str
+            The metric name.
+        description : str
+            Help text describing the metric.
+        label_names : Sequence[str]
+            The names of the labels distinguishing the metric's time series.
+
+        Returns
+        -------
+        Gauge
+            The registered gauge.
+        """
+        return self._get_or_create(Gauge, name, description, label_names)
+
+    def histogram(self, name: str, description: str = '', label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Get the histogram with the given name, registering it if needed.
+
+        Parameters
+        ----------
+        name : str
+            The metric name, which by convention ends in the unit of observations (e.g., ``_seconds``).
+        description : str
+            Help text describing the metric.
+        label_names : Sequence[str]
+            The names of the labels distinguishing the metric's time series.
+        buckets : Sequence[float]
+            The upper bounds of the buckets, used only if the histogram is not yet registered.
+
+        Returns
+        -------
+        Histogram
+            The registered histogram.
+        """
+        return self._get_or_create(Histogram, name, description, label_names, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_MetricFamily]:
+        return self._metrics.get(name)
+
+    def metrics(self) -> List[_MetricFamily]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def add_listener(self, listener: Callable[[_MetricFamily], None]):
+        """
+        Add a function called with each metric registered from now on, after first calling it with existing metrics.
+
+        Parameters
+        ----------
+        listener : Callable[[_MetricFamily], None]
+            The function to call with registered metrics.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            existing = list(self._metrics.values())
+        for metric in existing:
+            listener(metric)
+
+    def remove_listener(self, listener: Callable[[_MetricFamily], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def render_prometheus(self) -> str:
+        """
+        Render every registered metric in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The rendered metrics.
+        """
+        return ''.join(metric.render() for metric in sorted(self.metrics(), key=lambda m: m.name))
+
+
+REGISTRY = MetricsRegistry()
+""" The default, process-wide registry. """
+
+
+def counter(name: str, description: str = '', label_names: Sequence[str] = ()) -> Counter:
+    """ Get the counter with the given name from the default registry, registering it if needed. """
+    return REGISTRY.counter(name, description, label_names)
+
+
+def gauge(name: str, description: str = '', label_names: Sequence[str] = ()) -> Gauge:
+    """ Get the gauge with the given name from the default registry, registering it if needed. """
+    return REGISTRY.gauge(name, description, label_names)
+
+
+def histogram(name: str, description: str = '', label_names: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """ Get the histogram with the given name from the default registry, registering it if needed. """
+    return REGISTRY.histogram(name, description, label_names, buckets)
+
+
+def render_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    """ Render the metrics of the given registry, or the default registry, in the Prometheus text format. """
+    return (registry or REGISTRY).render_prometheus()
+
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('dmod_current_span', default=None)
+
+_RECENT_SPANS: Deque['Span'] = deque(maxlen=1000)
+""" The most recently finished spans of the process, for debugging. """
+
+_otel_tracer = None
+""" The OpenTelemetry tracer spans are bridged to, when enabled. """
+
+
+class Span:
+    """
+    A timed, named block of code, used as a context manager.
+
+    The duration of each finished span is observed in the ``dmod_span_duration_seconds`` histogram of its registry, and
+    spans exited with an exception are also counted in ``dmod_span_errors_total``, both labeled with the span's name.
+    """
+
+    __slots__ = ('name', 'attributes', 'parent', 'start', 'end', 'error', '_registry', '_token', '_otel_context')
+
+    def __init__(self, name: str, attributes: Dict[str, Any], registry: MetricsRegistry):
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[Span] = None
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self._registry = registry
+        self._token = None
+        self._otel_context = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """ The seconds the span took, or ``None`` if it has not finished. """
+        return None if self.end is None else self.end - self.start
+
+    def __enter__(self) -> 'Span':
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        if _otel_tracer is not None:
+            self._otel_context = _otel_tracer.start_as_current_span(self.name, attributes=self.attributes)
+            self._otel_context.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        self._registry.histogram(SPAN_DURATION_METRIC, "Duration of instrumented operations",
+                                 ('span',)).labels(self.name).observe(self.end - self.start)
+        if exc_val is not None:
+            self.error = exc_val
+            self._registry.counter(SPAN_ERRORS_METRIC, "Instrumented operations that raised an exception",
+                                   ('span',)).labels(self.name).inc()
+        if self._otel_context is not None:
+            self._otel_context.__exit__(exc_type, exc_val, exc_tb)
+            self._otel_context = None
+        _RECENT_SPANS.append(self)
+
+
+def span(name: str, registry: Optional[MetricsRegistry] = None, **attributes: Any) -> Span:
+    """
+    Create a span timing the code run within it, for use as a context manager.
+
+    Parameters
+    ----------
+    name : str
+        The name of the span, used as the ``span`` label of its metrics, and so of low cardinality.
+    registry : Optional[MetricsRegistry]
+        The registry for the span's metrics, by default the default registry.
+    attributes
+        Further details of the span, which are not used as metric labels but passed on to OpenTelemetry.
+
+    Returns
+    -------
+    Span
+        The span, which starts when entered.
+    """
+    return Span(name, attributes, registry or REGISTRY)
+
+
+def current_span() -> Optional[Span]:
+    """ Get the innermost span entered in the current context, if any. """
+    return _current_span.get()
+
+
+def recent_spans() -> List[Span]:
+    """ Get the most recently finished spans of the process, oldest first. """
+    return list(_RECENT_SPANS)
+
+
+class _OpenTelemetryBridge:
+    """
+    Reports the metrics of a registry through OpenTelemetry observable instruments.
+
+    Counters and gauges are reported as observable counters and gauges; histograms are reported as a pair of observable
+    counters of their observations' sum and count.
+    """
+
+    def __init__(self, meter, observation_type):
+        self._meter = meter
+        self._observation_type = observation_type
+
+    def _observe(self, metric: _MetricFamily, value_of: Callable[[Any], float]):
+        def callback(options=None) -> Iterable:
+            return [self._observation_type(value_of(child), dict(zip(metric.label_names, values)))
+                    for values, child in metric.children()]
+        return callback
+
+    def __call__(self, metric: _MetricFamily):
+        if isinstance(metric, Counter):
+            self._meter.create_observable_counter(metric.name, callbacks=[self._observe(metric, lambda c: c.value)],
+                                                  description=metric.description)
+        elif isinstance(metric, Gauge):
+            self._meter.create_observable_gauge(metric.name, callbacks=[self._observe(metric, lambda c: c.value)],
+                                                description=metric.description)
+        elif isinstance(metric, Histogram):
+            self._meter.create_observable_counter(f"{metric.name}_sum", callbacks=[self._observe(metric,
+                                                                                                 lambda c: c.sum)],
+                                                  description=metric.description)
+            self._meter.create_observable_counter(f"{metric.name}_count",
+                                                  callbacks=[self._observe(metric, lambda c: c.count)],
+                                                  description=metric.description)
+
+
+_otel_bridges: Dict[int, _OpenTelemetryBridge] = {}
+
+
+def enable_opentelemetry(tracer_provider=None, meter_provider=None, registry: Optional[MetricsRegistry] = None) -> bool:
+    """
+    Bridge spans and the metrics of a registry to OpenTelemetry, if the ``opentelemetry-api`` package is installed.
+
+    Parameters
+    ----------
+    tracer_provider
+        Optional OpenTelemetry tracer provider, by default the global provider.
+    meter_provider
+        Optional OpenTelemetry meter provider, by default the global provider.
+    registry : Optional[MetricsRegistry]
+        The registry whose metrics are reported, by default the default registry.
+
+    Returns
+    -------
+    bool
+        Whether OpenTelemetry is available and was enabled.
+    """
+    try:
+        from opentelemetry import metrics, trace
+        from opentelemetry.metrics import Observation
+    except ImportError:
+        return False
+
+    global _otel_tracer
+    registry = registry or REGISTRY
+    _otel_tracer = trace.get_tracer('dmod', tracer_provider=tracer_provider)
+    if id(registry) not in _otel_bridges:
+        bridge = _otel_bridges[id(registry)] = _OpenTelemetryBridge(metrics.get_meter('dmod',
+                                                                                      meter_provider=meter_provider),
+                                                                    Observation)
+        registry.add_listener(bridge)
+    return True
+
+
+def disable_opentelemetry(registry: Optional[MetricsRegistry] = None):
+    """
+    Stop starting OpenTelemetry spans, and stop bridging metrics registered from now on.
+
+    Parameters
+    ----------
+    registry : Optional[MetricsRegistry]
+        The registry whose metrics were reported, by default the default registry.
+    """
+    global _otel_tracer
+    _otel_tracer = None
+    bridge = _otel_bridges.pop(id(registry or REGISTRY), None)
+    if bridge is not None:
+        (registry or REGISTRY).remove_listener(bridge)
+
+
+class PrometheusASGIApp:
+    """
+    ASGI application serving the metrics of a registry, e.g., mounted with ``app.add_route("/metrics", ...)``.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self._registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        body = render_prometheus(self._registry).encode()
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', CONTENT_TYPE.encode()),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def start_http_server(port: int, host: str = '', registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Start a server for the metrics of a registry in a daemon thread, for processes without another HTTP server.
+
+    Parameters
+    ----------
+    port : int
+        The port to listen on, or ``0`` for an arbitrary free port.
+    host : str
+        The host to listen on, by default every interface.
+    registry : Optional[MetricsRegistry]
+        The registry whose metrics are served, by default the default registry.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The running server, which can be stopped with ``shutdown()``.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != METRICS_PATH:
+                self.send_error(404)
+                return
+            body = render_prometheus(registry).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='dmod-metrics-server', daemon=True).start()
+    return server
@@ -0,0 +1,136 @@
+import unittest
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict
+
+from ..core.data_domain_detectors import (AbstractDataCollectionDomainDetector, AbstractUniversalItemDomainDetector,
+                                          DomainDetectionCache, ItemDataDomainDetector, merge_domains_balanced)
+from ..core.meta_data import DataDomain, DataFormat, DiscreteRestriction, StandardDatasetIndex, TimeRange
+
+
+class CountingItemDetector(ItemDataDomainDetector):
+    """ Simple detector for test items containing a single line with a catchment id, counting its detections. """
+
+    _data_format = DataFormat.AORC_CSV
+    detect_count = 0
+
+    def detect(self, **kwargs) -> DataDomain:
+        CountingItemDetector.detect_count += 1
+        data = self._item.read_bytes() if isinstance(self._item, Path) else self._item
+        time_range = TimeRange(begin=datetime(2016, 1, 1), end=datetime(2016, 1, 1) + timedelta(days=1))
+        return DataDomain(data_format=self._data_format, continuous_restrictions=[time_range],
+                          discrete_restrictions=[DiscreteRestriction(variable=StandardDatasetIndex.CATCHMENT_ID,
+                                                                     values=[data.decode().strip()])])
+
+
+class UniversalTestDetector(AbstractUniversalItemDomainDetector):
+
+    def __init__(self, **kwargs):
+        super().__init__(detector_types=[CountingItemDetector], **kwargs)
+
+
+class CollectionTestDetector(AbstractDataCollectionDomainDetector[UniversalTestDetector]):
+
+    def get_item_detectors(self) -> Dict[str, UniversalTestDetector]:
+        return {name: UniversalTestDetector(item=self.get_item(name), item_name=name)
+                for name in sorted(self.get_item_names())}
+
+
+class TestDataDomainDetectors(unittest.TestCase):
+
+    def setUp(self):
+        CountingItemDetector.detect_count = 0
+        self.cat_ids = [f"cat-{i}" for i in range(25)]
+        self.collection = {f"{cat_id}.txt": cat_id.encode() for cat_id in self.cat_ids}
+
+    def test_merge_domains_balanced_0_a(self):
+        """ Test that a balanced merge produces the same domain as a left fold of merges. """
+        domains = [UniversalTestDetector(item=data).detect() for data in self.collection.values()]
+        left_fold = domains[0]
+        for d in domains[1:]:
+            left_fold = DataDomain.merge_domains(left_fold, d)
+        self.assertEqual(left_fold, merge_domains_balanced(domains))
+
+    def test_merge_domains_balanced_0_b(self):
+        """ Test that a balanced merge of no domains raises a ``ValueError``. """
+        self.assertRaises(ValueError, merge_domains_balanced, [])
+
+    def test_detect_0_a(self):
+        """ Test that collection detection includes all the item catchments. """
+        detector = CollectionTestDetector(data_collection=self.collection, detection_cache=DomainDetectionCache())
+        domain = detector.detect()
+        self.assertEqual(set(self.cat_ids),
+                         set(domain.discrete_restrictions[StandardDatasetIndex.CATCHMENT_ID].values))
+
+    def test_detect_0_b(self):
+        """ Test that repeated collection detection uses the cache and does not detect items again. """
+        cache = DomainDetectionCache()
+        first = CollectionTestDetector(data_collection=self.collection, detection_cache=cache).detect()
+        second = CollectionTestDetector(data_collection=self.collection, detection_cache=cache).detect()
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.collection), CountingItemDetector.detect_count)
+
+    def test_detect_0_c(self):
+        """ Test that a changed file item is detected again rather than served from the cache. """
+        cache = DomainDetectionCache()
+        with TemporaryDirectory() as tmp_dir:
+            dir_path = Path(tmp_dir)
+            for name, data in self.collection.items():
+                dir_path.joinpath(name).write_bytes(data)
+            CollectionTestDetector(data_collection=dir_path, detection_cache=cache).detect()
+            dir_path.joinpath("cat-0.txt").write_bytes(b"cat-100")
+            domain = CollectionTestDetector(data_collection=dir_path, detection_cache=cache).detect()
+        self.assertEqual(len(self.collection) + 1, CountingItemDetector.detect_count)
+        self.assertIn("cat-100", domain.discrete_restrictions[StandardDatasetIndex.CATCHMENT_ID].values)
+        self.assertNotIn("cat-0", domain.discrete_restrictions[StandardDatasetIndex.CATCHMENT_ID].values)
+
+    def test_cache_0_a(self):
+        """ Test that the cache returns copies, so modifying a returned domain does not alter the cache. """
+        cache = DomainDetectionCache()
+        domain = UniversalTestDetector(item=b"cat-1").detect()
+        cache.put("key", domain)
+        cached = cache.get("key")
+        cached.discrete_restrictions[StandardDatasetIndex.DATA_ID] = DiscreteRestriction(
+            variable=StandardDatasetIndex.DATA_ID, values=["changed"])
+        self.assertEqual(domain, cache.get("key"))
+
+    def test_cache_0_b(self):
+        """ Test that the cache evicts least recently used entries beyond its max size. """
+        cache = DomainDetectionCache(max_entries=2)
+        domain = UniversalTestDetector(item=b"cat-1").detect()
+        cache.put("a", domain)
+        cache.put("b", domain)
+        cache.get("a")
+        cache.put("c", domain)
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+    def test_fingerprint_0_a(self):
+        """ Test that same-sized in-memory and stream items differing anywhere have different fingerprints. """
+        data = bytes(3 * DomainDetectionCache._EDGE_DIGEST_SIZE)
+        changed = bytearray(data)
+        changed[len(data) // 2] = 1
+        changed = bytes(changed)
+        self.assertNotEqual(DomainDetectionCache.fingerprint(data), DomainDetectionCache.fingerprint(changed))
+        self.assertNotEqual(DomainDetectionCache.fingerprint(BytesIO(data)),
+                            DomainDetectionCache.fingerprint(BytesIO(changed)))
+
+    def test_fingerprint_0_b(self):
+        """ Test that changes to the end of a large file item, not just its start, change its fingerprint. """
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir).joinpath("item.bin")
+            file_path.write_bytes(bytes(3 * DomainDetectionCache._EDGE_DIGEST_SIZE))
+            before = DomainDetectionCache.fingerprint(file_path, version_tag="v1")
+            with file_path.open('r+b') as f:
+                f.seek(-1, 2)
+                f.write(b"\x01")
+            self.assertNotEqual(before, DomainDetectionCache.fingerprint(file_path, version_tag="v1"))
+
+    def test_fingerprint_0_c(self):
+        """ Test that fingerprinting a stream item leaves it positioned at its start. """
+        stream = BytesIO(b"cat-1")
+        DomainDetectionCache.fingerprint(stream)
+        self.assertEqual(b"cat-1", stream.read())
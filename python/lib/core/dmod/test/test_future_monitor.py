@@ -0,0 +1,145 @@
+"""
+Unit tests used to ensure that the FutureMonitor reacts to completed operations without polling
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import typing
+import unittest
+
+from concurrent import futures
+
+from ..core.context.base import ObjectManagerScope
+from ..core.context.monitor import FutureMonitor
+
+
+class FakeScope(ObjectManagerScope):
+    """
+    A scope that records when it is ended
+    """
+    def __init__(self, name: str):
+        super().__init__(name=name)
+        self.ended = threading.Event()
+
+    def create_object(self, name: str, /, *args, **kwargs):
+        raise NotImplementedError("Objects cannot be created within a FakeScope")
+
+    def end_scope(self):
+        super().end_scope()
+        self.ended.set()
+
+
+class TestFutureMonitor(unittest.TestCase):
+    FUTURE_COUNT: typing.Final[int] = 5000
+
+    def setUp(self) -> None:
+        self.results: typing.List[typing.Any] = []
+        self.result_received = threading.Event()
+        self.monitor = FutureMonitor(
+            callback=self.record_result,
+            timeout=30,
+            logger=logging.getLogger(self.__class__.__name__)
+        )
+
+    def tearDown(self) -> None:
+        self.monitor.kill(wait_seconds=5)
+
+    def record_result(self, value):
+        self.results.append(value)
+        self.result_received.set()
+
+    def test_waiting_is_idle(self):
+        """
+        Test that thousands of long-running futures don't consume CPU time while they wait and that completions are
+        still handled promptly
+        """
+        pending_futures = [futures.Future() for _ in range(self.FUTURE_COUNT)]
+
+        for future in pending_futures:
+            self.monitor.add(None, future)
+
+        # Let the monitor settle after handling everything that was added
+        time.sleep(0.5)
+        self.assertEqual(len(self.monitor), self.FUTURE_COUNT)
+
+        cpu_time_before = time.process_time()
+        time.sleep(1.0)
+        cpu_time_spent = time.process_time() - cpu_time_before
+
+        self.assertLess(cpu_time_spent, 0.1)
+
+        completion_started = time.monotonic()
+        pending_futures[self.FUTURE_COUNT // 2].set_result(9)
+        self.assertTrue(self.result_received.wait(timeout=1))
+        self.assertLess(time.monotonic() - completion_started, 0.5)
+        self.assertEqual(self.results, [9])
+        self.assertEqual(len(self.monitor), self.FUTURE_COUNT - 1)
+
+        for future in pending_futures:
+            if not future.done():
+                future.set_result(None)
+
+        self.monitor.stop()
+        self.assertEqual(len(self.results), self.FUTURE_COUNT)
+        self.assertFalse(self.monitor.running)
+
+    def test_scope_ends_on_completion(self):
+        """
+        Test that scopes end when their operations complete, whether they succeed or fail
+        """
+        successful_scope = FakeScope("successful")
+        failing_scope = FakeScope("failing")
+
+        successful_future = futures.Future()
+        failing_future = futures.Future()
+
+        self.monitor.add(successful_scope, successful_future)
+        self.monitor.add(failing_scope, failing_future)
+
+        successful_future.set_result(1)
+        failing_future.set_exception(ValueError("Expected failure"))
+
+        self.assertTrue(successful_scope.ended.wait(timeout=1))
+        self.assertTrue(failing_scope.ended.wait(timeout=1))
+        self.assertEqual(self.results, [1])
+
+    def test_already_finished_future(self):
+        """
+        Test that a future that finished before it was added is still handled
+        """
+        scope = FakeScope("finished")
+        finished_future = futures.Future()
+        finished_future.set_result("done")
+
+        self.monitor.add(scope, finished_future)
+
+        self.assertTrue(scope.ended.wait(timeout=1))
+        self.assertEqual(self.results, ["done"])
+
+    def test_per_future_timeout(self):
+        """
+        Test that operations given a timeout are abandoned once it passes while others are left alone
+        """
+        expiring_scope = FakeScope("expiring")
+        lasting_scope = FakeScope("lasting")
+
+        expiring_future = futures.Future()
+        lasting_future = futures.Future()
+
+        self.monitor.add(lasting_scope, lasting_future)
+        self.monitor.add(expiring_scope, expiring_future, timeout=0.2)
+
+        self.assertTrue(expiring_scope.ended.wait(timeout=2))
+        self.assertTrue(expiring_future.cancelled())
+        self.assertFalse(lasting_scope.ended.is_set())
+        self.assertEqual(len(self.monitor), 1)
+
+        lasting_future.set_result(3)
+        self.assertTrue(lasting_scope.ended.wait(timeout=1))
+        self.assertEqual(self.results, [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+Unit tests used to ensure that large results of calls through DMODObjectManager proxies are sent through shared memory
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import time
+import typing
+import unittest
+
+from multiprocessing import shared_memory as multiprocessing_shared_memory
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    numpy = None
+    pandas = None
+
+from ..core import context
+from ..core.context import shared_memory
+
+BENCHMARK_BYTES = int(float(os.environ.get("DMOD_SHARED_MEMORY_BENCHMARK_BYTES", 256 * 1024 * 1024)))
+"""
+The number of bytes of DataFrame columns passed between processes when comparing shared memory to pickling
+
+Set `DMOD_SHARED_MEMORY_BENCHMARK_BYTES` to 1e9 to compare with a full gigabyte on a machine with enough memory
+"""
+
+BENCHMARK_COLUMN_COUNT = 8
+
+
+class ColumnStore:
+    """
+    A class holding onto a frame that will be read through a proxy
+    """
+    def __init__(self, row_count: int, column_count: int = 4):
+        self.__frame = pandas.DataFrame(
+            {
+                f"column_{index}": numpy.arange(row_count, dtype=numpy.float64) * (index + 1)
+                for index in range(column_count)
+            }
+        )
+        self.__frame["label"] = [f"row {index % 3}" for index in range(row_count)]
+
+    def get_frame(self, numeric_only: bool = False) -> pandas.DataFrame:
+        if numeric_only:
+            return self.__frame.drop(columns=["label"])
+        return self.__frame
+
+    def get_column(self, name: str) -> pandas.Series:
+        return self.__frame[name]
+
+    def get_array(self) -> numpy.ndarray:
+        return self.__frame.drop(columns=["label"]).to_numpy()
+
+    def get_row_count(self) -> int:
+        return len(self.__frame)
+
+    @property
+    def first_column(self) -> numpy.ndarray:
+        return self.__frame["column_0"].values
+
+
+def get_segment_names() -> typing.Set[str]:
+    return {name for name in os.listdir("/dev/shm") if name.startswith(shared_memory.SEGMENT_PREFIX)}
+
+
+class SharedMemoryThreshold:
+    """
+    Sets the threshold that object servers started within the context will send results through shared memory with
+    """
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.previous_value: typing.Optional[str] = None
+
+    def __enter__(self):
+        self.previous_value = os.environ.get(shared_memory.SHARED_MEMORY_THRESHOLD_VARIABLE)
+        os.environ[shared_memory.SHARED_MEMORY_THRESHOLD_VARIABLE] = str(self.threshold)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.previous_value is None:
+            os.environ.pop(shared_memory.SHARED_MEMORY_THRESHOLD_VARIABLE, None)
+        else:
+            os.environ[shared_memory.SHARED_MEMORY_THRESHOLD_VARIABLE] = self.previous_value
+
+
+if pandas is not None:
+    context.DMODObjectManager.register_class(ColumnStore)
+
+
+@unittest.skipIf(pandas is None, "numpy and pandas are required to send data through shared memory")
+class TestSharedMemoryRegistry(unittest.TestCase):
+    def test_share_and_load(self):
+        registry = shared_memory.SharedMemoryRegistry(threshold=1)
+        store = ColumnStore(1000)
+
+        frame_payload = registry.share(store.get_frame())
+        self.assertEqual(frame_payload.nbytes, 4 * 1000 * 8)
+        self.assertIn("label", frame_payload.unshared_columns)
+
+        # Only the layout of the data should be pickled - not the data itself
+        self.assertLess(len(pickle.dumps(frame_payload.buffers)), 1000)
+
+        loaded_frame = pickle.loads(pickle.dumps(frame_payload)).load()
+        pandas.testing.assert_frame_equal(loaded_frame, store.get_frame())
+
+        series_payload = registry.share(store.get_column("column_2"))
+        pandas.testing.assert_series_equal(series_payload.load(), store.get_column("column_2"))
+
+        array_payload = registry.share(store.get_array())
+        loaded_array = array_payload.load()
+        self.assertTrue(numpy.array_equal(loaded_array, store.get_array()))
+
+        # The loaded array should read straight from the segment rather than from a copy
+        segment = multiprocessing_shared_memory.SharedMemory(name=array_payload.name)
+        _, layout = array_payload.buffers[0]
+        writable_array = layout.create_array(segment.buf)
+        writable_array[0, 0] = -1
+        self.assertEqual(loaded_array[0, 0], -1)
+        del writable_array
+        segment.close()
+
+        self.assertEqual(len(registry), 3)
+        registry.close()
+        self.assertEqual(len(registry), 0)
+
+        # Data that has already been loaded stays readable after its segment has been unlinked
+        self.assertEqual(loaded_frame["column_1"].sum(), store.get_frame()["column_1"].sum())
+
+        with self.assertRaises(FileNotFoundError):
+            multiprocessing_shared_memory.SharedMemory(name=array_payload.name)
+
+    def test_reference_counting(self):
+        registry = shared_memory.SharedMemoryRegistry(threshold=1)
+        payload = registry.share(numpy.arange(100))
+
+        self.assertEqual(registry.acquire(payload.name), 2)
+        self.assertEqual(registry.release(payload.name), 1)
+        self.assertIn(payload.name, registry)
+
+        self.assertEqual(registry.release(payload.name), 0)
+        self.assertNotIn(payload.name, registry)
+        self.assertEqual(registry.release(payload.name), 0)
+
+        with self.assertRaises(KeyError):
+            registry.acquire(payload.name)
+
+    def test_threshold(self):
+        registry = shared_memory.SharedMemoryRegistry(threshold=1024)
+
+        self.assertIs(registry.prepare_result(5), 5)
+        self.assertIsInstance(registry.prepare_result(numpy.arange(10)), numpy.ndarray)
+        self.assertIsInstance(registry.prepare_result(numpy.arange(1024)), shared_memory.SharedMemoryPayload)
+        self.assertIsInstance(registry.prepare_result(numpy.array(["a"] * 1024, dtype=object)), numpy.ndarray)
+
+        disabled = shared_memory.SharedMemoryRegistry(threshold=0)
+        self.assertIsInstance(disabled.prepare_result(numpy.arange(1024)), numpy.ndarray)
+
+        registry.close()
+
+        with SharedMemoryThreshold(2048):
+            self.assertEqual(shared_memory.get_shared_memory_threshold(), 2048)
+
+
+@unittest.skipIf(pandas is None, "numpy and pandas are required to send data through shared memory")
+@unittest.skipUnless(os.path.isdir("/dev/shm"), "Shared memory segments can only be inspected through /dev/shm")
+class TestSharedMemoryTransport(unittest.TestCase):
+    def test_results_through_proxy(self):
+        existing_segments = get_segment_names()
+
+        with SharedMemoryThreshold(1024), context.DMODObjectManager() as manager:
+            store: ColumnStore = manager.create_object("ColumnStore", 10_000)
+
+            frame = store.get_frame()
+            pandas.testing.assert_frame_equal(frame, ColumnStore(10_000).get_frame())
+
+            column = store.get_column("column_3")
+            self.assertEqual(column.name, "column_3")
+            self.assertEqual(column.iloc[-1], 9999 * 4)
+
+            self.assertEqual(store.get_array().shape, (10_000, 4))
+            self.assertEqual(store.first_column[-1], 9999)
+            self.assertEqual(store.get_row_count(), 10_000)
+
+            # Proxies release segments as soon as they've attached to them
+            self.assertEqual(get_segment_names(), existing_segments)
+
+            # Values below the threshold are pickled as normal
+            small_store: ColumnStore = manager.create_object("ColumnStore", 10)
+            pandas.testing.assert_frame_equal(small_store.get_frame(), ColumnStore(10).get_frame())
+
+        self.assertEqual(frame["column_0"].sum(), sum(range(10_000)))
+        self.assertEqual(get_segment_names(), existing_segments)
+
+    def test_benchmark(self):
+        row_count = BENCHMARK_BYTES // (8 * BENCHMARK_COLUMN_COUNT)
+
+        with SharedMemoryThreshold(0), context.DMODObjectManager() as manager:
+            store: ColumnStore = manager.create_object("ColumnStore", row_count, BENCHMARK_COLUMN_COUNT)
+            pickle_start = time.perf_counter()
+            pickled_frame = store.get_frame(numeric_only=True)
+            pickle_seconds = time.perf_counter() - pickle_start
+
+        self.assertEqual(len(pickled_frame), row_count)
+        del pickled_frame
+
+        with SharedMemoryThreshold(shared_memory.DEFAULT_SHARED_MEMORY_THRESHOLD), context.DMODObjectManager() as manager:
+            store: ColumnStore = manager.create_object("ColumnStore", row_count, BENCHMARK_COLUMN_COUNT)
+            shared_start = time.perf_counter()
+            shared_frame = store.get_frame(numeric_only=True)
+            shared_seconds = time.perf_counter() - shared_start
+
+        self.assertEqual(len(shared_frame), row_count)
+        self.assertLess(shared_seconds * 2, pickle_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
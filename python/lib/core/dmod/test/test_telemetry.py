@@ -0,0 +1,163 @@
+import asyncio
+import timeit
+import unittest
+import urllib.request
+
+from unittest.mock import MagicMock
+
+from ..core import telemetry
+from ..core.telemetry import CONTENT_TYPE, MetricsRegistry, PrometheusASGIApp
+
+try:
+    import opentelemetry
+except ImportError:
+    opentelemetry = None
+
+
+class TestTelemetry(unittest.TestCase):
+
+    CALL_BUDGET_SECONDS = 1e-6
+    """ The budget for the overhead of updating an instrumented metric. """
+
+    SPAN_BUDGET_SECONDS = 10e-6
+    """ The budget for the overhead of a span, which updates metrics and tracks context on both entry and exit. """
+
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def _per_call_seconds(self, func, number: int = 20_000) -> float:
+        """ Get the best per-call time of a function over a few runs, to be robust to a busy machine. """
+        return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+    def test_render_prometheus_0_a(self):
+        """ Test that counters and gauges are rendered, with escaped help text and label values. """
+        requests = self.registry.counter('requests_total', 'Handled requests\nby type', ('type', 'path'))
+        requests.labels('job', 'a"b\\c').inc()
+        requests.labels(type='job', path='a"b\\c').inc(2)
+        self.registry.gauge('queue_depth', 'Queued jobs').set(3)
+
+        self.assertEqual(self.registry.render_prometheus(),
+                         '# HELP queue_depth Queued jobs\n'
+                         '# TYPE queue_depth gauge\n'
+                         'queue_depth 3.0\n'
+                         '# HELP requests_total Handled requests\\nby type\n'
+                         '# TYPE requests_total counter\n'
+                         'requests_total{type="job",path="a\\"b\\\\c"} 3.0\n')
+
+    def test_render_prometheus_0_b(self):
+        """ Test that histograms are rendered with cumulative buckets, sum and count. """
+        histogram = self.registry.histogram('latency_seconds', 'Latency', ('op',), buckets=(0.1, 1.0))
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.labels(op='save').observe(value)
+
+        self.assertEqual(self.registry.render_prometheus().splitlines()[2:],
+                         ['latency_seconds_bucket{op="save",le="0.1"} 2',
+                          'latency_seconds_bucket{op="save",le="1.0"} 3',
+                          'latency_seconds_bucket{op="save",le="+Inf"} 4',
+                          'latency_seconds_sum{op="save"} 2.65',
+                          'latency_seconds_count{op="save"} 4'])
+
+    def test_registry_0_a(self):
+        """ Test that metrics are shared by name, and that conflicting or invalid definitions are rejected. """
+        self.assertIs(self.registry.counter('a_total', label_names=('x',)), self.registry.counter('a_total', '', ['x']))
+        self.assertRaises(ValueError, self.registry.gauge, 'a_total', label_names=('x',))
+        self.assertRaises(ValueError, self.registry.counter, 'a_total', label_names=('y',))
+        self.assertRaises(ValueError, self.registry.counter, 'not-valid')
+        self.assertRaises(ValueError, self.registry.histogram, 'b_seconds', label_names=('le',))
+        self.assertRaises(ValueError, self.registry.counter('a_total', label_names=('x',)).labels, 'one', 'two')
+        self.assertRaises(ValueError, self.registry.counter('c_total').inc, -1)
+
+    def test_span_0_a(self):
+        """ Test that spans track their parents and record durations and errors. """
+        with telemetry.span('outer', registry=self.registry) as outer:
+            with telemetry.span('inner', registry=self.registry, job_id='1') as inner:
+                self.assertIs(telemetry.current_span(), inner)
+        with self.assertRaises(KeyError):
+            with telemetry.span('inner', registry=self.registry):
+                raise KeyError()
+
+        self.assertIsNone(telemetry.current_span())
+        self.assertIs(inner.parent, outer)
+        self.assertLessEqual(inner.duration, outer.duration)
+        self.assertEqual(telemetry.recent_spans()[-3:-1], [inner, outer])
+        durations = self.registry.get(telemetry.SPAN_DURATION_METRIC)
+        self.assertEqual(durations.labels(span='inner').count, 2)
+        self.assertEqual(durations.labels(span='outer').count, 1)
+        self.assertEqual(self.registry.get(telemetry.SPAN_ERRORS_METRIC).labels(span='inner').value, 1)
+
+    def test_overhead_0_a(self):
+        """ Test that updating instrumented metrics stays within the per-call budget. """
+        requests = self.registry.counter('requests_total', label_names=('type',)).labels('job')
+        latency = self.registry.histogram('latency_seconds', label_names=('op',)).labels('save')
+        depth = self.registry.gauge('depth')
+
+        for name, func in [('counter', requests.inc), ('histogram', lambda: latency.observe(0.003)),
+                           ('gauge', depth.inc)]:
+            with self.subTest(metric=name):
+                self.assertLess(self._per_call_seconds(func), self.CALL_BUDGET_SECONDS)
+
+    def test_overhead_0_b(self):
+        """ Test that spans stay within their per-call budget. """
+        def run_span():
+            with telemetry.span('noop', registry=self.registry):
+                pass
+
+        self.assertLess(self._per_call_seconds(run_span), self.SPAN_BUDGET_SECONDS)
+
+    def test_start_http_server_0_a(self):
+        """ Test scraping metrics from an in-process server. """
+        self.registry.counter('requests_total', 'Handled requests').inc(5)
+        with telemetry.span('scraped', registry=self.registry):
+            pass
+        server = telemetry.start_http_server(0, host='127.0.0.1', registry=self.registry)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+            body = response.read().decode()
+        self.assertIn('requests_total 5.0\n', body)
+        self.assertIn('dmod_span_duration_seconds_count{span="scraped"} 1\n', body)
+        self.assertEqual(body, self.registry.render_prometheus())
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+        self.assertEqual(context.exception.code, 404)
+
+    def test_asgi_app_0_a(self):
+        """ Test that the ASGI application serves the registry's metrics. """
+        self.registry.gauge('queue_depth').set(2)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(PrometheusASGIApp(self.registry)({'type': 'http', 'path': '/metrics'}, None, send))
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', CONTENT_TYPE.encode()), sent[0]['headers'])
+        self.assertEqual(sent[1]['body'].decode(), self.registry.render_prometheus())
+
+    @unittest.skipIf(opentelemetry is None, "opentelemetry-api is not installed")
+    def test_enable_opentelemetry_0_a(self):
+        """ Test that registry metrics are reported through OpenTelemetry observable instruments. """
+        meter_provider = MagicMock()
+        meter = meter_provider.get_meter.return_value
+        self.registry.counter('requests_total', label_names=('type',)).labels('job').inc(2)
+
+        self.assertTrue(telemetry.enable_opentelemetry(meter_provider=meter_provider, registry=self.registry))
+        self.addCleanup(telemetry.disable_opentelemetry, self.registry)
+        self.registry.histogram('latency_seconds').observe(0.5)
+        with telemetry.span('bridged', registry=self.registry):
+            pass
+
+        counters = {c.args[0]: c.kwargs['callbacks'][0] for c in meter.create_observable_counter.call_args_list}
+        self.assertEqual(set(counters), {'requests_total', 'latency_seconds_sum', 'latency_seconds_count',
+                                         'dmod_span_duration_seconds_sum', 'dmod_span_duration_seconds_count'})
+        observation = counters['requests_total'](None)[0]
+        self.assertEqual((observation.value, dict(observation.attributes)), (2.0, {'type': 'job'}))
+        self.assertEqual(counters['latency_seconds_sum'](None)[0].value, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,274 @@
+"""
+Provides an in-memory index used to search through specification templates without scanning every one of them
+"""
+from __future__ import annotations
+
+import dataclasses
+import math
+import re
+import typing
+
+from array import array
+
+from .base import TemplateDetails
+
+SEARCH_FIELDS: typing.Sequence[typing.Tuple[str, float]] = (
+    ("name", 4.0),
+    ("author_name", 2.0),
+    ("specification_type", 1.5),
+    ("description", 1.0),
+)
+"""The fields of a template that are searched, along with how much a match in each counts towards its rank"""
+
+_FIELD_SEPARATOR = "\x1f"
+_WORD_PATTERN = re.compile(r"\w+")
+
+_EXACT_MATCH_BONUS = 3.0
+_PREFIX_MATCH_BONUS = 2.0
+_SUBSTRING_MATCH_BONUS = 1.0
+
+
+def tokenize(text: typing.Optional[str]) -> typing.List[str]:
+    """
+    Split text into lowercase words
+
+    Args:
+        text: The text to split
+
+    Returns:
+        Each word within the text
+    """
+    return _WORD_PATTERN.findall(text.lower()) if text else []
+
+
+def trigrams(text: str) -> typing.Set[str]:
+    """
+    Args:
+        text: The text to break apart
+
+    Returns:
+        Every three character sequence in the text
+    """
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+@dataclasses.dataclass(frozen=True)
+class RankedTemplate:
+    """
+    A template found through a search along with how well it matched
+    """
+    template: TemplateDetails
+    """The template that was found"""
+
+    score: float
+    """How well the template matched the search; higher is better"""
+
+
+class TemplateSearchIndex:
+    """
+    A trigram index over the name, description, author, and specification type of templates
+
+    Substring searches only have to check the templates that contain the rarest trigram of what is being searched for
+    rather than every template. Words of fewer than three characters are matched as the start of words.
+    """
+    def __init__(self, templates: typing.Iterable[TemplateDetails] = None):
+        self.__templates: typing.List[TemplateDetails] = list()
+        self.__fields: typing.List[typing.Tuple[str, ...]] = list()
+        self.__words: typing.List[typing.Tuple[str, ...]] = list()
+        self.__trigrams: typing.Dict[str, array] = dict()
+        self.__word_prefixes: typing.Dict[str, array] = dict()
+
+        if templates:
+            self.extend(templates)
+
+    def add(self, template: TemplateDetails) -> TemplateSearchIndex:
+        """
+        Add a template to the index
+
+        Args:
+            template: The template to add
+
+        Returns:
+            The updated index
+        """
+        position = len(self.__templates)
+        fields = tuple((getattr(template, field_name, None) or "").lower() for field_name, _ in SEARCH_FIELDS)
+        words = tuple(f" {' '.join(tokenize(field))}" for field in fields)
+
+        self.__templates.append(template)
+        self.__fields.append(fields)
+        self.__words.append(words)
+
+        for trigram in trigrams(_FIELD_SEPARATOR.join(fields)):
+            self.__trigrams.setdefault(trigram, array("I")).append(position)
+
+        short_prefixes = {word[:length] for field in fields for word in tokenize(field) for length in (1, 2)}
+        for prefix in short_prefixes:
+            self.__word_prefixes.setdefault(prefix, array("I")).append(position)
+
+        return self
+
+    def extend(self, templates: typing.Iterable[TemplateDetails]) -> TemplateSearchIndex:
+        """
+        Add several templates to the index
+
+        Args:
+            templates: The templates to add
+
+        Returns:
+            The updated index
+        """
+        for template in templates:
+            self.add(template)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.__templates)
+
+    def __candidates(self, term: str) -> typing.Sequence[int]:
+        if len(term) < 3:
+            return self.__word_prefixes.get(term, ())
+
+        postings: typing.List[array] = list()
+        for trigram in trigrams(term):
+            posting = self.__trigrams.get(trigram)
+            if posting is None:
+                return ()
+            postings.append(posting)
+
+        return min(postings, key=len)
+
+    def __field_index(self, field_name: str) -> int:
+        for index, (name, _) in enumerate(SEARCH_FIELDS):
+            if name == field_name:
+                return index
+        raise KeyError(f"'{field_name}' is not a searchable template field")
+
+    def __term_score(self, position: int, term: str) -> float:
+        score = 0.0
+
+        for (_, weight), field, words in zip(SEARCH_FIELDS, self.__fields[position], self.__words[position]):
+            if not field:
+                continue
+            elif field == term:
+                score += weight * _EXACT_MATCH_BONUS
+            elif f" {term}" in words:
+                score += weight * _PREFIX_MATCH_BONUS
+            elif term in field:
+                score += weight * _SUBSTRING_MATCH_BONUS
+
+        return score
+
+    def __matches_filters(self, position: int, specification_type: typing.Optional[str], author: typing.Optional[str]):
+        fields = self.__fields[position]
+
+        if specification_type and fields[self.__field_index("specification_type")] != specification_type:
+            return False
+
+        if author and author not in fields[self.__field_index("author_name")]:
+            return False
+
+        return True
+
+    def contains(
+        self,
+        field_name: str,
+        text: str,
+        specification_type: str = None,
+        author: str = None
+    ) -> typing.Sequence[TemplateDetails]:
+        """
+        Find templates whose value for a field contains the given text, ignoring case
+
+        Args:
+            field_name: The name of the field to check, such as 'name' or 'description'
+            text: The text to look for
+            specification_type: Only include templates of this specification type
+            author: Only include templates whose author contains this text
+
+        Returns:
+            Every matching template, in the order they were added
+        """
+        field_index = self.__field_index(field_name)
+        text = text.lower()
+        specification_type = specification_type.lower() if specification_type else None
+        author = author.lower() if author else None
+
+        candidates = self.__candidates(text) if len(text) >= 3 else range(len(self.__templates))
+
+        return [
+            self.__templates[position]
+            for position in candidates
+            if text in self.__fields[position][field_index]
+               and self.__matches_filters(position, specification_type, author)
+        ]
+
+    def find(
+        self,
+        query: str = None,
+        specification_type: str = None,
+        author: str = None,
+        limit: int = None,
+        offset: int = None
+    ) -> typing.Sequence[RankedTemplate]:
+        """
+        Find the templates that best match a free text query
+
+        Every word in the query has to match the start of a word (or, for longer words, any part) of one of the
+        searched fields of a template for it to be returned. Matches on names count for more than matches on
+        authors, specification types, and descriptions, and words that few templates contain count for more than
+        common ones.
+
+        Args:
+            query: The text to search for; every template passing the filters is returned, by name, if not given
+            specification_type: Only include templates of this specification type
+            author: Only include templates whose author contains this text
+            limit: The largest number of results to return
+            offset: The number of results to skip, for paging
+
+        Returns:
+            The matching templates, best matches first
+        """
+        specification_type = specification_type.lower() if specification_type else None
+        author = author.lower() if author else None
+        terms = list(dict.fromkeys(tokenize(query)))
+
+        scores: typing.Optional[typing.Dict[int, float]] = None
+
+        for term in terms:
+            candidates = self.__candidates(term)
+            weight = math.log(1 + len(self.__templates) / (1 + len(candidates)))
+            term_scores: typing.Dict[int, float] = dict()
+
+            for position in candidates:
+                if scores is not None and position not in scores:
+                    continue
+
+                score = self.__term_score(position, term)
+                if score:
+                    term_scores[position] = score * weight + (scores[position] if scores is not None else 0.0)
+
+            scores = term_scores
+
+            if not scores:
+                return []
+
+        if scores is None:
+            scores = {position: 0.0 for position in range(len(self.__templates))}
+
+        ranked = sorted(
+            (
+                (score, position)
+                for position, score in scores.items()
+                if self.__matches_filters(position, specification_type, author)
+            ),
+            key=lambda entry: (-entry[0], self.__fields[entry[1]][0])
+        )
+
+        start = offset or 0
+        end = start + limit if limit is not None else None
+
+        return [
+            RankedTemplate(template=self.__templates[position], score=score)
+            for score, position in ranked[start:end]
+        ]
@@ -33,6 +33,9 @@ from ._all import TemplateDetails
 from ._all import TemplateManagerProtocol
 from .base import GetSpecificationTypeProtocol
 from .base import SUPPORTS_SPECIFICATION_TYPE
+from .search import RankedTemplate
+from .search import TemplateSearchIndex
+from .search import tokenize
 
 from .templates import FileTemplateManifest
 
@@ -548,6 +551,15 @@ class TemplateManager(abc.ABC, TemplateManagerProtocol):
         """
         pass
 
+    def get_search_index(self) -> typing.Optional[TemplateSearchIndex]:
+        """
+        Get an index kept up to date with the templates in this manager, if the manager maintains one
+
+        Returns:
+            The index that searches should use, or None if templates have to be searched one by one
+        """
+        return None
+
     def search(
         self,
         specification_type: typing.Optional[str],
@@ -565,7 +577,22 @@ class TemplateManager(abc.ABC, TemplateManagerProtocol):
         Returns:
             A mapping from specification types to a listing of all templates that passed the filter
         """
-        if specification_type and name:
+        if isinstance(specification_type, GetSpecificationTypeProtocol):
+            specification_type = specification_type.get_specification_type()
+
+        search_index = self.get_search_index() if name or kwargs.get("author") else None
+
+        if search_index is not None:
+            found_templates = defaultdict(list)
+            matching_templates = search_index.contains(
+                "name",
+                name or "",
+                specification_type=specification_type,
+                author=kwargs.get("author")
+            )
+            for template in matching_templates:
+                found_templates[template.specification_type].append(template)
+        elif specification_type and name:
             name = name.lower()
             found_templates = [
                 template
@@ -590,6 +617,46 @@ class TemplateManager(abc.ABC, TemplateManagerProtocol):
 
         return found_templates
 
+    def find_templates(
+        self,
+        query: str = None,
+        specification_type: SUPPORTS_SPECIFICATION_TYPE = None,
+        author: str = None,
+        limit: int = None,
+        offset: int = None
+    ) -> typing.Sequence[RankedTemplate]:
+        """
+        Find the templates that best match a free text query across names, descriptions, authors, and specification
+        types
+
+        Each word of the query matches the start of a word within a template. Results are ranked so that the
+        closest matches come first.
+
+        Args:
+            query: The text to search for; every template passing the filters is returned, by name, if not given
+            specification_type: Only include templates of this specification type
+            author: Only include templates whose author contains this text
+            limit: The largest number of results to return
+            offset: The number of results to skip, for paging
+
+        Returns:
+            The matching templates, best matches first
+        """
+        if isinstance(specification_type, GetSpecificationTypeProtocol):
+            specification_type = specification_type.get_specification_type()
+
+        search_index = self.get_search_index()
+
+        if search_index is None:
+            search_index = TemplateSearchIndex(flat(self.get_all_templates()))
+
+        return search_index.find(
+            query=query,
+            specification_type=specification_type,
+            author=author,
+            limit=limit,
+            offset=offset
+        )
 
     def get_all_templates(self) -> typing.Mapping[str, typing.Sequence[TemplateDetails]]:
         """
@@ -813,6 +880,8 @@ class InMemoryTemplateManager(TemplateManager):
         else:
             self.__templates = {}
 
+        self.__search_index: typing.Optional[TemplateSearchIndex] = None
+
     def add_template(
         self,
         specification_type: SUPPORTS_SPECIFICATION_TYPE,
@@ -835,8 +904,17 @@ class InMemoryTemplateManager(TemplateManager):
             self.__templates[specification_type] = []
 
         self.__templates[specification_type].append(template)
+
+        if self.__search_index is not None:
+            self.__search_index.add(template)
+
         return self
 
+    def get_search_index(self) -> TemplateSearchIndex:
+        if self.__search_index is None:
+            self.__search_index = TemplateSearchIndex(flat(self.__templates))
+        return self.__search_index
+
     def get_all_templates(self) -> typing.Mapping[str, typing.Sequence[TemplateDetails]]:
         return self.__templates
 
@@ -915,6 +993,9 @@ class FileTemplateManager(TemplateManager):
         self.manifest.set_root_directory(path.parent)
         self.manifest.ensure_validity()
 
+        self.__details: typing.Dict[str, typing.Sequence[TemplateDetails]] = dict()
+        self.__search_index: typing.Optional[TemplateSearchIndex] = None
+
     def get_templates(self, specification_type: SUPPORTS_SPECIFICATION_TYPE) -> typing.Sequence[TemplateDetails]:
         if isinstance(specification_type, GetSpecificationTypeProtocol):
             specification_type = specification_type.get_specification_type()
@@ -922,10 +1003,16 @@ class FileTemplateManager(TemplateManager):
         if specification_type not in self.manifest:
             return []
 
-        return [
-            details
-            for details in self.manifest[specification_type].as_details()
-        ]
+        # The manifest doesn't change once loaded, so its details only need to be built once
+        if specification_type not in self.__details:
+            self.__details[specification_type] = self.manifest[specification_type].as_details()
+
+        return list(self.__details[specification_type])
+
+    def get_search_index(self) -> TemplateSearchIndex:
+        if self.__search_index is None:
+            self.__search_index = TemplateSearchIndex(flat(self.get_all_templates()))
+        return self.__search_index
 
     def export_to_file(self, directory: typing.Union[str, pathlib.Path]) -> pathlib.Path:
         return self.manifest.save(directory=directory)
@@ -1074,6 +1161,181 @@ class DatabaseTemplateManager(TemplateManager):
 
         return None
 
+    @property
+    def search_table_name(self) -> str:
+        """
+        The name of the full text search table that indexes the template table
+        """
+        return f"{self.table_name}_search"
+
+    def __get_search_columns(self) -> typing.Sequence[typing.Tuple[str, float]]:
+        """
+        Get the columns of the template table that should be searchable along with how much each should count towards
+        a match's rank
+        """
+        table_columns = {
+            row['name']
+            for row in query_database(self.connection, f'PRAGMA table_info("{self.table_name}")')
+        }
+        candidate_columns = [
+            (self.__name_column, 4.0),
+            (self.__description_column, 1.0),
+            ("author_name", 2.0),
+            (self.__specification_type_column, 1.5),
+        ]
+        return [(column, weight) for column, weight in candidate_columns if column in table_columns]
+
+    def build_search_index(self) -> bool:
+        """
+        Create (or recreate) an SQLite FTS5 index over the template table, along with the triggers that keep it up to
+        date as templates are added, changed, and removed
+
+        Returns:
+            Whether the index could be built; FTS5 is not available in every database
+        """
+        columns = self.__get_search_columns()
+        column_names = [column for column, _ in columns]
+        search_table = self.search_table_name
+
+        listed_columns = ", ".join(f'"{column}"' for column in column_names)
+        new_values = ", ".join(f'new."{column}"' for column in column_names)
+        old_values = ", ".join(f'old."{column}"' for column in column_names)
+
+        commands = [
+            f'DROP TABLE IF EXISTS "{search_table}"',
+            f'CREATE VIRTUAL TABLE "{search_table}" USING fts5('
+            f'{listed_columns}, content="{self.table_name}", content_rowid="rowid", '
+            f'tokenize="unicode61 remove_diacritics 2")',
+            f'CREATE TRIGGER IF NOT EXISTS "{search_table}_insert" AFTER INSERT ON "{self.table_name}" BEGIN '
+            f'INSERT INTO "{search_table}"(rowid, {listed_columns}) VALUES (new.rowid, {new_values}); END',
+            f'CREATE TRIGGER IF NOT EXISTS "{search_table}_delete" AFTER DELETE ON "{self.table_name}" BEGIN '
+            f'INSERT INTO "{search_table}"("{search_table}", rowid, {listed_columns}) '
+            f"VALUES ('delete', old.rowid, {old_values}); END",
+            f'CREATE TRIGGER IF NOT EXISTS "{search_table}_update" AFTER UPDATE ON "{self.table_name}" BEGIN '
+            f'INSERT INTO "{search_table}"("{search_table}", rowid, {listed_columns}) '
+            f"VALUES ('delete', old.rowid, {old_values}); "
+            f'INSERT INTO "{search_table}"(rowid, {listed_columns}) VALUES (new.rowid, {new_values}); END',
+            f'INSERT INTO "{search_table}"("{search_table}") VALUES (\'rebuild\')',
+        ]
+
+        cursor: typing.Optional[DBAPICursor] = None
+
+        try:
+            cursor = self.connection.cursor()
+            for command in commands:
+                cursor.execute(command)
+            self.connection.commit()
+        except BaseException as exception:
+            logging.warning(f"A full text search index could not be built for '{self.table_name}': {exception}")
+            return False
+        finally:
+            if cursor:
+                cursor.close()
+
+        self.__search_weights = [weight for _, weight in columns]
+        return True
+
+    def __ensure_search_index(self) -> bool:
+        """
+        Make sure that the full text search index exists and is being maintained
+
+        Replacing the template table drops its triggers, so the index is rebuilt whenever they are missing
+
+        Returns:
+            Whether the full text search index may be used
+        """
+        try:
+            triggers = query_database(
+                self.connection,
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?",
+                (self.table_name,)
+            )
+        except BaseException as exception:
+            logging.warning(f"Could not check for a full text search index for '{self.table_name}': {exception}")
+            return False
+
+        expected_triggers = {
+            f"{self.search_table_name}_{operation}" for operation in ("insert", "delete", "update")
+        }
+
+        if self.__search_weights and expected_triggers.issubset({trigger['name'] for trigger in triggers}):
+            return True
+
+        return self.build_search_index()
+
+    def find_templates(
+        self,
+        query: str = None,
+        specification_type: SUPPORTS_SPECIFICATION_TYPE = None,
+        author: str = None,
+        limit: int = None,
+        offset: int = None
+    ) -> typing.Sequence[RankedTemplate]:
+        if isinstance(specification_type, GetSpecificationTypeProtocol):
+            specification_type = specification_type.get_specification_type()
+
+        terms = tokenize(query)
+
+        if terms and not self.__ensure_search_index():
+            return super().find_templates(
+                query=query,
+                specification_type=specification_type,
+                author=author,
+                limit=limit,
+                offset=offset
+            )
+
+        conditions: typing.List[str] = list()
+        arguments: typing.List[typing.Any] = list()
+
+        if terms:
+            # Quote each word so that punctuation can't be read as query syntax and allow it to match as a prefix
+            weights = ", ".join(str(weight) for weight in self.__search_weights)
+            command = f'SELECT template.*, bm25("{self.search_table_name}", {weights}) AS search_rank ' \
+                      f'FROM "{self.search_table_name}" ' \
+                      f'INNER JOIN "{self.table_name}" AS template ' \
+                      f'ON template.rowid = "{self.search_table_name}".rowid'
+            conditions.append(f'"{self.search_table_name}" MATCH ?')
+            arguments.append(" ".join(f'"{term}"*' for term in terms))
+            ordering = f"search_rank, template.{self.__name_column}"
+        else:
+            command = f'SELECT template.*, 0 AS search_rank FROM "{self.table_name}" AS template'
+            ordering = f"template.{self.__name_column}"
+
+        if specification_type:
+            conditions.append(f"template.{self.__specification_type_column} = ?")
+            arguments.append(specification_type)
+
+        if author:
+            conditions.append("LOWER(template.author_name) LIKE ?")
+            arguments.append(f"%{author.lower()}%")
+
+        if conditions:
+            command += " WHERE " + " AND ".join(conditions)
+
+        command += f" ORDER BY {ordering}"
+
+        if limit is not None or offset:
+            command += " LIMIT ? OFFSET ?"
+            arguments.extend([limit if limit is not None else -1, offset or 0])
+
+        ranked_templates: typing.List[RankedTemplate] = list()
+
+        for record in query_database(self.connection, command, arguments):
+            search_rank = record.pop("search_rank")
+            template = BasicTemplateDetails.from_record(
+                record=record,
+                name_field=self.__name_column,
+                specification_type_field=self.__specification_type_column,
+                description_field=self.__description_column,
+                configuration_field=self.__configuration_column,
+                author_name_field="author_name"
+            )
+            # bm25 gives better matches lower values, so flip it so that higher scores are better
+            ranked_templates.append(RankedTemplate(template=template, score=-search_rank))
+
+        return ranked_templates
+
     def get_all_templates(self) -> typing.Mapping[str, typing.Sequence[TemplateDetails]]:
         command = f'SELECT * FROM "{self.table_name}"'
         raw_templates = query_database(self.connection, command)
@@ -1140,3 +1402,4 @@ class DatabaseTemplateManager(TemplateManager):
         self.__configuration_column = configuration_column if configuration_column else 'configuration'
 
         self.__loaded_entries: typing.MutableMapping[str, typing.List[TemplateDetails]] = defaultdict(list)
+        self.__search_weights: typing.Optional[typing.Sequence[float]] = None
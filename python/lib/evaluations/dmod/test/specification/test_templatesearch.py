@@ -0,0 +1,163 @@
+import sqlite3
+import time
+import typing
+import unittest
+
+from ...evaluations import specification
+from ...evaluations.specification.search import TemplateSearchIndex
+
+SPECIFICATION_TYPES = ["ThresholdSpecification", "LocationSpecification", "SchemeSpecification"]
+ADJECTIVES = ["daily", "hourly", "peak", "minimum", "maximum", "seasonal", "observed", "modeled"]
+SUBJECTS = ["streamflow", "stage", "precipitation", "temperature", "snowpack", "reservoir"]
+AUTHORS = ["alice", "bob", "carmen", "dmitri"]
+
+BENCHMARK_TEMPLATE_COUNT = 100_000
+
+
+def create_templates(count: int) -> typing.Dict[str, typing.List[specification.TemplateDetails]]:
+    templates: typing.Dict[str, typing.List[specification.TemplateDetails]] = {
+        specification_type: list() for specification_type in SPECIFICATION_TYPES
+    }
+
+    for index in range(count):
+        specification_type = SPECIFICATION_TYPES[index % len(SPECIFICATION_TYPES)]
+        adjective = ADJECTIVES[index % len(ADJECTIVES)]
+        subject = SUBJECTS[(index // len(ADJECTIVES)) % len(SUBJECTS)]
+        templates[specification_type].append(
+            specification.BasicTemplateDetails(
+                name=f"{adjective.title()} {subject.title()} {index}",
+                specification_type=specification_type,
+                configuration={"index": index},
+                description=f"Compares {adjective} {subject} for site {index % 997}",
+                author_name=AUTHORS[index % len(AUTHORS)]
+            )
+        )
+
+    return templates
+
+
+def linear_name_search(
+    templates: typing.Mapping[str, typing.Sequence[specification.TemplateDetails]],
+    name: str
+) -> typing.List[specification.TemplateDetails]:
+    name = name.lower()
+    return [
+        template
+        for templates_for_type in templates.values()
+        for template in templates_for_type
+        if name in template.name.lower()
+    ]
+
+
+class TestTemplateSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.templates = create_templates(240)
+        self.manager = specification.InMemoryTemplateManager(templates=self.templates)
+
+    def test_search_matches_linear_scan(self):
+        for name in ["streamflow 1", "PEAK", "ly st", "7", "nothing like this"]:
+            found = [template.name for templates in self.manager.search(None, name).values() for template in templates]
+            expected = [template.name for template in linear_name_search(self.templates, name)]
+            self.assertEqual(sorted(found), sorted(expected), f"Searching for '{name}' gave the wrong templates")
+
+        by_type = self.manager.search("LocationSpecification", "stage")
+        self.assertEqual(list(by_type), ["LocationSpecification"])
+        self.assertTrue(all("stage" in template.name.lower() for template in by_type["LocationSpecification"]))
+
+        by_author = self.manager.search(None, "snowpack", author="CARM")
+        self.assertTrue(by_author)
+        self.assertTrue(
+            all(template.author_name == "carmen" for templates in by_author.values() for template in templates)
+        )
+
+    def test_find_templates(self):
+        results = self.manager.find_templates("seas snow")
+        self.assertTrue(results)
+        for result in results:
+            self.assertIn("seasonal snowpack", result.template.name.lower())
+
+        scores = [result.score for result in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        # Matches within names should outrank matches within descriptions
+        index = TemplateSearchIndex([
+            specification.BasicTemplateDetails("Unrelated", "ValueSelector", {"a": 1}, description="flow"),
+            specification.BasicTemplateDetails("Flow Selector", "ValueSelector", {"a": 1}),
+        ])
+        self.assertEqual([result.template.name for result in index.find("flow")], ["Flow Selector", "Unrelated"])
+
+        filtered = self.manager.find_templates("daily", specification_type="SchemeSpecification", author="alice")
+        self.assertTrue(filtered)
+        for result in filtered:
+            self.assertEqual(result.template.specification_type, "SchemeSpecification")
+            self.assertEqual(result.template.author_name, "alice")
+
+        everything = self.manager.find_templates("streamflow")
+        pages = [self.manager.find_templates("streamflow", limit=7, offset=offset) for offset in range(0, 100, 7)]
+        paged = [result.template.name for page in pages for result in page]
+        self.assertEqual(paged, [result.template.name for result in everything])
+
+        self.assertEqual(self.manager.find_templates("zzz"), [])
+
+    def test_index_follows_added_templates(self):
+        self.assertEqual(self.manager.find_templates("glacier"), [])
+        self.manager.add_template(
+            "ThresholdSpecification",
+            specification.BasicTemplateDetails("Glacier Melt", "ThresholdSpecification", {"a": 1})
+        )
+        self.assertEqual([result.template.name for result in self.manager.find_templates("glac")], ["Glacier Melt"])
+
+    def test_database_full_text_search(self):
+        connection = sqlite3.connect(":memory:")
+        self.manager.export_to_database(table_name="template", connection=connection)
+        database_manager = specification.DatabaseTemplateManager(table_name="template", connection=connection)
+
+        results = database_manager.find_templates("seas snow")
+        expected = self.manager.find_templates("seas snow")
+        self.assertEqual(
+            sorted(result.template.name for result in results),
+            sorted(result.template.name for result in expected)
+        )
+
+        page = database_manager.find_templates("streamflow", specification_type="ThresholdSpecification", limit=3)
+        self.assertEqual(len(page), 3)
+        self.assertTrue(all(result.template.specification_type == "ThresholdSpecification" for result in page))
+
+        by_author = database_manager.find_templates("stage", author="ali")
+        self.assertTrue(by_author)
+        self.assertTrue(all(result.template.author_name == "alice" for result in by_author))
+
+        # The index should follow along with templates that are written after it was built
+        specification.InMemoryTemplateManager({
+            "ValueSelector": [specification.BasicTemplateDetails("Glacier Melt", "ValueSelector", {"a": 1})]
+        }).export_to_database(table_name="template", connection=connection)
+        self.assertEqual([result.template.name for result in database_manager.find_templates("glac")], ["Glacier Melt"])
+
+        connection.close()
+
+    def test_search_latency(self):
+        templates = create_templates(BENCHMARK_TEMPLATE_COUNT)
+        manager = specification.InMemoryTemplateManager(templates=templates)
+        manager.get_search_index()
+
+        queries = ["Streamflow 4242", "Snowpack 9999", "Minimum Stage 1234", "reservoir 77"]
+
+        scan_start = time.perf_counter()
+        expected = [linear_name_search(templates, query) for query in queries]
+        scan_seconds = time.perf_counter() - scan_start
+
+        index_start = time.perf_counter()
+        found = [manager.search(None, query) for query in queries]
+        index_seconds = time.perf_counter() - index_start
+
+        for expected_templates, found_templates in zip(expected, found):
+            self.assertEqual(
+                sorted(template.name for template in expected_templates),
+                sorted(template.name for templates_for_type in found_templates.values() for template in templates_for_type)
+            )
+
+        self.assertLess(index_seconds * 5, scan_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,21 @@
 import sqlite3
-from typing import Any, Dict, List, Optional, Iterator
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Iterator, Tuple
 from contextlib import contextmanager
 from dataclasses import dataclass
 
+ID_BATCH_SIZE = 50_000
+"""number of catchment id's loaded into the temporary lookup table at a time"""
+
+ROW_BATCH_SIZE = 10_000
+"""number of rows fetched from the database at a time when streaming records"""
+
+_LOOKUP_TABLE_PREFIX = "temp.dmod_linked_data_ids_"
+"""prefix of the names of temporary lookup tables, which each get a unique suffix"""
+
+Columns = Dict[str, List[Any]]
+"""mapping of column name to column values, in row order"""
+
 
 @dataclass
 class ColumnInfo:
@@ -16,6 +29,24 @@ class ColumnInfo:
     pk: bool
 
 
+@dataclass(frozen=True)
+class AttributeTableSchema:
+    """Cached description of a geopackage 'attributes' type table"""
+
+    name: str
+    columns: Tuple[ColumnInfo, ...]
+    id_indexed: bool
+    """whether the `id` column has an index; without one, lookups scan the table"""
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column.name for column in self.columns]
+
+    @property
+    def has_id(self) -> bool:
+        return any(column.name == "id" for column in self.columns)
+
+
 # walk the crosswalk to get the flow path id and query for the flow path attribute id's too
 
 
@@ -48,6 +79,40 @@ def table_info(table_name: str, conn: sqlite3.Connection) -> List[ColumnInfo]:
     return [ColumnInfo(*result) for result in results]
 
 
+def quote_identifier(name: str) -> str:
+    """quote a table or column name for use in a sqlite statement"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def is_column_indexed(table_name: str, column_name: str, conn: sqlite3.Connection) -> bool:
+    """whether `column_name` is the leading column of any index on `table_name`"""
+    with cursor_context(conn) as cursor:
+        indexes = cursor.execute(
+            f"PRAGMA index_list({quote_identifier(table_name)})"
+        ).fetchall()
+        for index in indexes:
+            # index 1 is the index `name` column
+            index_columns = cursor.execute(
+                f"PRAGMA index_info({quote_identifier(index[1])})"
+            ).fetchall()
+            # sorted by `seqno`, index 2 is the `name` column
+            if index_columns and sorted(index_columns)[0][2] == column_name:
+                return True
+    return False
+
+
+def attribute_table_schemas(conn: sqlite3.Connection) -> List[AttributeTableSchema]:
+    """describe every geopackage 'attributes' type table. Intended to be read once and reused."""
+    return [
+        AttributeTableSchema(
+            name=table_name,
+            columns=tuple(table_info(table_name, conn)),
+            id_indexed=is_column_indexed(table_name, "id", conn),
+        )
+        for table_name in attribute_table_names(conn)
+    ]
+
+
 def catchment_ids(conn: sqlite3.Connection) -> List[str]:
     """catchment id's in a given hydrofabric topology. guarantees uniqueness."""
     with cursor_context(conn) as cursor:
@@ -56,20 +121,27 @@ def catchment_ids(conn: sqlite3.Connection) -> List[str]:
 
 
 def hydrofabric_linked_data(
-    catchment_id: str, connection: sqlite3.Connection
+    catchment_id: str,
+    connection: sqlite3.Connection,
+    schemas: Optional[List[AttributeTableSchema]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     """Return all associated _linked_ (not topological) hydrofabric data for a given catchment_id
     (e.g. `cat-1`) and a nested mapping of table name to table columns to table value(s).
+
+    Pass `schemas` (see `attribute_table_schemas`) to avoid re-reading table schemas on every call.
     """
-    attr_table_names = attribute_table_names(connection)
+    if schemas is None:
+        schemas = attribute_table_schemas(connection)
 
     attr_table_records_map: Dict[str, Dict[str, Any]] = {}
-    for table_name in attr_table_names:
-        table_field_info = table_info(table_name, connection)
+    for schema in schemas:
+        table_name = schema.name
+        table_field_info = schema.columns
 
         with cursor_context(connection) as cursor:
             records = cursor.execute(
-                f"SELECT * FROM {table_name} WHERE id = ?", (catchment_id,)
+                f"SELECT * FROM {quote_identifier(table_name)} WHERE id = ?",
+                (catchment_id,),
             ).fetchall()
 
         if not records:
@@ -88,3 +160,124 @@ def hydrofabric_linked_data(
         attr_table_records_map[table_name] = table_records
 
     return attr_table_records_map
+
+
+def _append_rows(columns: Columns, column_names: List[str], rows: List[tuple]):
+    for name, values in zip(column_names, zip(*rows)):
+        columns[name].extend(values)
+
+
+@contextmanager
+def _catchment_id_lookup(
+    ids: Iterable[str], connection: sqlite3.Connection
+) -> Iterator[str]:
+    """Load `ids` into a temporary table so that attribute tables may be joined against it.
+
+    Temporary tables live outside of the geopackage, so this works on read only connections. Each call gets its own
+    uniquely named table, so lookups interleaved on the same connection (e.g. by nested or concurrent generators) don't
+    clobber each other.
+    """
+    lookup_table = f"{_LOOKUP_TABLE_PREFIX}{uuid.uuid4().hex}"
+    with cursor_context(connection) as cursor:
+        cursor.execute(
+            f"CREATE TABLE {lookup_table} (id TEXT PRIMARY KEY) WITHOUT ROWID"
+        )
+        try:
+            batch: List[Tuple[str]] = []
+            for catchment_id in ids:
+                batch.append((catchment_id,))
+                if len(batch) >= ID_BATCH_SIZE:
+                    cursor.executemany(
+                        f"INSERT OR IGNORE INTO {lookup_table} (id) VALUES (?)", batch
+                    )
+                    batch = []
+            if batch:
+                cursor.executemany(
+                    f"INSERT OR IGNORE INTO {lookup_table} (id) VALUES (?)", batch
+                )
+            yield lookup_table
+        finally:
+            cursor.execute(f"DROP TABLE IF EXISTS {lookup_table}")
+
+
+def iter_hydrofabric_linked_data_bulk(
+    catchment_ids: Iterable[str],
+    connection: sqlite3.Connection,
+    schemas: Optional[List[AttributeTableSchema]] = None,
+    batch_size: int = ROW_BATCH_SIZE,
+) -> Iterator[Tuple[str, Columns]]:
+    """Stream the _linked_ hydrofabric data of many catchments, one attribute table at a time.
+
+    Yields pairs of table name and a columnar mapping of column name to a list of the values of every matching
+    record. Tables without any matching records are skipped.
+
+    The requested id's are joined against each table in a single statement, so each table is read in one pass:
+    through its `id` index if it has one, otherwise by a single scan.
+    """
+    if schemas is None:
+        schemas = attribute_table_schemas(connection)
+
+    schemas = [schema for schema in schemas if schema.has_id]
+
+    with _catchment_id_lookup(catchment_ids, connection) as lookup_table:
+        for schema in schemas:
+            column_names = schema.column_names
+            columns: Columns = {name: [] for name in column_names}
+            selected_columns = ", ".join(
+                f"t.{quote_identifier(name)}" for name in column_names
+            )
+
+            with cursor_context(connection) as cursor:
+                cursor.execute(
+                    f"SELECT {selected_columns} FROM {quote_identifier(schema.name)} AS t "
+                    f"JOIN {lookup_table} AS ids ON t.id = ids.id"
+                )
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    _append_rows(columns, column_names, rows)
+
+            if columns[column_names[0]]:
+                yield schema.name, columns
+
+
+def hydrofabric_linked_data_bulk(
+    catchment_ids: Iterable[str],
+    connection: sqlite3.Connection,
+    schemas: Optional[List[AttributeTableSchema]] = None,
+) -> Dict[str, Columns]:
+    """Return the _linked_ hydrofabric data of many catchments as a nested mapping of table name to column name to
+    a list of the values of every matching record (see `iter_hydrofabric_linked_data_bulk`).
+    """
+    return dict(
+        iter_hydrofabric_linked_data_bulk(catchment_ids, connection, schemas=schemas)
+    )
+
+
+def iter_hydrofabric_linked_data(
+    connection: sqlite3.Connection,
+    schemas: Optional[List[AttributeTableSchema]] = None,
+    batch_size: int = ROW_BATCH_SIZE,
+) -> Iterator[Tuple[str, Columns]]:
+    """Stream every record of every attribute table as pairs of table name and a columnar mapping of at most
+    `batch_size` records.
+    """
+    if schemas is None:
+        schemas = attribute_table_schemas(connection)
+
+    for schema in schemas:
+        column_names = schema.column_names
+        selected_columns = ", ".join(quote_identifier(name) for name in column_names)
+
+        with cursor_context(connection) as cursor:
+            cursor.execute(
+                f"SELECT {selected_columns} FROM {quote_identifier(schema.name)}"
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns: Columns = {name: [] for name in column_names}
+                _append_rows(columns, column_names, rows)
+                yield schema.name, columns
@@ -1,14 +1,28 @@
 import sqlite3
-from dataclasses import dataclass
-from typing import Any, Dict, List, Protocol
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
 
-from .gpkg_utils import catchment_ids, hydrofabric_linked_data
+from .gpkg_utils import (
+    AttributeTableSchema,
+    Columns,
+    attribute_table_schemas,
+    catchment_ids,
+    hydrofabric_linked_data,
+    iter_hydrofabric_linked_data,
+    iter_hydrofabric_linked_data_bulk,
+)
 
 
 class LinkedDataProvider(Protocol):
     def get_data(self, catchment_id: str) -> Dict[str, Dict[str, Any]]:
         ...
 
+    def get_data_bulk(self, catchment_ids: Iterable[str]) -> Dict[str, Columns]:
+        ...
+
+    def iter_all(self) -> Iterator[Tuple[str, Columns]]:
+        ...
+
     def catchment_ids(self) -> List[str]:
         ...
 
@@ -16,9 +30,37 @@ class LinkedDataProvider(Protocol):
 @dataclass
 class GPKGLinkedDataProvider:
     connection: sqlite3.Connection
+    _schemas: Optional[List[AttributeTableSchema]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def schemas(self) -> List[AttributeTableSchema]:
+        """attribute table schemas, read from the geopackage once"""
+        if self._schemas is None:
+            self._schemas = attribute_table_schemas(self.connection)
+        return self._schemas
 
     def get_data(self, catchment_id: str) -> Dict[str, Dict[str, Any]]:
-        return hydrofabric_linked_data(catchment_id, self.connection)
+        return hydrofabric_linked_data(
+            catchment_id, self.connection, schemas=self.schemas
+        )
+
+    def iter_data_bulk(
+        self, catchment_ids: Iterable[str]
+    ) -> Iterator[Tuple[str, Columns]]:
+        """stream the linked data of many catchments as (table name, columns) pairs, one table at a time"""
+        return iter_hydrofabric_linked_data_bulk(
+            catchment_ids, self.connection, schemas=self.schemas
+        )
+
+    def get_data_bulk(self, catchment_ids: Iterable[str]) -> Dict[str, Columns]:
+        """linked data of many catchments as a mapping of table name to column name to column values"""
+        return dict(self.iter_data_bulk(catchment_ids))
+
+    def iter_all(self) -> Iterator[Tuple[str, Columns]]:
+        """stream every attribute record as (table name, columns) pairs in batches of rows"""
+        return iter_hydrofabric_linked_data(self.connection, schemas=self.schemas)
 
     def catchment_ids(self) -> List[str]:
         return catchment_ids(self.connection)
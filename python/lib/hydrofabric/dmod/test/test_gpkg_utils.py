@@ -1,7 +1,20 @@
+import sqlite3
+import tempfile
+import time
 import unittest
+from pathlib import Path
+
 from . import hydrofabric_fixture
 
-from ..hydrofabric.gpkg_utils import table_info, attribute_table_names
+from ..hydrofabric.gpkg_utils import (
+    attribute_table_names,
+    attribute_table_schemas,
+    hydrofabric_linked_data,
+    hydrofabric_linked_data_bulk,
+    is_column_indexed,
+    iter_hydrofabric_linked_data_bulk,
+    table_info,
+)
 
 
 class TestGPKGUtils(unittest.TestCase):
@@ -25,3 +38,119 @@ class TestGPKGUtils(unittest.TestCase):
                     "forcing_metadata",
                 ],
             )
+
+
+class TestBulkLinkedData(unittest.TestCase):
+    """Compare bulk extraction against the per-catchment path on a synthetic, unindexed geopackage"""
+
+    DIVIDE_COUNT = 500_000
+    SAMPLE_SIZE = 20
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        path = Path(cls.directory.name) / "synthetic.gpkg"
+        cls.ids = [f"cat-{i}" for i in range(cls.DIVIDE_COUNT)]
+
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE gpkg_contents (table_name TEXT PRIMARY KEY, data_type TEXT)"
+        )
+        connection.executemany(
+            "INSERT INTO gpkg_contents VALUES (?, ?)",
+            [
+                ("divides", "features"),
+                ("model_attributes", "attributes"),
+                ("forcing_metadata", "attributes"),
+            ],
+        )
+        connection.execute("CREATE TABLE divides (fid INTEGER PRIMARY KEY, id TEXT)")
+        connection.execute(
+            "CREATE TABLE model_attributes (fid INTEGER PRIMARY KEY, id TEXT, slope REAL, soil INTEGER)"
+        )
+        connection.execute(
+            "CREATE TABLE forcing_metadata (fid INTEGER PRIMARY KEY, id TEXT, areasqkm REAL)"
+        )
+        connection.executemany(
+            "INSERT INTO divides (id) VALUES (?)", ((i,) for i in cls.ids)
+        )
+        connection.executemany(
+            "INSERT INTO model_attributes (id, slope, soil) VALUES (?, ?, ?)",
+            ((i, n / 1000, n % 19) for n, i in enumerate(cls.ids)),
+        )
+        connection.executemany(
+            "INSERT INTO forcing_metadata (id, areasqkm) VALUES (?, ?)",
+            ((i, n / 7) for n, i in enumerate(cls.ids)),
+        )
+        connection.commit()
+        connection.close()
+
+        cls.connection = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.connection.close()
+        cls.directory.cleanup()
+
+    def test_bulk_matches_per_catchment(self):
+        schemas = attribute_table_schemas(self.connection)
+        self.assertFalse(any(schema.id_indexed for schema in schemas))
+
+        sample = self.ids[:: self.DIVIDE_COUNT // self.SAMPLE_SIZE]
+        bulk = hydrofabric_linked_data_bulk(sample, self.connection, schemas=schemas)
+
+        for row, catchment_id in enumerate(sample):
+            for table_name, record in hydrofabric_linked_data(
+                catchment_id, self.connection, schemas=schemas
+            ).items():
+                self.assertDictEqual(
+                    {name: values[row] for name, values in bulk[table_name].items()},
+                    record,
+                )
+
+    def test_bulk_is_faster(self):
+        schemas = attribute_table_schemas(self.connection)
+
+        start = time.perf_counter()
+        for catchment_id in self.ids[: self.SAMPLE_SIZE]:
+            hydrofabric_linked_data(catchment_id, self.connection, schemas=schemas)
+        per_catchment = (time.perf_counter() - start) / self.SAMPLE_SIZE
+
+        start = time.perf_counter()
+        streamed_tables = []
+        for table_name, columns in iter_hydrofabric_linked_data_bulk(
+            self.ids, self.connection, schemas=schemas
+        ):
+            streamed_tables.append(table_name)
+            self.assertEqual(len(columns["id"]), self.DIVIDE_COUNT)
+        bulk = time.perf_counter() - start
+
+        self.assertListEqual(streamed_tables, ["model_attributes", "forcing_metadata"])
+        # every divide fetched at once should cost less than a handful of divides fetched one at a time
+        self.assertLess(bulk, per_catchment * self.DIVIDE_COUNT / 100)
+
+    def test_interleaved_bulk_streams(self):
+        schemas = attribute_table_schemas(self.connection)
+        first_ids = self.ids[: self.SAMPLE_SIZE]
+        second_ids = self.ids[self.SAMPLE_SIZE : 3 * self.SAMPLE_SIZE]
+
+        first = iter_hydrofabric_linked_data_bulk(first_ids, self.connection, schemas=schemas)
+        _, first_columns = next(first)
+        # starting a second stream on the same connection must not replace the first stream's lookup table
+        second = list(iter_hydrofabric_linked_data_bulk(second_ids, self.connection, schemas=schemas))
+        rest_of_first = list(first)
+
+        self.assertCountEqual(first_columns["id"], first_ids)
+        for _, columns in rest_of_first:
+            self.assertCountEqual(columns["id"], first_ids)
+        for _, columns in second:
+            self.assertCountEqual(columns["id"], second_ids)
+
+    def test_is_column_indexed(self):
+        with sqlite3.connect(":memory:") as connection:
+            connection.execute("CREATE TABLE t (fid INTEGER PRIMARY KEY, id TEXT, other TEXT)")
+            self.assertFalse(is_column_indexed("t", "id", connection))
+            connection.execute("CREATE INDEX t_other_id ON t (other, id)")
+            self.assertFalse(is_column_indexed("t", "id", connection))
+            connection.execute("CREATE INDEX t_id ON t (id)")
+            self.assertTrue(is_column_indexed("t", "id", connection))
@@ -1,6 +1,7 @@
 import unittest
 
 from . import hydrofabric_fixture, TESTING_DATA
+from ..hydrofabric.gpkg_utils import attribute_table_names
 from ..hydrofabric.linked_data_provider import GPKGLinkedDataProvider
 from ..hydrofabric.linked_data_provider_factory import LinkedDataProviderFactory
 
@@ -68,3 +69,32 @@ class TestGPKGLinkedDataProvider(unittest.TestCase):
                     },
                 },
             )
+
+    def test_get_data_bulk(self):
+        with hydrofabric_fixture() as connection:
+            o = GPKGLinkedDataProvider(connection=connection)
+            bulk = o.get_data_bulk(["cat-1", "cat-10", "cat-missing"])
+
+            for catchment_id in ["cat-1", "cat-10"]:
+                for table_name, record in o.get_data(catchment_id).items():
+                    rows = [
+                        idx
+                        for idx, value in enumerate(bulk[table_name]["id"])
+                        if value == catchment_id
+                    ]
+                    self.assertEqual(len(rows), 1)
+                    self.assertDictEqual(
+                        {name: values[rows[0]] for name, values in bulk[table_name].items()},
+                        record,
+                    )
+
+    def test_iter_all(self):
+        with hydrofabric_fixture() as connection:
+            o = GPKGLinkedDataProvider(connection=connection)
+            row_counts = {}
+            for table_name, columns in o.iter_all():
+                row_counts[table_name] = row_counts.get(table_name, 0) + len(columns["fid"])
+
+            self.assertListEqual(sorted(row_counts), attribute_table_names(connection))
+            self.assertEqual(row_counts["crosswalk"], 6)
+            self.assertEqual(row_counts["forcing_metadata"], 2)
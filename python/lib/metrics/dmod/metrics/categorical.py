@@ -47,6 +47,153 @@ def value_was_a_false_positive(observation: float, prediction: float) -> bool:
     return not observation and prediction
 
 
+BROADCAST_BLOCK_SIZE = 2 ** 22
+"""
+The most threshold and value comparisons to hold in memory at once when evaluating many thresholds together
+"""
+
+
+class ContingencyCounts(typing.NamedTuple):
+    """
+    The number of each kind of outcome between observations and predictions for a single threshold
+    """
+    hits: int
+    """The number of times that both the observation and prediction met the threshold"""
+    misses: int
+    """The number of times that the observation met the threshold but the prediction did not"""
+    false_positives: int
+    """The number of times that the prediction met the threshold but the observation did not"""
+    true_negatives: int
+    """The number of times that neither the observation nor the prediction met the threshold"""
+
+    @classmethod
+    def from_masks(cls, observed_events: PANDAS_DATA, predicted_events: PANDAS_DATA) -> "ContingencyCounts":
+        """
+        Count outcomes from flags marking where observations and predictions met a threshold
+
+        Args:
+            observed_events: Flags stating whether each observation met a threshold
+            predicted_events: Flags stating whether each prediction met a threshold
+
+        Returns:
+            The number of each kind of outcome
+        """
+        observed_events = numpy.asarray(observed_events, dtype=bool)
+        predicted_events = numpy.asarray(predicted_events, dtype=bool)
+
+        if observed_events.shape != predicted_events.shape:
+            raise ValueError(
+                f"Observations and predictions must be the same length in order to form a truth table. "
+                f"Received {len(observed_events)} observations and {len(predicted_events)} predictions"
+            )
+
+        hits = int(numpy.count_nonzero(observed_events & predicted_events))
+        observed_positives = int(numpy.count_nonzero(observed_events))
+        predicted_positives = int(numpy.count_nonzero(predicted_events))
+
+        return cls(
+            hits=hits,
+            misses=observed_positives - hits,
+            false_positives=predicted_positives - hits,
+            true_negatives=len(observed_events) - observed_positives - predicted_positives + hits
+        )
+
+    @property
+    def size(self) -> int:
+        """
+        The total number of observation and prediction pairs
+        """
+        return self.hits + self.misses + self.false_positives + self.true_negatives
+
+    @property
+    def observation_had_activity(self) -> bool:
+        """
+        Whether any observation met the threshold
+        """
+        return self.hits + self.misses > 0
+
+    @property
+    def predictions_had_activity(self) -> bool:
+        """
+        Whether any prediction met the threshold
+        """
+        return self.hits + self.false_positives > 0
+
+
+def count_contingencies(
+    observations: pandas.Series,
+    predictions: pandas.Series,
+    thresholds: typing.Sequence[Threshold]
+) -> typing.List[ContingencyCounts]:
+    """
+    Count the outcomes between observations and predictions for many thresholds in as few passes as possible
+
+    Thresholds that compare against a single number are evaluated together by broadcasting the values against a
+    vector of threshold values, forming boolean matrices that are counted row by row. Thresholds that compare against
+    indexed values or transform data first are evaluated one at a time.
+
+    Args:
+        observations: An ordered series of observed values
+        predictions: An ordered series of predicted values aligned with the observations
+        thresholds: The thresholds to count outcomes for
+
+    Returns:
+        The counts for each threshold, in the same order as the thresholds
+    """
+    counts: typing.List[typing.Optional[ContingencyCounts]] = [None] * len(thresholds)
+
+    observed_values = numpy.asarray(observations)
+    predicted_values = numpy.asarray(predictions)
+
+    values_can_broadcast = len(observed_values) == len(predicted_values)
+    values_can_broadcast &= numpy.issubdtype(observed_values.dtype, numpy.number)
+    values_can_broadcast &= numpy.issubdtype(predicted_values.dtype, numpy.number)
+
+    # Group every threshold that may be broadcast by operator so that each group is a single vectorized comparison
+    comparison_groups: typing.Dict[typing.Callable, typing.List[typing.Tuple[int, NUMBER]]] = dict()
+
+    for threshold_index, threshold in enumerate(thresholds):
+        comparison = threshold.get_scalar_comparison() if values_can_broadcast else None
+
+        if comparison is None:
+            counts[threshold_index] = ContingencyCounts.from_masks(threshold(observations), threshold(predictions))
+        else:
+            operator, threshold_value = comparison
+            comparison_groups.setdefault(operator, list()).append((threshold_index, threshold_value))
+
+    for operator, indexed_values in comparison_groups.items():
+        threshold_indices = [threshold_index for threshold_index, _ in indexed_values]
+        threshold_values = numpy.array([value for _, value in indexed_values])[:, numpy.newaxis]
+
+        hits = numpy.zeros(len(threshold_indices), dtype=numpy.int64)
+        observed_positives = numpy.zeros(len(threshold_indices), dtype=numpy.int64)
+        predicted_positives = numpy.zeros(len(threshold_indices), dtype=numpy.int64)
+
+        # Work through the values in blocks so that the boolean matrices stay small no matter how long the series are
+        block_length = max(BROADCAST_BLOCK_SIZE // len(threshold_indices), 1)
+
+        for block_start in range(0, len(observed_values), block_length):
+            block = slice(block_start, block_start + block_length)
+            observed_events = operator(observed_values[numpy.newaxis, block], threshold_values)
+            predicted_events = operator(predicted_values[numpy.newaxis, block], threshold_values)
+
+            hits += numpy.count_nonzero(observed_events & predicted_events, axis=1)
+            observed_positives += numpy.count_nonzero(observed_events, axis=1)
+            predicted_positives += numpy.count_nonzero(predicted_events, axis=1)
+
+        for position, threshold_index in enumerate(threshold_indices):
+            counts[threshold_index] = ContingencyCounts(
+                hits=int(hits[position]),
+                misses=int(observed_positives[position] - hits[position]),
+                false_positives=int(predicted_positives[position] - hits[position]),
+                true_negatives=int(
+                    len(observed_values) - observed_positives[position] - predicted_positives[position] + hits[position]
+                )
+            )
+
+    return counts
+
+
 def categorical_metric(
     minimum: float = -math.inf,
     maximum: float = math.inf,
@@ -277,7 +424,13 @@ class TruthTable(object):
             greater_is_better=metric_function.greater_is_better
         )
 
-    def __init__(self, observations: pandas.Series, predictions: pandas.Series, threshold: Threshold):
+    def __init__(
+        self,
+        observations: pandas.Series,
+        predictions: pandas.Series,
+        threshold: Threshold,
+        counts: ContingencyCounts = None
+    ):
         """
         Constructor
 
@@ -285,17 +438,13 @@ class TruthTable(object):
             observations: An ordered series of values representing all observations used to form the truth table
             predictions: An ordered series of values representing all predictions used to form the truth table
             threshold: The threshold used to indicate something that might constitute a notable event
+            counts: Outcomes that have already been counted for the threshold; the observations and predictions will
+                be evaluated if these aren't given
         """
         self.__name = threshold.name or "Unknown"
         self.__threshold = threshold
 
-        observed_values_that_matter = threshold(observations)
-        predicted_values_that_matter = threshold(predictions)
-
-        self.__observation_had_activity = observed_values_that_matter.any()
-        self.__predictions_had_activity = predicted_values_that_matter.any()
-
-        # Creates a contingency table matching:
+        # The counts match a contingency table like:
         #
         #  Observations     False                   True
         #  Predictions
@@ -310,45 +459,25 @@ class TruthTable(object):
         #  False            51          2       53
         #  True             0           1       1
         #                   51          3       54
-        # contingency_table[False] => 51, 0
-        # contingency_table[True] => 2, 1
-        #
-        #
-        # contingency_table[Observed Event][Predicted Event]
         #
-        # hits: contingency_table[True][True]
-        # misses: contingency_table[True][False]
-        # true negatives: contingency_table[False][False]
-        # False Positives: contingency_table[False][True]
-        #
-        contingency_table = pandas.crosstab(predicted_values_that_matter.values, observed_values_that_matter.values)
-
-        # Store evaluated parameters so they don't have to be evaluated multiple times
-        self.__hits = 0
-        self.__false_positives = 0
-        self.__true_negatives = 0
-        self.__misses = 0
+        # hits: 1
+        # misses: 2
+        # true negatives: 51
+        # False Positives: 0
+        if counts is None:
+            counts = count_contingencies(observations, predictions, [threshold])[0]
 
-        if True in contingency_table:
-            self.__hits = contingency_table[True][True] if True in contingency_table[True] else 0
-            self.__misses = contingency_table[True][False] if False in contingency_table[True] else 0
+        self.__counts = counts
 
-        if False in contingency_table:
-            self.__true_negatives = contingency_table[False][False] if False in contingency_table[False] else 0
-            self.__false_positives = contingency_table[False][True] if True in contingency_table[False] else 0
+        self.__observation_had_activity = counts.observation_had_activity
+        self.__predictions_had_activity = counts.predictions_had_activity
 
-        # Adds the values in each column together, then adds those numbers togethers.
-        #
-        # From the Example above:
-        #
-        #  Observations     False       True
-        #  Predictions
-        #  False            51          2
-        #  True             0           1
-        #
-        #  contingency_table.sum() => (False, 51), (True, 3)
-        #  contingency_table.sum().sum() => 54
-        self.__size = contingency_table.sum().sum()
+        # Store evaluated parameters so they don't have to be evaluated multiple times
+        self.__hits = counts.hits
+        self.__false_positives = counts.false_positives
+        self.__true_negatives = counts.true_negatives
+        self.__misses = counts.misses
+        self.__size = counts.size
 
         self.__observed_positives = self.__hits + self.__misses
         self.__observed_negatives = self.__false_positives + self.__true_negatives
@@ -677,6 +806,13 @@ class TruthTable(object):
 
         return self.__precision
 
+    @property
+    def counts(self) -> ContingencyCounts:
+        """
+        The number of each kind of outcome that the metrics of this table are derived from
+        """
+        return self.__counts
+
     @property
     def threshold(self) -> Threshold:
         """
@@ -756,11 +892,15 @@ class TruthTables(object):
 
         has_usable_observations = observations is not None and isinstance(observations, pandas.Series)
         has_usable_predictions = predictions is not None and isinstance(predictions, pandas.Series)
-        has_usable_thresholds = thresholds is not None and len([val for val in thresholds]) > 0
+        thresholds = [threshold for threshold in thresholds] if thresholds is not None else list()
+        has_usable_thresholds = len(thresholds) > 0
 
         if has_usable_observations and has_usable_predictions and has_usable_thresholds:
-            for threshold in thresholds:
-                self.create_table(observations, predictions, threshold)
+            # Count the outcomes for every threshold at once rather than evaluating the data once per threshold
+            all_counts = count_contingencies(observations, predictions, thresholds)
+
+            for threshold, counts in zip(thresholds, all_counts):
+                self.add_table(TruthTable(observations, predictions, threshold, counts=counts))
 
         if tables is not None:
             for table in tables:
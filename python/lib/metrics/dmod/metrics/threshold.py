@@ -93,6 +93,16 @@ class Operators(object):
         return self.__operator_function(first, second)
 
 
+BROADCASTABLE_OPERATORS: typing.Sequence[NUMERIC_FILTER] = (
+    Operators.greater_than,
+    Operators.greater_than_or_equal,
+    Operators.equal,
+    Operators.less_than,
+    Operators.less_than_or_equal,
+)
+"""Operators that behave identically when given numpy arrays instead of pandas objects"""
+
+
 class ValueFilter(typing.Callable[[PANDAS_DATA], PANDAS_DATA]):
     __slots__ = [
         '_operator',
@@ -137,6 +147,35 @@ class ValueFilter(typing.Callable[[PANDAS_DATA], PANDAS_DATA]):
         self._threshold_value = threshold_value
         self._threshold_is_indexible = threshold_is_indexible
 
+    @property
+    def operator(self) -> NUMERIC_FILTER:
+        """
+        The function used to compare values against the threshold value
+        """
+        return self._operator
+
+    @property
+    def threshold_value(self) -> NUMBER:
+        """
+        The value that data is compared against
+        """
+        return self._threshold_value
+
+    @property
+    def can_broadcast(self) -> bool:
+        """
+        Whether this filter compares data against a single number with one of the stock operators, meaning that it
+        may be evaluated against many values and many thresholds at once
+        """
+        if self._threshold_is_indexible or self._transformation_function is not None:
+            return False
+
+        if self._operator not in BROADCASTABLE_OPERATORS:
+            return False
+
+        return isinstance(self._threshold_value, (int, float, numpy.number)) \
+            and not isinstance(self._threshold_value, (bool, numpy.bool_))
+
     def filter_series(self, series: pandas.Series) -> pandas.Series:
         """
         Apply the threshold to a single series
@@ -287,6 +326,19 @@ class Threshold(FRAME_FILTER):
     def __call__(self, pairs: PANDAS_DATA) -> PANDAS_DATA:
         return self._allow(pairs)
 
+    def get_scalar_comparison(self) -> typing.Optional[typing.Tuple[NUMERIC_FILTER, NUMBER]]:
+        """
+        Get the operator and the single number that this threshold compares values against if the comparison may
+        be broadcast across many values and thresholds at once
+
+        Returns:
+            The operator and the number that values are compared against, or None if the threshold compares against
+            indexed values or transforms data before comparing it
+        """
+        if isinstance(self._allow, ValueFilter) and self._allow.can_broadcast:
+            return self._allow.operator, self._allow.threshold_value
+        return None
+
     @property
     def name(self) -> str:
         return self._name
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests to ensure that truth tables counted for many thresholds at once match truth tables built through crosstabs
+"""
+import os
+import time
+import typing
+import unittest
+
+import numpy
+import pandas
+
+from ...metrics import categorical
+from ...metrics.threshold import Threshold
+from ...metrics.threshold import Operators
+
+BENCHMARK_ROW_COUNT = int(float(os.environ.get("DMOD_TRUTH_TABLE_BENCHMARK_ROWS", 1_000_000)))
+"""The number of observations and predictions used when comparing crosstabs to vectorized counting"""
+
+BENCHMARK_THRESHOLD_COUNT = 50
+
+
+def crosstab_counts(
+    observations: pandas.Series,
+    predictions: pandas.Series,
+    threshold: Threshold
+) -> categorical.ContingencyCounts:
+    """
+    Count outcomes the way that truth tables used to - through a crosstab for a single threshold
+    """
+    contingency_table = pandas.crosstab(threshold(predictions).values, threshold(observations).values)
+
+    hits = 0
+    misses = 0
+    true_negatives = 0
+    false_positives = 0
+
+    if True in contingency_table:
+        hits = contingency_table[True][True] if True in contingency_table[True] else 0
+        misses = contingency_table[True][False] if False in contingency_table[True] else 0
+
+    if False in contingency_table:
+        true_negatives = contingency_table[False][False] if False in contingency_table[False] else 0
+        false_positives = contingency_table[False][True] if True in contingency_table[False] else 0
+
+    return categorical.ContingencyCounts(
+        hits=int(hits),
+        misses=int(misses),
+        false_positives=int(false_positives),
+        true_negatives=int(true_negatives)
+    )
+
+
+def create_series(row_count: int, seed: int = 8) -> typing.Tuple[pandas.Series, pandas.Series]:
+    generator = numpy.random.default_rng(seed)
+    index = pandas.date_range("2022-01-01", periods=row_count, freq="h")
+
+    observed_values = generator.gamma(2.0, 20.0, size=row_count)
+    predicted_values = observed_values + generator.normal(0.0, 10.0, size=row_count)
+
+    # Gaps in the data should never be treated as events
+    observed_values[generator.random(row_count) < 0.02] = numpy.nan
+    predicted_values[generator.random(row_count) < 0.02] = numpy.nan
+
+    return (
+        pandas.Series(observed_values, index=index, name="observed"),
+        pandas.Series(predicted_values, index=index, name="predicted")
+    )
+
+
+def create_thresholds(values: typing.Iterable[float], **kwargs) -> typing.List[Threshold]:
+    return [
+        Threshold(
+            name=f"threshold_{index}",
+            value=value,
+            weight=1,
+            observed_value_key="observed",
+            predicted_value_key="predicted",
+            **kwargs
+        )
+        for index, value in enumerate(values)
+    ]
+
+
+class TestTruthTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.observations, self.predictions = create_series(5000)
+
+    def assert_parity(self, thresholds: typing.Sequence[Threshold]):
+        tables = categorical.TruthTables(self.observations, self.predictions, thresholds)
+
+        for threshold in thresholds:
+            expected = crosstab_counts(self.observations, self.predictions, threshold)
+            table = tables[threshold.name]
+
+            self.assertEqual(table.counts, expected, f"The counts for {threshold} do not match a crosstab")
+            self.assertEqual(len(table), expected.size)
+            self.assertEqual(table.observation_had_activity, bool(threshold(self.observations).any()))
+            self.assertEqual(table.predictions_had_activity, bool(threshold(self.predictions).any()))
+
+            # The constructor should still be able to form tables on its own
+            single_table = categorical.TruthTable(self.observations, self.predictions, threshold)
+
+            for metric_name in categorical.TruthTable.metrics():
+                numpy.testing.assert_equal(
+                    getattr(table, metric_name)(),
+                    getattr(single_table, metric_name)(),
+                    err_msg=f"'{metric_name}' for {threshold} changed based on how the table was built"
+                )
+
+    def test_scalar_thresholds(self):
+        values = [-numpy.inf, 0, 5, 27, 36.5, 43, 60, 120, 10_000]
+        self.assert_parity([Threshold.default()] + create_thresholds(values))
+
+        for operator in [Operators.greater_than, Operators.less_than, Operators.less_than_or_equal]:
+            with self.subTest(operator=operator.__name__):
+                self.assert_parity(create_thresholds(values, operator=operator))
+
+        rounded_observations = self.observations.round()
+        rounded_predictions = self.predictions.round()
+        thresholds = create_thresholds([20, 30, 40], operator=Operators.equal)
+
+        for threshold in thresholds:
+            counts = categorical.count_contingencies(rounded_observations, rounded_predictions, [threshold])[0]
+            self.assertEqual(counts, crosstab_counts(rounded_observations, rounded_predictions, threshold))
+
+    def test_indexed_thresholds(self):
+        varying_values = pandas.Series(
+            numpy.linspace(10, 70, len(self.observations)),
+            index=self.observations.index,
+            name="varying"
+        )
+        thresholds = create_thresholds([15, 45])
+        thresholds.append(
+            Threshold(
+                name="varying",
+                value=varying_values,
+                weight=2,
+                observed_value_key="observed",
+                predicted_value_key="predicted"
+            )
+        )
+
+        self.assertIsNone(thresholds[-1].get_scalar_comparison())
+        self.assert_parity(thresholds)
+
+    def test_edge_cases(self):
+        # Nothing meets the threshold
+        counts = categorical.count_contingencies(self.observations, self.predictions, create_thresholds([1e9]))[0]
+        self.assertEqual(counts.hits + counts.misses + counts.false_positives, 0)
+        self.assertFalse(counts.observation_had_activity)
+
+        empty = pandas.Series([], dtype=float)
+        self.assertEqual(
+            categorical.count_contingencies(empty, empty, create_thresholds([1])),
+            [categorical.ContingencyCounts(0, 0, 0, 0)]
+        )
+
+        # Integer data should broadcast just like floating point data
+        integers = pandas.Series(numpy.arange(100))
+        self.assertEqual(
+            categorical.count_contingencies(integers, integers[::-1].reset_index(drop=True), create_thresholds([50])),
+            [categorical.ContingencyCounts(hits=0, misses=50, false_positives=50, true_negatives=0)]
+        )
+
+        with self.assertRaises(ValueError):
+            categorical.count_contingencies(integers, integers.iloc[:10], create_thresholds([50]))
+
+    def test_benchmark(self):
+        observations, predictions = create_series(BENCHMARK_ROW_COUNT)
+        thresholds = create_thresholds(numpy.linspace(0, 150, BENCHMARK_THRESHOLD_COUNT).tolist())
+
+        crosstab_start = time.perf_counter()
+        expected = [crosstab_counts(observations, predictions, threshold) for threshold in thresholds]
+        crosstab_seconds = time.perf_counter() - crosstab_start
+
+        vectorized_start = time.perf_counter()
+        tables = categorical.TruthTables(observations, predictions, thresholds)
+        vectorized_seconds = time.perf_counter() - vectorized_start
+
+        self.assertEqual([table.counts for table in tables.values()], expected)
+        self.assertLess(vectorized_seconds * 5, crosstab_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1 +1 @@
-__version__ = '0.13.0'
+__version__ = '0.16.0'
@@ -1,21 +1,28 @@
 import geopandas as gpd
+import io
 import pandas as pd
+import tarfile
 
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from copy import copy
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Set, Tuple, Union
+from typing import Any, Deque, Dict, Generator, Iterable, List, Optional, Set, Tuple, Union
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
 from pydantic import BaseModel
 from math import degrees as math_degrees, tan as math_tan
 
 from ngen.config.formulation import Formulation
 from ngen.config.multi import MultiBMI
 from ngen.config.realization import NgenRealization
-from ngen.config_gen.file_writer import DefaultFileWriter
+from ngen.config_gen.file_writer import DefaultFileWriter, _get_file_extension
 from ngen.config_gen.hook_providers import DefaultHookProvider
 from ngen.config_gen.models import Pet
 from ngen.config_gen.models.cfe import Cfe
 
+from ngen.init_config.serializer import (IniSerializer, JsonSerializer, NamelistSerializer, TomlSerializer,
+                                         YamlSerializer)
 from ngen.config.init_config.noahowp import (Forcing, InitialValues, LandSurfaceType, Location, ModelOptions,
                                              NoahOWP as NoahOWPConfig, Structure)
 from ngen.config.init_config.noahowp_options import (CanopyStomResistOption, CropModelOption, DrainageOption,
@@ -25,6 +32,7 @@ from ngen.config.init_config.noahowp_options import (CanopyStomResistOption, Cro
                                                      SnowsoilTempTimeOption, SoilTempBoundaryOption,
                                                      StomatalResistanceOption, SubsurfaceOption, SupercooledWaterOption)
 
+from dmod.core.dataset import DataArchiving
 from dmod.core.exception import DmodRuntimeError
 
 
@@ -292,6 +300,23 @@ class BmiGenDivideIdHookObject:
         return self.__divide_id
 
 
+def _generate_shard(shard: "BmiInitConfigAutoGenerator") -> List[Tuple[str, bytes]]:
+    """
+    Generate the serialized configs for a single shard of a generator, as done within a worker process.
+
+    Parameters
+    ----------
+    shard: BmiInitConfigAutoGenerator
+        A generator holding only its slice of the hydrofabric data and model attributes.
+
+    Returns
+    -------
+    List[Tuple[str, bytes]]
+        The file name and serialized contents of each generated config, in generation order.
+    """
+    return list(shard.serialize_configs())
+
+
 # TODO: figure out how to handle noah owp
 class BmiInitConfigAutoGenerator:
     """
@@ -312,6 +337,59 @@ class BmiInitConfigAutoGenerator:
     """ Map of config strings to builders, for modules with builders than can be easily init with no more info. """
     _no_init_config_modules = {"SLOTH"}
     """ Config strings for modules that do not need init configs generated. """
+    _divide_id_column = "divide_id"
+    """ Name of the column (or index) identifying each divide in the hydrofabric data and model attributes. """
+    _default_shard_size = 2_000
+    """ Default number of divides given to each worker at a time when generating in parallel. """
+
+    @classmethod
+    def get_config_file_name(cls, catchment_id: str, config_model: BaseModel) -> str:
+        """
+        Get the name of the file for a generated config, matching the name :class:`DefaultFileWriter` would give it.
+
+        Parameters
+        ----------
+        catchment_id: str
+            The id of the catchment the config is for.
+        config_model: BaseModel
+            The generated config model object.
+
+        Returns
+        -------
+        str
+            The name of the file for the config.
+        """
+        return f"{config_model.__class__.__name__}_{catchment_id}.{_get_file_extension(config_model)}"
+
+    @classmethod
+    def serialize_config(cls, config_model: BaseModel) -> bytes:
+        """
+        Serialize a generated config model object to the bytes that would be written to its file.
+
+        Parameters
+        ----------
+        config_model: BaseModel
+            The generated config model object.
+
+        Returns
+        -------
+        bytes
+            The serialized config.
+        """
+        if isinstance(config_model, IniSerializer):
+            return config_model.to_ini_str().encode()
+        elif isinstance(config_model, JsonSerializer):
+            return config_model.to_json_str().encode()
+        elif isinstance(config_model, NamelistSerializer):
+            return config_model.to_namelist_str().encode()
+        elif isinstance(config_model, TomlSerializer):
+            return config_model.to_toml_str().encode()
+        elif isinstance(config_model, YamlSerializer):
+            return config_model.to_yaml_str().encode()
+        elif isinstance(config_model, BaseModel):
+            return config_model.json().encode()
+
+        raise RuntimeError(f"{cls.__name__} can't serialize config model of type '{config_model.__class__.__name__}'")
 
     @staticmethod
     def get_module_names(formulation: Formulation) -> Set[str]:
@@ -437,6 +515,139 @@ class BmiInitConfigAutoGenerator:
                 builder.visit(cat_hook_provider)
                 yield cat_id, builder.build()
 
+    def _select_divides(self, data: pd.DataFrame, divide_ids: Iterable[str]) -> pd.DataFrame:
+        """
+        Select the rows of hydrofabric data or model attributes for the given divides, keeping their original order.
+        """
+        if self._divide_id_column in data.columns:
+            return data[data[self._divide_id_column].isin(divide_ids)]
+        return data[data.index.isin(divide_ids)]
+
+    def _divide_ids(self) -> List[str]:
+        """
+        Get the ids of the divides that configs will be generated for, in the order they will be generated.
+        """
+        if self._divide_id_column in self._hf_data.columns:
+            divide_ids = self._hf_data[self._divide_id_column].tolist()
+        else:
+            divide_ids = self._hf_data.index.tolist()
+        if self._catchment_subset:
+            return [d for d in divide_ids if d in self._catchment_subset]
+        return divide_ids
+
+    def create_shards(self, shard_size: Optional[int] = None) -> Generator["BmiInitConfigAutoGenerator", None, None]:
+        """
+        Partition this generator into generators for consecutive slices of divides.
+
+        Each shard holds only its slice of the hydrofabric data and model attributes, so that it is cheap to send to a
+        worker process.  Generating from each shard in order produces the same configs, in the same order, as
+        generating from this instance.
+
+        Parameters
+        ----------
+        shard_size: Optional[int]
+            The number of divides in each shard; by default, ``2000``.
+
+        Yields
+        -------
+        Generator[BmiInitConfigAutoGenerator, None, None]
+            Generators for each consecutive slice of divides.
+        """
+        divide_ids = self._divide_ids()
+        shard_size = max(shard_size or self._default_shard_size, 1)
+        for start in range(0, len(divide_ids), shard_size):
+            shard_divide_ids = set(divide_ids[start:start + shard_size])
+            shard = copy(self)
+            shard._hf_data = self._select_divides(self._hf_data, shard_divide_ids)
+            shard._hf_model_attributes = self._select_divides(self._hf_model_attributes, shard_divide_ids)
+            shard._catchment_subset = shard_divide_ids
+            yield shard
+
+    def serialize_configs(self, processes: Optional[int] = None,
+                          shard_size: Optional[int] = None) -> Generator[Tuple[str, bytes], None, None]:
+        """
+        Generate and yield the file name and serialized contents of each config, optionally using multiple processes.
+
+        When more than one process is used, the divides are split into shards that are generated within a process
+        pool.  Results are still yielded in exactly the order :meth:`generate_configs` would produce them, and only a
+        bounded number of shards are in flight at any time.
+
+        Parameters
+        ----------
+        processes: Optional[int]
+            The number of worker processes to use; ``None`` by default, which means to generate within this process.
+        shard_size: Optional[int]
+            The number of divides given to a worker at a time; by default, ``2000``.
+
+        Yields
+        -------
+        Generator[Tuple[str, bytes], None, None]
+            A generator yielding tuples, containing the file name and serialized contents of a generated config.
+        """
+        if processes is None or processes <= 1:
+            for catchment_id, config_model in self.generate_configs():
+                yield self.get_config_file_name(catchment_id, config_model), self.serialize_config(config_model)
+            return
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending: Deque[Future] = deque()
+            for shard in self.create_shards(shard_size=shard_size):
+                pending.append(executor.submit(_generate_shard, shard))
+                # Keep a couple of shards queued per worker, but don't hold every shard's results in memory at once
+                if len(pending) >= 2 * processes:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def write_archive(self, output_file: Union[str, Path], archiving: DataArchiving = DataArchiving.ZIP_0,
+                      processes: Optional[int] = None, shard_size: Optional[int] = None) -> Path:
+        """
+        Write the generated configs into a single archive file, rather than into one file per config.
+
+        The archive contains the same file names and contents that :meth:`write_configs` would write, in the same
+        order.  Zip archives are indexed by their central directory, so individual configs can be read without
+        scanning the archive.
+
+        Parameters
+        ----------
+        output_file: Union[str, Path]
+            The path of the archive file to write.
+        archiving: DataArchiving
+            The type of archive to write; by default, an uncompressed zip archive.
+        processes: Optional[int]
+            The number of worker processes to generate configs with; ``None`` by default, which means to generate
+            within this process.
+        shard_size: Optional[int]
+            The number of divides given to a worker at a time; by default, ``2000``.
+
+        Returns
+        -------
+        Path
+            The path of the written archive file.
+        """
+        output_file = Path(output_file)
+        configs = self.serialize_configs(processes=processes, shard_size=shard_size)
+
+        if archiving.extension == ".zip":
+            compression = ZIP_STORED if archiving == DataArchiving.ZIP_0 else ZIP_DEFLATED
+            compress_level = {DataArchiving.ZIP_6: 6, DataArchiving.ZIP_9: 9}.get(archiving)
+            with ZipFile(output_file, "w", compression=compression, compresslevel=compress_level) as archive:
+                for file_name, contents in configs:
+                    # Use a fixed timestamp so that identical configs always produce identical archives
+                    info = ZipInfo(file_name, date_time=(1980, 1, 1, 0, 0, 0))
+                    info.external_attr = 0o644 << 16
+                    archive.writestr(info, contents, compress_type=compression, compresslevel=compress_level)
+            return output_file
+
+        tar_modes = {DataArchiving.TAR: "w", DataArchiving.TAR_GZIP: "w:gz", DataArchiving.TAR_BZIP2: "w:bz2",
+                     DataArchiving.TAR_XZ: "w:xz"}
+        with tarfile.open(output_file, tar_modes[archiving]) as archive:
+            for file_name, contents in configs:
+                info = tarfile.TarInfo(name=file_name)
+                info.size = len(contents)
+                archive.addfile(info, io.BytesIO(contents))
+        return output_file
+
     def get_supported_module_names(self) -> List[str]:
         """
         Get a list of the supported BMI module configuration names for which this instance can generate an init config.
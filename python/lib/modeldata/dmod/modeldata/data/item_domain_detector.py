@@ -1,14 +1,16 @@
 import json
+import os
 import re
 
+from datetime import datetime
 from dmod.core.meta_data import DataDomain, DataFormat, DiscreteRestriction, StandardDatasetIndex, TimeRange
 from dmod.core.common.reader import ReadSeeker
 from dmod.core.exception import DmodRuntimeError
 from dmod.core.data_domain_detectors import DataItem, ItemDataDomainDetector
-from pandas import read_csv as pandas_read_csv
+from pathlib import Path
 import ngen.config.realization
 
-from typing import Optional
+from typing import List, Optional, Tuple
 from io import BytesIO
 
 from ..hydrofabric.geopackage_hydrofabric import GeoPackageHydrofabric
@@ -26,6 +28,8 @@ class AorcCsvFileDomainDetector(ItemDataDomainDetector):
 
     _data_format = DataFormat.AORC_CSV
     _datetime_format: str = "%Y-%m-%d %H:%M:%S"
+    _tail_read_size: int = 4096
+    """ Initial number of bytes read from the end of an item when looking for its last line (grown as needed). """
 
     def __init__(self, *, item: DataItem, item_name: Optional[str] = None, decode_format: str = 'utf-8'):
         """
@@ -43,7 +47,6 @@ class AorcCsvFileDomainDetector(ItemDataDomainDetector):
         super().__init__(item=item, item_name=item_name, decode_format=decode_format)
         if self._item_name is None:
             raise DmodRuntimeError(f"{self.__class__.__name__} must be passed an item name on init unless item is file")
-        self._num_time_steps = None
 
     def _get_catchment_id(self) -> str:
         matches = re.match('^.*(cat)[_-](\d+)\D?.*$', self._item_name)
@@ -56,10 +59,63 @@ class AorcCsvFileDomainDetector(ItemDataDomainDetector):
         """ Get :class:`DiscreteRestriction` defining applicable catchments (i.e., catchment) for the domain. """
         return DiscreteRestriction(variable=StandardDatasetIndex.CATCHMENT_ID, values=[self._get_catchment_id()])
 
+    def _read_head_and_tail(self) -> Tuple[bytes, bytes, bytes]:
+        """
+        Read only the header line, the first data line, and the last (non-empty) line of the item.
+
+        The item is never read in full: leading and trailing blocks are read by seeking, starting with blocks of
+        ``_tail_read_size`` bytes and doubling the block size until enough complete lines have been found.
+
+        Returns
+        -------
+        Tuple[bytes, bytes, bytes]
+            The header line, first data line, and last non-empty line of the item, without line terminators.
+        """
+        def read_from(data: ReadSeeker, size: int) -> Tuple[bytes, bytes, bytes]:
+            read_size = self._tail_read_size
+            while True:
+                data.seek(0)
+                head_lines = data.read(min(read_size, size)).split(b'\n', 2)
+                if len(head_lines) > 2 or read_size >= size:
+                    break
+                read_size *= 2
+            read_size = self._tail_read_size
+            while True:
+                offset = max(0, size - read_size)
+                data.seek(offset)
+                tail_lines = data.read(size - offset).rstrip(b'\r\n').rsplit(b'\n', 1)
+                # Unless we've reached the start of the item, the first line in the block may only be partial
+                if len(tail_lines) > 1 or offset == 0:
+                    break
+                read_size *= 2
+            first_data_line = head_lines[1] if len(head_lines) > 1 else b''
+            return head_lines[0].rstrip(b'\r'), first_data_line.rstrip(b'\r'), tail_lines[-1].rstrip(b'\r')
+
+        if isinstance(self._item, bytes):
+            return read_from(BytesIO(self._item), len(self._item))
+        elif isinstance(self._item, Path):
+            with self._item.open('rb') as f:
+                return read_from(f, self._item.stat().st_size)
+        try:
+            return read_from(self._item, self._item.seek(0, os.SEEK_END))
+        finally:
+            self._item.seek(0)
+
+    def _parse_time_value(self, line: bytes, time_col_index: int) -> datetime:
+        """ Parse the timestamp in the given column of a (non-header) line of the CSV data. """
+        value = line.decode(self._decode_format).split(',')[time_col_index].strip()
+        try:
+            return datetime.strptime(value, self._datetime_format)
+        except ValueError:
+            return datetime.fromisoformat(value)
+
     def detect(self, **kwargs) -> DataDomain:
         """
         Detect and return the data domain.
 
+        Only the header line and the last line of the item are read, since these are sufficient to validate the columns
+        and to determine the first and last timestamps of the data.
+
         Parameters
         ----------
         kwargs
@@ -77,17 +133,24 @@ class AorcCsvFileDomainDetector(ItemDataDomainDetector):
             If it was not possible to properly detect the domain.
         """
 
-        # Do this early to fail here rather than try to load the dataframe
+        # Do this early to fail here rather than try to read the data
         cat_restriction = self._get_cat_restriction()
-        data = BytesIO(self._item) if isinstance(self._item, bytes) else self._item
         dt_index = self.get_data_format().indices_to_fields()[StandardDatasetIndex.TIME]
-        df = pandas_read_csv(data, parse_dates=[dt_index])
-        if {col.lower() for col in df.columns} != {field.lower() for field in self.get_data_format().data_fields}:
+        header, first_line, last_line = self._read_head_and_tail()
+        columns: List[str] = [c.strip() for c in header.decode(self._decode_format).split(',')]
+        if {col.lower() for col in columns} != {field.lower() for field in self.get_data_format().data_fields}:
             raise DmodRuntimeError(f"{self.__class__.__name__} could not detect; unexpected columns "
-                                   f"{df.columns.values!s} in data for format {self.get_data_format().name} (expected "
+                                   f"{columns!s} in data for format {self.get_data_format().name} (expected "
                                    f"{[k for k in self.get_data_format().data_fields]})")
-        self._num_time_steps = df.shape[0]
-        date_range = TimeRange(begin=df.iloc[0][dt_index].to_pydatetime(), end=df.iloc[-1][dt_index].to_pydatetime())
+        if not first_line.strip():
+            raise DmodRuntimeError(f"{self.__class__.__name__} could not detect; no data rows in item")
+        time_col_index = [c.lower() for c in columns].index(dt_index.lower())
+        try:
+            begin = self._parse_time_value(first_line, time_col_index)
+            end = self._parse_time_value(last_line, time_col_index)
+        except (ValueError, IndexError) as e:
+            raise DmodRuntimeError(f"{self.__class__.__name__} could not parse times from data: {e!s}")
+        date_range = TimeRange(begin=begin, end=end)
         return DataDomain(data_format=self.get_data_format(), continuous_restrictions=[date_range],
                           discrete_restrictions=[cat_restriction])
 
@@ -101,6 +164,31 @@ class AorcCsvFileDomainDetector(ItemDataDomainDetector):
 class GeoPackageHydrofabricDomainDetector(ItemDataDomainDetector):
 
     _data_format = DataFormat.NGEN_GEOPACKAGE_HYDROFABRIC_V2
+    _sqlite_header: bytes = b'SQLite format 3\x00'
+    _gpkg_application_ids: Tuple[bytes, ...] = (b'GPKG', b'GP10', b'GP11')
+
+    def _read_file_header(self) -> bytes:
+        """ Read the 100-byte SQLite database file header of the item, without reading anything else. """
+        if isinstance(self._item, bytes):
+            return self._item[:100]
+        elif isinstance(self._item, Path):
+            with self._item.open('rb') as f:
+                return f.read(100)
+        self._item.seek(0)
+        try:
+            return self._item.read(100)
+        finally:
+            self._item.seek(0)
+
+    def _is_geopackage(self) -> bool:
+        """
+        Check, using only the database file header, whether the item looks like a GeoPackage.
+
+        This allows non-GeoPackage items to be rejected without loading them.  A GeoPackage is a SQLite database with
+        its ``application_id`` (bytes 68-71 of the header) set to one of the registered GeoPackage values.
+        """
+        header = self._read_file_header()
+        return header[:16] == self._sqlite_header and header[68:72] in self._gpkg_application_ids
 
     def detect(self, **kwargs) -> DataDomain:
         """
@@ -130,8 +218,15 @@ class GeoPackageHydrofabricDomainDetector(ItemDataDomainDetector):
         DmodRuntimeError
             If it was not possible to properly detect the domain.
         """
+        if not self._is_geopackage():
+            raise DmodRuntimeError(f"{self.__class__.__name__} could not detect; item is not a GeoPackage file")
+
+        # Opened files can be read directly by path by the backing library, rather than loading all bytes into memory
+        if isinstance(self._item, ReadSeeker) and isinstance(getattr(self._item, 'name', None), str) \
+                and Path(self._item.name).is_file():
+            gpkg_data = Path(self._item.name)
         # TODO: (later) probably isn't necessary to treat separately, but don't have a good way to test yet
-        if isinstance(self._item, ReadSeeker):
+        elif isinstance(self._item, ReadSeeker):
             gpkg_data = self._item.read()
             self._item.seek(0)
         else:
@@ -0,0 +1,467 @@
+import geopandas as gpd
+import hashlib
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyogrio
+import shutil
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .geopackage_hydrofabric import GeoPackageHydrofabric
+from .hydrofabric import GeoJsonHydrofabric, GeoJsonHydrofabricReader
+
+CACHE_DIR_ENV_VAR = 'DMOD_HYDROFABRIC_CACHE_DIR'
+""" Environment variable that, when set, gives the directory of the default hydrofabric cache. """
+
+CACHE_FORMAT_VERSION = 1
+""" The version of the cache entry layout, which is part of entry keys so that format changes invalidate entries. """
+
+_HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class CachedLayer:
+    """
+    A single hydrofabric layer within a cache entry, stored as a columnar Arrow IPC file.
+
+    The file is memory-mapped when first read, so the pages of its buffers are shared by all processes on a host that
+    load the same entry.  Geometries are stored as WKB and only decoded when a full (geo)dataframe is requested, so
+    loads that only need identifiers and topology columns never pay for geometry.
+    """
+
+    def __init__(self, path: Path, columns: List[str], geometry_column: Optional[str] = None,
+                 crs: Optional[str] = None):
+        """
+        Initialize this instance.
+
+        Parameters
+        ----------
+        path : Path
+            The layer's Arrow IPC file.
+        columns : List[str]
+            The names of the layer's columns, in their original order.
+        geometry_column : Optional[str]
+            The name of the layer's (WKB-encoded) geometry column, or ``None`` for non-spatial layers.
+        crs : Optional[str]
+            The layer's coordinate reference system, as WKT, if there is one.
+        """
+        self._path = path
+        self._columns = columns
+        self._geometry_column = geometry_column
+        self._crs = crs
+        self._table: Optional[pa.Table] = None
+        self._dataframe: Optional[Union[pd.DataFrame, gpd.GeoDataFrame]] = None
+        self._lock = RLock()
+
+    @property
+    def table(self) -> pa.Table:
+        """
+        The layer's memory-mapped Arrow table, which is opened when first accessed.
+
+        Returns
+        -------
+        pa.Table
+            The layer's memory-mapped Arrow table.
+        """
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self._table = pa.ipc.open_file(pa.memory_map(str(self._path), 'r')).read_all()
+        return self._table
+
+    def get_attributes(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Get attribute (i.e., non-geometry) columns of the layer as a dataframe, without decoding any geometries.
+
+        Parameters
+        ----------
+        columns : Optional[Sequence[str]]
+            The columns to get, by default all attribute columns.
+
+        Returns
+        -------
+        pd.DataFrame
+            The attribute columns of the layer.
+        """
+        if columns is None:
+            columns = [c for c in self._columns if c != self._geometry_column]
+        return self.table.select(list(columns)).to_pandas()
+
+    def to_dataframe(self) -> Union[pd.DataFrame, gpd.GeoDataFrame]:
+        """
+        Get the full layer as a (geo)dataframe, decoding geometries the first time this is called.
+
+        Returns
+        -------
+        Union[pd.DataFrame, gpd.GeoDataFrame]
+            The full layer, as a geodataframe for spatial layers or otherwise a plain dataframe.
+        """
+        if self._dataframe is None:
+            with self._lock:
+                if self._dataframe is None:
+                    self._dataframe = self._decode()
+        return self._dataframe
+
+    def _decode(self) -> Union[pd.DataFrame, gpd.GeoDataFrame]:
+        attributes = self.get_attributes()
+        if self._geometry_column is None:
+            return attributes
+        wkb = self.table.column(self._geometry_column).to_numpy(zero_copy_only=False)
+        attributes[self._geometry_column] = gpd.GeoSeries.from_wkb(wkb, crs=self._crs, index=attributes.index)
+        return gpd.GeoDataFrame(attributes[self._columns], geometry=self._geometry_column, crs=self._crs)
+
+
+class CachedLayers(Mapping):
+    """
+    Read-only mapping of layer names to (geo)dataframes, lazily decoded from the layers of a cache entry.
+    """
+
+    def __init__(self, layers: Dict[str, CachedLayer]):
+        self._layers = layers
+
+    def __getitem__(self, layer_name: str) -> Union[pd.DataFrame, gpd.GeoDataFrame]:
+        return self._layers[layer_name].to_dataframe()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layers)
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def get_layer(self, layer_name: str) -> CachedLayer:
+        """
+        Get the cached layer object for a layer, for access to it without decoding geometries.
+
+        Parameters
+        ----------
+        layer_name : str
+            The name of the layer.
+
+        Returns
+        -------
+        CachedLayer
+            The cached layer object.
+        """
+        return self._layers[layer_name]
+
+
+class HydrofabricCache:
+    """
+    Persistent, on-disk cache of hydrofabrics, converted once from their source files into columnar Arrow files.
+
+    Parsing GeoPackage or GeoJSON hydrofabric files is slow and memory-hungry for large domains, and every process that
+    needs a hydrofabric otherwise repeats it.  Instead, the first load of some source files stores each of their layers
+    in an uncompressed Arrow IPC file, with geometries as WKB, within a cache entry directory keyed by a hash of the
+    source files' contents.  Later loads memory-map these files and only decode geometries for layers that are used in
+    full.  GeoPackage entries also include precomputed topology arrays, so such hydrofabrics can be initialized from
+    identifier columns alone.
+
+    Hashing the contents of large files is itself costly, so computed hashes are also recorded, keyed by each file's
+    path, size, and modification time, and reused while those are unchanged.
+
+    Entries are written to a temporary directory and then moved into place, so concurrent processes converting the same
+    files do not see partial entries.
+    """
+
+    _GEOJSON_ENTRY_PREFIX = 'geojson'
+    _GEOPACKAGE_ENTRY_PREFIX = 'gpkg'
+    _HASHES_FILE_NAME = 'hashes.json'
+    _MANIFEST_FILE_NAME = 'manifest.json'
+    _TOPOLOGY_FILE_NAME = 'topology.arrow'
+
+    _TOPOLOGY_CAT_ID_COL = 'catchment_id'
+    _TOPOLOGY_OUTFLOW_COL = 'outflow_nexus_id'
+    _TOPOLOGY_INFLOW_COL = 'inflow_nexus_id'
+
+    @classmethod
+    def from_env(cls) -> Optional['HydrofabricCache']:
+        """
+        Get a cache in the directory given by the ::data:`CACHE_DIR_ENV_VAR` environment variable, if it is set.
+
+        Returns
+        -------
+        Optional[HydrofabricCache]
+            A cache in the configured directory, or ``None`` if the environment variable is not set.
+        """
+        cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+        return cls(cache_dir) if cache_dir else None
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize this instance.
+
+        Parameters
+        ----------
+        cache_dir : Union[str, Path]
+            The directory in which to store cache entries, which is created if it does not exist.
+        """
+        self._cache_dir = Path(cache_dir)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._hashes_lock = Lock()
+
+    def _hash_file(self, file: Path) -> str:
+        hasher = hashlib.sha256()
+        with file.open('rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _read_hashes(self) -> Dict[str, list]:
+        try:
+            return json.loads(self._cache_dir.joinpath(self._HASHES_FILE_NAME).read_text())
+        except (FileNotFoundError, ValueError):
+            return dict()
+
+    def _write_json(self, path: Path, obj):
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(obj, f)
+        os.replace(tmp_name, path)
+
+    def content_hash(self, file: Union[str, Path]) -> str:
+        """
+        Get the hash of a file's contents, reusing a recorded hash if the file has not changed since it was recorded.
+
+        Parameters
+        ----------
+        file : Union[str, Path]
+            The file.
+
+        Returns
+        -------
+        str
+            The hex digest of the SHA-256 hash of the file's contents.
+        """
+        path = Path(file).resolve()
+        stat = path.stat()
+        with self._hashes_lock:
+            hashes = self._read_hashes()
+            recorded = hashes.get(str(path))
+            if recorded is not None and recorded[:2] == [stat.st_size, stat.st_mtime_ns]:
+                return recorded[2]
+            digest = self._hash_file(path)
+            hashes = self._read_hashes()
+            hashes[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+            self._write_json(self._cache_dir.joinpath(self._HASHES_FILE_NAME), hashes)
+            return digest
+
+    def get_entry_key(self, prefix: str, files: Sequence[Union[str, Path]]) -> str:
+        """
+        Get the key of the cache entry for some hydrofabric source files.
+
+        Parameters
+        ----------
+        prefix : str
+            A prefix for the kind of hydrofabric.
+        files : Sequence[Union[str, Path]]
+            The source files, in the order in which they are used.
+
+        Returns
+        -------
+        str
+            The key, which is also the name of the entry's directory.
+        """
+        hasher = hashlib.sha256(f'{CACHE_FORMAT_VERSION}'.encode())
+        for file in files:
+            hasher.update(self.content_hash(file).encode())
+        return f'{prefix}-{hasher.hexdigest()}'
+
+    def get_entry_dir(self, key: str) -> Path:
+        """
+        Get the directory of the cache entry with the given key, which may not exist.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+
+        Returns
+        -------
+        Path
+            The entry's directory.
+        """
+        return self._cache_dir.joinpath(key)
+
+    def has_entry(self, key: str) -> bool:
+        """
+        Whether there is a complete cache entry with the given key.
+
+        Parameters
+        ----------
+        key : str
+            The entry key.
+
+        Returns
+        -------
+        bool
+            Whether there is a complete cache entry with the given key.
+        """
+        return self.get_entry_dir(key).joinpath(self._MANIFEST_FILE_NAME).is_file()
+
+    def clear(self):
+        """
+        Remove all cache entries and recorded file hashes.
+        """
+        for path in self._cache_dir.iterdir():
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_table(table: pa.Table, path: Path):
+        with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    def _write_layer(self, df: Union[pd.DataFrame, gpd.GeoDataFrame], path: Path) -> dict:
+        """
+        Write a layer to an Arrow IPC file, returning its manifest details.
+        """
+        df = df.reset_index(drop=df.index.name is None)
+        geometry_column, crs = None, None
+        if isinstance(df, gpd.GeoDataFrame) and df._geometry_column_name in df.columns:
+            geometry_column = df.geometry.name
+            crs = df.crs.to_wkt() if df.crs is not None else None
+            attributes = pd.DataFrame(df.drop(columns=[geometry_column]))
+        else:
+            attributes = pd.DataFrame(df)
+        table = pa.Table.from_pandas(attributes, preserve_index=False)
+        if geometry_column is not None:
+            table = table.append_column(geometry_column,
+                                        pa.array(df.geometry.to_wkb(), type=pa.large_binary(), from_pandas=True))
+        self._write_table(table, path)
+        return {'file': path.name, 'columns': [str(c) for c in df.columns], 'geometry': geometry_column, 'crs': crs}
+
+    def _store(self, key: str, layers: Dict[str, Union[pd.DataFrame, gpd.GeoDataFrame]], uid: str,
+               topology: Optional[pd.DataFrame] = None):
+        """
+        Store a new entry, atomically moving it into place unless another process has already done so.
+        """
+        entry_dir = self.get_entry_dir(key)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self._cache_dir, prefix=f'.{key}.'))
+        try:
+            manifest = {'format_version': CACHE_FORMAT_VERSION, 'uid': uid, 'layers': dict()}
+            for i, (layer_name, df) in enumerate(layers.items()):
+                manifest['layers'][layer_name] = self._write_layer(df, tmp_dir.joinpath(f'layer-{i}.arrow'))
+            if topology is not None:
+                self._write_table(pa.Table.from_pandas(topology, preserve_index=False),
+                                  tmp_dir.joinpath(self._TOPOLOGY_FILE_NAME))
+            self._write_json(tmp_dir.joinpath(self._MANIFEST_FILE_NAME), manifest)
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # Another process finished storing the same entry first, so just use that one
+                if not self.has_entry(key):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _load(self, key: str) -> Tuple[dict, CachedLayers]:
+        entry_dir = self.get_entry_dir(key)
+        manifest = json.loads(entry_dir.joinpath(self._MANIFEST_FILE_NAME).read_text())
+        layers = {name: CachedLayer(path=entry_dir.joinpath(details['file']), columns=details['columns'],
+                                    geometry_column=details['geometry'], crs=details['crs'])
+                  for name, details in manifest['layers'].items()}
+        return manifest, CachedLayers(layers)
+
+    def _create_geopackage_topology(self, divides: pd.DataFrame, nexuses: pd.DataFrame) -> pd.DataFrame:
+        """
+        Create topology arrays for a GeoPackage hydrofabric, with each catchment's outflow and inflow nexus.
+
+        Catchments without an inflow nexus are the roots of the hydrofabric.
+        """
+        cls = GeoPackageHydrofabric
+        inflows = nexuses[[cls._NEXUS_NEX_ID_COL, cls._NEXUS_TO_CAT_COL]].drop_duplicates(subset=cls._NEXUS_TO_CAT_COL)
+        inflows = inflows.rename(columns={cls._NEXUS_NEX_ID_COL: self._TOPOLOGY_INFLOW_COL,
+                                          cls._NEXUS_TO_CAT_COL: self._TOPOLOGY_CAT_ID_COL})
+        topology = pd.DataFrame({self._TOPOLOGY_CAT_ID_COL: divides[cls._DIVIDES_CAT_ID_COL].values,
+                                 self._TOPOLOGY_OUTFLOW_COL: divides[cls._DIVIDES_TO_NEX_COL].values})
+        return topology.merge(inflows, on=self._TOPOLOGY_CAT_ID_COL, how='left')
+
+    def get_geopackage_hydrofabric(self, geopackage_file: Union[str, Path], vpu: Optional[int] = None,
+                                   is_conus: bool = False) -> GeoPackageHydrofabric:
+        """
+        Get a GeoPackage hydrofabric, loading it from the cache or, if not cached, reading and then caching it.
+
+        Hydrofabrics loaded from the cache are initialized using only identifier columns and the precomputed topology
+        arrays; full layer dataframes, including geometries, are decoded on first use.
+
+        Parameters
+        ----------
+        geopackage_file : Union[str, Path]
+            The GeoPackage file.
+        vpu : Optional[int]
+            The VPU of the hydrofabric, if it is known.
+        is_conus : bool
+            Whether this hydrofabric is for all of CONUS.
+
+        Returns
+        -------
+        GeoPackageHydrofabric
+            The hydrofabric.
+        """
+        key = self.get_entry_key(self._GEOPACKAGE_ENTRY_PREFIX, [geopackage_file])
+        if not self.has_entry(key):
+            layer_names = [layer_info[0] for layer_info in pyogrio.list_layers(geopackage_file)]
+            dataframes = {ln: gpd.read_file(geopackage_file, layer=ln, engine="pyogrio") for ln in layer_names}
+            hydrofabric = GeoPackageHydrofabric(layer_names=layer_names, layer_dataframes=dataframes, vpu=vpu,
+                                                is_conus=is_conus)
+            topology = self._create_geopackage_topology(dataframes[GeoPackageHydrofabric._DIVIDES_LAYER_NAME],
+                                                        dataframes[GeoPackageHydrofabric._NEXUS_LAYER_NAME])
+            self._store(key, dataframes, uid=hydrofabric.uid, topology=topology)
+            return hydrofabric
+
+        manifest, layers = self._load(key)
+        cls = GeoPackageHydrofabric
+        topology = pa.ipc.open_file(pa.memory_map(str(self.get_entry_dir(key).joinpath(self._TOPOLOGY_FILE_NAME)),
+                                                  'r')).read_all()
+        inflows = topology.column(self._TOPOLOGY_INFLOW_COL)
+        cat_ids = topology.column(self._TOPOLOGY_CAT_ID_COL)
+        roots: FrozenSet[str] = frozenset(cat_ids.filter(inflows.is_null()).to_pylist())
+        topology_dataframes = {
+            cls._DIVIDES_LAYER_NAME: layers.get_layer(cls._DIVIDES_LAYER_NAME).get_attributes(
+                [cls._DIVIDES_CAT_ID_COL, cls._DIVIDES_TO_NEX_COL]),
+            cls._NEXUS_LAYER_NAME: layers.get_layer(cls._NEXUS_LAYER_NAME).get_attributes(
+                [cls._NEXUS_NEX_ID_COL, cls._NEXUS_TO_CAT_COL])}
+        return cls(layer_names=list(layers), layer_dataframes=layers, vpu=vpu, is_conus=is_conus,
+                   topology_dataframes=topology_dataframes, roots=roots, uid=manifest['uid'])
+
+    def get_geojson_hydrofabric(self, catchment_data: Union[str, Path], nexus_data: Union[str, Path],
+                                cross_walk: Union[str, Path]) -> GeoJsonHydrofabric:
+        """
+        Get a GeoJSON hydrofabric, loading its data from the cache or, if not cached, reading and then caching it.
+
+        Note that the object graph of a ::class:`GeoJsonHydrofabric` is built from its full dataframes, so geometries
+        are always decoded; caching still avoids parsing GeoJSON.
+
+        Parameters
+        ----------
+        catchment_data : Union[str, Path]
+            The catchment data GeoJSON file.
+        nexus_data : Union[str, Path]
+            The nexus data GeoJSON file.
+        cross_walk : Union[str, Path]
+            The crosswalk CSV or JSON file.
+
+        Returns
+        -------
+        GeoJsonHydrofabric
+            The hydrofabric.
+        """
+        key = self.get_entry_key(self._GEOJSON_ENTRY_PREFIX, [catchment_data, nexus_data, cross_walk])
+        if not self.has_entry(key):
+            reader = GeoJsonHydrofabricReader(catchment_data, nexus_data, cross_walk)
+            hydrofabric = GeoJsonHydrofabric(reader)
+            layers = {'catchment': reader.catchment_geodataframe, 'nexus': reader.nexus_geodataframe,
+                      'crosswalk': reader.crosswalk_dataframe}
+            self._store(key, layers, uid=hydrofabric.uid)
+            return hydrofabric
+
+        _, layers = self._load(key)
+        # Copy, since the reader standardizes the frames in place, and the cached frames are shared
+        reader = GeoJsonHydrofabricReader(layers['catchment'].copy(), layers['nexus'].copy(), layers['crosswalk'])
+        return GeoJsonHydrofabric(reader)
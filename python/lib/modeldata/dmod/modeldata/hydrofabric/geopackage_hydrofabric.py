@@ -1,13 +1,17 @@
 import pyogrio
 import geopandas as gpd
 import hashlib
+import pandas as pd
 from pandas.util import hash_pandas_object
 from pathlib import Path
-from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
 from hypy import Catchment, Nexus, Realization
 from .hydrofabric import Hydrofabric
 from ..subset import SubsetDefinition
 
+if TYPE_CHECKING:
+    from .cache import HydrofabricCache
+
 
 class GeoPackageCatchment(Catchment):
     """
@@ -324,7 +328,8 @@ class GeoPackageHydrofabric(Hydrofabric):
     _NEXUS_TO_CAT_COL = 'toid'
 
     @classmethod
-    def from_file(cls, geopackage_file: Union[str, Path, bytes], vpu: Optional[int] = None, is_conus: bool = False) -> 'GeoPackageHydrofabric':
+    def from_file(cls, geopackage_file: Union[str, Path, bytes], vpu: Optional[int] = None, is_conus: bool = False,
+                  cache: Optional['HydrofabricCache'] = None) -> 'GeoPackageHydrofabric':
         """
         Initialize a new instance from a GeoPackage file or contents of such a file (as ``bytes``).
 
@@ -339,12 +344,17 @@ class GeoPackageHydrofabric(Hydrofabric):
             The VPU of the hydrofabric to create, if it is known (defaults to ``None``).
         is_conus: bool
             Whether this hydrofabric is for all of CONUS (defaults to ``False``).
+        cache: Optional[HydrofabricCache]
+            Optional cache from which to load the hydrofabric, or in which to store it after reading, when
+            ``geopackage_file`` is a file path.
 
         Returns
         -------
         GeoPackageHydrofabric
             A new instance of this type.
         """
+        if cache is not None and not isinstance(geopackage_file, bytes):
+            return cache.get_geopackage_hydrofabric(geopackage_file, vpu=vpu, is_conus=is_conus)
         # pyogrio's function returns an ndarry of ndarrays, with inner layer info array containing layer name and type
         # We only need a list of layer names, though
         layer_names = [layer_info[0] for layer_info in pyogrio.list_layers(geopackage_file)]
@@ -353,17 +363,45 @@ class GeoPackageHydrofabric(Hydrofabric):
                    vpu=vpu,
                    is_conus=is_conus)
 
-    def __init__(self, layer_names: List[str], layer_dataframes: Dict[str, gpd.GeoDataFrame], vpu: Optional[int] = None,
-                 is_conus: bool = False):
+    def __init__(self, layer_names: List[str], layer_dataframes: Mapping[str, gpd.GeoDataFrame],
+                 vpu: Optional[int] = None, is_conus: bool = False,
+                 topology_dataframes: Optional[Dict[str, pd.DataFrame]] = None, roots: Optional[FrozenSet[str]] = None,
+                 uid: Optional[str] = None):
+        """
+        Initialize this instance.
+
+        Parameters
+        ----------
+        layer_names : List[str]
+            The names of the hydrofabric's layers.
+        layer_dataframes : Mapping[str, gpd.GeoDataFrame]
+            Mapping of layer names to layer dataframes, which may be lazily loaded (e.g., from a cache).
+        vpu : Optional[int]
+            The VPU of the hydrofabric, if it is known.
+        is_conus : bool
+            Whether this hydrofabric is for all of CONUS.
+        topology_dataframes : Optional[Dict[str, pd.DataFrame]]
+            Optional dataframes of just the id and ``toid`` columns of the ``divides`` and ``nexus`` layers, used in
+            place of the full layers for the hydrofabric's graph structure, so those do not need to be loaded.
+        roots : Optional[FrozenSet[str]]
+            The ids of the roots of the hydrofabric graph, if already known.
+        uid : Optional[str]
+            The unique id of the hydrofabric, if already known.
+        """
         self._layer_names: List[str] = layer_names
-        self._dataframes: Dict[str, gpd.GeoDataFrame] = layer_dataframes
-        self._roots = None
+        self._dataframes: Mapping[str, gpd.GeoDataFrame] = layer_dataframes
+        self._roots = roots
+        self._uid = uid
         self._vpu = vpu
         self._is_conus = is_conus
 
+        if topology_dataframes is None:
+            topology_dataframes = {ln: self._dataframes[ln] for ln in (self._DIVIDES_LAYER_NAME, self._NEXUS_LAYER_NAME)}
+        self._topology_dataframes: Dict[str, pd.DataFrame] = topology_dataframes
+
         #flowpaths = self._dataframes[self._FLOWPATHS_LAYER_NAME]
-        divides = self._dataframes[self._DIVIDES_LAYER_NAME]
-        nexuses = self._dataframes[self._NEXUS_LAYER_NAME]
+        divides = self._topology_dataframes[self._DIVIDES_LAYER_NAME]
+        nexuses = self._topology_dataframes[self._NEXUS_LAYER_NAME]
 
         col_args = {'col_cat_id': self._DIVIDES_CAT_ID_COL, 'col_nex_id': self._NEXUS_NEX_ID_COL,
                     'col_to_cat': self._NEXUS_TO_CAT_COL, 'col_to_nex': self._DIVIDES_TO_NEX_COL}
@@ -399,7 +437,7 @@ class GeoPackageHydrofabric(Hydrofabric):
         Tuple[str, ...]
             Ids for all contained catchments.
         """
-        return tuple(self._dataframes[self._DIVIDES_LAYER_NAME][self._DIVIDES_CAT_ID_COL].values)
+        return tuple(self._topology_dataframes[self._DIVIDES_LAYER_NAME][self._DIVIDES_CAT_ID_COL].values)
 
     def get_all_nexus_ids(self) -> Tuple[str, ...]:
         """
@@ -410,7 +448,7 @@ class GeoPackageHydrofabric(Hydrofabric):
         Tuple[str, ...]
             Ids for all contained nexuses.
         """
-        return tuple(self._dataframes[self._NEXUS_LAYER_NAME][self._NEXUS_NEX_ID_COL].values)
+        return tuple(self._topology_dataframes[self._NEXUS_LAYER_NAME][self._NEXUS_NEX_ID_COL].values)
 
     def get_catchment_by_id(self, catchment_id: str) -> Optional[GeoPackageCatchment]:
         return self._catchments.get(catchment_id)
@@ -487,7 +525,7 @@ class GeoPackageHydrofabric(Hydrofabric):
         bool
             Whether the catchment is recognized.
         """
-        return catchment_id in self._dataframes[self._DIVIDES_LAYER_NAME][self._DIVIDES_CAT_ID_COL].values
+        return catchment_id in self._catchments
 
     @property
     def is_conus(self) -> bool:
@@ -515,7 +553,7 @@ class GeoPackageHydrofabric(Hydrofabric):
        bool
            Whether the nexus is recognized.
        """
-        return nexus_id in self._dataframes[self._NEXUS_LAYER_NAME][self._NEXUS_NEX_ID_COL].values
+        return nexus_id in self._nexuses
 
     @property
     def roots(self) -> FrozenSet[str]:
@@ -532,8 +570,8 @@ class GeoPackageHydrofabric(Hydrofabric):
         ::attribute:`hydrofabric_graph`
         """
         if self._roots is None:
-            divides_df = self._dataframes[self._DIVIDES_LAYER_NAME]
-            nexuses_df = self._dataframes[self._NEXUS_LAYER_NAME]
+            divides_df = self._topology_dataframes[self._DIVIDES_LAYER_NAME]
+            nexuses_df = self._topology_dataframes[self._NEXUS_LAYER_NAME]
             self._roots = frozenset(divides_df.loc[~divides_df[self._DIVIDES_CAT_ID_COL].isin(
                 nexuses_df[self._NEXUS_TO_CAT_COL].values)][self._DIVIDES_CAT_ID_COL].values)
         return self._roots
@@ -550,8 +588,11 @@ class GeoPackageHydrofabric(Hydrofabric):
         int
             A unique id for this instance.
         """
-        layer_hashes = [hash_pandas_object(self._dataframes[layer]).values.sum() for layer in sorted(self._layer_names)]
-        return hashlib.sha1(','.join([str(h) for h in layer_hashes]).encode('UTF-8')).hexdigest()
+        if self._uid is None:
+            layer_hashes = [hash_pandas_object(self._dataframes[layer]).values.sum()
+                            for layer in sorted(self._layer_names)]
+            self._uid = hashlib.sha1(','.join([str(h) for h in layer_hashes]).encode('UTF-8')).hexdigest()
+        return self._uid
 
     @property
     def vpu(self) -> Optional[int]:
@@ -5,9 +5,12 @@ from abc import ABC, abstractmethod
 from collections import defaultdict
 from hypy import Catchment, HydroLocation, Nexus
 from pathlib import Path
-from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 from ..subset import SubsetDefinition
 
+if TYPE_CHECKING:
+    from .cache import HydrofabricCache
+
 
 class Hydrofabric(ABC):
 
@@ -384,9 +387,13 @@ class HydrofabricFilesManager(ABC):
     initially setting ``None`` to a corresponding hydrofabric's index.  This is to avoid loading all found hydrofabrics
     initially.
 
+    An optional ::class:`HydrofabricCache` may be supplied at initialization, in which case found hydrofabrics are
+    loaded through it, so that their files are only parsed the first time any process on the host loads them.
+
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, hydrofabric_cache: Optional['HydrofabricCache'] = None, **kwargs):
+        self._hydrofabric_cache: Optional['HydrofabricCache'] = hydrofabric_cache
         self._hydrofabric_files: List[Tuple[Path, ...]] = []
         self._hydrofabric_initializers: List[Callable[[Any, ...], Hydrofabric]] = []
         self._hydrofabric_uids: List[Optional[str]] = []
@@ -414,8 +421,9 @@ class HydrofabricFilesManager(ABC):
         done.  For this, all three files must have the same (potentially empty) substring for the ``*`` component of the
         file base name, and must be located within the same directory.  When all three exist, the catchment, nexus, and
         crosswalk files are saved into a files tuple in that order, and a callable to the
-        ::method:`GeoJsonHydrofabric.factory_create_from_data` factory class method is saved for use with initializing
-        an instance.
+        ::method:`GeoJsonHydrofabric.factory_create_from_data` factory class method (or, if the instance has a
+        hydrofabric cache, to the cache's ::method:`HydrofabricCache.get_geojson_hydrofabric` method) is saved for use
+        with initializing an instance.
 
         The above described search is the only supported search operation.  As such, only ::class:`GeoJsonHydrofabric`
         hydrofabrics are supported in the base implementation.
@@ -447,7 +455,10 @@ class HydrofabricFilesManager(ABC):
             # If all the files with corresponding id patterns exist, then assume this must be a geojson hydrofabric
             if catchment_file.is_file() and nexus_file.is_file() and crosswalk_file.is_file():
                 self._hydrofabric_files.append((catchment_file, nexus_file, crosswalk_file))
-                self._hydrofabric_initializers.append(GeoJsonHydrofabric.factory_create_from_data)
+                if self._hydrofabric_cache is not None:
+                    self._hydrofabric_initializers.append(self._hydrofabric_cache.get_geojson_hydrofabric)
+                else:
+                    self._hydrofabric_initializers.append(GeoJsonHydrofabric.factory_create_from_data)
                 # For now, don't inflate a hydrofabric to get its uid
                 self._hydrofabric_uids.append(None)
 
@@ -1,3 +1,4 @@
 from .subset_definition import SubsetDefinition
 from .hydrofabric_subset import HydrofabricSubset, SimpleHydrofabricSubset
 from .subset_handler import SubsetHandler
+from .upstream_index import UpstreamIndex
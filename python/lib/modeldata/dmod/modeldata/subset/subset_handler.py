@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 from hypy import Catchment, Nexus
 from queue import Queue
+from threading import Lock
 from typing import Collection, Optional, Set, Tuple, Union
 from .subset_definition import SubsetDefinition
-from ..hydrofabric import Hydrofabric, GeoJsonHydrofabricReader, GeoJsonHydrofabric
+from .upstream_index import UpstreamIndex
+from ..hydrofabric import Hydrofabric, GeoJsonHydrofabricReader, GeoJsonHydrofabric, HydrofabricCache
 
 
 class SubsetValidator(ABC):
@@ -107,28 +109,23 @@ class BasicSubsetValidator(SubsetValidator):
             cid = subset.catchment_ids[0]
             return None if self.hydrofabric.is_catchment_recognized(cid) else 'Unrecognized catchment: {}'.format(cid)
 
+        # Membership is checked against sets, as the subset's (sorted) tuples would make these checks linear
+        subset_nexus_ids = frozenset(subset.nexus_ids)
+        subset_catchment_ids = frozenset(subset.catchment_ids)
+
         for cid in subset.catchment_ids:
             catchment = self.hydrofabric.get_catchment_by_id(cid)
             if catchment is None:
                 return 'Unrecognized catchment: {}'.format(cid)
-            connected_nexus_found = False
-            for n in [catchment.outflow, catchment.inflow]:
-                if n.id in subset.nexus_ids:
-                    connected_nexus_found = True
-                    break
-            if not connected_nexus_found:
+            if not any(n is not None and n.id in subset_nexus_ids for n in (catchment.outflow, catchment.inflow)):
                 return 'Catchment {} has no connected nexus included in this subset'.format(cid)
 
         for nid in subset.nexus_ids:
             nexus = self.hydrofabric.get_nexus_by_id(nid)
             if nexus is None:
                 return 'Unrecognized nexus: {}'.format(nid)
-            connected_cat_found = False
-            for c in [i for sub in [nexus.contributing_catchments, nexus.receiving_catchments] for i in sub]:
-                if c.id in subset.catchment_ids:
-                    connected_cat_found = True
-                    break
-            if not connected_cat_found:
+            connected = (nexus.contributing_catchments or (), nexus.receiving_catchments or ())
+            if not any(c.id in subset_catchment_ids for catchments in connected for c in catchments):
                 return 'Nexus {} has no connected catchment included in this subset'.format(nid)
 
         return None
@@ -138,8 +135,12 @@ class SubsetHandler:
 
     @classmethod
     def factory_create_from_geojson(cls, catchment_data, nexus_data, cross_walk,
-                                    validator: Optional[SubsetValidator] = None) -> 'SubsetHandler':
-        hydrofabric = GeoJsonHydrofabric(GeoJsonHydrofabricReader(catchment_data, nexus_data, cross_walk))
+                                    validator: Optional[SubsetValidator] = None,
+                                    cache: Optional[HydrofabricCache] = None) -> 'SubsetHandler':
+        if cache is not None:
+            hydrofabric = cache.get_geojson_hydrofabric(catchment_data, nexus_data, cross_walk)
+        else:
+            hydrofabric = GeoJsonHydrofabric(GeoJsonHydrofabricReader(catchment_data, nexus_data, cross_walk))
         return cls(hydrofabric=hydrofabric, validator=validator)
 
     def __init__(self, hydrofabric: Hydrofabric, validator: Optional[SubsetValidator] = None):
@@ -153,6 +154,8 @@ class SubsetHandler:
         """
         self._hydrofabric = hydrofabric
         self._validator = validator if validator else BasicSubsetValidator(hydrofabric)
+        self._upstream_index: Optional[UpstreamIndex] = None
+        self._upstream_index_lock = Lock()
 
     def get_catchment_by_id(self, catchment_id: str) -> Optional[Catchment]:
         """
@@ -186,6 +189,22 @@ class SubsetHandler:
         """
         return self._hydrofabric.get_nexus_by_id(nexus_id)
 
+    @property
+    def upstream_index(self) -> UpstreamIndex:
+        """
+        The index of upstream closures of the hydrofabric's catchments, lazily built on first use.
+
+        Returns
+        -------
+        UpstreamIndex
+            The index of upstream closures of the hydrofabric's catchments.
+        """
+        if self._upstream_index is None:
+            with self._upstream_index_lock:
+                if self._upstream_index is None:
+                    self._upstream_index = UpstreamIndex(self._hydrofabric)
+        return self._upstream_index
+
     def get_subset_for(self, catchment_ids: Union[str, Collection[str]]) -> SubsetDefinition:
         """
         Get the subset for a particular collection of catchments and the downstream nexus of each.
@@ -224,6 +243,9 @@ class SubsetHandler:
         negative value is supplied, the graph is traversed completely across all recursive upstream relationships as
         described above.
 
+        Full traversals (i.e., without a link limit) are answered through ::attribute:`upstream_index`, so repeated
+        requests do not traverse the graph again.
+
         Parameters
         ----------
         catchment_ids: Union[str, Collection[str]]
@@ -240,6 +262,19 @@ class SubsetHandler:
             link_limit = None
         if isinstance(catchment_ids, str):
             catchment_ids = [catchment_ids]
+
+        if link_limit is None:
+            # As with a traversal, start from each recognized catchment and its downstream nexus
+            starting_ids: Set[str] = set()
+            for cid in catchment_ids:
+                starting_catchment = self.get_catchment_by_id(cid)
+                if isinstance(starting_catchment, Catchment):
+                    starting_ids.add(cid)
+                    if starting_catchment.outflow is not None:
+                        starting_ids.add(starting_catchment.outflow.id)
+            cat_ids, nex_ids = self.upstream_index.get_upstream_ids(starting_ids)
+            return SubsetDefinition(catchment_ids=cat_ids, nexus_ids=nex_ids)
+
         cat_ids: Set[str] = set()
         nex_ids: Set[str] = set()
         # Construct queue of graph nodes to be processed, start from initially given catchments and their downstream
@@ -0,0 +1,233 @@
+import numpy as np
+from collections import OrderedDict
+from hypy import Catchment, Nexus
+from queue import Queue
+from threading import RLock
+from typing import Collection, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+from ..hydrofabric import Hydrofabric
+
+
+class UpstreamIndex:
+    """
+    Index for quickly finding every catchment and nexus upstream of features in a hydrofabric.
+
+    When building the index, each feature of the hydrofabric is labeled with an interval, via a depth-first traversal of
+    the upstream relationships (i.e., ::attribute:`Catchment.inflow` and ::attribute:`Nexus.contributing_catchments`)
+    starting from the downstream-most features.  As long as every feature is reachable from no more than one
+    downstream feature - which holds for typical dendritic hydrofabrics - the features upstream of a feature are
+    exactly those with labels inside that feature's interval.  This makes finding the full upstream closure of a
+    feature a slice of a precomputed ordering, rather than a traversal of the object graph.
+
+    Hydrofabrics for which that does not hold (e.g., because a nexus flows into several catchments) cannot be labeled
+    like this.  For these, closures are instead found by traversal and memoized per feature, with the least recently
+    used closures discarded once ``cache_size`` closures are cached.
+
+    Once built, an instance is safe to share across threads.
+    """
+
+    def __init__(self, hydrofabric: Hydrofabric, cache_size: int = 1024):
+        """
+        Initialize the instance, labeling the features of the given hydrofabric.
+
+        Parameters
+        ----------
+        hydrofabric : Hydrofabric
+            The hydrofabric to index, which should not be modified after the index is created.
+        cache_size : int
+            The maximum number of memoized closures, for hydrofabrics that cannot be labeled with intervals.
+        """
+        self._hydrofabric = hydrofabric
+        self._cache_size = cache_size
+        self._closure_cache: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = OrderedDict()
+        self._cache_lock = RLock()
+        self._intervals: Optional[Dict[str, Tuple[int, int]]] = None
+        """ The (start inclusive, end exclusive) interval of labels upstream of each feature, keyed by feature id. """
+        self._ordered_ids: Optional[np.ndarray] = None
+        """ The ids of all features, ordered by label. """
+        self._ordered_is_catchment: Optional[np.ndarray] = None
+        """ Mask of which values in ::attribute:`_ordered_ids` are catchment ids (as opposed to nexus ids). """
+        self._label_features()
+
+    def _label_features(self):
+        """
+        Label the hydrofabric's features with intervals, if possible.
+
+        If some feature is connected to more than one downstream feature, has an upstream connection to a feature not
+        in the hydrofabric, or is part of a cycle, no labels are applied.
+        """
+        catchment_ids = self._hydrofabric.get_all_catchment_ids()
+        nexus_ids = self._hydrofabric.get_all_nexus_ids()
+
+        upstream_ids: Dict[str, Tuple[str, ...]] = dict()
+        for cid in catchment_ids:
+            inflow = self._hydrofabric.get_catchment_by_id(cid).inflow
+            upstream_ids[cid] = () if inflow is None else (inflow.id,)
+        for nid in nexus_ids:
+            contributing = self._hydrofabric.get_nexus_by_id(nid).contributing_catchments
+            upstream_ids[nid] = tuple(c.id for c in contributing) if contributing else ()
+
+        downstream_counts: Dict[str, int] = dict.fromkeys(upstream_ids, 0)
+        for connected_ids in upstream_ids.values():
+            for feature_id in connected_ids:
+                if feature_id not in downstream_counts:
+                    return
+                downstream_counts[feature_id] += 1
+                if downstream_counts[feature_id] > 1:
+                    return
+
+        ordered_ids: List[str] = []
+        intervals: Dict[str, Tuple[int, int]] = dict()
+        for outlet_id in (feature_id for feature_id, count in downstream_counts.items() if count == 0):
+            # Stack of feature ids, along with whether all features upstream of that feature have been labeled
+            stack: List[Tuple[str, bool]] = [(outlet_id, False)]
+            while stack:
+                feature_id, is_finished = stack.pop()
+                if is_finished:
+                    intervals[feature_id] = (intervals[feature_id][0], len(ordered_ids))
+                    continue
+                intervals[feature_id] = (len(ordered_ids), -1)
+                ordered_ids.append(feature_id)
+                stack.append((feature_id, True))
+                stack.extend((upstream_id, False) for upstream_id in upstream_ids[feature_id])
+
+        # Features in cycles are never reached from an outlet
+        if len(ordered_ids) != len(upstream_ids):
+            return
+
+        self._intervals = intervals
+        self._ordered_ids = np.array(ordered_ids, dtype=object)
+        catchment_id_set = frozenset(catchment_ids)
+        self._ordered_is_catchment = np.fromiter((fid in catchment_id_set for fid in ordered_ids), dtype=bool,
+                                                 count=len(ordered_ids))
+
+    def _traverse_upstream(self, feature: Union[Catchment, Nexus]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Find the closure of a feature by traversing the object graph upstream of it.
+
+        Parameters
+        ----------
+        feature : Union[Catchment, Nexus]
+            The catchment or nexus from which to start.
+
+        Returns
+        -------
+        Tuple[FrozenSet[str], FrozenSet[str]]
+            The ids of all catchments and the ids of all nexuses in the closure, which includes the feature itself.
+        """
+        cat_ids: Set[str] = set()
+        nex_ids: Set[str] = set()
+        # Nodes are tuples of catchment/nexus object and bool of whether node is catchment (not nexus)
+        graph_nodes = Queue()
+        graph_nodes.put((feature, isinstance(feature, Catchment)))
+        while graph_nodes.qsize() > 0:
+            item, is_catchment = graph_nodes.get()
+            if item is None:
+                continue
+            if is_catchment and item.id not in cat_ids:
+                cat_ids.add(item.id)
+                graph_nodes.put((item.inflow, False))
+            elif not is_catchment and item.id not in nex_ids:
+                nex_ids.add(item.id)
+                for c in item.contributing_catchments or ():
+                    graph_nodes.put((c, True))
+        return frozenset(cat_ids), frozenset(nex_ids)
+
+    @property
+    def is_labeled(self) -> bool:
+        """
+        Whether the hydrofabric's features could be labeled with intervals.
+
+        Returns
+        -------
+        bool
+            Whether the hydrofabric's features could be labeled with intervals.
+        """
+        return self._intervals is not None
+
+    def get_upstream_closure(self, feature_id: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Get the ids of a feature and of all catchments and nexuses upstream of it.
+
+        Parameters
+        ----------
+        feature_id : str
+            The id of the catchment or nexus from which to start.
+
+        Returns
+        -------
+        Tuple[FrozenSet[str], FrozenSet[str]]
+            The ids of all catchments and the ids of all nexuses in the closure, which includes the feature itself, with
+            both empty if the feature is not recognized.
+        """
+        return self.get_upstream_ids([feature_id])
+
+    def get_upstream_ids(self, feature_ids: Collection[str]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Get the ids of the given features and of all catchments and nexuses upstream of any of them.
+
+        Parameters
+        ----------
+        feature_ids : Collection[str]
+            The ids of the catchments and/or nexuses from which to start, with any not recognized being ignored.
+
+        Returns
+        -------
+        Tuple[FrozenSet[str], FrozenSet[str]]
+            The ids of all catchments and the ids of all nexuses that are either one of the given features or upstream of
+            one of them.
+        """
+        if self._intervals is None:
+            cat_ids: Set[str] = set()
+            nex_ids: Set[str] = set()
+            for feature_id in feature_ids:
+                closure = self._get_memoized_closure(feature_id)
+                cat_ids.update(closure[0])
+                nex_ids.update(closure[1])
+            return frozenset(cat_ids), frozenset(nex_ids)
+
+        # Intervals in a forest are either nested or disjoint, so skip any inside the previously included interval
+        slices: List[np.ndarray] = []
+        included_end = -1
+        for start, end in sorted({self._intervals[fid] for fid in feature_ids if fid in self._intervals}):
+            if end > included_end:
+                slices.append(np.arange(start, end))
+                included_end = end
+        if not slices:
+            return frozenset(), frozenset()
+
+        labels = np.concatenate(slices)
+        is_catchment = self._ordered_is_catchment[labels]
+        ordered_ids = self._ordered_ids[labels]
+        return frozenset(ordered_ids[is_catchment]), frozenset(ordered_ids[~is_catchment])
+
+    def _get_memoized_closure(self, feature_id: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Get the closure of a feature from the cache, traversing the object graph and caching it if needed.
+
+        Parameters
+        ----------
+        feature_id : str
+            The id of the catchment or nexus from which to start.
+
+        Returns
+        -------
+        Tuple[FrozenSet[str], FrozenSet[str]]
+            The ids of all catchments and the ids of all nexuses in the closure, which includes the feature itself.
+        """
+        with self._cache_lock:
+            if feature_id in self._closure_cache:
+                self._closure_cache.move_to_end(feature_id)
+                return self._closure_cache[feature_id]
+
+        feature = self._hydrofabric.get_catchment_by_id(feature_id)
+        if feature is None:
+            feature = self._hydrofabric.get_nexus_by_id(feature_id)
+        if feature is None:
+            return frozenset(), frozenset()
+        closure = self._traverse_upstream(feature)
+
+        with self._cache_lock:
+            self._closure_cache[feature_id] = closure
+            while len(self._closure_cache) > self._cache_size:
+                self._closure_cache.popitem(last=False)
+        return closure
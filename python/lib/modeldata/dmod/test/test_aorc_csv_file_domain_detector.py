@@ -64,3 +64,23 @@ class TestAorcCsvFileDomainDetector(unittest.TestCase):
         domain = detector.detect()
         self.assertEqual(self.example_cat_id[ex_idx],
                          domain.discrete_restrictions[StandardDatasetIndex.CATCHMENT_ID].values[0])
+
+    def test_detect_0_f(self):
+        """ Test that detect gets the same domain from raw bytes as from the file, reading small trailing blocks. """
+        ex_idx = 0
+
+        expected = self.detector_subclass(item=self.example_data[ex_idx]).detect()
+        data = self.example_data[ex_idx].read_bytes()
+        detector = self.detector_subclass(item=data, item_name=self.example_data[ex_idx].name)
+        detector._tail_read_size = 16
+        self.assertEqual(expected, detector.detect())
+
+    def test_detect_0_g(self):
+        """ Test that detect gets the same domain from a seekable reader, and leaves it at the start. """
+        ex_idx = 0
+
+        expected = self.detector_subclass(item=self.example_data[ex_idx]).detect()
+        with self.example_data[ex_idx].open('rb') as reader:
+            detector = self.detector_subclass(item=reader, item_name=self.example_data[ex_idx].name)
+            self.assertEqual(expected, detector.detect())
+            self.assertEqual(0, reader.tell())
@@ -0,0 +1,183 @@
+import git
+import os
+import tarfile
+import tempfile
+import time
+import unittest
+import zipfile
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from shapely.geometry import Point
+from typing import Dict
+
+from dmod.core.dataset import DataArchiving
+from ..modeldata.data.bmi_init_config_auto_generator import BmiInitConfigAutoGenerator, NgenRealization
+
+BENCHMARK_DIVIDE_COUNT = int(os.environ.get("DMOD_BMI_GEN_BENCHMARK_DIVIDES", 100_000))
+""" The number of synthetic divides to generate configs for when comparing serial and sharded generation. """
+
+SOIL_LAYER_ATTRIBUTES = ["bexp", "dksat", "psisat", "quartz", "smcmax", "smcwlt"]
+
+
+def create_hydrofabric(divide_count: int, seed: int = 42):
+    """
+    Create synthetic hydrofabric divides and model attributes for the given number of divides.
+
+    Returns
+    -------
+    Tuple[gpd.GeoDataFrame, pd.DataFrame]
+        The synthetic divides data and model attributes data.
+    """
+    rng = np.random.default_rng(seed)
+    divide_ids = [f"cat-{i}" for i in range(1, divide_count + 1)]
+    x = rng.uniform(-124.0, -67.0, divide_count)
+    y = rng.uniform(25.0, 49.0, divide_count)
+
+    divides = gpd.GeoDataFrame(
+        {
+            "divide_id": divide_ids,
+            "toid": [f"nex-{i}" for i in range(2, divide_count + 2)],
+            "type": "network",
+            "ds_id": np.nan,
+            "areasqkm": rng.uniform(1.0, 50.0, divide_count),
+            "id": [f"wb-{i}" for i in range(1, divide_count + 1)],
+            "lengthkm": rng.uniform(0.5, 10.0, divide_count),
+            "tot_drainage_areasqkm": rng.uniform(1.0, 5000.0, divide_count),
+            "has_flowline": True,
+        },
+        geometry=[Point(px, py).buffer(0.01) for px, py in zip(x, y)],
+        crs="EPSG:4326")
+
+    attributes: Dict[str, object] = {
+        "divide_id": divide_ids,
+        "X": x,
+        "Y": y,
+        "elevation_mean": rng.uniform(0.0, 3000.0, divide_count),
+        "slope": rng.uniform(0.0, 1.0, divide_count),
+        "slope_mean": rng.uniform(0.0, 1.0, divide_count),
+        "aspect_c_mean": rng.uniform(0.0, 360.0, divide_count),
+        "impervious_mean": rng.uniform(0.0, 1.0, divide_count),
+        "ISLTYP": rng.integers(1, 20, divide_count),
+        "IVGTYP": rng.integers(1, 28, divide_count),
+        "gw_Coeff": rng.uniform(0.0, 0.01, divide_count),
+        "gw_Expon": rng.uniform(1.0, 8.0, divide_count),
+        "gw_Zmax": rng.uniform(0.01, 0.25, divide_count),
+        "refkdt": rng.uniform(0.1, 4.0, divide_count),
+        "mult": rng.uniform(100.0, 1000.0, divide_count),
+        "cwpvt": rng.uniform(0.1, 0.4, divide_count),
+        "mfsno": rng.uniform(0.5, 4.0, divide_count),
+        "mp": rng.uniform(3.0, 12.0, divide_count),
+        "vcmx25": rng.uniform(20.0, 100.0, divide_count),
+    }
+    for name in SOIL_LAYER_ATTRIBUTES:
+        for layer in range(1, 5):
+            attributes[f"{name}_soil_layers_stag={layer}"] = rng.uniform(0.01, 1.0, divide_count)
+
+    return divides, pd.DataFrame(attributes)
+
+
+def write_serially(generator: BmiInitConfigAutoGenerator, output_dir: Path) -> Dict[str, bytes]:
+    generator.write_configs(output_dir)
+    return {p.name: p.read_bytes() for p in output_dir.iterdir()}
+
+
+class TestBmiInitConfigShardedGeneration(unittest.TestCase):
+
+    @property
+    def proj_root(self) -> Path:
+        return Path(git.Repo(__file__, search_parent_directories=True).working_dir)
+
+    def create_generator(self, divide_count: int, **kwargs) -> BmiInitConfigAutoGenerator:
+        # This realization config uses PET, CFE, and NoahOWP modules in its global formulation
+        real_cfg_file = self.proj_root.joinpath("data/example_realization_configs/ex_realization_config_03.json")
+        divides, attributes = create_hydrofabric(divide_count)
+        return BmiInitConfigAutoGenerator(ngen_realization=NgenRealization.parse_file(real_cfg_file),
+                                          hydrofabric_data=divides,
+                                          hydrofabric_model_attributes=attributes,
+                                          noah_owp_params_dir=Path("/dmod/noah_owp_params"),
+                                          **kwargs)
+
+    def test_create_shards_0_a(self):
+        """ Test that shards partition the divides in order and hold only their slice of the data. """
+        generator = self.create_generator(1_050)
+        shards = list(generator.create_shards(shard_size=100))
+
+        self.assertEqual(len(shards), 11)
+        self.assertEqual([len(s._hf_data) for s in shards], [100] * 10 + [50])
+        self.assertEqual([len(s._hf_model_attributes) for s in shards], [100] * 10 + [50])
+        self.assertEqual([d for s in shards for d in s._hf_data["divide_id"]], list(generator._hf_data["divide_id"]))
+
+    def test_create_shards_0_b(self):
+        """ Test that shards respect a catchment subset. """
+        generator = self.create_generator(1_000, catchment_subset={"cat-3", "cat-500", "cat-999"})
+        shards = list(generator.create_shards(shard_size=2))
+
+        self.assertEqual(len(shards), 2)
+        self.assertEqual([list(s._hf_data["divide_id"]) for s in shards], [["cat-3", "cat-500"], ["cat-999"]])
+
+    def test_serialize_configs_0_a(self):
+        """ Test that sharded generation produces exactly the configs of serial generation, in the same order. """
+        generator = self.create_generator(500)
+
+        serial = list(generator.serialize_configs())
+        sharded = list(generator.serialize_configs(processes=3, shard_size=37))
+
+        self.assertEqual(len(serial), 3 * 500)
+        self.assertEqual(serial, sharded)
+
+    def test_write_archive_0_a(self):
+        """ Test that an archive holds the same file names and content as loose files from the serial writer. """
+        generator = self.create_generator(300)
+
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            temp_dir = Path(temp_dir_name)
+            expected = write_serially(generator, temp_dir.joinpath("serial"))
+
+            for archiving in (DataArchiving.ZIP_0, DataArchiving.ZIP_9, DataArchiving.TAR_GZIP):
+                archive_file = generator.write_archive(temp_dir.joinpath(f"configs{archiving.extension}"),
+                                                       archiving=archiving, processes=2, shard_size=64)
+                extract_dir = temp_dir.joinpath(f"extract_{archiving.name}")
+                if archiving.extension == ".zip":
+                    with zipfile.ZipFile(archive_file) as archive:
+                        archive.extractall(extract_dir)
+                else:
+                    with tarfile.open(archive_file) as archive:
+                        archive.extractall(extract_dir)
+                self.assertEqual({p.name: p.read_bytes() for p in extract_dir.iterdir()}, expected)
+
+    def test_write_archive_0_b(self):
+        """ Test that archives are deterministic. """
+        generator = self.create_generator(200)
+
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            first = generator.write_archive(Path(temp_dir_name).joinpath("first.zip"), processes=2, shard_size=50)
+            second = generator.write_archive(Path(temp_dir_name).joinpath("second.zip"), processes=4, shard_size=7)
+            self.assertEqual(first.read_bytes(), second.read_bytes())
+
+    def test_benchmark_0_a(self):
+        """ Compare writing loose files serially with writing an archive from a process pool. """
+        generator = self.create_generator(BENCHMARK_DIVIDE_COUNT)
+        processes = os.cpu_count() or 1
+
+        with tempfile.TemporaryDirectory() as temp_dir_name:
+            temp_dir = Path(temp_dir_name)
+
+            serial_start = time.perf_counter()
+            expected = write_serially(generator, temp_dir.joinpath("serial"))
+            serial_seconds = time.perf_counter() - serial_start
+
+            sharded_start = time.perf_counter()
+            archive_file = generator.write_archive(temp_dir.joinpath("configs.zip"), processes=processes)
+            sharded_seconds = time.perf_counter() - sharded_start
+
+            with zipfile.ZipFile(archive_file) as archive:
+                self.assertEqual(len(archive.namelist()), len(expected))
+                for name in archive.namelist()[::997]:
+                    self.assertEqual(archive.read(name), expected[name])
+
+        if processes >= 4:
+            self.assertLess(sharded_seconds * 2, serial_seconds)
@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..modeldata.hydrofabric import GeoJsonHydrofabric, GeoPackageHydrofabric, HydrofabricCache, \
+    HydrofabricFilesManager
+from ..modeldata.subset import SubsetDefinition, SubsetHandler
+from ..test.abstract_geopackage_hydrofabric_tester import AbstractGeoPackageHydrofabricTester
+
+
+class _CachingFilesManager(HydrofabricFilesManager):
+
+    def __init__(self, root_dir: Path, cache: HydrofabricCache):
+        self._root_dir = root_dir
+        super().__init__(hydrofabric_cache=cache)
+
+    @property
+    def hydrofabric_data_root_dir(self) -> Path:
+        return self._root_dir
+
+
+class TestHydrofabricCache(unittest.TestCase):
+
+    _GEOPACKAGE_RELATIVE_PATH = 'data/example_hydrofabric_2/hydrofabric.gpkg'
+    _GEOJSON_RELATIVE_DIR = 'data/example_hydrofabric_1'
+    _GEOPACKAGE_UID = 'b671cf04fdf5e1129b029663aae59abbcda7ec7a'
+
+    def setUp(self) -> None:
+        proj_root = AbstractGeoPackageHydrofabricTester.find_project_root()
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        self.tmp_path = Path(self._tmp_dir.name)
+        self.geopackage_file = proj_root.joinpath(self._GEOPACKAGE_RELATIVE_PATH)
+        self.geojson_dir = proj_root.joinpath(self._GEOJSON_RELATIVE_DIR)
+        self.cache = HydrofabricCache(self.tmp_path.joinpath('cache'))
+
+    def _geojson_files(self):
+        return tuple(self.geojson_dir.joinpath(f) for f in ('catchment_data.geojson', 'nexus_data.geojson',
+                                                            'crosswalk.json'))
+
+    def test_get_geopackage_hydrofabric_0_a(self):
+        """ Test that a hydrofabric loaded from the cache matches the hydrofabric read from the original file. """
+        original = GeoPackageHydrofabric.from_file(self.geopackage_file)
+        cold = GeoPackageHydrofabric.from_file(self.geopackage_file, cache=self.cache)
+        warm = GeoPackageHydrofabric.from_file(self.geopackage_file, cache=self.cache)
+
+        self.assertEqual(cold.uid, self._GEOPACKAGE_UID)
+        self.assertEqual(warm.uid, self._GEOPACKAGE_UID)
+        self.assertEqual(set(warm.get_all_catchment_ids()), set(original.get_all_catchment_ids()))
+        self.assertEqual(set(warm.get_all_nexus_ids()), set(original.get_all_nexus_ids()))
+        self.assertEqual(warm.roots, original.roots)
+        self.assertEqual(warm.get_catchment_by_id('cat-8').outflow.id, original.get_catchment_by_id('cat-8').outflow.id)
+        self.assertEqual(warm.get_catchment_by_id('cat-8').inflow.id, original.get_catchment_by_id('cat-8').inflow.id)
+        for layer_name in original._layer_names:
+            with self.subTest(layer=layer_name):
+                self.assertTrue(original._dataframes[layer_name].equals(warm._dataframes[layer_name]))
+                self.assertEqual(original._dataframes[layer_name].crs, warm._dataframes[layer_name].crs)
+
+    def test_get_geopackage_hydrofabric_0_b(self):
+        """ Test that geometries of a cached hydrofabric are only decoded once a layer is used in full. """
+        GeoPackageHydrofabric.from_file(self.geopackage_file, cache=self.cache)
+        warm = GeoPackageHydrofabric.from_file(self.geopackage_file, cache=self.cache)
+        divides = warm._dataframes.get_layer('divides')
+
+        self.assertIsNone(divides._dataframe)
+        self.assertTrue(warm.is_catchment_recognized('cat-5'))
+        self.assertIsNone(divides._dataframe)
+        subset = warm.get_subset_hydrofabric(SubsetDefinition(catchment_ids=['cat-7', 'cat-8'], nexus_ids=['nex-8']))
+        self.assertIsNotNone(divides._dataframe)
+        self.assertEqual(set(subset.get_all_catchment_ids()), {'cat-7', 'cat-8'})
+
+    def test_get_entry_key_0_a(self):
+        """ Test that entries are keyed by file contents, regardless of file location or modification time. """
+        copied = self.tmp_path.joinpath('copy.gpkg')
+        shutil.copyfile(self.geopackage_file, copied)
+        key = self.cache.get_entry_key('gpkg', [self.geopackage_file])
+
+        self.assertEqual(self.cache.get_entry_key('gpkg', [copied]), key)
+        os.utime(copied, ns=(0, 0))
+        self.assertEqual(self.cache.get_entry_key('gpkg', [copied]), key)
+        with copied.open('ab') as f:
+            f.write(b'\0')
+        self.assertNotEqual(self.cache.get_entry_key('gpkg', [copied]), key)
+
+    def test_get_geojson_hydrofabric_0_a(self):
+        """ Test that a GeoJSON hydrofabric loaded from the cache matches one read from the original files. """
+        original = GeoJsonHydrofabric.factory_create_from_data(*self._geojson_files())
+        self.cache.get_geojson_hydrofabric(*self._geojson_files())
+        warm = self.cache.get_geojson_hydrofabric(*self._geojson_files())
+
+        self.assertEqual(warm.uid, original.uid)
+        self.assertEqual(warm.roots, original.roots)
+        self.assertTrue(warm.geojson_reader.catchment_geodataframe.equals(
+            original.geojson_reader.catchment_geodataframe))
+
+    def test_factory_create_from_geojson_0_a(self):
+        """ Test that subset handlers may be created from hydrofabrics loaded through a cache. """
+        SubsetHandler.factory_create_from_geojson(*self._geojson_files(), cache=self.cache)
+        handler = SubsetHandler.factory_create_from_geojson(*self._geojson_files(), cache=self.cache)
+        self.assertEqual(len(list(self.tmp_path.joinpath('cache').glob('geojson-*'))), 1)
+        self.assertIsNotNone(handler.get_catchment_by_id(next(iter(handler._hydrofabric.roots))))
+
+    def test_files_manager_0_a(self):
+        """ Test that a files manager with a cache loads its hydrofabrics through the cache. """
+        manager = _CachingFilesManager(self.geojson_dir, self.cache)
+        uid = manager.get_hydrofabric_uid(0)
+        self.assertEqual(len(list(self.tmp_path.joinpath('cache').glob('geojson-*'))), 1)
+        self.assertEqual(manager.get_hydrofabric(0).uid, uid)
+
+
+if __name__ == '__main__':
+    unittest.main()
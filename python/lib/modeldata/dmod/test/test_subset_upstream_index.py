@@ -0,0 +1,203 @@
+import os
+import random
+import time
+import unittest
+from hypy import Catchment, HydroLocation, Nexus
+from typing import Dict, Optional, Set, Union
+from ..modeldata.hydrofabric import MappedGraphHydrofabric
+from ..modeldata.subset import SubsetDefinition, SubsetHandler
+from ..modeldata.subset.subset_handler import BasicSubsetValidator
+from ..modeldata.subset.upstream_index import UpstreamIndex
+
+BENCHMARK_CATCHMENT_COUNT = int(os.environ.get("DMOD_SUBSET_BENCHMARK_CATCHMENTS", 100_000))
+""" The number of synthetic catchments in the hydrofabric used when benchmarking validation and upstream queries. """
+
+
+def create_hydrofabric(catchment_count: int, seed: int = 3, max_branch_distance: int = 50,
+                       diverging_catchment_id: Optional[str] = None) -> MappedGraphHydrofabric:
+    """
+    Create a synthetic dendritic hydrofabric, where catchment ``cat-0`` drains to the terminal nexus ``tnx-0``.
+
+    Every other catchment ``cat-<i>`` drains to the inflow nexus ``nex-<j>`` of a randomly selected catchment
+    ``cat-<j>``, for some ``j < i``.
+
+    Parameters
+    ----------
+    catchment_count : int
+        The number of catchments.
+    seed : int
+        The seed for randomly connecting catchments.
+    max_branch_distance : int
+        The maximum difference between the indices of connected catchments, which controls the depth of the network.
+    diverging_catchment_id : Optional[str]
+        Optional id of a catchment without any tributaries that should also receive water from ``nex-0``, making the
+        network no longer dendritic.
+
+    Returns
+    -------
+    MappedGraphHydrofabric
+        The synthetic hydrofabric.
+    """
+    rng = random.Random(seed)
+    graph: Dict[str, Union[Catchment, Nexus]] = dict()
+    nexus_contrib_cats: Dict[str, Set[str]] = {"tnx-0": {"cat-0"}}
+    cat_to: Dict[str, str] = {"cat-0": "tnx-0"}
+
+    for i in range(catchment_count):
+        graph[f"cat-{i}"] = Catchment(catchment_id=f"cat-{i}", params=dict())
+        if i > 0:
+            to_nex_id = f"nex-{rng.randrange(max(0, i - max_branch_distance), i)}"
+            cat_to[f"cat-{i}"] = to_nex_id
+            nexus_contrib_cats.setdefault(to_nex_id, set()).add(f"cat-{i}")
+
+    cat_from = {f"cat-{nex_id[4:]}": nex_id for nex_id in nexus_contrib_cats if nex_id != "tnx-0"}
+    if diverging_catchment_id is not None:
+        assert diverging_catchment_id not in cat_from
+        cat_from[diverging_catchment_id] = "nex-0"
+
+    nexus_receiving_cats: Dict[str, Set[str]] = {nex_id: set() for nex_id in nexus_contrib_cats}
+    for cat_id, nex_id in cat_from.items():
+        nexus_receiving_cats[nex_id].add(cat_id)
+
+    for nex_id, contributing in nexus_contrib_cats.items():
+        graph[nex_id] = Nexus(nexus_id=nex_id, hydro_location=HydroLocation(realized_nexus=nex_id),
+                              receiving_catchments=[graph[cid] for cid in sorted(nexus_receiving_cats[nex_id])],
+                              contributing_catchments=[graph[cid] for cid in sorted(contributing)])
+    for cat_id, nex_id in cat_to.items():
+        graph[cat_id]._outflow = graph[nex_id]
+    for cat_id, nex_id in cat_from.items():
+        graph[cat_id]._inflow = graph[nex_id]
+
+    roots = frozenset(cid for cid in graph if cid.startswith("cat-") and cid not in cat_from)
+    return MappedGraphHydrofabric(hydrofabric_object_graph=graph, roots=roots)
+
+
+def tuple_invalid_reason(validator: BasicSubsetValidator, subset: SubsetDefinition) -> Optional[str]:
+    """
+    Validate subsets like the basic validator used to - checking membership against the subset's tuples.
+    """
+    if len(subset.catchment_ids) == 1 and len(subset.nexus_ids) == 0:
+        cid = subset.catchment_ids[0]
+        return None if validator.hydrofabric.is_catchment_recognized(cid) else 'Unrecognized catchment: {}'.format(cid)
+    for cid in subset.catchment_ids:
+        catchment = validator.hydrofabric.get_catchment_by_id(cid)
+        if catchment is None:
+            return 'Unrecognized catchment: {}'.format(cid)
+        if not any(n is not None and n.id in subset.nexus_ids for n in (catchment.outflow, catchment.inflow)):
+            return 'Catchment {} has no connected nexus included in this subset'.format(cid)
+    for nid in subset.nexus_ids:
+        nexus = validator.hydrofabric.get_nexus_by_id(nid)
+        if nexus is None:
+            return 'Unrecognized nexus: {}'.format(nid)
+        connected = list(nexus.contributing_catchments) + list(nexus.receiving_catchments)
+        if not any(c.id in subset.catchment_ids for c in connected):
+            return 'Nexus {} has no connected catchment included in this subset'.format(nid)
+    return None
+
+
+class TestSubsetUpstreamIndex(unittest.TestCase):
+
+    # A link limit large enough that upstream subsets are found by traversing the graph, but without any real limit
+    TRAVERSAL_LINK_LIMIT = 10 ** 9
+
+    def setUp(self) -> None:
+        self.hydrofabric = create_hydrofabric(2_000)
+        self.subset_handler = SubsetHandler(self.hydrofabric)
+
+    def assert_upstream_parity(self, subset_handler: SubsetHandler, seed: int = 5):
+        rng = random.Random(seed)
+        all_catchment_ids = subset_handler._hydrofabric.get_all_catchment_ids()
+        requests = [["cat-0"], ["cat-1", "cat-2", "cat-1"], ["cat-7", "cat-not-real"], ["cat-not-real"], []]
+        requests.extend(rng.sample(all_catchment_ids, rng.randint(1, 5)) for _ in range(50))
+
+        for catchment_ids in requests:
+            expected = subset_handler.get_upstream_subset(catchment_ids, link_limit=self.TRAVERSAL_LINK_LIMIT)
+            self.assertEqual(subset_handler.get_upstream_subset(catchment_ids), expected)
+            self.assertTrue(subset_handler.validate(expected)[0] or len(expected.catchment_ids) == 0)
+
+    def test_get_upstream_subset_0_a(self):
+        """ Test that upstream subsets from the index match those from traversing the graph. """
+        self.assertTrue(self.subset_handler.upstream_index.is_labeled)
+        self.assert_upstream_parity(self.subset_handler)
+
+        # The whole network is upstream of the outlet
+        subset = self.subset_handler.get_upstream_subset("cat-0")
+        self.assertEqual(set(subset.catchment_ids), set(self.hydrofabric.get_all_catchment_ids()))
+        self.assertEqual(set(subset.nexus_ids), set(self.hydrofabric.get_all_nexus_ids()))
+
+    def test_get_upstream_subset_0_b(self):
+        """ Test that upstream subsets match when some nexus flows into multiple catchments. """
+        leaf_id = next(cid for cid in reversed(self.hydrofabric.get_all_catchment_ids())
+                       if self.hydrofabric.get_catchment_by_id(cid).inflow is None)
+        subset_handler = SubsetHandler(create_hydrofabric(2_000, diverging_catchment_id=leaf_id))
+
+        self.assertFalse(subset_handler.upstream_index.is_labeled)
+        self.assert_upstream_parity(subset_handler)
+        self.assertIn(leaf_id, subset_handler.get_upstream_subset("cat-1").catchment_ids)
+
+    def test_get_upstream_closure_0_a(self):
+        """ Test the closure of a single nexus and memoization limits. """
+        index = UpstreamIndex(self.hydrofabric)
+        cat_ids, nex_ids = index.get_upstream_closure("nex-0")
+        self.assertNotIn("cat-0", cat_ids)
+        self.assertIn("nex-0", nex_ids)
+        self.assertEqual(index.get_upstream_closure("not-real"), (frozenset(), frozenset()))
+
+        unlabeled = UpstreamIndex(self.hydrofabric, cache_size=3)
+        unlabeled._intervals = None
+        for feature_id in ["cat-1", "cat-2", "nex-0", "cat-3", "cat-2"]:
+            self.assertEqual(unlabeled.get_upstream_closure(feature_id), index.get_upstream_closure(feature_id))
+        self.assertEqual(list(unlabeled._closure_cache), ["nex-0", "cat-3", "cat-2"])
+
+    def test_validate_0_a(self):
+        """ Test that validation results match validating against tuples. """
+        validator = BasicSubsetValidator(self.hydrofabric)
+        full = self.subset_handler.get_upstream_subset("cat-0")
+        subsets = [
+            full,
+            self.subset_handler.get_subset_for(["cat-3", "cat-4"]),
+            SubsetDefinition(catchment_ids=full.catchment_ids, nexus_ids=full.nexus_ids[1:]),
+            SubsetDefinition(catchment_ids=full.catchment_ids[1:], nexus_ids=full.nexus_ids),
+            SubsetDefinition(catchment_ids=full.catchment_ids + ("cat-not-real",), nexus_ids=full.nexus_ids),
+            SubsetDefinition(catchment_ids=full.catchment_ids, nexus_ids=full.nexus_ids + ("nex-not-real",)),
+            SubsetDefinition(catchment_ids=["cat-5"], nexus_ids=[]),
+            SubsetDefinition(catchment_ids=["cat-not-real"], nexus_ids=[]),
+        ]
+        for subset in subsets:
+            self.assertEqual(validator.invalid_reason(subset), tuple_invalid_reason(validator, subset))
+        self.assertIsNone(validator.invalid_reason(full))
+        self.assertEqual(validator.invalid_reason(subsets[-1]), 'Unrecognized catchment: cat-not-real')
+
+    def test_benchmark_0_a(self):
+        """ Benchmark validation of large subsets and repeated upstream queries. """
+        hydrofabric = create_hydrofabric(BENCHMARK_CATCHMENT_COUNT)
+        subset_handler = SubsetHandler(hydrofabric)
+        validator = BasicSubsetValidator(hydrofabric)
+
+        full = subset_handler.get_upstream_subset("cat-0")
+        self.assertEqual(len(full.catchment_ids), BENCHMARK_CATCHMENT_COUNT)
+
+        validate_start = time.perf_counter()
+        self.assertEqual(subset_handler.validate(full), (True, None))
+        validate_seconds = time.perf_counter() - validate_start
+
+        # Validating against tuples is quadratic, so only compare on a much smaller subset
+        smaller = subset_handler.get_upstream_subset("cat-0", link_limit=max(2, BENCHMARK_CATCHMENT_COUNT // 1000))
+        tuple_start = time.perf_counter()
+        self.assertIsNone(tuple_invalid_reason(validator, smaller))
+        tuple_seconds = time.perf_counter() - tuple_start
+        self.assertLess(validate_seconds / len(full.catchment_ids), tuple_seconds / len(smaller.catchment_ids))
+
+        rng = random.Random(17)
+        queries = [rng.sample(range(BENCHMARK_CATCHMENT_COUNT // 100), 3) for _ in range(20)]
+        queries = [[f"cat-{i}" for i in query] for query in queries]
+
+        traversal_start = time.perf_counter()
+        expected = [subset_handler.get_upstream_subset(q, link_limit=self.TRAVERSAL_LINK_LIMIT) for q in queries]
+        traversal_seconds = time.perf_counter() - traversal_start
+
+        index_start = time.perf_counter()
+        self.assertEqual([subset_handler.get_upstream_subset(q) for q in queries], expected)
+        index_seconds = time.perf_counter() - index_start
+
+        self.assertLess(index_seconds * 2, traversal_seconds)
@@ -2,7 +2,10 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import json
 import docker
 from docker.models.services import Service
@@ -72,6 +75,26 @@ class Monitor(ABC):
         """
         pass
 
+    def wait_for_changes(self, timeout: float) -> bool:
+        """
+        Block until there may be job changes to monitor, or until the given timeout has elapsed.
+
+        This default implementation has no way of learning about changes as they happen, so it simply sleeps for the
+        entire timeout (i.e., monitoring is done by polling).  Subtypes able to receive notifications should override.
+
+        Parameters
+        ----------
+        timeout: float
+            The maximum number of seconds to wait.
+
+        Returns
+        -------
+        bool
+            Whether the wait ended early because of a notification of possible changes.
+        """
+        time.sleep(timeout)
+        return False
+
     def monitor_jobs(self) -> Tuple[Dict[str, Job], Dict[str, JobStatus], Dict[str, JobStatus]]:
         """
         Monitor jobs and return data on those that have changed.
@@ -102,6 +125,107 @@ class Monitor(ABC):
         return jobs_with_changed_state, original_job_statuses, updated_job_statuses
 
 
+class DockerClusterSnapshot:
+    """
+    Point-in-time view of the Docker Swarm services and tasks, indexed by the ids of the jobs they were created for.
+
+    A snapshot is built from exactly one call listing services and one call listing tasks, regardless of how many jobs
+    are being monitored, so that the cost of a monitoring cycle against the Docker API does not grow with job count.
+    """
+
+    _SERVICE_NAME_JOB_ID_PATTERN = re.compile(r'^.+-worker\d+_(.+)$')
+    """ Pattern for job allocation service names (see ::attribute:`Job.allocation_service_names`), capturing job id. """
+
+    @classmethod
+    def get_job_id_for_service_name(cls, service_name: Optional[str]) -> Optional[str]:
+        """
+        Get the id of the job for which a service was created, based on the standard format of service names.
+
+        Parameters
+        ----------
+        service_name: Optional[str]
+            The name of a Docker service.
+
+        Returns
+        -------
+        Optional[str]
+            The id of the job associated with the service, or ``None`` if the name is not that of a job service.
+        """
+        match = cls._SERVICE_NAME_JOB_ID_PATTERN.match(service_name) if service_name else None
+        return match.group(1) if match else None
+
+    @classmethod
+    def take(cls, docker_client: docker.DockerClient) -> 'DockerClusterSnapshot':
+        """
+        Take a new snapshot of the cluster's services and tasks.
+
+        Parameters
+        ----------
+        docker_client: docker.DockerClient
+            The client for the Docker Swarm.
+
+        Returns
+        -------
+        DockerClusterSnapshot
+            The new snapshot.
+        """
+        return cls(services=docker_client.services.list(), tasks=docker_client.api.tasks())
+
+    def __init__(self, services: Iterable[Service], tasks: Iterable[Dict[str, Any]]):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        services: Iterable[Service]
+            All the services in the Swarm.
+        tasks: Iterable[Dict[str, Any]]
+            All the tasks in the Swarm, as the raw dictionaries returned by the low-level API.
+        """
+        self.taken_at: datetime = datetime.now()
+        self._services_by_job_id: Dict[str, Dict[str, Service]] = dict()
+        for service in services:
+            job_id = self.get_job_id_for_service_name(service.name)
+            if job_id is not None:
+                self._services_by_job_id.setdefault(job_id, dict())[service.name] = service
+        self._task_states_by_service_id: Dict[str, List[str]] = dict()
+        for task in tasks:
+            self._task_states_by_service_id.setdefault(task['ServiceID'], []).append(task['Status']['State'])
+
+    def get_services_for_job(self, job: Job) -> List[Service]:
+        """
+        Get the services in this snapshot created for the allocations of the given job.
+
+        Parameters
+        ----------
+        job: Job
+            A particular job of interest.
+
+        Returns
+        -------
+        List[Service]
+            The services associated with the given job, in the order of its allocation service names.
+        """
+        job_services = self._services_by_job_id.get(str(job.job_id), dict())
+        return [job_services[name] for name in (job.allocation_service_names or ()) if name in job_services]
+
+    def get_task_states(self, service: Service) -> List[str]:
+        """
+        Get the ``state`` values for all tasks of the given service in this snapshot.
+
+        Parameters
+        ----------
+        service: Service
+            The Docker service in question.
+
+        Returns
+        -------
+        List[str]
+            The state values of the service's tasks.
+        """
+        return self._task_states_by_service_id.get(service.id, [])
+
+
 class DockerSwarmMonitor(Monitor, ABC):
     """
     Abstract subtype of ::class:`Monitor` for monitoring Docker-Swarm-based jobs.
@@ -110,6 +234,11 @@ class DockerSwarmMonitor(Monitor, ABC):
     ::method:`monitor_job` from superclass and provides methods for checking the Docker runtime and determining a job's
     true status.
 
+    Each ::method:`monitor_jobs` cycle works from a single ::class:`DockerClusterSnapshot` of the Swarm, rather than
+    querying Docker separately for every job.  Instances can also watch the Docker events stream (see
+    ::method:`start_event_watcher`), so that ::method:`wait_for_changes` returns as soon as a job service changes.
+    Periodic snapshots - i.e., waits that time out - remain the fallback for reconciling anything events miss.
+
     Type does not provide implementation of ::method:`get_jobs_to_monitor`.
     """
     _EXEC_STEP_DOCKER_STATUS_MAP: Dict[JobExecStep, Set[str]] = {
@@ -121,8 +250,35 @@ class DockerSwarmMonitor(Monitor, ABC):
     }
     """ Map of job exec steps and the set of string forms of Docker Service Tasks ``state`` values that correspond. """
 
+    _EVENT_TYPES: List[str] = ['service', 'container']
+    """ Types of Docker events watched for changes to job services. """
+
+    _EVENT_RETRY_SECONDS: float = 5.0
+    """ Delay before resubscribing to the Docker events stream after it fails. """
+
+    @classmethod
+    def _get_event_service_name(cls, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the name of the service to which a (decoded) Docker event applies, if any.
+
+        Parameters
+        ----------
+        event: Dict[str, Any]
+            The decoded Docker event.
+
+        Returns
+        -------
+        Optional[str]
+            The name of the applicable service, or ``None`` if the event does not apply to a service.
+        """
+        attributes = event.get('Actor', {}).get('Attributes', {})
+        if event.get('Type') == 'service':
+            return attributes.get('name')
+        return attributes.get('com.docker.swarm.service.name')
+
     @classmethod
-    def _get_task_state_and_exec_step_counts(cls, service: Service) -> Tuple[Dict[str, int], Dict[JobExecStep, int]]:
+    def _get_task_state_and_exec_step_counts(cls, service: Service, snapshot: Optional[DockerClusterSnapshot] = None
+                                             ) -> Tuple[Dict[str, int], Dict[JobExecStep, int]]:
         """
         For a given service, examine the state of its tasks, returning a dictionary of state values to number of times
         occurring and a dictionary of converted ::class:`JobExecStep` for the state values to number of times occurring.
@@ -131,6 +287,8 @@ class DockerSwarmMonitor(Monitor, ABC):
         ----------
         service : Service
             The Docker service in question.
+        snapshot : Optional[DockerClusterSnapshot]
+            Optional snapshot from which to get task states, rather than querying Docker for the service's tasks.
 
         Returns
         -------
@@ -138,10 +296,13 @@ class DockerSwarmMonitor(Monitor, ABC):
             Dictionary of task state values to number of occurrences, and dictionary of equivalent ::class:`JobExecStep`
             values for observed task states to summed total occurrences.
         """
+        if snapshot is None:
+            all_task_states = [task['Status']['State'] for task in service.tasks()]
+        else:
+            all_task_states = snapshot.get_task_states(service)
         # First get the statuses from all tasks for this service
         task_states = dict()
-        for task in service.tasks():
-            ts = task['Status']['State']
+        for ts in all_task_states:
             if ts in task_states:
                 task_states[ts] += 1
             else:
@@ -175,8 +336,12 @@ class DockerSwarmMonitor(Monitor, ABC):
         """
         # Now apply some rules to determine an exec step value for the service
         #
+        # If the service does not have any tasks yet, it is still waiting to be scheduled
+        if len(task_exec_steps) == 0:
+            return JobExecStep.SCHEDULED
+
         # If there was only a single exec step encountered in tasks, then that's the service's step
-        if len(task_exec_steps) == 1:
+        elif len(task_exec_steps) == 1:
             # This syntax unpacks dict key(s) to tuple (mind the comma), then gets the 1st (and here, only) element
             return (*task_exec_steps,)[0]
 
@@ -261,7 +426,7 @@ class DockerSwarmMonitor(Monitor, ABC):
         """
         for exec_step in cls._EXEC_STEP_DOCKER_STATUS_MAP:
             if task_state in cls._EXEC_STEP_DOCKER_STATUS_MAP[exec_step]:
-                return task_state
+                return exec_step
         # Fall back to fail
         return JobExecStep.FAILED
 
@@ -277,6 +442,13 @@ class DockerSwarmMonitor(Monitor, ABC):
             self._api_client = docker.APIClient()
         self._last_checked: Optional[datetime] = None
         self._service_state_map = {}
+        self._snapshot: Optional[DockerClusterSnapshot] = None
+        """ Snapshot of the Swarm for the current ::method:`monitor_jobs` cycle, when one is in progress. """
+        self._changes_pending = threading.Event()
+        """ Set by the events watcher when a job service may have changed since the last monitoring cycle. """
+        self._stop_watching = threading.Event()
+        self._event_stream = None
+        self._event_watcher: Optional[threading.Thread] = None
 
     @property
     def api_client(self) -> docker.APIClient:
@@ -292,7 +464,74 @@ class DockerSwarmMonitor(Monitor, ABC):
         except:
             raise ConnectionError("Please check that the Docker Daemon is installed and running.")
 
-    def check_implied_job_exec_step(self, job: Job) -> JobExecStep:
+    def _watch_events(self):
+        """
+        Consume the Docker events stream, flagging pending changes whenever an event concerns a job service.
+
+        Runs until ::method:`stop_event_watcher` is called, resubscribing after a delay if the stream fails.
+        """
+        while not self._stop_watching.is_set():
+            try:
+                self._event_stream = self.docker_client.events(decode=True, filters={'type': self._EVENT_TYPES})
+                for event in self._event_stream:
+                    if self._stop_watching.is_set():
+                        break
+                    service_name = self._get_event_service_name(event)
+                    if DockerClusterSnapshot.get_job_id_for_service_name(service_name) is not None:
+                        self._changes_pending.set()
+            except Exception as e:
+                if not self._stop_watching.is_set():
+                    logging.warning(f"Docker events stream failed ({e.__class__.__name__}: {e!s}); relying on "
+                                    f"periodic snapshots until resubscribed")
+            # Make sure the next cycle reconciles anything that may have been missed while not subscribed
+            self._changes_pending.set()
+            self._stop_watching.wait(self._EVENT_RETRY_SECONDS)
+
+    def start_event_watcher(self):
+        """
+        Start a daemon thread watching the Docker events stream for changes to job services.
+        """
+        if self._event_watcher is not None and self._event_watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        self._event_watcher = threading.Thread(target=self._watch_events, name='docker-events-watcher', daemon=True)
+        self._event_watcher.start()
+
+    def stop_event_watcher(self, timeout: Optional[float] = None):
+        """
+        Stop the Docker events watcher thread, if it is running.
+
+        Parameters
+        ----------
+        timeout: Optional[float]
+            Maximum seconds to wait for the watcher thread to finish.
+        """
+        self._stop_watching.set()
+        if self._event_stream is not None and hasattr(self._event_stream, 'close'):
+            self._event_stream.close()
+        if self._event_watcher is not None:
+            self._event_watcher.join(timeout)
+            self._event_watcher = None
+
+    def wait_for_changes(self, timeout: float) -> bool:
+        """
+        Block until the events watcher sees a change to a job service, or until the given timeout has elapsed.
+
+        Parameters
+        ----------
+        timeout: float
+            The maximum number of seconds to wait; i.e., the interval for reconciling from a full snapshot.
+
+        Returns
+        -------
+        bool
+            Whether the wait ended early because of an event for a job service.
+        """
+        notified = self._changes_pending.wait(timeout)
+        self._changes_pending.clear()
+        return notified
+
+    def check_implied_job_exec_step(self, job: Job, snapshot: Optional[DockerClusterSnapshot] = None) -> JobExecStep:
         """
         Infer the appropriate ::class:`JobExecStep` value for a job based on the real-time states of the services
         created for its allocations.
@@ -301,20 +540,27 @@ class DockerSwarmMonitor(Monitor, ABC):
         ----------
         job : Job
             The job in question.
+        snapshot : Optional[DockerClusterSnapshot]
+            Snapshot of the Swarm to use; if ``None``, the snapshot of the current ::method:`monitor_jobs` cycle is
+            used, or a new snapshot is taken if not in a cycle.
 
         Returns
         -------
         JobExecStep
             The appropriate ::class:`JobExecStep` value for the given job.
         """
+        if snapshot is None:
+            snapshot = self._snapshot if self._snapshot is not None else DockerClusterSnapshot.take(self.docker_client)
+
         # Start by getting the services for a given job.
-        job_alloc_services = self.filter_services_for_job(job=job, services=self.docker_client.services.list())
+        job_alloc_services = snapshot.get_services_for_job(job)
 
         # Then, process the exec step for each service, based on the states of each service's task(s)
         service_states = []
         for service in job_alloc_services:
             # Get counts for task states and counts for task mapped exec_steps
-            task_states, task_exec_steps = self._get_task_state_and_exec_step_counts(service=service)
+            task_states, task_exec_steps = self._get_task_state_and_exec_step_counts(service=service,
+                                                                                     snapshot=snapshot)
             # TODO: this will need to be tested
             desired_replica_count = service.attrs['Spec']['Mode']['Replicated']['Replicas']
             # Now apply some rules to determine an exec step value for the service
@@ -351,6 +597,25 @@ class DockerSwarmMonitor(Monitor, ABC):
     def docker_client(self) -> docker.DockerClient:
         return self._docker_client
 
+    def monitor_jobs(self) -> Tuple[Dict[str, Job], Dict[str, JobStatus], Dict[str, JobStatus]]:
+        """
+        Monitor jobs and return data on those that have changed.
+
+        Jobs are checked against a single ::class:`DockerClusterSnapshot` taken at the start of the cycle.
+
+        Returns
+        -------
+        Tuple[Dict[str, Job], Dict[str, JobStatus], Dict[str, JobStatus]]
+            A tuple of three dictionaries for jobs with status changes, having values of job object, original status,
+            and updated status respectively, and all keyed by job id.
+        """
+        self._snapshot = DockerClusterSnapshot.take(self.docker_client)
+        try:
+            return super().monitor_jobs()
+        finally:
+            self._last_checked = self._snapshot.taken_at
+            self._snapshot = None
+
     def monitor_job(self, job: Job) -> Optional[Tuple[JobStatus, JobStatus]]:
         """
         Monitor whether a given job has changed status.
@@ -0,0 +1,215 @@
+import queue
+import threading
+import time
+import unittest
+from typing import Any, Dict, List, Optional
+
+from dmod.scheduler.job import Job, JobExecStep
+from ..monitor.que_monitor import DockerClusterSnapshot, DockerSwarmMonitor
+
+
+class FakeJob:
+    """ Minimal stand-in for a job, with just what the monitor uses. """
+
+    def __init__(self, job_id: str, num_allocations: int):
+        self.job_id = job_id
+        self.allocation_service_names = tuple(f"ngen-worker{i}_{job_id}" for i in range(num_allocations))
+        self.status_step = JobExecStep.SCHEDULED
+
+    @property
+    def status(self) -> JobExecStep:
+        return self.status_step
+
+
+class FakeService:
+
+    def __init__(self, service_id: str, name: str, replicas: int = 1):
+        self.id = service_id
+        self.name = name
+        self.attrs = {'Spec': {'Mode': {'Replicated': {'Replicas': replicas}}}}
+
+    def tasks(self):
+        raise AssertionError("Monitor should use cluster snapshots rather than per-service task queries")
+
+
+class FakeEventStream:
+    """ Blocking stream of scripted Docker events, analogous to the SDK's ``CancellableStream``. """
+
+    _CLOSE = object()
+
+    def __init__(self, events: "queue.Queue"):
+        self._events = events
+
+    def __iter__(self):
+        while True:
+            event = self._events.get()
+            if event is self._CLOSE:
+                return
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    def close(self):
+        self._events.put(self._CLOSE)
+
+
+class FakeDockerClient:
+    """ Fake Docker client tracking API calls, with scriptable services, task states, and events. """
+
+    def __init__(self):
+        self.services_by_name: Dict[str, FakeService] = dict()
+        self.task_states: Dict[str, List[str]] = dict()
+        self.events_queue: "queue.Queue" = queue.Queue()
+        self.events_subscriptions = 0
+        self.call_counts = {'services.list': 0, 'tasks': 0}
+        self.services = self
+        self.api = self
+
+    def add_service(self, name: str, states: List[str]):
+        service = FakeService(service_id=f"id-{name}", name=name)
+        self.services_by_name[name] = service
+        self.task_states[service.id] = states
+
+    def set_states(self, name: str, states: List[str]):
+        self.task_states[self.services_by_name[name].id] = states
+
+    def list(self) -> List[FakeService]:
+        self.call_counts['services.list'] += 1
+        return list(self.services_by_name.values())
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        self.call_counts['tasks'] += 1
+        return [{'ServiceID': sid, 'Status': {'State': state}} for sid, states in self.task_states.items()
+                for state in states]
+
+    def events(self, decode: bool = False, filters: Optional[dict] = None) -> FakeEventStream:
+        self.events_subscriptions += 1
+        return FakeEventStream(self.events_queue)
+
+    def emit_service_event(self, service_name: str, action: str = 'update'):
+        self.events_queue.put({'Type': 'service', 'Action': action, 'Actor': {'Attributes': {'name': service_name}}})
+
+    def emit_container_event(self, service_name: str, action: str = 'start'):
+        self.events_queue.put({'Type': 'container', 'Action': action,
+                               'Actor': {'Attributes': {'com.docker.swarm.service.name': service_name}}})
+
+
+class FakeDockerSwarmMonitor(DockerSwarmMonitor):
+
+    def __init__(self, docker_client: FakeDockerClient, jobs: List[FakeJob]):
+        super().__init__(docker_client=docker_client)
+        self.jobs = jobs
+
+    def get_jobs_to_monitor(self) -> List[Job]:
+        return self.jobs
+
+
+class TestDockerSwarmMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.num_jobs = 300
+        self.client = FakeDockerClient()
+        self.jobs = [FakeJob(job_id=f"job-{i}", num_allocations=2) for i in range(self.num_jobs)]
+        for job in self.jobs:
+            for name in job.allocation_service_names:
+                self.client.add_service(name, ['pending'])
+        # Also include some services not associated with any job
+        self.client.add_service("unrelated_service", ['running'])
+        self.monitor = FakeDockerSwarmMonitor(docker_client=self.client, jobs=self.jobs)
+
+    def tearDown(self):
+        self.monitor.stop_event_watcher(timeout=5)
+
+    def _set_job_states(self, job: FakeJob, states: List[str]):
+        for name in job.allocation_service_names:
+            self.client.set_states(name, states)
+
+    def test_get_job_id_for_service_name_0_a(self):
+        """ Test that the job id is parsed from a job service name. """
+        self.assertEqual("job-7", DockerClusterSnapshot.get_job_id_for_service_name("ngen-worker12_job-7"))
+
+    def test_get_job_id_for_service_name_0_b(self):
+        """ Test that non-job service names are not associated with a job id. """
+        self.assertIsNone(DockerClusterSnapshot.get_job_id_for_service_name("unrelated_service"))
+
+    def test_get_exec_step_for_job_docker_task_state_0_a(self):
+        """ Test that task states are mapped to exec steps. """
+        self.assertEqual(JobExecStep.RUNNING, DockerSwarmMonitor.get_exec_step_for_job_docker_task_state('running'))
+
+    def test_monitor_jobs_0_a(self):
+        """ Test that a monitoring cycle takes a single cluster snapshot regardless of the number of jobs. """
+        self.monitor.monitor_jobs()
+        self.assertEqual({'services.list': 1, 'tasks': 1}, self.client.call_counts)
+
+    def test_monitor_jobs_0_b(self):
+        """ Test that a monitoring cycle finds exactly the jobs that changed. """
+        changed = self.jobs[::3]
+        for job in changed:
+            self._set_job_states(job, ['running'])
+        jobs, original, updated = self.monitor.monitor_jobs()
+        self.assertEqual({j.job_id for j in changed}, set(jobs.keys()))
+        self.assertTrue(all(s == JobExecStep.SCHEDULED for s in original.values()))
+        self.assertTrue(all(s == JobExecStep.RUNNING for s in updated.values()))
+
+    def test_monitor_jobs_0_c(self):
+        """ Test that a job with one failed and one running service is seen as failed. """
+        job = self.jobs[0]
+        self.client.set_states(job.allocation_service_names[0], ['failed'])
+        self.client.set_states(job.allocation_service_names[1], ['running'])
+        jobs, _, updated = self.monitor.monitor_jobs()
+        self.assertEqual(JobExecStep.FAILED, updated[job.job_id])
+
+    def test_monitor_jobs_0_d(self):
+        """ Test that repeated cycles without changes report nothing. """
+        self._set_job_states(self.jobs[0], ['running'])
+        self.monitor.monitor_jobs()
+        jobs, _, _ = self.monitor.monitor_jobs()
+        self.assertEqual(0, len(jobs))
+
+    def test_wait_for_changes_0_a(self):
+        """ Test that a wait without any events times out and reports no notification. """
+        self.monitor.start_event_watcher()
+        self.assertFalse(self.monitor.wait_for_changes(timeout=0.2))
+
+    def test_wait_for_changes_0_b(self):
+        """ Test that an event for a job service ends a wait early. """
+        self.monitor.start_event_watcher()
+        self.client.emit_container_event(self.jobs[5].allocation_service_names[1])
+        start = time.monotonic()
+        self.assertTrue(self.monitor.wait_for_changes(timeout=10))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_wait_for_changes_0_c(self):
+        """ Test that events for non-job services do not end a wait. """
+        self.monitor.start_event_watcher()
+        self.client.emit_service_event("unrelated_service")
+        self.assertFalse(self.monitor.wait_for_changes(timeout=0.3))
+
+    def test_wait_for_changes_0_d(self):
+        """ Test that scripted events for hundreds of jobs wake monitoring, which then needs one snapshot for all. """
+        self.monitor.start_event_watcher()
+
+        def script_events():
+            for job in self.jobs:
+                self._set_job_states(job, ['running'])
+                self.client.emit_service_event(job.allocation_service_names[0])
+
+        scripter = threading.Thread(target=script_events)
+        scripter.start()
+        scripter.join()
+
+        self.assertTrue(self.monitor.wait_for_changes(timeout=5))
+        jobs, _, updated = self.monitor.monitor_jobs()
+        self.assertEqual({j.job_id for j in self.jobs}, {j for j, s in updated.items() if s == JobExecStep.RUNNING})
+        self.assertEqual({'services.list': 1, 'tasks': 1}, self.client.call_counts)
+
+    def test_wait_for_changes_0_e(self):
+        """ Test that a failed events stream is resubscribed and forces a reconciliation cycle. """
+        self.monitor._EVENT_RETRY_SECONDS = 0.05
+        self.client.events_queue.put(ConnectionError("stream dropped"))
+        self.monitor.start_event_watcher()
+        self.assertTrue(self.monitor.wait_for_changes(timeout=5))
+        deadline = time.monotonic() + 5
+        while self.client.events_subscriptions < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(self.client.events_subscriptions, 2)
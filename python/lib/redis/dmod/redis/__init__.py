@@ -1,2 +1,4 @@
 from .keynamehelper import KeyNameHelper
 from .redisbacked import RedisBacked
+from .pool import ConnectionPoolRegistry, PoolStatistics, get_connection_pool_registry
+from .pubsub import PubSubMultiplexer, SlowReaderPolicy, Subscription, get_multiplexer, listen_in_background
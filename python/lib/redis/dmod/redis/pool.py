@@ -0,0 +1,272 @@
+"""
+Process-wide registry of Redis connection pools shared by every Redis-backed object in a service.
+"""
+import hashlib
+import logging
+import threading
+import time
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from redis import ConnectionPool, Redis
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from redis.retry import Retry
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 30
+""" Seconds a pooled connection may sit idle before it is pinged prior to reuse. """
+
+DEFAULT_SOCKET_CONNECT_TIMEOUT = 5.0
+DEFAULT_COMMAND_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 8.0
+
+PoolKey = Tuple[str, int, int, Optional[str], str, bool]
+
+
+@dataclass(frozen=True)
+class PoolStatistics:
+    """
+    Snapshot of the usage of a single registered connection pool.
+    """
+    host: str
+    port: int
+    db: int
+    max_connections: int
+    created_connections: int
+    in_use_connections: int
+    available_connections: int
+
+
+def _credential_digest(username: Optional[str], password: Optional[str]) -> str:
+    # Pools are keyed by a digest so that registry keys never expose credentials in logs or reprs
+    return hashlib.sha256(f"{username or ''}\0{password or ''}".encode()).hexdigest()
+
+
+def backoff_delays(attempts: int, base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_CAP) -> List[float]:
+    """
+    Get the delays to wait between consecutive attempts, doubling each time up to a maximum.
+
+    Parameters
+    ----------
+    attempts : int
+        The total number of attempts that will be made.
+    base : float
+        The delay before the first retry.
+    cap : float
+        The longest delay to wait between any two attempts.
+
+    Returns
+    -------
+    List[float]
+        One delay per retry, i.e., one fewer than the number of attempts.
+    """
+    return [min(cap, base * (2 ** n)) for n in range(max(attempts - 1, 0))]
+
+
+class ConnectionPoolRegistry:
+    """
+    Registry of Redis connection pools, keyed by host, port, db, and credentials.
+
+    Objects in the same process that talk to the same Redis instance share a single pool rather than each holding their
+    own. Pooled connections use TCP keepalive, are pinged before reuse after sitting idle for longer than the health
+    check interval, and retry commands with exponential backoff after connection failures, so that clients recover
+    transparently when the server restarts.
+    """
+
+    _default_instance: Optional['ConnectionPoolRegistry'] = None
+    _default_instance_lock = threading.Lock()
+
+    @classmethod
+    def get_default_instance(cls) -> 'ConnectionPoolRegistry':
+        """
+        Get the registry shared by the whole process.
+
+        Returns
+        -------
+        ConnectionPoolRegistry
+            The process-wide registry.
+        """
+        with cls._default_instance_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def __init__(self, health_check_interval: int = DEFAULT_HEALTH_CHECK_INTERVAL,
+                 socket_connect_timeout: float = DEFAULT_SOCKET_CONNECT_TIMEOUT,
+                 command_retries: int = DEFAULT_COMMAND_RETRIES, max_connections: Optional[int] = None,
+                 sleep: Callable[[float], Any] = time.sleep):
+        self._health_check_interval = health_check_interval
+        self._socket_connect_timeout = socket_connect_timeout
+        self._command_retries = command_retries
+        self._max_connections = max_connections
+        self._sleep = sleep
+        self._pools: Dict[PoolKey, ConnectionPool] = {}
+        self._lock = threading.Lock()
+        self._failed_health_checks = 0
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def _create_pool(self, host: str, port: int, db: int, username: Optional[str], password: Optional[str],
+                     decode_responses: bool) -> ConnectionPool:
+        retry = Retry(ExponentialBackoff(cap=DEFAULT_BACKOFF_CAP, base=DEFAULT_BACKOFF_BASE), self._command_retries,
+                      supported_errors=(RedisConnectionError, RedisTimeoutError, ConnectionResetError))
+        pool_kwargs = dict(host=host, port=port, db=db, username=username, password=password or None,
+                           decode_responses=decode_responses, health_check_interval=self._health_check_interval,
+                           socket_keepalive=True, socket_connect_timeout=self._socket_connect_timeout, retry=retry)
+        if self._max_connections is not None:
+            pool_kwargs['max_connections'] = self._max_connections
+        return ConnectionPool(**pool_kwargs)
+
+    def get_pool(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                 username: Optional[str] = None, decode_responses: bool = True) -> ConnectionPool:
+        """
+        Get the shared pool for the given connection parameters, creating it on first use.
+
+        Parameters
+        ----------
+        host : str
+            The Redis host.
+        port : int
+            The listening port of the Redis host.
+        db : int
+            The Redis ``db`` index.
+        password : Optional[str]
+            The password to authenticate with.
+        username : Optional[str]
+            The username to authenticate with.
+        decode_responses : bool
+            Whether responses are decoded to strings.
+
+        Returns
+        -------
+        ConnectionPool
+            The pool shared by every caller with the same parameters.
+        """
+        key: PoolKey = (host, int(port), int(db), username, _credential_digest(username, password), decode_responses)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._create_pool(host=host, port=int(port), db=int(db), username=username, password=password,
+                                         decode_responses=decode_responses)
+                self._pools[key] = pool
+            return pool
+
+    def get_client(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                   username: Optional[str] = None, decode_responses: bool = True) -> Redis:
+        """
+        Get a client backed by the shared pool for the given connection parameters.
+
+        Clients are cheap; the connections they use belong to the shared pool.
+
+        Parameters
+        ----------
+        host : str
+            The Redis host.
+        port : int
+            The listening port of the Redis host.
+        db : int
+            The Redis ``db`` index.
+        password : Optional[str]
+            The password to authenticate with.
+        username : Optional[str]
+            The username to authenticate with.
+        decode_responses : bool
+            Whether responses are decoded to strings.
+
+        Returns
+        -------
+        Redis
+            A client using the shared pool.
+        """
+        return Redis(connection_pool=self.get_pool(host=host, port=port, db=db, password=password,
+                                                   username=username, decode_responses=decode_responses))
+
+    def wait_until_ready(self, client: Redis, max_attempts: int = 5, backoff_base: float = DEFAULT_BACKOFF_BASE,
+                         backoff_cap: float = DEFAULT_BACKOFF_CAP) -> bool:
+        """
+        Confirm that the server behind a client responds to ``PING``, retrying with exponential backoff.
+
+        Parameters
+        ----------
+        client : Redis
+            The client to check.
+        max_attempts : int
+            The maximum number of times to send ``PING``; always at least once.
+        backoff_base : float
+            The delay before the first retry.
+        backoff_cap : float
+            The longest delay to wait between attempts.
+
+        Returns
+        -------
+        bool
+            Whether the server responded before attempts ran out.
+        """
+        delays = backoff_delays(max(max_attempts, 1), base=backoff_base, cap=backoff_cap)
+        for attempt in range(len(delays) + 1):
+            try:
+                if client.ping():
+                    return True
+            except (RedisConnectionError, RedisTimeoutError, OSError) as e:
+                self._failed_health_checks += 1
+                logging.debug(f"Redis health check {attempt + 1} failed: {e}")
+            if attempt < len(delays):
+                self._sleep(delays[attempt])
+        return False
+
+    @property
+    def failed_health_checks(self) -> int:
+        """
+        The number of startup health checks that have failed across all pools.
+
+        Returns
+        -------
+        int
+            The number of startup health checks that have failed across all pools.
+        """
+        return self._failed_health_checks
+
+    def statistics(self) -> List[PoolStatistics]:
+        """
+        Get a snapshot of how each registered pool is being used.
+
+        Returns
+        -------
+        List[PoolStatistics]
+            Usage of each pool in the registry.
+        """
+        with self._lock:
+            pools = list(self._pools.items())
+        stats = []
+        for key, pool in pools:
+            stats.append(PoolStatistics(host=key[0], port=key[1], db=key[2], max_connections=pool.max_connections,
+                                        created_connections=getattr(pool, '_created_connections', 0),
+                                        in_use_connections=len(getattr(pool, '_in_use_connections', ())),
+                                        available_connections=len(getattr(pool, '_available_connections', ()))))
+        return stats
+
+    def clear(self):
+        """
+        Disconnect and forget every registered pool.
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.disconnect()
+
+
+def get_connection_pool_registry() -> ConnectionPoolRegistry:
+    """
+    Get the process-wide ::class:`ConnectionPoolRegistry`.
+
+    Returns
+    -------
+    ConnectionPoolRegistry
+        The process-wide registry.
+    """
+    return ConnectionPoolRegistry.get_default_instance()
@@ -0,0 +1,580 @@
+"""
+Process-wide multiplexing of Redis pub/sub subscriptions.
+
+Rather than every subscriber opening its own pub/sub connection and its own polling thread, subscribers within a
+process share a single ::class:`PubSubMultiplexer` per event loop and Redis instance. The multiplexer holds one
+pub/sub connection, reference counts channel subscriptions, and fans each message out to bounded per-subscriber
+queues. Synchronous code that needs to react to published messages may use ::function:`listen_in_background`, which
+runs every such listener in the process on one shared event loop thread.
+"""
+import asyncio
+import logging
+import threading
+import weakref
+
+from enum import Enum
+from typing import Any, Awaitable, Callable, Collection, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple, \
+    Union
+
+from redis import asyncio as redis_asyncio
+
+PubSubMessage = Dict[str, Any]
+"""
+A message received through pub/sub, in the form produced by ``redis``: a dict with ``type``, ``pattern``, ``channel``,
+and ``data`` entries.
+"""
+
+DEFAULT_QUEUE_SIZE: int = 256
+""" The default maximum number of messages that may wait for a single subscriber. """
+
+
+class SlowReaderPolicy(Enum):
+    """
+    What to do with a new message when a subscriber's queue is full.
+    """
+    DROP_NEWEST = "drop_newest"
+    """ Discard the new message, keeping everything that is already queued. """
+    DROP_OLDEST = "drop_oldest"
+    """ Discard the oldest queued message to make room for the new message. """
+    COALESCE = "coalesce"
+    """ Discard queued messages from the new message's channel, then the oldest queued message if still full. """
+
+
+def _channel_name(channel: Union[str, bytes]) -> str:
+    return channel.decode() if isinstance(channel, bytes) else str(channel)
+
+
+class Subscription:
+    """
+    A single subscriber's view of one or more channels within a ::class:`PubSubMultiplexer`.
+
+    Messages are held in a bounded ::class:`asyncio.Queue` until read via ::method:`get` or by iterating asynchronously
+    over the subscription. If the reader falls behind and the queue fills, the subscription's ::class:`SlowReaderPolicy`
+    determines which message is discarded, and ::attribute:`dropped` is incremented.
+    """
+
+    _CLOSED = object()
+    """ Sentinel placed in the queue to wake readers when the subscription is closed. """
+
+    def __init__(self, multiplexer: 'PubSubMultiplexer', channels: Iterable[str], maxsize: int = DEFAULT_QUEUE_SIZE,
+                 policy: SlowReaderPolicy = SlowReaderPolicy.DROP_OLDEST):
+        if maxsize < 1:
+            raise ValueError(f"Cannot create a {self.__class__.__name__} with a maximum queue size of {maxsize}")
+        self._multiplexer = multiplexer
+        self._channels: FrozenSet[str] = frozenset(_channel_name(c) for c in channels)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._policy = policy
+        self._dropped: int = 0
+        self._closed: bool = False
+
+    @property
+    def channels(self) -> FrozenSet[str]:
+        """
+        The names of the channels this subscription receives messages from.
+
+        Returns
+        -------
+        FrozenSet[str]
+            The names of the channels this subscription receives messages from.
+        """
+        return self._channels
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether this subscription has been closed and will receive no further messages.
+
+        Returns
+        -------
+        bool
+            Whether this subscription has been closed.
+        """
+        return self._closed
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of messages discarded because the reader fell behind.
+
+        Returns
+        -------
+        int
+            The number of messages discarded because the reader fell behind.
+        """
+        return self._dropped
+
+    @property
+    def policy(self) -> SlowReaderPolicy:
+        return self._policy
+
+    def qsize(self) -> int:
+        """
+        Get the number of messages waiting to be read.
+
+        Returns
+        -------
+        int
+            The number of messages waiting to be read.
+        """
+        return self._queue.qsize()
+
+    def _make_room(self, channel: Optional[str]):
+        """
+        Discard queued messages according to the slow reader policy so that another message fits.
+
+        Parameters
+        ----------
+        channel : Optional[str]
+            The channel of the incoming message, used to coalesce; ``None`` to simply discard the oldest message.
+        """
+        if channel is not None and self._policy == SlowReaderPolicy.COALESCE:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            kept = [m for m in queued if m is self._CLOSED or _channel_name(m["channel"]) != channel]
+            self._dropped += len(queued) - len(kept)
+            for m in kept:
+                self._queue.put_nowait(m)
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._dropped += 1
+
+    def _deliver(self, message: PubSubMessage) -> bool:
+        """
+        Place a message in this subscription's queue, applying the slow reader policy if the queue is full.
+
+        Parameters
+        ----------
+        message : PubSubMessage
+            The message to deliver.
+
+        Returns
+        -------
+        bool
+            Whether the message was queued.
+        """
+        if self._closed:
+            return False
+        if self._queue.full():
+            if self._policy == SlowReaderPolicy.DROP_NEWEST:
+                self._dropped += 1
+                return False
+            self._make_room(_channel_name(message["channel"]))
+        self._queue.put_nowait(message)
+        return True
+
+    def _mark_closed(self):
+        """
+        Mark this subscription as closed and wake any waiting reader.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue.full():
+            self._make_room(None)
+        self._queue.put_nowait(self._CLOSED)
+
+    async def get(self) -> Optional[PubSubMessage]:
+        """
+        Wait for and return the next message.
+
+        Returns
+        -------
+        Optional[PubSubMessage]
+            The next message, or ``None`` if the subscription has been closed.
+        """
+        message = await self._queue.get()
+        if message is self._CLOSED:
+            # Leave the sentinel in place so that any other readers also see the subscription as closed
+            self._queue.put_nowait(message)
+            return None
+        return message
+
+    def get_nowait(self) -> Optional[PubSubMessage]:
+        """
+        Return the next message if one is immediately available.
+
+        Returns
+        -------
+        Optional[PubSubMessage]
+            The next message, or ``None`` if none is queued or the subscription has been closed.
+        """
+        try:
+            message = self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        if message is self._CLOSED:
+            self._queue.put_nowait(message)
+            return None
+        return message
+
+    async def close(self):
+        """
+        Stop receiving messages, releasing this subscription's hold on its channels.
+        """
+        await self._multiplexer.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> PubSubMessage:
+        message = await self.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    async def __aenter__(self) -> 'Subscription':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({', '.join(sorted(self._channels))})"
+
+
+class PubSubMultiplexer:
+    """
+    Shares a single Redis pub/sub connection among any number of ::class:`Subscription` objects.
+
+    Channels are subscribed to in Redis when their first subscriber arrives and unsubscribed from when their last
+    subscriber leaves. One reader task receives every message and fans it out to the queues of the subscriptions for
+    its channel, so the number of connections and tasks stays constant no matter how many subscribers there are.
+
+    An instance is bound to the event loop it is used within; see ::function:`get_multiplexer` for obtaining the
+    shared instance for the running loop.
+    """
+
+    _READ_TIMEOUT: float = 1.0
+    """ Seconds to block waiting for a message before checking whether there is still anything to read. """
+
+    _RETRY_DELAY: float = 1.0
+    """ Seconds to wait before reading again after an error. """
+
+    def __init__(self, connection: redis_asyncio.Redis, logger: Optional[logging.Logger] = None):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        connection : redis.asyncio.Redis
+            The Redis client used to publish and to open the shared pub/sub connection.
+        logger : Optional[logging.Logger]
+            Logger for reporting read errors, defaulting to the module logger.
+        """
+        self._connection = connection
+        self._pubsub = connection.pubsub()
+        self._subscriptions_by_channel: Dict[str, Set[Subscription]] = {}
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+        self._logger = logger or logging.getLogger(__name__)
+
+    @property
+    def channels(self) -> FrozenSet[str]:
+        """
+        The channels that currently have at least one subscriber.
+
+        Returns
+        -------
+        FrozenSet[str]
+            The channels that currently have at least one subscriber.
+        """
+        return frozenset(self._subscriptions_by_channel)
+
+    @property
+    def connection(self) -> redis_asyncio.Redis:
+        return self._connection
+
+    def subscriber_count(self, channel: Union[str, bytes]) -> int:
+        """
+        Get the number of subscriptions receiving messages from a channel.
+
+        Parameters
+        ----------
+        channel : Union[str, bytes]
+            The channel of interest.
+
+        Returns
+        -------
+        int
+            The number of subscriptions receiving messages from the channel.
+        """
+        return len(self._subscriptions_by_channel.get(_channel_name(channel), ()))
+
+    async def subscribe(self, *channels: Union[str, bytes], maxsize: int = DEFAULT_QUEUE_SIZE,
+                        policy: SlowReaderPolicy = SlowReaderPolicy.DROP_OLDEST) -> Subscription:
+        """
+        Create a subscription that receives messages from the given channels.
+
+        Parameters
+        ----------
+        channels : Union[str, bytes]
+            The channels to receive messages from.
+        maxsize : int
+            The maximum number of messages that may wait in the subscription's queue.
+        policy : SlowReaderPolicy
+            What to do with new messages when the subscription's queue is full.
+
+        Returns
+        -------
+        Subscription
+            The new subscription.
+        """
+        if not channels:
+            raise ValueError("Cannot subscribe to no channels")
+        subscription = Subscription(multiplexer=self, channels=channels, maxsize=maxsize, policy=policy)
+        async with self._lock:
+            new_channels = [c for c in subscription.channels if c not in self._subscriptions_by_channel]
+            if new_channels:
+                await self._pubsub.subscribe(*new_channels)
+            for channel in subscription.channels:
+                self._subscriptions_by_channel.setdefault(channel, set()).add(subscription)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.get_running_loop().create_task(self._read())
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        """
+        Close a subscription, unsubscribing from any of its channels that no longer have subscribers.
+
+        Parameters
+        ----------
+        subscription : Subscription
+            The subscription to close.
+        """
+        async with self._lock:
+            abandoned_channels = []
+            for channel in subscription.channels:
+                subscribers = self._subscriptions_by_channel.get(channel)
+                if subscribers is None or subscription not in subscribers:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions_by_channel[channel]
+                    abandoned_channels.append(channel)
+            subscription._mark_closed()
+            if abandoned_channels:
+                await self._pubsub.unsubscribe(*abandoned_channels)
+
+    async def publish(self, channel: Union[str, bytes], message: Union[str, bytes, int, float]) -> int:
+        """
+        Publish a message through the multiplexer's connection.
+
+        Parameters
+        ----------
+        channel : Union[str, bytes]
+            The channel to publish to.
+        message : Union[str, bytes, int, float]
+            The message to publish.
+
+        Returns
+        -------
+        int
+            The number of Redis-level subscribers that received the message.
+        """
+        return await self._connection.publish(channel, message)
+
+    def _dispatch(self, message: PubSubMessage):
+        """
+        Fan a received message out to every subscription for its channel.
+
+        Parameters
+        ----------
+        message : PubSubMessage
+            A message read from the shared pub/sub connection.
+        """
+        if message.get("type") != "message":
+            return
+        for subscription in tuple(self._subscriptions_by_channel.get(_channel_name(message["channel"]), ())):
+            subscription._deliver(message)
+
+    async def _read(self):
+        """
+        Read messages from the shared connection and dispatch them until there are no more subscribers.
+        """
+        while self._subscriptions_by_channel:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=self._READ_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f"{self.__class__.__name__} failed to read from Redis: {e}")
+                await asyncio.sleep(self._RETRY_DELAY)
+                continue
+            if message is not None:
+                self._dispatch(message)
+
+    async def close(self):
+        """
+        Close every subscription and release the shared connection.
+        """
+        async with self._lock:
+            subscriptions = {s for subscribers in self._subscriptions_by_channel.values() for s in subscribers}
+            self._subscriptions_by_channel.clear()
+            for subscription in subscriptions:
+                subscription._mark_closed()
+            if self._reader is not None:
+                self._reader.cancel()
+                try:
+                    await self._reader
+                except asyncio.CancelledError:
+                    pass
+                self._reader = None
+            # Older versions of redis only offer the now deprecated 'close'
+            close_pubsub = getattr(self._pubsub, "aclose", None) or self._pubsub.close
+            await close_pubsub()
+
+
+_multiplexers: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, PubSubMultiplexer]]' = \
+    weakref.WeakKeyDictionary()
+_multiplexers_lock = threading.Lock()
+
+
+def get_multiplexer(connection_factory: Optional[Callable[..., redis_asyncio.Redis]] = None,
+                    **connection_kwargs) -> PubSubMultiplexer:
+    """
+    Get the process-wide multiplexer for the running event loop and the described Redis instance.
+
+    A multiplexer is created on first use and shared by every later call with the same connection parameters within the
+    same event loop.
+
+    Parameters
+    ----------
+    connection_factory : Optional[Callable[..., redis.asyncio.Redis]]
+        Callable used to create the Redis client from the connection parameters, defaulting to
+        ::class:`redis.asyncio.Redis`.
+    connection_kwargs
+        Parameters for the Redis client, such as ``host``, ``port``, ``db``, ``username``, and ``password``.
+
+    Returns
+    -------
+    PubSubMultiplexer
+        The shared multiplexer for the running loop and connection parameters.
+    """
+    loop = asyncio.get_running_loop()
+    factory = connection_factory or redis_asyncio.Redis
+    key = (factory, tuple(sorted((k, str(v)) for k, v in connection_kwargs.items() if v is not None)))
+    with _multiplexers_lock:
+        loop_multiplexers = _multiplexers.setdefault(loop, {})
+        multiplexer = loop_multiplexers.get(key)
+        if multiplexer is None:
+            kwargs = {k: v for k, v in connection_kwargs.items() if v is not None}
+            multiplexer = PubSubMultiplexer(connection=factory(**kwargs))
+            loop_multiplexers[key] = multiplexer
+        return multiplexer
+
+
+class _BackgroundLoop:
+    """
+    A single daemon thread running an event loop, shared by every background listener in the process.
+    """
+
+    _instance: Optional['_BackgroundLoop'] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> '_BackgroundLoop':
+        with cls._instance_lock:
+            if cls._instance is None or not cls._instance.thread.is_alive():
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="dmod-redis-pubsub", daemon=True)
+        self.thread.start()
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+
+class BackgroundListener:
+    """
+    Handle to a subscription whose messages are passed to a synchronous handler, created by
+    ::function:`listen_in_background`.
+    """
+
+    def __init__(self, background_loop: _BackgroundLoop, subscription: Subscription, task: asyncio.Task):
+        self._background_loop = background_loop
+        self._subscription = subscription
+        self._task = task
+
+    @property
+    def subscription(self) -> Subscription:
+        return self._subscription
+
+    def is_alive(self) -> bool:
+        """
+        Whether messages are still being passed to the handler.
+
+        Returns
+        -------
+        bool
+            Whether messages are still being passed to the handler.
+        """
+        return not self._task.done()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop passing messages to the handler and release the underlying subscription.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Maximum seconds to wait for the subscription to be released.
+        """
+        if self._subscription.closed:
+            return
+        self._background_loop.run(self._subscription.close(), timeout)
+
+
+def listen_in_background(channels: Union[str, Collection[str]], handler: Callable[[PubSubMessage], Any],
+                         maxsize: int = DEFAULT_QUEUE_SIZE, policy: SlowReaderPolicy = SlowReaderPolicy.DROP_OLDEST,
+                         connection_factory: Optional[Callable[..., redis_asyncio.Redis]] = None,
+                         **connection_kwargs) -> BackgroundListener:
+    """
+    Pass messages from the given channels to a synchronous handler without dedicating a thread to the subscription.
+
+    All background listeners in a process share one event loop thread and one multiplexer per Redis instance. Handlers
+    are run in that loop's default executor, one message at a time per listener, so a slow handler does not hold up
+    delivery to other listeners.
+
+    Parameters
+    ----------
+    channels : Union[str, Collection[str]]
+        The channel or channels to listen to.
+    handler : Callable[[PubSubMessage], Any]
+        Function called with each received message.
+    maxsize : int
+        The maximum number of messages that may wait for the handler.
+    policy : SlowReaderPolicy
+        What to do with new messages when the handler has fallen behind.
+    connection_factory : Optional[Callable[..., redis.asyncio.Redis]]
+        Callable used to create the Redis client, defaulting to ::class:`redis.asyncio.Redis`.
+    connection_kwargs
+        Parameters for the Redis client.
+
+    Returns
+    -------
+    BackgroundListener
+        A handle that may be used to stop listening.
+    """
+    if isinstance(channels, (str, bytes)):
+        channels = [channels]
+    background_loop = _BackgroundLoop.get_instance()
+
+    async def forward(subscription: Subscription):
+        loop = asyncio.get_running_loop()
+        async for message in subscription:
+            try:
+                await loop.run_in_executor(None, handler, message)
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Handler for {subscription} failed: {e}")
+
+    async def start() -> Tuple[Subscription, asyncio.Task]:
+        multiplexer = get_multiplexer(connection_factory=connection_factory, **connection_kwargs)
+        subscription = await multiplexer.subscribe(*channels, maxsize=maxsize, policy=policy)
+        return subscription, asyncio.get_running_loop().create_task(forward(subscription))
+
+    subscription, task = background_loop.run(start())
+    return BackgroundListener(background_loop=background_loop, subscription=subscription, task=task)
@@ -1,9 +1,9 @@
 from abc import ABC
 from os import getenv
 from redis import Redis
-from time import sleep as time_sleep
 from typing import Optional
 from .keynamehelper import KeyNameHelper
+from .pool import get_connection_pool_registry
 
 
 class RedisBacked(ABC):
@@ -34,6 +34,11 @@ class RedisBacked(ABC):
         have something easily separable from the rest of initializer.  The allows for better isolation of logic during
         testing. As such, there is limited sanity checking of parameters.
 
+        The client is backed by the process-wide connection pool for the given parameters (see
+        ::class:`ConnectionPoolRegistry`), so all Redis-backed objects within a process that use the same Redis
+        instance share connections.  Since clients connect lazily, the server is sent ``PING`` to confirm that it is
+        reachable, retrying with exponential backoff.
+
         Parameters
         ----------
         host : str
@@ -56,20 +61,9 @@ class RedisBacked(ABC):
         Optional[Redis]
             An initialize Redis client object, or ``None`` if all attempts failed.
         """
-        n = 0
-        while n <= max_attempts:
-            # Sleep for one second on any retries, but not the first attempt.
-            if n == 0:
-                time_sleep(1)
-            try:
-                return Redis(host=host, port=port, db=db_num, decode_responses=True, password=passwd)
-            # FIXME except only redis failures here
-            except:
-                # TODO: implement some kind of logging
-                #logging.debug("redis connection error")
-                pass
-            n += 1
-        return None
+        registry = get_connection_pool_registry()
+        client = registry.get_client(host=host, port=port, db=db_num, password=passwd, decode_responses=True)
+        return client if registry.wait_until_ready(client, max_attempts=max_attempts) else None
 
     @classmethod
     def get_docker_secret_name_for_redis_pass(cls) -> str:
@@ -187,9 +181,9 @@ class RedisBacked(ABC):
         ::method:`get_redis_pass` respectively.
 
         Once the parameter values are set, the method will attempt to initialize a ::class:`Redis` connection object
-        and store it in the backing attribute for the ::attribute:`redis` property.  It will optionally retry if
-        attempts encounter raised errors, sleeping for 1 second after each attempt, up to the given maximum number of
-        attempts. By default, the maximum number of attempts is ``5`` if not provided.  This value is also used if a
+        from the process-wide connection pool and store it in the backing attribute for the ::attribute:`redis`
+        property.  It confirms the server responds to ``PING``, retrying with exponential backoff up to the given
+        maximum number of attempts. By default, the maximum number of attempts is ``5`` if not provided.  This value is also used if a
         non-integer argument is passed (meaning also that the argument cannot be cast to an integer).  Additionally,
         argument values of less than one will still be tried once, though not re-tried.
 
@@ -0,0 +1,192 @@
+import select
+import socket
+import threading
+import time
+import unittest
+
+from typing import List, Optional
+
+from ..redis.pool import ConnectionPoolRegistry, backoff_delays, get_connection_pool_registry
+from ..redis.redisbacked import RedisBacked
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class RestartableProxy:
+    """
+    TCP stand-in for a Redis server that can be killed and restarted on the same port.
+
+    Traffic is forwarded to an upstream server that keeps its data across restarts, while stopping the proxy drops every
+    open connection the same way a crashed server would.
+    """
+
+    def __init__(self, upstream_address):
+        self.upstream_address = upstream_address
+        self.port: Optional[int] = None
+        self.accepted_connections = 0
+        self._listener: Optional[socket.socket] = None
+        self._sockets: List[socket.socket] = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(("127.0.0.1", self.port or 0))
+        listener.listen()
+        self.port = listener.getsockname()[1]
+        self._listener = listener
+        threading.Thread(target=self._accept, args=(listener,), daemon=True).start()
+
+    def stop(self):
+        with self._lock:
+            sockets, self._sockets = self._sockets, []
+            listener, self._listener = self._listener, None
+        for s in sockets + [listener]:
+            try:
+                s.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            s.close()
+
+    def _accept(self, listener: socket.socket):
+        while True:
+            try:
+                client, _ = listener.accept()
+            except OSError:
+                return
+            upstream = socket.create_connection(self.upstream_address)
+            with self._lock:
+                self._sockets.extend([client, upstream])
+                self.accepted_connections += 1
+            threading.Thread(target=self._pipe, args=(client, upstream), daemon=True).start()
+
+    @staticmethod
+    def _pipe(client: socket.socket, upstream: socket.socket):
+        pair = {client: upstream, upstream: client}
+        try:
+            while True:
+                readable, _, _ = select.select(list(pair), [], [])
+                for source in readable:
+                    data = source.recv(65536)
+                    if not data:
+                        raise ConnectionError()
+                    pair[source].sendall(data)
+        except (OSError, ValueError):
+            for s in pair:
+                s.close()
+
+
+class _RedisBackedImpl(RedisBacked):
+    pass
+
+
+class TestBackoff(unittest.TestCase):
+
+    def test_backoff_delays_1_a(self):
+        """ Test that delays double up to the cap and there is one fewer than the attempts. """
+        self.assertEqual(backoff_delays(6, base=0.5, cap=4.0), [0.5, 1.0, 2.0, 4.0, 4.0])
+        self.assertEqual(backoff_delays(1), [])
+
+    def test_wait_until_ready_1_a(self):
+        """ Test that an unreachable server is pinged the given number of times with backoff in between. """
+        delays = []
+        registry = ConnectionPoolRegistry(socket_connect_timeout=0.5, command_retries=0, sleep=delays.append)
+        unused = socket.socket()
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+        unused.close()
+
+        client = registry.get_client(host="127.0.0.1", port=port)
+        self.assertFalse(registry.wait_until_ready(client, max_attempts=4, backoff_base=0.1, backoff_cap=1.0))
+        self.assertEqual(delays, [0.1, 0.2, 0.4])
+        self.assertEqual(registry.failed_health_checks, 4)
+        registry.clear()
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestConnectionPoolRegistry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.proxy = RestartableProxy(self.server.server_address)
+        self.proxy.start()
+        self.registry = get_connection_pool_registry()
+        self.registry.clear()
+
+    def tearDown(self) -> None:
+        self.registry.clear()
+        self.proxy.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_pool_1_a(self):
+        """ Test that pools are shared for the same parameters and separate otherwise. """
+        pool = self.registry.get_pool(host="127.0.0.1", port=self.proxy.port, db=0, password="")
+        self.assertIs(pool, self.registry.get_pool(host="127.0.0.1", port=self.proxy.port, db=0, password=""))
+        self.assertIsNot(pool, self.registry.get_pool(host="127.0.0.1", port=self.proxy.port, db=1, password=""))
+        self.assertIsNot(pool, self.registry.get_pool(host="127.0.0.1", port=self.proxy.port, db=0, password="x"))
+        self.assertEqual(len(self.registry), 3)
+
+    def test_redis_backed_1_a(self):
+        """ Test that separate Redis-backed objects for the same instance share a single pool. """
+        first = _RedisBackedImpl(redis_host="127.0.0.1", redis_port=self.proxy.port, redis_pass="")
+        second = _RedisBackedImpl(redis_host="127.0.0.1", redis_port=self.proxy.port, redis_pass="")
+
+        self.assertIs(first.redis.connection_pool, second.redis.connection_pool)
+        first.redis.set("key", "value")
+        self.assertEqual(second.redis.get("key"), "value")
+
+        stats = self.registry.statistics()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].created_connections, 1)
+        self.assertEqual(stats[0].in_use_connections, 0)
+        self.assertEqual(stats[0].available_connections, 1)
+
+    def test_restart_1_a(self):
+        """ Test that clients recover when the server is killed and restarted mid-run without leaking pools. """
+        clients = [_RedisBackedImpl(redis_host="127.0.0.1", redis_port=self.proxy.port, redis_pass="").redis
+                   for _ in range(4)]
+        clients[0].set("counter", 0)
+
+        errors = []
+        stop = threading.Event()
+
+        def work(client):
+            while not stop.is_set():
+                try:
+                    client.incr("counter")
+                except Exception as e:
+                    errors.append(e)
+                time.sleep(0.01)
+
+        workers = [threading.Thread(target=work, args=(c,), daemon=True) for c in clients]
+        for worker in workers:
+            worker.start()
+
+        time.sleep(0.2)
+        self.proxy.stop()
+        time.sleep(0.5)
+        self.proxy.start()
+        time.sleep(0.5)
+        count_after_restart = int(clients[0].get("counter"))
+        time.sleep(0.2)
+
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=10)
+
+        self.assertEqual(errors, [])
+        self.assertGreater(int(clients[0].get("counter")), count_after_restart)
+        self.assertEqual(len(self.registry), 1)
+        stats = self.registry.statistics()[0]
+        # Dropped connections are replaced rather than piling up
+        self.assertLessEqual(stats.in_use_connections + stats.available_connections, len(clients) + 1)
+        self.assertGreater(self.proxy.accepted_connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from typing import List
+
+from ..redis.pubsub import BackgroundListener, PubSubMultiplexer, SlowReaderPolicy, Subscription, get_multiplexer, \
+    listen_in_background
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+def _message(channel: str, data: str) -> dict:
+    return {"type": "message", "pattern": None, "channel": channel.encode(), "data": data.encode()}
+
+
+class TestSubscription(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests of slow reader handling within ::class:`Subscription`, independent of any Redis connection.
+    """
+
+    async def test_deliver_1_a(self):
+        """ Test that the newest message is discarded under the drop newest policy. """
+        subscription = Subscription(multiplexer=None, channels=["a"], maxsize=2, policy=SlowReaderPolicy.DROP_NEWEST)
+        for i in range(3):
+            subscription._deliver(_message("a", str(i)))
+        self.assertEqual(subscription.dropped, 1)
+        self.assertEqual([subscription.get_nowait()["data"] for _ in range(2)], [b"0", b"1"])
+
+    async def test_deliver_1_b(self):
+        """ Test that the oldest message is discarded under the drop oldest policy. """
+        subscription = Subscription(multiplexer=None, channels=["a"], maxsize=2, policy=SlowReaderPolicy.DROP_OLDEST)
+        for i in range(3):
+            subscription._deliver(_message("a", str(i)))
+        self.assertEqual(subscription.dropped, 1)
+        self.assertEqual([subscription.get_nowait()["data"] for _ in range(2)], [b"1", b"2"])
+
+    async def test_deliver_1_c(self):
+        """ Test that queued messages from the same channel are replaced under the coalesce policy. """
+        subscription = Subscription(multiplexer=None, channels=["a", "b"], maxsize=3,
+                                    policy=SlowReaderPolicy.COALESCE)
+        for channel, data in [("a", "0"), ("b", "1"), ("a", "2"), ("a", "3")]:
+            subscription._deliver(_message(channel, data))
+        self.assertEqual(subscription.dropped, 2)
+        self.assertEqual([subscription.get_nowait()["data"] for _ in range(2)], [b"1", b"3"])
+        self.assertIsNone(subscription.get_nowait())
+
+    async def test_deliver_1_d(self):
+        """ Test that coalescing falls back to dropping the oldest message when no channel has a backlog. """
+        subscription = Subscription(multiplexer=None, channels=["a", "b", "c"], maxsize=2,
+                                    policy=SlowReaderPolicy.COALESCE)
+        for channel, data in [("a", "0"), ("b", "1"), ("c", "2")]:
+            subscription._deliver(_message(channel, data))
+        self.assertEqual(subscription.dropped, 1)
+        self.assertEqual([subscription.get_nowait()["data"] for _ in range(2)], [b"1", b"2"])
+
+    async def test_mark_closed_1_a(self):
+        """ Test that closing a subscription wakes a waiting reader and ends iteration. """
+        subscription = Subscription(multiplexer=None, channels=["a"], maxsize=1)
+        subscription._deliver(_message("a", "0"))
+        subscription._mark_closed()
+        received = [m async for m in subscription]
+        # The queue was full, so the message made way for the close notice
+        self.assertEqual(received, [])
+        self.assertTrue(subscription.closed)
+        self.assertFalse(subscription._deliver(_message("a", "1")))
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestPubSubMultiplexer(unittest.IsolatedAsyncioTestCase):
+
+    NUM_CONSUMERS = 2000
+    NUM_SHARED_CHANNELS = 20
+
+    async def asyncSetUp(self) -> None:
+        # The test case runs its loop in debug mode, whose per-callback overhead would distort the load measurements
+        asyncio.get_running_loop().set_debug(False)
+        self.server = fakeredis.FakeServer()
+        self.multiplexer = PubSubMultiplexer(connection=fakeredis.FakeAsyncRedis(server=self.server))
+        self.publisher = fakeredis.FakeAsyncRedis(server=self.server)
+
+    async def asyncTearDown(self) -> None:
+        await self.multiplexer.close()
+
+    async def test_subscribe_1_a(self):
+        """ Test that channel subscriptions are reference counted. """
+        first = await self.multiplexer.subscribe("a", "b")
+        second = await self.multiplexer.subscribe("b")
+        self.assertEqual(self.multiplexer.subscriber_count("a"), 1)
+        self.assertEqual(self.multiplexer.subscriber_count("b"), 2)
+
+        await first.close()
+        self.assertEqual(self.multiplexer.channels, frozenset({"b"}))
+        self.assertEqual(self.multiplexer.subscriber_count("b"), 1)
+
+        await second.close()
+        self.assertEqual(self.multiplexer.channels, frozenset())
+        self.assertTrue(second.closed)
+
+    async def test_subscribe_1_b(self):
+        """ Test that messages are only delivered to subscriptions for their channel. """
+        a_subscription = await self.multiplexer.subscribe("a")
+        b_subscription = await self.multiplexer.subscribe("b")
+        both_subscription = await self.multiplexer.subscribe("a", "b")
+
+        await self.multiplexer.publish("a", "to a")
+        await self.multiplexer.publish("b", "to b")
+
+        self.assertEqual((await asyncio.wait_for(a_subscription.get(), 2))["data"], b"to a")
+        self.assertEqual((await asyncio.wait_for(b_subscription.get(), 2))["data"], b"to b")
+        both = [(await asyncio.wait_for(both_subscription.get(), 2))["data"] for _ in range(2)]
+        self.assertEqual(both, [b"to a", b"to b"])
+        self.assertIsNone(a_subscription.get_nowait())
+
+    async def test_subscribe_1_c(self):
+        """ Test that a channel resumes delivery after its last subscriber leaves and a new one arrives. """
+        subscription = await self.multiplexer.subscribe("a")
+        await subscription.close()
+        subscription = await self.multiplexer.subscribe("a")
+        await self.publisher.publish("a", "again")
+        self.assertEqual((await asyncio.wait_for(subscription.get(), 2))["data"], b"again")
+
+    async def test_get_multiplexer_1_a(self):
+        """ Test that the same multiplexer is shared for the same loop and connection parameters. """
+        factory = lambda **kwargs: fakeredis.FakeAsyncRedis(server=self.server)
+        first = get_multiplexer(connection_factory=factory, host="localhost", port=6379)
+        self.assertIs(first, get_multiplexer(connection_factory=factory, host="localhost", port=6379))
+        self.assertIsNot(first, get_multiplexer(connection_factory=factory, host="localhost", port=6380))
+
+    async def test_load_1_a(self):
+        """
+        Test that thousands of consumers share one reader without extra threads, idle CPU use, or slow delivery.
+        """
+        threads_before = threading.active_count()
+
+        consumers: List[Subscription] = []
+        for i in range(self.NUM_CONSUMERS):
+            consumers.append(await self.multiplexer.subscribe(f"consumer-{i}",
+                                                              f"shared-{i % self.NUM_SHARED_CHANNELS}"))
+
+        self.assertEqual(threading.active_count(), threads_before)
+        self.assertEqual(len(self.multiplexer.channels), self.NUM_CONSUMERS + self.NUM_SHARED_CHANNELS)
+
+        # Waiting on subscriptions with nothing to deliver should cost next to nothing
+        cpu_before = time.process_time()
+        await asyncio.sleep(1.0)
+        self.assertLess(time.process_time() - cpu_before, 0.2)
+
+        latencies: List[float] = []
+
+        async def consume(subscription: Subscription):
+            message = await subscription.get()
+            latencies.append(time.perf_counter() - float(message["data"]))
+
+        readers = [asyncio.create_task(consume(c)) for c in consumers]
+        for i in range(self.NUM_SHARED_CHANNELS):
+            await self.publisher.publish(f"shared-{i}", str(time.perf_counter()))
+        await asyncio.wait_for(asyncio.gather(*readers), timeout=10)
+
+        self.assertEqual(len(latencies), self.NUM_CONSUMERS)
+        self.assertLess(max(latencies), 2.0)
+        self.assertEqual(threading.active_count(), threads_before)
+
+        for consumer in consumers:
+            await consumer.close()
+        self.assertEqual(self.multiplexer.channels, frozenset())
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestListenInBackground(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = fakeredis.FakeServer()
+        self.publisher = fakeredis.FakeRedis(server=self.server)
+        self.factory = lambda **kwargs: fakeredis.FakeAsyncRedis(server=self.server)
+
+    def test_listen_in_background_1_a(self):
+        """ Test that many synchronous listeners share one thread and each receive their messages. """
+        received = {i: threading.Event() for i in range(50)}
+
+        threads_before = threading.active_count()
+        listeners: List[BackgroundListener] = [
+            listen_in_background(f"channel-{i}", lambda message, i=i: received[i].set(),
+                                 connection_factory=self.factory)
+            for i in range(50)
+        ]
+        # At most the one shared loop thread is added, no matter how many listeners there are
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+
+        for i in range(50):
+            self.publisher.publish(f"channel-{i}", "hello")
+        self.assertTrue(all(event.wait(timeout=5) for event in received.values()))
+
+        for listener in listeners:
+            listener.stop(timeout=5)
+        self.assertTrue(all(listener.subscription.closed for listener in listeners))
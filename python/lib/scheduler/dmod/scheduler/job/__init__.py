@@ -1,3 +1,4 @@
 from .job import Job, JobExecPhase, JobExecStep, JobImpl, JobStatus, RequestedJob
 from .job_util import JobUtil, DefaultJobUtilFactory
+from .job_watch import JobChange, JobWatcher
 from .job_manager import JobManager, JobManagerFactory
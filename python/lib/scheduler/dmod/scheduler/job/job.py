@@ -390,6 +390,9 @@ class Job(Serializable, ABC):
     rsa_key_pair: Optional[RsaKeyPair]
     """The ::class:`'RsaKeyPair'` for this job's shared SSH RSA keys, or ``None`` if not has been set."""
 
+    service_launch_latencies: Optional[Dict[str, float]]
+    """Seconds taken to launch each of this job's runtime services, keyed by service name, if it has been started."""
+
     status: JobStatus = Field(default_factory=lambda: JobStatus(JobExecPhase.INIT))
     """The ::class:`JobStatus` of this object."""
 
@@ -537,6 +540,10 @@ class Job(Serializable, ABC):
     def set_partition_config(self, part_config: PartitionConfig):
         pass
 
+    @abstractmethod
+    def set_service_launch_latencies(self, latencies: Dict[str, float]):
+        pass
+
     @abstractmethod
     def set_status(self, status: JobStatus):
         pass
@@ -936,6 +943,12 @@ class JobImpl(Job):
         # docstring for more detail.
         self.__dict__["partition_config"] = part_config
 
+    def set_service_launch_latencies(self, latencies: Dict[str, float]):
+        # NOTE: set using dict to avoid deprecation warning thrown by `__setattr__`.  See `Job.__setattr__`
+        # docstring for more detail.
+        self.__dict__["service_launch_latencies"] = dict(latencies)
+        self._reset_last_updated()
+
     def set_rsa_key_pair(self, key_pair: 'RsaKeyPair'):
         if key_pair != self.rsa_key_pair:
             # NOTE: set using dict to avoid deprecation warning thrown by `__setattr__`.  See `Job.__setattr__`
@@ -992,6 +1005,7 @@ class JobImpl(Job):
             "allocation_priority": self.set_allocation_priority,
             "job_id": self.set_job_id,
             "rsa_key_pair": self.set_rsa_key_pair,
+            "service_launch_latencies": self.set_service_launch_latencies,
          }
 
     def dict(
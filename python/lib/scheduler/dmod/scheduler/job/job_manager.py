@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from asyncio import sleep
 from typing import Dict, List, Optional, Tuple, Union
 from uuid import UUID, uuid4 as random_uuid
+from dmod.core import telemetry
 from dmod.core.execution import AllocationParadigm
 from dmod.core.serializable import BasicResultIndicator
 from dmod.communication.maas_request.dmod_job_request import DmodJobRequest
@@ -16,9 +17,18 @@ from dmod.communication import SchedulerRequestMessage
 
 import datetime
 import heapq
+import time
 
 import logging
 
+_ACTIVE_JOBS = telemetry.gauge('dmod_scheduler_active_jobs', 'Active jobs seen by the last job management iteration')
+_QUEUE_DEPTH = telemetry.gauge('dmod_scheduler_allocation_queue_depth',
+                               'Jobs awaiting allocation in the last job management iteration, by priority',
+                               ('priority',))
+_JOBS_ALLOCATED = telemetry.counter('dmod_scheduler_jobs_allocated_total', 'Jobs successfully allocated resources')
+_ITERATION_SECONDS = telemetry.histogram('dmod_scheduler_job_management_iteration_seconds',
+                                         'Time job management iterations hold the active jobs lock')
+
 
 class JobManagerFactory:
     """
@@ -545,9 +555,8 @@ class RedisBackedJobManager(JobManager, RedisBackedJobUtil):
 
         for _ in range(max_attempt_count):
             with self.redis.pipeline() as pipeline:
-                if job_obj.status.is_active:
-                    # Make sure not in active set
-                    pipeline.srem(self._active_jobs_set_key, job_key)
+                # Make sure not in the active set or status index
+                self._remove_job_from_indexes(pipeline, job_id, job_obj.status)
                 pipeline.delete(job_key)
                 pipeline.execute()
 
@@ -647,6 +656,7 @@ class RedisBackedJobManager(JobManager, RedisBackedJobUtil):
             lock_id = str(uuid.uuid4())
             while not self.lock_active_jobs(lock_id):
                 await sleep(2)
+            iteration_start = time.perf_counter()
 
             # Get collection of "active" jobs
             active_jobs: List[RequestedJob] = self.get_all_active_jobs()
@@ -676,6 +686,8 @@ class RedisBackedJobManager(JobManager, RedisBackedJobUtil):
                     active_jobs.remove(job)
                     self.save_job(job)
 
+            _ACTIVE_JOBS.set(len(active_jobs))
+
             # TODO: something must transition MODEL_EXEC_RUNNING Jobs to MODEL_EXEC_COMPLETED (probably Monitor class)
             # TODO: something must transition OUTPUT_EXEC_RUNNING Jobs to OUTPUT_EXEC_COMPLETED (probably Monitor class)
 
@@ -696,6 +708,8 @@ class RedisBackedJobManager(JobManager, RedisBackedJobUtil):
 
             # Build prioritized list/queue of allocation eligible Jobs
             priority_queues = self.build_prioritized_pending_allocation_queues(jobs_eligible_for_allocate)
+            for priority, pending in priority_queues.items():
+                _QUEUE_DEPTH.labels(priority).set(len(pending))
             high_priority_queue = priority_queues['high']
 
             # Do this here to get size in case queue is altered below
@@ -710,6 +724,7 @@ class RedisBackedJobManager(JobManager, RedisBackedJobUtil):
             if len(allocated_successfully) == initial_high_priority_queue_size:
                 allocated_successfully.extend(self._request_allocations_for_queue(med_priority_queue))
                 allocated_successfully.extend(self._request_allocations_for_queue(low_priority_queue))
+            _JOBS_ALLOCATED.inc(len(allocated_successfully))
 
             # TODO: have data management service handle the AWAITING_DATA step so it can transition to the AWAITING_SCHEDULING step
 
@@ -731,6 +746,7 @@ class RedisBackedJobManager(JobManager, RedisBackedJobUtil):
                     logging.error(f"The job '{job}' failed")
                 self.save_job(job)
 
+            _ITERATION_SECONDS.observe(time.perf_counter() - iteration_start)
             self.unlock_active_jobs(lock_id)
             await sleep(5)
 
@@ -1,9 +1,19 @@
 import json
+import time
 
 from .job import Job, JobStatus, RequestedJob
+from .job_watch import JobChange, JobWatcher
 from abc import ABC, abstractmethod
+from datetime import datetime
+from dmod.core import telemetry
 from dmod.redis import KeyNameHelper, RedisBacked
-from typing import List, Optional
+from redis import asyncio as redis_asyncio
+from redis.client import Pipeline
+from typing import Iterator, List, Optional, Set, Tuple, Union
+
+_STATUS_SECONDS = telemetry.histogram('dmod_job_status_seconds',
+                                      'Time jobs spent in a status before changing to another, by the status left',
+                                      ('status',))
 
 
 class DefaultJobUtilFactory:
@@ -54,6 +64,22 @@ class JobUtil(ABC):
     resource allocations.
     """
 
+    @abstractmethod
+    def create_job_watcher(self) -> JobWatcher:
+        """
+        Create a watcher for receiving the status changes of jobs as they are saved.
+
+        Returns
+        -------
+        JobWatcher
+            A new watcher, which should be used within a single event loop.
+
+        See Also
+        -------
+        get_job_changes
+        """
+        pass
+
     @abstractmethod
     def does_job_exist(self, job_id) -> bool:
         """
@@ -100,6 +126,25 @@ class JobUtil(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_job_changes(self, job_id, after_version: int = 0) -> List[JobChange]:
+        """
+        Get the retained status changes of a job, in order.
+
+        Parameters
+        ----------
+        job_id
+            The id of the job of interest.
+        after_version : int
+            Only changes with a greater version are returned; by default ``0``, to return all retained changes.
+
+        Returns
+        -------
+        List[JobChange]
+            The retained status changes of the job, in order.
+        """
+        pass
+
     @abstractmethod
     def lock_active_jobs(self, lock_id: str) -> bool:
         """
@@ -212,6 +257,9 @@ class RedisBackedJobUtil(JobUtil, RedisBacked):
 
     _ACTIVE_JOBS_LOCK_KEY = b':lock:active_jobs:'
 
+    _JOB_CHANGES_MAX_LENGTH = 100
+    """ The (approximate) number of the latest status changes retained in the changes stream of each job. """
+
     # TODO: look at either deprecating this or applying it appropriately to all managed objects
     @classmethod
     def get_key_prefix(cls, environment_type: str = 'prod'):
@@ -246,6 +294,10 @@ class RedisBackedJobUtil(JobUtil, RedisBacked):
         """ Key to Redis set containing the job ids (not keys) of active jobs. """
         self._all_jobs_set_key = self.keynamehelper.create_key_name(key_prefix, 'all_jobs')
         """ Key to Redis set containing the job ids (not keys) of all jobs. """
+        self._status_index_key_prefix = self.keynamehelper.create_key_name(key_prefix, 'status')
+        """ Prefix of keys to Redis sorted sets of the ids of jobs with a given status, scored by last update time. """
+        self._status_index_names_key = self.keynamehelper.create_key_name(key_prefix, 'indexed_statuses')
+        """ Key to Redis set containing the names of statuses that have an index. """
 
     def _dev_setup(self):
         self._clean_keys()
@@ -286,6 +338,90 @@ class RedisBackedJobUtil(JobUtil, RedisBacked):
         """
         return self.create_key_name('job', str(job_id))
 
+    def _get_job_status_key_for_id(self, job_id) -> str:
+        """
+        Get the Redis key for the name of the status under which the job with the given id is indexed.
+
+        Parameters
+        ----------
+        job_id
+            The id of the job of interest.
+
+        Returns
+        -------
+        str
+            The Redis key for the name of the status under which the job with the given id is indexed.
+        """
+        return self.create_key_name('job', str(job_id), 'status')
+
+    def _get_job_changes_key_for_id(self, job_id) -> str:
+        """
+        Get the Redis key for the stream of status changes of the job with the given id.
+
+        Parameters
+        ----------
+        job_id
+            The id of the job of interest.
+
+        Returns
+        -------
+        str
+            The Redis key for the stream of status changes of the job with the given id.
+        """
+        return self.create_key_name('job', str(job_id), 'changes')
+
+    def _get_status_index_key(self, status: Union[JobStatus, str]) -> str:
+        """
+        Get the Redis key for the sorted set index of the ids of jobs with the given status.
+
+        Parameters
+        ----------
+        status : Union[JobStatus, str]
+            The status, or the name of the status, of interest.
+
+        Returns
+        -------
+        str
+            The Redis key for the sorted set index of the ids of jobs with the given status.
+        """
+        name = status.name if isinstance(status, JobStatus) else str(status)
+        return self.keynamehelper.create_derived_key(self._status_index_key_prefix, name)
+
+    def _remove_job_from_indexes(self, pipeline: Pipeline, job_id, status: Union[JobStatus, str]):
+        """
+        Queue the commands for removing a job from the active jobs set and status index on the given pipeline.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline or transaction to which the commands are added.
+        job_id
+            The id of the job being removed.
+        status : Union[JobStatus, str]
+            The status under which the job is indexed.
+        """
+        pipeline.srem(self._active_jobs_set_key, str(job_id))
+        pipeline.zrem(self._get_status_index_key(status), str(job_id))
+        pipeline.delete(self._get_job_status_key_for_id(job_id))
+        pipeline.delete(self._get_job_changes_key_for_id(job_id))
+
+    def create_job_watcher(self) -> JobWatcher:
+        """
+        Create a watcher for receiving the status changes of jobs as they are saved.
+
+        The watcher gets its own asynchronous Redis client, connected to the same Redis instance as this object.
+
+        Returns
+        -------
+        JobWatcher
+            A new watcher, which should be used within a single event loop.
+        """
+        params = self.redis.connection_pool.connection_kwargs
+        connection = redis_asyncio.Redis(host=params.get('host', 'localhost'), port=params.get('port', 6379),
+                                         db=params.get('db', 0), password=params.get('password'),
+                                         decode_responses=True)
+        return JobWatcher(connection=connection, changes_key_for=self._get_job_changes_key_for_id)
+
     def does_job_exist(self, job_id) -> bool:
         """
         Test whether a job with the given job id exists.
@@ -330,6 +466,26 @@ class RedisBackedJobUtil(JobUtil, RedisBacked):
         """
         return sorted(self.redis.smembers(self._active_jobs_set_key if only_active else self._all_jobs_set_key))
 
+    def get_job_changes(self, job_id, after_version: int = 0) -> List[JobChange]:
+        """
+        Get the retained status changes of a job, in order.
+
+        Parameters
+        ----------
+        job_id
+            The id of the job of interest.
+        after_version : int
+            Only changes with a greater version are returned; by default ``0``, to return all retained changes.
+
+        Returns
+        -------
+        List[JobChange]
+            The retained status changes of the job, in order.
+        """
+        entries = self.redis.xrange(self._get_job_changes_key_for_id(job_id),
+                                    min=JobChange.get_stream_id(after_version + 1))
+        return [JobChange.from_stream_entry(str(job_id), stream_id, fields) for stream_id, fields in entries]
+
     def get_jobs_for_status(self, status: JobStatus) -> List[Job]:
         """
         Get a list of the known jobs to this object with the given ::class:`JobStatus`.
@@ -343,8 +499,135 @@ class RedisBackedJobUtil(JobUtil, RedisBacked):
         -------
         List[Job]
             A list of the known jobs to this object with the given ::class:`JobStatus`.
+
+        See Also
+        -------
+        iter_jobs
         """
-        pass
+        return list(self.iter_jobs(status))
+
+    def iter_jobs(self, status: JobStatus, since: Optional[datetime] = None,
+                  page_size: int = 500) -> Iterator[RequestedJob]:
+        """
+        Iterate through the known jobs with the given status, in order of when they were last updated.
+
+        Jobs are found through the status index maintained by ::method:`save_job` and retrieved a page at a time.  Pages
+        are read from a cursor of the last seen update time, so jobs that change status while being iterated over do
+        not cause others to be repeated or skipped.  A job whose status changed between being found in the index and
+        being retrieved is not returned.
+
+        Parameters
+        ----------
+        status : JobStatus
+            The status value of interest.
+        since : Optional[datetime]
+            When given, only jobs last updated at or after this time are returned.
+        page_size : int
+            The number of jobs retrieved from Redis at once.
+
+        Returns
+        -------
+        Iterator[RequestedJob]
+            The jobs with the given status.
+        """
+        index_key = self._get_status_index_key(status)
+        lower_bound: Union[float, str] = since.timestamp() if since is not None else '-inf'
+        # Ids already returned with a score equal to the lower bound, which is inclusive
+        seen_at_lower_bound: Set[str] = set()
+
+        while True:
+            requested = page_size + len(seen_at_lower_bound)
+            entries: List[Tuple[str, float]] = self.redis.zrangebyscore(index_key, lower_bound, '+inf', start=0,
+                                                                        num=requested, withscores=True)
+            page = [(job_id, score) for job_id, score in entries if job_id not in seen_at_lower_bound][:page_size]
+            if not page:
+                return
+
+            records = self.redis.mget([self._get_job_key_for_id(job_id) for job_id, _ in page])
+            for record in records:
+                if record is None:
+                    continue
+                job = RequestedJob.factory_init_from_deserialized_json(json_obj=json.loads(record))
+                if job.status == status:
+                    yield job
+
+            last_score = page[-1][1]
+            if last_score != lower_bound:
+                lower_bound = last_score
+                seen_at_lower_bound = set()
+            seen_at_lower_bound.update(job_id for job_id, score in page if score == last_score)
+
+            if len(entries) < requested:
+                return
+
+    def rebuild_status_indexes(self, batch_size: int = 1000) -> int:
+        """
+        Rebuild (i.e., repair) the status indexes and the active jobs set from the saved job records.
+
+        Indexes are rebuilt under temporary keys and then swapped in at once, so readers never see partial indexes.
+        Ids of jobs without a saved record are removed along the way.  Jobs saved while a rebuild is in progress may be
+        left out of the rebuilt indexes, so this is best run while the scheduler is idle.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of job records read from Redis at once.
+
+        Returns
+        -------
+        int
+            The number of jobs that were indexed.
+        """
+        rebuild_suffix = 'rebuild'
+        job_ids = sorted(self.redis.smembers(self._all_jobs_set_key))
+        rebuilt_statuses: Set[str] = set()
+        active_job_ids: Set[str] = set()
+        indexed_count = 0
+
+        for start in range(0, len(job_ids), batch_size):
+            batch = job_ids[start:start + batch_size]
+            records = self.redis.mget([self._get_job_key_for_id(job_id) for job_id in batch])
+            pipeline = self.redis.pipeline(transaction=False)
+            try:
+                for job_id, record in zip(batch, records):
+                    if record is None:
+                        pipeline.srem(self._all_jobs_set_key, job_id)
+                        pipeline.delete(self._get_job_status_key_for_id(job_id))
+                        pipeline.delete(self._get_job_changes_key_for_id(job_id))
+                        continue
+                    serialized_job = json.loads(record)
+                    status = JobStatus.get_for_name(serialized_job['status'])
+                    last_updated = datetime.strptime(serialized_job['last_updated'], Job.get_datetime_str_format())
+                    temporary_index_key = self.keynamehelper.create_derived_key(self._get_status_index_key(status),
+                                                                                rebuild_suffix)
+                    pipeline.zadd(temporary_index_key, {job_id: last_updated.timestamp()})
+                    pipeline.set(self._get_job_status_key_for_id(job_id), status.name)
+                    rebuilt_statuses.add(status.name)
+                    if status.is_active:
+                        active_job_ids.add(job_id)
+                    indexed_count += 1
+                pipeline.execute()
+            finally:
+                pipeline.reset()
+
+        previous_statuses = self.redis.smembers(self._status_index_names_key)
+        with self.redis.pipeline() as transaction:
+            for name in previous_statuses:
+                if name not in rebuilt_statuses:
+                    transaction.delete(self._get_status_index_key(name))
+            for name in rebuilt_statuses:
+                transaction.rename(self.keynamehelper.create_derived_key(self._get_status_index_key(name),
+                                                                         rebuild_suffix),
+                                   self._get_status_index_key(name))
+            transaction.delete(self._status_index_names_key)
+            if rebuilt_statuses:
+                transaction.sadd(self._status_index_names_key, *rebuilt_statuses)
+            transaction.delete(self._active_jobs_set_key)
+            if active_job_ids:
+                transaction.sadd(self._active_jobs_set_key, *active_job_ids)
+            transaction.execute()
+
+        return indexed_count
 
     def retrieve_job(self, job_id) -> RequestedJob:
         """
@@ -434,27 +717,71 @@ class RedisBackedJobUtil(JobUtil, RedisBacked):
 
     def save_job(self, job: RequestedJob):
         """
-        Add or update the given job object's Redis record, also maintaining a Redis set of the ids of 'active' jobs.
+        Add or update the given job object's Redis record, also maintaining a Redis set of the ids of 'active' jobs and
+        an index of the ids of jobs for each status.
+
+        When the job's status differs from its indexed status, a ::class:`JobChange` with the next version for the job is
+        also appended to the job's changes stream, for any ::class:`JobWatcher` following the job.  Entries also record
+        when they were added, so the time the job spent in its previous status is observed in the
+        ``dmod_job_status_seconds`` histogram.
+
+        The record, indexes, and changes stream are updated in a single transaction that watches the job's indexed
+        status and changes stream, so that concurrent saves of the same job always leave it in exactly one status index
+        (the one matching its record) and never record the same version twice.
 
         Parameters
         ----------
         job : RequestedJob
             The job to be updated or added.
         """
-        pipeline = self.redis.pipeline()
-        try:
-            pipeline.set(name=self._get_job_key_for_id(job.job_id), value=job.to_json())
+        job_id = str(job.job_id)
+        job_key = self._get_job_key_for_id(job_id)
+        status_key = self._get_job_status_key_for_id(job_id)
+        changes_key = self._get_job_changes_key_for_id(job_id)
+        serialized_job = job.to_json()
+        status_name = job.status.name
+        score = job.last_updated.timestamp()
+        # The status left and the time spent in it, as of the last attempt at the transaction
+        transition: Optional[Tuple[str, float]] = None
+
+        def update(pipeline: Pipeline):
+            nonlocal transition
+            transition = None
+            previous_status = pipeline.get(status_key)
+            if isinstance(previous_status, bytes):
+                previous_status = previous_status.decode()
+            change = None
+            changed_at = time.time()
+            if previous_status != status_name:
+                last_entries = pipeline.xrevrange(changes_key, count=1)
+                version = JobChange.get_version(last_entries[0][0]) + 1 if last_entries else 1
+                change = JobChange(job_id=job_id, status=status_name, step=job.status.job_exec_step.name,
+                                   version=version)
+                last_changed_at = last_entries[0][1].get(b'at', last_entries[0][1].get('at')) if last_entries else None
+                if previous_status is not None and last_changed_at is not None:
+                    transition = (previous_status, max(0.0, changed_at - float(last_changed_at)))
+            pipeline.multi()
+            pipeline.set(name=job_key, value=serialized_job)
             # Always add to our all-jobs set
-            pipeline.sadd(self._all_jobs_set_key, job.job_id)
+            pipeline.sadd(self._all_jobs_set_key, job_id)
             if job.status.is_active:
                 # Add to active set
-                pipeline.sadd(self._active_jobs_set_key, job.job_id)
+                pipeline.sadd(self._active_jobs_set_key, job_id)
             else:
                 # Make sure not in active set
-                pipeline.srem(self._active_jobs_set_key, job.job_id)
-            pipeline.execute()
-        finally:
-            pipeline.reset()
+                pipeline.srem(self._active_jobs_set_key, job_id)
+            if previous_status is not None and previous_status != status_name:
+                pipeline.zrem(self._get_status_index_key(previous_status), job_id)
+            pipeline.zadd(self._get_status_index_key(status_name), {job_id: score})
+            pipeline.sadd(self._status_index_names_key, status_name)
+            pipeline.set(name=status_key, value=status_name)
+            if change is not None:
+                pipeline.xadd(changes_key, dict(change.to_stream_fields(), at=repr(changed_at)), id=change.stream_id,
+                              maxlen=self._JOB_CHANGES_MAX_LENGTH, approximate=True)
+
+        self.redis.transaction(update, status_key, changes_key)
+        if transition is not None:
+            _STATUS_SECONDS.labels(transition[0]).observe(transition[1])
 
     def unlock_active_jobs(self, lock_id: str) -> bool:
         """
@@ -0,0 +1,334 @@
+"""
+Push-based watching of job status changes.
+
+Whenever a job's status changes, ::method:`RedisBackedJobUtil.save_job` appends a compact ::class:`JobChange` record to
+a Redis stream for that job.  Each record's stream entry id is derived from its version, a per-job counter of status
+changes, so changes can be read again from any version (e.g., by a client that reconnects).
+
+A ::class:`JobWatcher` shares one reader among any number of watches, of any number of jobs, in a process.  It reads
+every watched stream with a single blocking ``XREAD`` and fans each change out to the ::class:`Subscription` of each
+watch of that job.  As such, the number of Redis commands needed to follow jobs does not grow with the number of
+watchers.
+"""
+import asyncio
+import logging
+
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple, Union
+
+from dmod.redis import SlowReaderPolicy, Subscription
+from dmod.redis.pubsub import DEFAULT_QUEUE_SIZE
+from redis import asyncio as redis_asyncio
+
+from .job import JobStatus
+
+
+class JobChange(NamedTuple):
+    """
+    Compact record of a change to a job's status.
+    """
+    job_id: str
+    status: str
+    """ The name of the job's new ::class:`JobStatus`. """
+    step: str
+    """ The name of the job's new ::class:`JobExecStep`. """
+    version: int
+    """ The number of status changes the job has had, including this one. """
+
+    @classmethod
+    def get_stream_id(cls, version: int) -> str:
+        """
+        Get the id of the stream entry for the change with the given version.
+
+        Parameters
+        ----------
+        version : int
+            The version of a change.
+
+        Returns
+        -------
+        str
+            The id of the stream entry for the change with the given version.
+        """
+        return f"{version}-0"
+
+    @classmethod
+    def get_version(cls, stream_id: Union[str, bytes]) -> int:
+        """
+        Get the version of the change with the given stream entry id.
+
+        Parameters
+        ----------
+        stream_id : Union[str, bytes]
+            The id of a change's stream entry.
+
+        Returns
+        -------
+        int
+            The version of the change.
+        """
+        if isinstance(stream_id, bytes):
+            stream_id = stream_id.decode()
+        return int(stream_id.split('-', 1)[0])
+
+    @classmethod
+    def from_stream_entry(cls, job_id: str, stream_id: Union[str, bytes],
+                          fields: Dict[Union[str, bytes], Union[str, bytes]]) -> 'JobChange':
+        """
+        Create an instance from an entry of a job's changes stream.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job.
+        stream_id : Union[str, bytes]
+            The id of the stream entry.
+        fields : Dict[Union[str, bytes], Union[str, bytes]]
+            The fields of the stream entry.
+
+        Returns
+        -------
+        JobChange
+            The change recorded in the stream entry.
+        """
+        values = {(k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                  for k, v in fields.items()}
+        return cls(job_id=job_id, status=values['status'], step=values['step'], version=cls.get_version(stream_id))
+
+    @property
+    def job_status(self) -> JobStatus:
+        return JobStatus.get_for_name(self.status)
+
+    @property
+    def stream_id(self) -> str:
+        return self.get_stream_id(self.version)
+
+    def to_stream_fields(self) -> Dict[str, str]:
+        """
+        Get the fields for this change's stream entry, which leave out what is implied by the stream and entry id.
+
+        Returns
+        -------
+        Dict[str, str]
+            The fields for this change's stream entry.
+        """
+        return {'status': self.status, 'step': self.step}
+
+
+class JobWatcher:
+    """
+    Shares a single reader of job changes streams among any number of job watches.
+
+    Streams are added to the shared ``XREAD`` when the first watch of their job is created, and removed when the last
+    watch of their job is closed.  Since that blocking read only notices newly watched jobs once it returns, reads block
+    for at most ::attribute:`_BLOCK_MILLISECONDS`; changes to already watched jobs are received as soon as they happen.
+
+    An instance is bound to the event loop it is used within.
+    """
+
+    _BLOCK_MILLISECONDS: int = 500
+    """ Milliseconds to block waiting for changes before reading again with the current set of watched jobs. """
+
+    _RETRY_DELAY: float = 1.0
+    """ Seconds to wait before reading again after an error. """
+
+    def __init__(self, connection: redis_asyncio.Redis, changes_key_for: Callable[[str], str],
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize an instance.
+
+        Parameters
+        ----------
+        connection : redis.asyncio.Redis
+            The Redis client used to read changes streams.
+        changes_key_for : Callable[[str], str]
+            Function to get the key of the changes stream for a job id.
+        logger : Optional[logging.Logger]
+            Logger for reporting read errors, defaulting to the module logger.
+        """
+        self._connection = connection
+        self._changes_key_for = changes_key_for
+        self._subscriptions_by_job: Dict[str, Set[Subscription]] = {}
+        self._last_versions: Dict[str, int] = {}
+        """ The version of the last change delivered to watches of each job. """
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.Task] = None
+        self._logger = logger or logging.getLogger(__name__)
+
+    @property
+    def watched_job_ids(self) -> FrozenSet[str]:
+        """
+        The ids of jobs that currently have at least one watch.
+
+        Returns
+        -------
+        FrozenSet[str]
+            The ids of jobs that currently have at least one watch.
+        """
+        return frozenset(self._subscriptions_by_job)
+
+    def watch_count(self, job_id: str) -> int:
+        """
+        Get the number of watches of a job.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job of interest.
+
+        Returns
+        -------
+        int
+            The number of watches of the job.
+        """
+        return len(self._subscriptions_by_job.get(job_id, ()))
+
+    def _deliver(self, subscription: Subscription, change: JobChange):
+        subscription._deliver({'type': 'message', 'pattern': None, 'channel': change.job_id, 'data': change})
+
+    async def _read_changes(self, job_id: str, after_version: int,
+                            through_version: Optional[int] = None) -> List[JobChange]:
+        """
+        Read the retained changes of a job directly from its stream.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job of interest.
+        after_version : int
+            Only changes with greater versions are read.
+        through_version : Optional[int]
+            When given, only changes with versions less than or equal to this are read.
+
+        Returns
+        -------
+        List[JobChange]
+            The retained changes of the job in the given range, in order.
+        """
+        maximum = '+' if through_version is None else JobChange.get_stream_id(through_version)
+        entries = await self._connection.xrange(self._changes_key_for(job_id),
+                                                min=JobChange.get_stream_id(after_version + 1), max=maximum)
+        return [JobChange.from_stream_entry(job_id, stream_id, fields) for stream_id, fields in entries]
+
+    async def watch(self, job_id: str, after_version: int = 0, maxsize: int = DEFAULT_QUEUE_SIZE,
+                    policy: SlowReaderPolicy = SlowReaderPolicy.DROP_OLDEST) -> Subscription:
+        """
+        Create a watch that receives the changes of a job, starting after the given version.
+
+        Each message received through the returned subscription has the ::class:`JobChange` as its ``data`` and the job
+        id as its ``channel``.  Retained changes after ``after_version`` are queued immediately, so a client that lost
+        its connection may resume from the last version it received.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job to watch.
+        after_version : int
+            The version after which changes should be received; by default ``0``, to receive every retained change.
+        maxsize : int
+            The maximum number of changes that may wait in the watch's queue.
+        policy : SlowReaderPolicy
+            What to do with new changes when the watch's queue is full.
+
+        Returns
+        -------
+        Subscription
+            The new watch, which should be closed once no longer needed.
+        """
+        job_id = str(job_id)
+        subscription = Subscription(multiplexer=self, channels=[job_id], maxsize=maxsize, policy=policy)
+        async with self._lock:
+            if job_id in self._subscriptions_by_job:
+                # Catch up to the shared reader, which continues after its last delivered version
+                last_version = self._last_versions[job_id]
+                backlog = [] if after_version >= last_version else await self._read_changes(job_id, after_version,
+                                                                                           last_version)
+            else:
+                backlog = await self._read_changes(job_id, after_version)
+                self._last_versions[job_id] = backlog[-1].version if backlog else after_version
+            for change in backlog:
+                self._deliver(subscription, change)
+            self._subscriptions_by_job.setdefault(job_id, set()).add(subscription)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.get_running_loop().create_task(self._read())
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        """
+        Close a watch, no longer reading the changes of its job if it has no other watches.
+
+        Parameters
+        ----------
+        subscription : Subscription
+            The watch to close.
+        """
+        async with self._lock:
+            for job_id in subscription.channels:
+                subscriptions = self._subscriptions_by_job.get(job_id)
+                if subscriptions is None or subscription not in subscriptions:
+                    continue
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions_by_job[job_id]
+                    del self._last_versions[job_id]
+            subscription._mark_closed()
+
+    def _dispatch(self, job_id: str, entries: List[Tuple[str, Dict[str, str]]]):
+        """
+        Fan changes read from a job's stream out to every watch of the job.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job.
+        entries : List[Tuple[str, Dict[str, str]]]
+            The stream entries read for the job.
+        """
+        if job_id not in self._subscriptions_by_job:
+            return
+        for stream_id, fields in entries:
+            change = JobChange.from_stream_entry(job_id, stream_id, fields)
+            # Skip anything already delivered, e.g., if the job was watched again while this read was underway
+            if change.version <= self._last_versions[job_id]:
+                continue
+            self._last_versions[job_id] = change.version
+            for subscription in tuple(self._subscriptions_by_job[job_id]):
+                self._deliver(subscription, change)
+
+    async def _read(self):
+        """
+        Read changes for every watched job and dispatch them until there are no more watches.
+        """
+        while self._subscriptions_by_job:
+            job_ids_by_key = {self._changes_key_for(job_id): job_id for job_id in self._subscriptions_by_job}
+            streams = {key: JobChange.get_stream_id(self._last_versions[job_id]) for key, job_id in
+                       job_ids_by_key.items()}
+            try:
+                results = await self._connection.xread(streams, block=self._BLOCK_MILLISECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._logger.error(f"{self.__class__.__name__} failed to read from Redis: {e}")
+                await asyncio.sleep(self._RETRY_DELAY)
+                continue
+            for key, entries in results or ():
+                if isinstance(key, bytes):
+                    key = key.decode()
+                self._dispatch(job_ids_by_key[key], entries)
+
+    async def close(self):
+        """
+        Close every watch and stop reading.
+        """
+        async with self._lock:
+            subscriptions = {s for subscriptions in self._subscriptions_by_job.values() for s in subscriptions}
+            self._subscriptions_by_job.clear()
+            self._last_versions.clear()
+            for subscription in subscriptions:
+                subscription._mark_closed()
+            if self._reader is not None:
+                self._reader.cancel()
+                try:
+                    await self._reader
+                except asyncio.CancelledError:
+                    pass
+                self._reader = None
@@ -4,6 +4,7 @@ from typing import Iterable, List, Union, Optional
 from redis import WatchError
 import logging
 
+from dmod.core import telemetry
 from dmod.redis import RedisBacked
 ## local imports
 from .resource_manager import ResourceManager
@@ -18,6 +19,10 @@ logging.basicConfig(
     format="%(asctime)s,%(msecs)d %(levelname)s: %(message)s",
     datefmt="%H:%M:%S")
 
+_TRANSACTION_RETRIES = telemetry.counter('dmod_resource_transaction_retries_total',
+                                         'Resource transactions retried after a concurrent write conflict',
+                                         ('operation',))
+
 
 class RedisManager(ResourceManager, RedisBacked):
     """
@@ -158,6 +163,7 @@ class RedisManager(ResourceManager, RedisBacked):
                         resource.release(cpus_allocated, mem_allocated)
                 except WatchError:
                     logging.debug("Write Conflict allocate_resource: {}. Retrying...".format(resource_key))
+                    _TRANSACTION_RETRIES.labels('allocate_resource').inc()
                     # Clear and try the transaction again
                     pipeline.reset()
                     continue
@@ -209,6 +215,7 @@ class RedisManager(ResourceManager, RedisBacked):
 
                 except WatchError:
                     logging.debug("Write Conflict allocate_resource: {}. Retrying...".format(source_resource_key))
+                    _TRANSACTION_RETRIES.labels('release_resource').inc()
 
     def release_resources(self, allocated_resources: Iterable[ResourceAllocation]):
         """
@@ -246,6 +253,7 @@ class RedisManager(ResourceManager, RedisBacked):
                         total_available += int(pipeline.hget(key, Resource.get_cpu_hash_key()))
                 except WatchError as e:
                     logging.warning("Resource changed while counting available CPUs; will retry", e)
+                    _TRANSACTION_RETRIES.labels('get_available_cpu_count').inc()
                     continue
                 break
         return total_available
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from requests.exceptions import ReadTimeout
 from dmod.communication import AbstractNgenRequest, MessageEventType, NGENRequest, NWMRequest, NgenCalibrationRequest
 from dmod.core.exception import DmodRuntimeError
@@ -142,7 +144,8 @@ class Launcher(SimpleDockerUtil):
     """
     TODO: Add class docstring for Launcher
     """
-    def __init__(self, images_and_domains_yaml, docker_client=None, api_client=None, **kwargs):
+    def __init__(self, images_and_domains_yaml, docker_client=None, api_client=None, max_concurrent_launches: int = 8,
+                 launch_timeout: float = 300.0, **kwargs):
         """ FIXME
         Parameters
         ----------
@@ -150,9 +153,15 @@ class Launcher(SimpleDockerUtil):
             Docker API client
         api_client
             Docker Low-level API client
+        max_concurrent_launches
+            Maximum number of a job's allocation services that are created concurrently
+        launch_timeout
+            Maximum seconds to wait for all of a job's allocation services to be created
         """
         super(Launcher, self).__init__(docker_client, api_client, **kwargs)
         self._images_and_domains_yaml = images_and_domains_yaml
+        self._max_concurrent_launches = max_concurrent_launches
+        self._launch_timeout = launch_timeout
 
         #FIXME make networks, stack name __init__ params
 
@@ -628,6 +637,76 @@ class Launcher(SimpleDockerUtil):
 
         return image, [input_mount, output_mount]
 
+    def _timed_create_service(self, service_params: DockerServiceParameters, idx: int, docker_cmd_args: List[str]
+                              ) -> Tuple[DockerService, float]:
+        """
+        Create a service via ::method:`create_service`, also returning how many seconds that took.
+        """
+        start = time.perf_counter()
+        service = self.create_service(serviceParams=service_params, idx=idx, docker_cmd_args=docker_cmd_args)
+        return service, time.perf_counter() - start
+
+    @staticmethod
+    def _remove_launched_service(service: DockerService):
+        """
+        Remove a service launched for a job that failed to start, logging rather than raising on errors.
+        """
+        try:
+            service.remove()
+        except Exception as e:
+            logging.error(f"Failed to remove service {service.name} of failed job launch: {e.__class__.__name__} {e!s}")
+
+    def _launch_services(self, job: 'Job', launch_params: List[Tuple[DockerServiceParameters, List[str]]]
+                         ) -> Tuple[bool, tuple]:
+        """
+        Concurrently create the services for a job's allocations, tearing down any created if any others fail.
+
+        Services are created by a bounded pool of threads (see ::attribute:`_max_concurrent_launches`), and all must be
+        created within the launch timeout.  If any creation fails or does not finish in time, every service that was
+        created is removed, including those whose creation only finishes after the timeout.  The seconds taken to
+        launch each created service are recorded on the job, keyed by service name.
+
+        Parameters
+        ----------
+        job: Job
+            The job being started.
+        launch_params: List[Tuple[DockerServiceParameters, List[str]]]
+            The service parameters and Docker CMD args for each of the job's allocations, in allocation order.
+
+        Returns
+        -------
+        Tuple[bool, tuple]
+            Whether all services were created, and either the created services (in allocation order) or, on failure, a
+            tuple with a message describing the failure.
+        """
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self._max_concurrent_launches, len(launch_params))),
+                                      thread_name_prefix=f"launch-{job.job_id}")
+        futures: List[Future] = [executor.submit(self._timed_create_service, params, idx, cmd_args)
+                                 for idx, (params, cmd_args) in enumerate(launch_params)]
+        done, not_done = wait(futures, timeout=self._launch_timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        failures = [f.exception() for f in done if f.exception() is not None]
+        launched = {idx: f.result() for idx, f in enumerate(futures) if f in done and f.exception() is None}
+        job.set_service_launch_latencies({service.name: latency for service, latency in launched.values()})
+
+        if not failures and not not_done:
+            return True, tuple(launched[idx][0] for idx in range(len(futures)))
+
+        # Roll back: remove what was launched, and anything that finishes launching after the timeout
+        for service, _ in launched.values():
+            self._remove_launched_service(service)
+        for future in not_done:
+            future.add_done_callback(lambda f: None if f.cancelled() or f.exception() is not None
+                                     else self._remove_launched_service(f.result()[0]))
+
+        reasons = [f"{e.__class__.__name__}: {e!s}" for e in failures]
+        if not_done:
+            reasons.append(f"{len(not_done)} service(s) not launched within {self._launch_timeout} seconds")
+        message = f"Failed to start job {job.job_id} ({'; '.join(reasons)}); removed {len(launched)} launched service(s)"
+        logging.error(message)
+        return False, (message,)
+
     def remove_job_services(self, job: 'Job'):
         """
         Stop and remove all services that are part of executing the given job.
@@ -657,7 +736,8 @@ class Launcher(SimpleDockerUtil):
         Services/containers will have names corresponding to the values from ::attribute:`Job.allocation_service_names`.
         As a result, they can later be mapped back to the associated job.
 
-        Services themselves are created via a call to ::method:`create_service`.
+        Services themselves are created via calls to ::method:`create_service`, made concurrently for the job's
+        allocations.  If any service fails to be created, all of the job's services that were created are removed.
 
         Parameters
         ----------
@@ -668,8 +748,8 @@ class Launcher(SimpleDockerUtil):
         -------
         Tuple[bool, tuple]
             A tuple with the first item being an indication of whether all necessary services were started successfully,
-            and the second item being a nested tuple of the service objects returned by ::method:`create_service` as
-            they were created.
+            and the second item being either a nested tuple of the service objects returned by ::method:`create_service`
+            (in allocation order) or, on failure, a nested tuple with a message describing the failure.
 
         See Also
         -------
@@ -704,7 +784,7 @@ class Launcher(SimpleDockerUtil):
             logging.error("Attempting to start job {} that has no allocations".format(str(job.job_id)))
             return False, tuple()
 
-        service_per_allocation = []
+        launch_params: List[Tuple[DockerServiceParameters, List[str]]] = []
 
         # TODO: might want to adjust this in the future to be lazy in case not always needed
         # Get the Docker Secrets for object store data access
@@ -731,13 +811,13 @@ class Launcher(SimpleDockerUtil):
             logging.info(f"Hostname: {alloc.hostname}")
 
             #FIXME important that all label values are strings, otherwise docker service create hangs
-            labels_tmp = {"Hostname": alloc.hostname, "cpus_alloc": str(alloc.cpu_count)}
-            labels.update(labels_tmp)
+            # Services are created concurrently later, so each needs its own copy of the labels
+            service_labels = {**labels, "Hostname": alloc.hostname, "cpus_alloc": str(alloc.cpu_count)}
 
             serv_name = job.allocation_service_names[alloc_index]
 
             # Create the docker service
-            service_params = DockerServiceParameters(image_tag=image_tag, constraints=constraints, labels=labels,
+            service_params = DockerServiceParameters(image_tag=image_tag, constraints=constraints, labels=service_labels,
                                                      hostname=job.allocation_service_names[alloc_index],
                                                      serv_name=serv_name, mounts=mounts, secrets=secrets)
 
@@ -747,14 +827,9 @@ class Launcher(SimpleDockerUtil):
                 # Also adding this for ngen
                 service_params.capabilities_to_add = ['SYS_ADMIN']
 
-            #TODO check for proper service creation, return False if doesn't work
-            service = self.create_service(serviceParams=service_params, idx=alloc_index,
-                                          docker_cmd_args=self._generate_docker_cmd_args(job, alloc_index))
+            launch_params.append((service_params, self._generate_docker_cmd_args(job, alloc_index)))
 
-            service_per_allocation.append(service)
-
-        logging.info("\n")
-        return True, tuple(service_per_allocation)
+        return self._launch_services(job, launch_params)
 
     def stop_job(self, job: 'Job'):
         """
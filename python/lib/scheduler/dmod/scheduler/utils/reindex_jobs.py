@@ -0,0 +1,35 @@
+"""
+Utility to rebuild the job status indexes and active jobs set from the saved job records, e.g., after upgrading from a
+version that did not maintain the indexes.
+"""
+import argparse
+import os
+
+from ..job.job_util import RedisBackedJobUtil
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(description='Rebuild the Redis status indexes of saved scheduler jobs.')
+    parser.add_argument('--redis-host', dest='redis_host', default=os.environ.get('REDIS_HOST', 'localhost'),
+                        help='Set the Redis host')
+    parser.add_argument('--redis-port', dest='redis_port', type=int, default=os.environ.get('REDIS_PORT', 6379),
+                        help='Set the Redis port')
+    parser.add_argument('--redis-pass', dest='redis_pass', default=os.environ.get('REDIS_PASS'),
+                        help='Set the Redis password')
+    parser.add_argument('--type', dest='type', default='prod', choices=['prod', 'local'],
+                        help='Set the environment type of the job keys')
+    parser.add_argument('--batch-size', dest='batch_size', type=int, default=1000,
+                        help='Set the number of job records read at once')
+    return parser.parse_args()
+
+
+def main():
+    args = _handle_args()
+    job_util = RedisBackedJobUtil(redis_host=args.redis_host, redis_port=args.redis_port, redis_pass=args.redis_pass,
+                                  type=args.type)
+    count = job_util.rebuild_status_indexes(batch_size=args.batch_size)
+    print("Indexed {} jobs".format(count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import json
+import threading
+import time
+import unittest
+
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import patch
+from uuid import uuid4
+
+from ..scheduler.job.job import Job, JobExecPhase, JobExecStep, JobStatus, RequestedJob
+from ..scheduler.job.job_util import RedisBackedJobUtil
+from dmod.communication import NWMRequest, SchedulerRequestMessage
+from dmod.redis import RedisBacked
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+MODEL_REQUEST_JSON = {
+    "allocation_paradigm": "ROUND_ROBIN",
+    "cpu_count": 1,
+    "job_type": "nwm",
+    "request_body": {
+        "nwm": {
+            "config_data_id": "2",
+            "data_requirements": [
+                {
+                    "category": "CONFIG",
+                    "domain": {
+                        "continuous": [],
+                        "data_format": "NWM_CONFIG",
+                        "discrete": [{"values": ["2"], "variable": "DATA_ID"}]
+                    },
+                    "is_input": True
+                }
+            ]
+        }
+    },
+    "session_secret": "123f27ac3d443c0948aab924bddefc64891c455a756ca77a4d86ec2f697cd13c"
+}
+
+AWAITING_ALLOCATION = JobStatus(JobExecPhase.MODEL_EXEC, JobExecStep.AWAITING_ALLOCATION)
+RUNNING = JobStatus(JobExecPhase.MODEL_EXEC, JobExecStep.RUNNING)
+COMPLETED = JobStatus(JobExecPhase.MODEL_EXEC, JobExecStep.COMPLETED)
+FAILED = JobStatus(JobExecPhase.MODEL_EXEC, JobExecStep.FAILED)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestRedisBackedJobUtil(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = fakeredis.FakeServer()
+        client_patch = patch.object(RedisBacked, '_init_redis_client',
+                                    lambda *args, **kwargs: fakeredis.FakeRedis(server=self.server,
+                                                                                decode_responses=True))
+        client_patch.start()
+        self.addCleanup(client_patch.stop)
+        self.job_util = RedisBackedJobUtil(redis_host='localhost', redis_port=6379, redis_pass='')
+
+    def _create_job(self, status: JobStatus) -> RequestedJob:
+        scheduler_request = SchedulerRequestMessage(
+            model_request=NWMRequest.factory_init_from_deserialized_json(MODEL_REQUEST_JSON),
+            user_id='someone',
+            cpus=4,
+            mem=500000,
+            allocation_paradigm='single-node')
+        job = RequestedJob(job_request=scheduler_request)
+        job.set_status(status)
+        return job
+
+    def _job_ids(self, jobs: List[Job]) -> List[str]:
+        return sorted(str(j.job_id) for j in jobs)
+
+    def _indexed_ids(self, status: JobStatus) -> List[str]:
+        return sorted(self.job_util.redis.zrange(self.job_util._get_status_index_key(status), 0, -1))
+
+    def test_get_jobs_for_status_1_a(self):
+        """ Test that jobs are found only under their current status. """
+        waiting = [self._create_job(AWAITING_ALLOCATION) for _ in range(3)]
+        running = [self._create_job(RUNNING) for _ in range(2)]
+        for job in waiting + running:
+            self.job_util.save_job(job)
+
+        self.assertEqual(self._job_ids(self.job_util.get_jobs_for_status(AWAITING_ALLOCATION)), self._job_ids(waiting))
+        self.assertEqual(self._job_ids(self.job_util.get_jobs_for_status(RUNNING)), self._job_ids(running))
+        self.assertEqual(self.job_util.get_jobs_for_status(COMPLETED), [])
+
+    def test_get_jobs_for_status_1_b(self):
+        """ Test that a status change moves a job between indexes and out of the active set. """
+        job = self._create_job(RUNNING)
+        self.job_util.save_job(job)
+        job.set_status(COMPLETED)
+        self.job_util.save_job(job)
+
+        self.assertEqual(self.job_util.get_jobs_for_status(RUNNING), [])
+        self.assertEqual(self._job_ids(self.job_util.get_jobs_for_status(COMPLETED)), [str(job.job_id)])
+        self.assertFalse(self.job_util.redis.sismember(self.job_util._active_jobs_set_key, str(job.job_id)))
+
+    def test_iter_jobs_1_a(self):
+        """ Test that paging visits every job once, even when many share the same update time. """
+        jobs = [self._create_job(RUNNING) for _ in range(25)]
+        shared_time = datetime.now().replace(microsecond=0)
+        for i, job in enumerate(jobs):
+            job.last_updated = shared_time + timedelta(seconds=i // 10)
+            self.job_util.save_job(job)
+
+        found = list(self.job_util.iter_jobs(RUNNING, page_size=4))
+        self.assertEqual(len(found), len(jobs))
+        self.assertEqual(self._job_ids(found), self._job_ids(jobs))
+
+    def test_iter_jobs_1_b(self):
+        """ Test that ``since`` excludes jobs last updated earlier. """
+        jobs = [self._create_job(RUNNING) for _ in range(4)]
+        start = datetime.now().replace(microsecond=0)
+        for i, job in enumerate(jobs):
+            job.last_updated = start + timedelta(minutes=i)
+            self.job_util.save_job(job)
+
+        found = list(self.job_util.iter_jobs(RUNNING, since=start + timedelta(minutes=2)))
+        self.assertEqual(self._job_ids(found), self._job_ids(jobs[2:]))
+
+    def test_save_job_1_a(self):
+        """ Test that concurrent status changes leave each job in exactly the index matching its record. """
+        jobs = [self._create_job(AWAITING_ALLOCATION) for _ in range(10)]
+        for job in jobs:
+            self.job_util.save_job(job)
+        statuses = [AWAITING_ALLOCATION, RUNNING, COMPLETED, FAILED]
+
+        def transition(worker: int):
+            for n in range(20):
+                for job in jobs:
+                    copy = RequestedJob.factory_init_from_deserialized_json(job.to_dict())
+                    copy.set_status(statuses[(worker + n) % len(statuses)])
+                    self.job_util.save_job(copy)
+
+        threads = [threading.Thread(target=transition, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for job in jobs:
+            saved = self.job_util.retrieve_job(job.job_id)
+            for status in statuses:
+                indexed = str(job.job_id) in self._indexed_ids(status)
+                self.assertEqual(indexed, saved.status == status)
+            is_active = self.job_util.redis.sismember(self.job_util._active_jobs_set_key, str(job.job_id))
+            self.assertEqual(bool(is_active), saved.status.is_active)
+
+    def test_rebuild_status_indexes_1_a(self):
+        """ Test that rebuilding repairs missing, stale, and orphaned index entries. """
+        waiting = [self._create_job(AWAITING_ALLOCATION) for _ in range(3)]
+        completed = [self._create_job(COMPLETED) for _ in range(2)]
+        for job in waiting + completed:
+            self.job_util.save_job(job)
+
+        redis = self.job_util.redis
+        # Simulate records written before indexing existed, a stale entry, and a deleted record
+        redis.delete(self.job_util._get_status_index_key(AWAITING_ALLOCATION))
+        redis.zadd(self.job_util._get_status_index_key(RUNNING), {str(completed[0].job_id): 0})
+        redis.sadd(self.job_util._status_index_names_key, RUNNING.name)
+        redis.delete(self.job_util._get_job_key_for_id(completed[1].job_id))
+
+        self.assertEqual(self.job_util.rebuild_status_indexes(batch_size=2), 4)
+        self.assertEqual(self._indexed_ids(AWAITING_ALLOCATION), self._job_ids(waiting))
+        self.assertEqual(self._indexed_ids(RUNNING), [])
+        self.assertEqual(self._indexed_ids(COMPLETED), [str(completed[0].job_id)])
+        self.assertFalse(redis.sismember(self.job_util._all_jobs_set_key, str(completed[1].job_id)))
+        self.assertEqual(sorted(redis.smembers(self.job_util._active_jobs_set_key)), self._job_ids(waiting))
+
+    def test_get_jobs_for_status_2_a(self):
+        """ Test that the index is faster than a full scan of 100,000 jobs when looking up one status. """
+        template = json.loads(self._create_job(RUNNING).to_json())
+        statuses = [RUNNING, COMPLETED, FAILED, AWAITING_ALLOCATION]
+        job_count, wanted_count = 100000, 100
+        now = datetime.now()
+
+        redis = self.job_util.redis
+        pipeline = redis.pipeline(transaction=False)
+        wanted_ids = []
+        for i in range(job_count):
+            job_id = str(uuid4())
+            status = AWAITING_ALLOCATION if i % (job_count // wanted_count) == 0 else statuses[i % 3]
+            if status == AWAITING_ALLOCATION:
+                wanted_ids.append(job_id)
+            last_updated = now - timedelta(seconds=i)
+            template.update(job_id=job_id, status=status.name,
+                            last_updated=last_updated.strftime(Job.get_datetime_str_format()))
+            pipeline.set(self.job_util._get_job_key_for_id(job_id), json.dumps(template))
+            pipeline.sadd(self.job_util._all_jobs_set_key, job_id)
+            if i % 10000 == 9999:
+                pipeline.execute()
+        pipeline.execute()
+        self.job_util.rebuild_status_indexes()
+
+        def full_scan() -> List[str]:
+            ids = sorted(redis.smembers(self.job_util._all_jobs_set_key))
+            found = []
+            for start in range(0, len(ids), 1000):
+                records = redis.mget([self.job_util._get_job_key_for_id(job_id) for job_id in ids[start:start + 1000]])
+                for record in records:
+                    serialized_job = json.loads(record)
+                    if JobStatus.get_for_name(serialized_job['status']) == AWAITING_ALLOCATION:
+                        found.append(serialized_job['job_id'])
+            return found
+
+        scan_start = time.perf_counter()
+        scanned_ids = full_scan()
+        scan_seconds = time.perf_counter() - scan_start
+
+        index_start = time.perf_counter()
+        indexed_jobs = self.job_util.get_jobs_for_status(AWAITING_ALLOCATION)
+        index_seconds = time.perf_counter() - index_start
+
+        self.assertEqual(sorted(scanned_ids), sorted(wanted_ids))
+        self.assertEqual(self._job_ids(indexed_jobs), sorted(wanted_ids))
+        self.assertLess(index_seconds * 10, scan_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import asyncio
+import time
+import unittest
+
+from collections import Counter
+from typing import List
+from unittest.mock import patch
+
+from ..scheduler.job.job import JobStatus, RequestedJob
+from ..scheduler.job.job_util import RedisBackedJobUtil
+from ..scheduler.job.job_watch import JobChange, JobWatcher
+from .test_job_util import AWAITING_ALLOCATION, COMPLETED, FAILED, MODEL_REQUEST_JSON, RUNNING
+from dmod.communication import NWMRequest, SchedulerRequestMessage
+from dmod.core import telemetry
+from dmod.redis import RedisBacked, Subscription
+
+try:
+    import fakeredis
+    from fakeredis import aioredis
+except ImportError:
+    fakeredis = None
+
+
+class CountingRedis(aioredis.FakeRedis if fakeredis is not None else object):
+    """
+    Asynchronous fake Redis client that counts the commands sent through it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.command_counts = Counter()
+
+    async def execute_command(self, *args, **options):
+        self.command_counts[args[0]] += 1
+        return await super().execute_command(*args, **options)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestJobWatcher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.server = fakeredis.FakeServer()
+        client_patch = patch.object(RedisBacked, '_init_redis_client',
+                                    lambda *args, **kwargs: fakeredis.FakeRedis(server=self.server,
+                                                                                decode_responses=True))
+        client_patch.start()
+        self.addCleanup(client_patch.stop)
+        self.job_util = RedisBackedJobUtil(redis_host='localhost', redis_port=6379, redis_pass='')
+        self.connection = CountingRedis(server=self.server, decode_responses=True)
+        self.watcher = JobWatcher(connection=self.connection, changes_key_for=self.job_util._get_job_changes_key_for_id)
+
+    async def asyncTearDown(self) -> None:
+        await self.watcher.close()
+
+    def _create_job(self, status: JobStatus) -> RequestedJob:
+        scheduler_request = SchedulerRequestMessage(
+            model_request=NWMRequest.factory_init_from_deserialized_json(MODEL_REQUEST_JSON),
+            user_id='someone',
+            cpus=4,
+            mem=500000,
+            allocation_paradigm='single-node')
+        job = RequestedJob(job_request=scheduler_request)
+        job.set_status(status)
+        return job
+
+    async def _save_with_status(self, job: RequestedJob, status: JobStatus):
+        """ Save a status change for a job from another thread, like another service would. """
+        job.set_status(status)
+        await asyncio.get_running_loop().run_in_executor(None, self.job_util.save_job, job)
+
+    async def _next_change(self, subscription: Subscription, timeout: float = 5) -> JobChange:
+        return (await asyncio.wait_for(subscription.get(), timeout))['data']
+
+    def test_save_job_1_a(self):
+        """ Test that saves record a versioned change only when a job's status changes. """
+        job = self._create_job(AWAITING_ALLOCATION)
+        for status in [AWAITING_ALLOCATION, AWAITING_ALLOCATION, RUNNING, RUNNING, COMPLETED]:
+            job.set_status(status)
+            self.job_util.save_job(job)
+
+        job_id = str(job.job_id)
+        self.assertEqual(self.job_util.get_job_changes(job_id), [
+            JobChange(job_id, AWAITING_ALLOCATION.name, 'AWAITING_ALLOCATION', 1),
+            JobChange(job_id, RUNNING.name, 'RUNNING', 2),
+            JobChange(job_id, COMPLETED.name, 'COMPLETED', 3)])
+        self.assertEqual([c.version for c in self.job_util.get_job_changes(job_id, after_version=2)], [3])
+        self.assertEqual(self.job_util.get_job_changes(job_id)[-1].job_status, COMPLETED)
+
+    def test_save_job_1_b(self):
+        """ Test that only the latest changes are retained, and that none are left behind when a job is deleted. """
+        job = self._create_job(AWAITING_ALLOCATION)
+        for i in range(3 * RedisBackedJobUtil._JOB_CHANGES_MAX_LENGTH):
+            job.set_status(RUNNING if i % 2 else FAILED)
+            self.job_util.save_job(job)
+
+        changes = self.job_util.get_job_changes(job.job_id)
+        self.assertLess(len(changes), 2 * RedisBackedJobUtil._JOB_CHANGES_MAX_LENGTH)
+        self.assertEqual(changes[-1].version, 3 * RedisBackedJobUtil._JOB_CHANGES_MAX_LENGTH)
+
+        with self.job_util.redis.pipeline() as pipeline:
+            self.job_util._remove_job_from_indexes(pipeline, job.job_id, job.status)
+            pipeline.execute()
+        self.assertEqual(self.job_util.get_job_changes(job.job_id), [])
+
+    def test_save_job_1_c(self):
+        """ Test that the time spent in a status is observed when a job leaves it. """
+        status_seconds = telemetry.REGISTRY.get('dmod_job_status_seconds').labels(status=RUNNING.name)
+        initial_count, initial_sum = status_seconds.count, status_seconds.sum
+
+        job = self._create_job(RUNNING)
+        self.job_util.save_job(job)
+        time.sleep(0.1)
+        job.set_status(COMPLETED)
+        self.job_util.save_job(job)
+        self.job_util.save_job(job)
+
+        self.assertEqual(status_seconds.count, initial_count + 1)
+        self.assertGreaterEqual(status_seconds.sum - initial_sum, 0.1)
+
+    async def test_watch_1_a(self):
+        """ Test that watches are notified of changes in well under a second. """
+        job = self._create_job(AWAITING_ALLOCATION)
+        self.job_util.save_job(job)
+        subscription = await self.watcher.watch(str(job.job_id))
+        self.assertEqual((await self._next_change(subscription)).version, 1)
+
+        latencies: List[float] = []
+        for status in [RUNNING, FAILED, RUNNING, COMPLETED]:
+            start = time.perf_counter()
+            await self._save_with_status(job, status)
+            change = await self._next_change(subscription)
+            latencies.append(time.perf_counter() - start)
+            self.assertEqual(change.job_status, status)
+
+        self.assertEqual([c.version for c in self.job_util.get_job_changes(job.job_id)], [1, 2, 3, 4, 5])
+        self.assertLess(max(latencies), 0.5)
+
+        await subscription.close()
+        self.assertEqual(self.watcher.watched_job_ids, frozenset())
+
+    async def test_watch_1_b(self):
+        """ Test that watches may resume after the last version they saw, without repeats or gaps. """
+        job = self._create_job(AWAITING_ALLOCATION)
+        self.job_util.save_job(job)
+        for status in [RUNNING, FAILED]:
+            await self._save_with_status(job, status)
+
+        first = await self.watcher.watch(str(job.job_id))
+        self.assertEqual([(await self._next_change(first)).version for _ in range(3)], [1, 2, 3])
+
+        await self._save_with_status(job, RUNNING)
+        self.assertEqual((await self._next_change(first)).version, 4)
+
+        # A client that reconnects after seeing version 2 receives the rest, then new changes alongside others
+        resumed = await self.watcher.watch(str(job.job_id), after_version=2)
+        self.assertEqual(self.watcher.watch_count(str(job.job_id)), 2)
+        self.assertEqual([(await self._next_change(resumed)).version for _ in range(2)], [3, 4])
+
+        await self._save_with_status(job, COMPLETED)
+        self.assertEqual((await self._next_change(first)).version, 5)
+        self.assertEqual((await self._next_change(resumed)).version, 5)
+        self.assertIsNone(first.get_nowait())
+        self.assertIsNone(resumed.get_nowait())
+
+    async def test_watch_1_c(self):
+        """ Test that the Redis commands needed to follow jobs stay constant as watchers scale into the thousands. """
+        jobs = [self._create_job(AWAITING_ALLOCATION) for _ in range(5)]
+        for job in jobs:
+            self.job_util.save_job(job)
+
+        # Every save is followed by the same fixed window, so that reads which time out are counted equally
+        window_seconds = 2.0
+        max_commands = len(jobs) + int(window_seconds * 1000 / JobWatcher._BLOCK_MILLISECONDS) + 1
+
+        commands_per_watcher_count = dict()
+        for watcher_count in [5, 500, 5000]:
+            subscriptions = [await self.watcher.watch(str(jobs[i % len(jobs)].job_id), after_version=1)
+                             for i in range(watcher_count)]
+            # Let any read started with a previous set of watches finish
+            await asyncio.sleep(JobWatcher._BLOCK_MILLISECONDS / 1000 + 0.1)
+
+            self.connection.command_counts.clear()
+            for job in jobs:
+                await self._save_with_status(job, RUNNING if job.status != RUNNING else FAILED)
+            await asyncio.sleep(window_seconds)
+            commands_per_watcher_count[watcher_count] = sum(self.connection.command_counts.values())
+
+            changes = [subscription.get_nowait() for subscription in subscriptions]
+            self.assertTrue(all(c['data'].job_id == str(jobs[i % len(jobs)].job_id) for i, c in enumerate(changes)))
+            for subscription in subscriptions:
+                await subscription.close()
+
+        # Only the shared reads, regardless of how many are watching
+        self.assertTrue(all(count <= max_commands for count in commands_per_watcher_count.values()),
+                        commands_per_watcher_count)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,11 @@
+import threading
+import time
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Optional, Set
+
+import docker
 from ..scheduler.job import RequestedJob
 from ..scheduler.resources import ResourceAllocation
 from ..scheduler.scheduler import Launcher
@@ -190,3 +196,139 @@ class TestLauncher(unittest.TestCase):
         self.assertEqual(image_tag, '127.0.0.1:5000/nwm-2.0:latest')
         self.assertEqual( mounts[0], './domains:./example_case/NWM:rw')
         self.assertEqual( mounts[1], './local_out:/run_out:rw')
+
+
+class FakeService:
+
+    def __init__(self, name: str):
+        self.id = f"id-{name}"
+        self.name = name
+        self.removed = False
+
+    def remove(self):
+        self.removed = True
+
+
+class FakeDockerClient:
+    """
+    Fake Docker client for testing launches, which injects latency into service creation and fails for given names.
+    """
+
+    def __init__(self, latency: float = 0.0, failing_names: Optional[Set[str]] = None,
+                 slow_names: Optional[Set[str]] = None, slow_latency: float = 0.0):
+        self.latency = latency
+        self.failing_names = failing_names or set()
+        self.slow_names = slow_names or set()
+        self.slow_latency = slow_latency
+        self.created: List[FakeService] = []
+        self._lock = threading.Lock()
+        self.services = self
+        self.secrets = self
+
+    def get(self, secret_name: str):
+        return SimpleNamespace(id=f"id-{secret_name}", name=secret_name)
+
+    def create(self, name: str, **kwargs) -> FakeService:
+        time.sleep(self.slow_latency if name in self.slow_names else self.latency)
+        if name in self.failing_names:
+            raise docker.errors.APIError(f"Injected failure creating {name}")
+        service = FakeService(name)
+        with self._lock:
+            self.created.append(service)
+        return service
+
+    def close(self):
+        pass
+
+
+class FakeDockerLauncher(NoCheckDockerLauncher):
+    """
+    Launcher for unit testing launch orchestration against a ::class:`FakeDockerClient`.
+    """
+
+    @staticmethod
+    def log_service(base_name: str, id: str):
+        pass
+
+    def _generate_docker_cmd_args(self, job: 'Job', worker_index: int) -> List[str]:
+        return ["--worker-index", str(worker_index)]
+
+    def determine_image_for_job(self, job: 'Job') -> str:
+        return "127.0.0.1:5000/ngen:latest"
+
+
+class TestLauncherStartJob(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.yaml_file = Path(__file__).parent/"image_and_domain.yaml"
+        self.num_allocations = 8
+        self.latency = 0.2
+        cpu_count = self.num_allocations
+        request = NGENRequest.factory_init_from_deserialized_json({
+            "allocation_paradigm": "ROUND_ROBIN",
+            "cpu_count": cpu_count,
+            "job_type": "ngen",
+            'request_body': {
+                'bmi_config_data_id': '02468',
+                'composite_config_data_id': 'composite02468',
+                'hydrofabric_data_id': '9876543210',
+                'hydrofabric_uid': '0123456789',
+                'realization_config_data_id': '02468',
+                'time_range': TimeRange.parse_from_string('2022-01-01 00:00:00 to 2022-03-01 00:00:00').to_dict()
+            },
+            'session_secret': 'f21f27ac3d443c0948aab924bddefc64891c455a756ca77a4d86ec2f697cd13c'
+        })
+        sch_req = SchedulerRequestMessage(model_request=request, user_id='user', cpus=cpu_count, mem=5000,
+                                          allocation_paradigm='ROUND_ROBIN')
+        self.job = RequestedJob(sch_req)
+        self.job.set_allocations([ResourceAllocation(str(i), f'hostname{i}', 1, 500)
+                                  for i in range(self.num_allocations)])
+
+    def _init_launcher(self, client: FakeDockerClient, **kwargs) -> FakeDockerLauncher:
+        return FakeDockerLauncher(images_and_domains_yaml=self.yaml_file, docker_client=client, **kwargs)
+
+    def test_start_job_0_a(self):
+        """ Test that a job's services are launched concurrently rather than serially. """
+        launcher = self._init_launcher(FakeDockerClient(latency=self.latency))
+        start = time.perf_counter()
+        success, services = launcher.start_job(self.job)
+        elapsed = time.perf_counter() - start
+        self.assertTrue(success)
+        self.assertEqual(list(self.job.allocation_service_names), [s.name for s in services])
+        self.assertLess(elapsed, self.latency * self.num_allocations / 2)
+
+    def test_start_job_0_b(self):
+        """ Test that per-service launch latencies are recorded on the job. """
+        launcher = self._init_launcher(FakeDockerClient(latency=self.latency))
+        launcher.start_job(self.job)
+        self.assertEqual(set(self.job.allocation_service_names), set(self.job.service_launch_latencies.keys()))
+        self.assertTrue(all(l >= self.latency for l in self.job.service_launch_latencies.values()))
+
+    def test_start_job_0_c(self):
+        """ Test that concurrent launches are bounded by the max concurrent launches. """
+        launcher = self._init_launcher(FakeDockerClient(latency=self.latency), max_concurrent_launches=2)
+        start = time.perf_counter()
+        success, _ = launcher.start_job(self.job)
+        self.assertTrue(success)
+        self.assertGreaterEqual(time.perf_counter() - start, self.latency * self.num_allocations / 2)
+
+    def test_start_job_1_a(self):
+        """ Test that when a launch fails, the job fails to start and all launched services are removed. """
+        client = FakeDockerClient(latency=self.latency, failing_names={self.job.allocation_service_names[3]})
+        launcher = self._init_launcher(client)
+        success, details = launcher.start_job(self.job)
+        self.assertFalse(success)
+        self.assertEqual(self.num_allocations - 1, len(client.created))
+        self.assertTrue(all(s.removed for s in client.created))
+
+    def test_start_job_1_b(self):
+        """ Test that when a launch times out, services launched before and after the timeout are removed. """
+        slow_name = self.job.allocation_service_names[0]
+        client = FakeDockerClient(latency=0.0, slow_names={slow_name}, slow_latency=0.5)
+        launcher = self._init_launcher(client, launch_timeout=0.1)
+        success, details = launcher.start_job(self.job)
+        self.assertFalse(success)
+        # Wait for the slow launch to finish, at which point it should be torn down as well
+        time.sleep(1.0)
+        self.assertEqual(self.num_allocations, len(client.created))
+        self.assertTrue(all(s.removed for s in client.created))
@@ -0,0 +1,151 @@
+import heapq
+from datetime import datetime
+from itertools import count
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from dmod.core.dataset import Dataset
+
+
+class TempDatasetExpiryIndex:
+    """
+    Min-heap index of temporary datasets ordered by expire time.
+
+    The index holds the name of each tracked temporary dataset along with the expire time it was last tracked with.
+    Updating the expire time of a dataset pushes a new heap entry rather than reordering the heap; outdated entries are
+    discarded lazily as they reach the top of the heap.  As such, finding the next expiring dataset is ``O(1)``
+    (amortized), and tracking a change or removing a due dataset is ``O(log n)``.
+
+    Parameters
+    ----------
+    clock : Callable[[], datetime]
+        Source for the current time; by default, ::function:`datetime.now`.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        self._clock = clock
+        self._heap: List[Tuple[datetime, int, str]] = []
+        """ Heap of expire time, insertion order, and dataset name tuples, which may include outdated entries. """
+        self._expires: Dict[str, datetime] = dict()
+        """ The current expire time of each tracked dataset, keyed by dataset name. """
+        self._sequence = count()
+
+    def __contains__(self, dataset_name: str) -> bool:
+        return dataset_name in self._expires
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._expires)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def _discard_outdated(self):
+        """
+        Pop heap entries from the top of the heap until the top entry reflects the current state of its dataset.
+        """
+        while self._heap and self._expires.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+        # Compact the heap if outdated entries have come to dominate it
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [(expires, seq, name) for expires, seq, name in self._heap if self._expires.get(name) == expires]
+            heapq.heapify(self._heap)
+
+    def expires(self, dataset_name: str) -> Optional[datetime]:
+        """
+        Get the expire time with which the given dataset is tracked.
+
+        Parameters
+        ----------
+        dataset_name : str
+            The name of the dataset of interest.
+
+        Returns
+        -------
+        Optional[datetime]
+            The tracked expire time of the dataset, or ``None`` if it is not tracked.
+        """
+        return self._expires.get(dataset_name)
+
+    @property
+    def next_expiry(self) -> Optional[datetime]:
+        """
+        The earliest expire time of any tracked dataset, or ``None`` if nothing is tracked.
+        """
+        self._discard_outdated()
+        return self._heap[0][0] if self._heap else None
+
+    def seconds_until_next_expiry(self) -> Optional[float]:
+        """
+        Get the number of seconds from now until the earliest expire time of any tracked dataset.
+
+        Returns
+        -------
+        Optional[float]
+            The (non-negative) number of seconds until the next dataset expires, or ``None`` if nothing is tracked.
+        """
+        next_expiry = self.next_expiry
+        if next_expiry is None:
+            return None
+        return max((next_expiry - self._clock()).total_seconds(), 0.0)
+
+    def pop_due(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Remove and return the names of tracked datasets that have expired, in order of expire time.
+
+        Parameters
+        ----------
+        limit : Optional[int]
+            Optional maximum number of names to remove and return.
+
+        Returns
+        -------
+        List[str]
+            The names of the removed datasets for which the expire time has passed.
+        """
+        now = self._clock()
+        due: List[str] = []
+        self._discard_outdated()
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            _, _, name = heapq.heappop(self._heap)
+            self._expires.pop(name)
+            due.append(name)
+            self._discard_outdated()
+        return due
+
+    def track(self, dataset: Dataset) -> bool:
+        """
+        Track the current expire time of a dataset, or stop tracking it if it is no longer temporary.
+
+        Parameters
+        ----------
+        dataset : Dataset
+            The dataset to track.
+
+        Returns
+        -------
+        bool
+            Whether the index was changed.
+        """
+        if not dataset.is_temporary:
+            return self.untrack(dataset.name)
+        if self._expires.get(dataset.name) == dataset.expires:
+            return False
+        self._expires[dataset.name] = dataset.expires
+        heapq.heappush(self._heap, (dataset.expires, next(self._sequence), dataset.name))
+        return True
+
+    def untrack(self, dataset_name: str) -> bool:
+        """
+        Stop tracking the dataset of the given name.
+
+        Parameters
+        ----------
+        dataset_name : str
+            The name of the dataset to stop tracking.
+
+        Returns
+        -------
+        bool
+            Whether the dataset was previously tracked.
+        """
+        return self._expires.pop(dataset_name, None) is not None
@@ -4,6 +4,7 @@ import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+from dmod.core import telemetry
 from dmod.core.dataset import DatasetType
 from dmod.dataservice.dataset_inquery_util import DatasetInqueryUtil
 from dmod.dataservice.dataset_manager_collection import DatasetManagerCollection
@@ -144,6 +145,7 @@ async def lifespan(app: FastAPI):
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_route(telemetry.METRICS_PATH, telemetry.PrometheusASGIApp(), include_in_schema=False)
 
 
 DatasetManagementCollectionDep = Annotated[
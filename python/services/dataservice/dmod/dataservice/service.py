@@ -12,12 +12,14 @@ from dmod.core.meta_data import DataCategory, DataDomain, DataFormat, DataRequir
 from dmod.core.dataset import Dataset, DatasetManager, DatasetUser, DatasetType
 from dmod.core.serializable import BasicResultIndicator
 from dmod.core.exception import DmodRuntimeError
+from dmod.core import telemetry
 from dmod.modeldata.data.object_store_manager import ObjectStoreDatasetManager
 from dmod.modeldata.data.filesystem_manager import FilesystemDatasetManager
 from dmod.scheduler import SimpleDockerUtil
 from dmod.scheduler.job import Job, JobExecStep, JobUtil
 from pathlib import Path
-from typing import Dict, List, NoReturn, Optional, Set, Tuple, Type, TypeVar, Union
+from functools import partial
+from typing import Callable, Dict, List, NoReturn, Optional, Set, Tuple, Type, TypeVar, Union
 from uuid import UUID, uuid4
 from websockets import WebSocketServerProtocol
 from fastapi.websockets import WebSocket
@@ -26,12 +28,18 @@ from .data_derive_util import DataDeriveUtil
 from .dataset_user_impl import JobDatasetUser
 from .service_settings import ServiceSettings
 from .dataset_manager_collection import DatasetManagerCollection
+from .expiry_index import TempDatasetExpiryIndex
 
 import logging
 
 
 DATASET_MGR = TypeVar('DATASET_MGR', bound=DatasetManager)
 
+_TRANSMIT_CHUNKS = telemetry.counter('dmod_data_transmit_chunks_total', 'Data transmit messages sent or received',
+                                     ('direction',))
+_TRANSMIT_BYTES = telemetry.counter('dmod_data_transmit_bytes_total',
+                                    'Characters of data in data transmit messages sent or received', ('direction',))
+
 
 class DockerS3FSPluginHelper(SimpleDockerUtil):
     """
@@ -254,7 +262,9 @@ class ServiceManager:
         elif message.data is None:
             return DatasetManagementResponse(action=ManagementAction.ADD_DATA, success=False, dataset_name=dataset_name,
                                              reason="No Data In Transmit Message")
-        elif manager.add_data(dataset_name=dataset_name, dest=dest_item_name, data=message.data.encode(), is_temp=is_temp):
+        _TRANSMIT_CHUNKS.labels('received').inc()
+        _TRANSMIT_BYTES.labels('received').inc(len(message.data))
+        if manager.add_data(dataset_name=dataset_name, dest=dest_item_name, data=message.data.encode(), is_temp=is_temp):
             if message.is_last:
                 return DatasetManagementResponse(action=ManagementAction.ADD_DATA, success=True,
                                                  dataset_name=dataset_name, reason="All Data Added Successfully")
@@ -299,6 +309,8 @@ class ServiceManager:
             raw_data = manager.get_data(dataset_name=message.dataset_name, item_name=message.data_location)
             transmit = DataTransmitMessage(data=raw_data, series_uuid=uuid4(), is_last=True)
             await websocket.send_json(transmit.to_dict())
+            _TRANSMIT_CHUNKS.labels('sent').inc()
+            _TRANSMIT_BYTES.labels('sent').inc(len(raw_data))
             response = DataTransmitResponse.factory_init_from_deserialized_json(await websocket.receive_json())
         else:
             offset = 0
@@ -310,6 +322,8 @@ class ServiceManager:
                 actual_length = len(raw_data)
                 transmit = DataTransmitMessage(data=raw_data, series_uuid=uuid4(), is_last=True)
                 await websocket.send_json(transmit.to_dict())
+                _TRANSMIT_CHUNKS.labels('sent').inc()
+                _TRANSMIT_BYTES.labels('sent').inc(actual_length)
                 json_response = await websocket.receive_json()
                 response = DataTransmitResponse.factory_init_from_deserialized_json(json_response)
                 if not response.success:
@@ -882,6 +896,14 @@ class TempDataTaskManager:
     """
     Async task that purges and prolongs the expiration of temporary datasets.
 
+    Temporary datasets are tracked by expire time within a ::class:`TempDatasetExpiryIndex`.  The index is populated
+    once when the task starts, then kept current by listening for lifecycle events from the dataset managers (i.e.,
+    temporary dataset creation, expire time changes, and user linking and unlinking).  The task sleeps until the next
+    tracked expire time - waking early if the index changes - and then handles only the datasets that are due.
+
+    Due datasets that are still in use are leased more time, extending their expire time to ``lease`` from now.  All
+    other due datasets are deleted, in parallel batches of at most ``max_parallel_deletes``.
+
     Start the task by calling ::method:`start`.
 
     Parameters
@@ -890,14 +912,28 @@ class TempDataTaskManager:
         Facilitates creating and accessing Datasets
     safe_to_exec_tracker : ActiveOperationTracker
         Used to determine if it is okay to purge or prolong temporary datasets
+    lease : timedelta
+        How long to extend the life of a due dataset that is still in use, or that failed to be deleted
+    max_parallel_deletes : int
+        The most datasets to delete at once
+    clock : Callable[[], datetime]
+        Source for the current time; by default, ::function:`datetime.now`
     """
 
-    def __init__(self, dataset_manager_collection: DatasetManagerCollection, safe_to_exec_tracker: "ActiveOperationTracker"):
+    def __init__(self, dataset_manager_collection: DatasetManagerCollection, safe_to_exec_tracker: "ActiveOperationTracker",
+                 lease: timedelta = timedelta(hours=1), max_parallel_deletes: int = 10,
+                 clock: Callable[[], datetime] = datetime.now):
         self._safe_to_exec_tracker = safe_to_exec_tracker
         self._managers = dataset_manager_collection
+        self._lease = lease
+        self._max_parallel_deletes = max(max_parallel_deletes, 1)
+        self._clock = clock
 
-        self._marked_expired_datasets: Set[str] = set()
-        """ Names of expired datasets marked for deletion the next time through ::method:`manage_temp_datasets`. """
+        self._expiry_index = TempDatasetExpiryIndex(clock=clock)
+        """ Names of temporary datasets, ordered by when each expires. """
+        self._index_changed: Optional[asyncio.Event] = None
+        """ Set whenever the index changes, to wake the task if it is waiting on a later expire time. """
+        self._is_indexed = False
 
     async def start(self) -> NoReturn:
         await self._manage_temp_datasets()
@@ -906,39 +942,109 @@ class TempDataTaskManager:
         """
         Async task for managing temporary datasets, including updating expire times and purging of expired datasets.
         """
+        self._index_changed = asyncio.Event()
+        self._index_temp_datasets()
         while True:
-            # Ensure that mark and sweep doesn't proceed while something is potentially to linking datasets
-            while self._safe_to_exec_tracker.value > 0:
-                await asyncio.sleep(10)
-            self._temp_dataset_mark_and_sweep()
-            await asyncio.sleep(3600)
+            await self._wait_for_next_expiry()
+            await self._sweep_due_datasets()
 
-    def _temp_dataset_mark_and_sweep(self):
+    def _index_temp_datasets(self):
         """
-        Encapsulation of the required behavior for a single iteration through ::method:`manage_temp_datasets`.
+        Index all currently known temporary datasets and begin listening for changes to datasets from each manager.
+        """
+        if self._is_indexed:
+            return
+        for _, manager in self._managers.managers():
+            manager.add_lifecycle_listener(self._on_dataset_lifecycle_event)
+        for ds in (ds for ds in self._managers.known_datasets().values() if ds.is_temporary):
+            self._expiry_index.track(ds)
+        self._is_indexed = True
 
-        Method scans for in use temporary datasets, updating the expire times of each.  It then deletes any expired
-        datasets marked for deletion already within the instance's private field.  Finally, it updates the instance's
-        private field for marked-for-deletion datasets with any that are now expired (and thus will be removed on the
-        next invocation).
+    def _on_dataset_lifecycle_event(self, dataset: Dataset):
         """
-        # Get these upfront, since no meaningful changes can happen during the course of an iteration
-        temp_datasets = {ds_name: ds for ds_name, ds in self._managers.known_datasets().items() if ds.is_temporary}
+        Update the index after a change to the lifetime or usage of a dataset.
 
-        # Account for any in-use temporary datasets by potentially unmarking and updating expire time
-        for ds in (ds for _, ds in temp_datasets.items() if ds.manager.get_user_ids_for_dataset(ds)):
-            if ds.name in self._marked_expired_datasets:
-                self._marked_expired_datasets.remove(ds.name)
+        Parameters
+        ----------
+        dataset : Dataset
+            The dataset that changed.
+        """
+        if self._expiry_index.track(dataset) and self._index_changed is not None:
+            self._index_changed.set()
 
-            assert ds.expires is not None
-            ds.extend_life(timedelta(days=1) if ds.expires < (datetime.now()+timedelta(days=1)) else timedelta(hours=1))
+    async def _wait_for_next_expiry(self):
+        """
+        Wait until the next tracked dataset expires, or until the index changes.
+        """
+        self._index_changed.clear()
+        seconds = self._expiry_index.seconds_until_next_expiry()
+        if seconds is not None and seconds <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._index_changed.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
 
-        # Delete any datasets previously marked for deletion
-        for ds in (temp_datasets.pop(ds_name) for ds_name in self._marked_expired_datasets):
-            ds.manager.delete(dataset=ds)
+    def _find_dataset(self, dataset_name: str) -> Tuple[Optional[DatasetManager], Optional[Dataset]]:
+        """
+        Find the managed dataset of the given name without merging the datasets of every manager together.
+        """
+        for manager in {m.uuid: m for _, m in self._managers.managers()}.values():
+            if dataset_name in manager.datasets:
+                return manager, manager.datasets[dataset_name]
+        return None, None
+
+    def _extend_lease(self, dataset: Dataset):
+        """
+        Extend the life of a due dataset to one lease from now, and make sure the index reflects it.
+        """
+        dataset.extend_life(self._clock() + self._lease)
+        self._expiry_index.track(dataset)
+
+    async def _sweep_due_datasets(self) -> Set[str]:
+        """
+        Lease more time to any due datasets that are in use and delete all others, in bounded parallel batches.
+
+        Returns
+        -------
+        Set[str]
+            The names of the datasets that were deleted.
+        """
+        loop = asyncio.get_running_loop()
+        deleted: Set[str] = set()
+
+        while True:
+            # Ensure that deletion doesn't proceed while something is potentially linking datasets
+            while self._safe_to_exec_tracker.value > 0:
+                await asyncio.sleep(10)
+
+            due_names = self._expiry_index.pop_due(limit=self._max_parallel_deletes)
+            if not due_names:
+                return deleted
+
+            to_delete: List[Tuple[DatasetManager, Dataset]] = []
+            for manager, ds in (self._find_dataset(name) for name in due_names):
+                # Skip datasets that no longer exist, and re-index those whose expire time changed without notice
+                if ds is None:
+                    continue
+                elif not ds.is_temporary or ds.expires > self._clock():
+                    self._expiry_index.track(ds)
+                elif manager.get_user_ids_for_dataset(ds.name):
+                    self._extend_lease(ds)
+                else:
+                    to_delete.append((manager, ds))
+
+            results = await asyncio.gather(
+                *(loop.run_in_executor(None, partial(manager.delete, dataset=ds)) for manager, ds in to_delete),
+                return_exceptions=True)
+
+            for (_, ds), result in zip(to_delete, results):
+                if isinstance(result, Exception) or result is False:
+                    logging.error("Failed to delete expired temporary dataset {}: {}".format(ds.name, result))
+                    self._extend_lease(ds)
+                else:
+                    deleted.add(ds.name)
 
-        # Mark any expired datasets for deletion on the next iteration
-        self._marked_expired_datasets.update(n for n, ds in temp_datasets.items() if ds.expires > datetime.now())
 
 class DataProvisionManager:
     """
@@ -0,0 +1,253 @@
+import asyncio
+import random
+import threading
+import unittest
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from dmod.core.dataset import Dataset, DatasetType
+from dmod.core.meta_data import DataCategory, DataDomain, DataFormat, DiscreteRestriction, StandardDatasetIndex
+
+from ..dataservice.dataset_manager_collection import DatasetManagerCollection
+from ..dataservice.dataset_user_impl import JobDatasetUser
+from ..dataservice.expiry_index import TempDatasetExpiryIndex
+from ..dataservice.service import ActiveOperationTracker, TempDataTaskManager
+from .test_required_data_checks_manager import MockDataset, MockDatasetManager
+
+
+class FakeClock:
+    """
+    Manually advanced source for the current time.
+    """
+
+    def __init__(self, now: datetime = datetime(2024, 1, 1)):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+class DeletingDatasetManager(MockDatasetManager):
+    """
+    Mock manager that actually removes deleted datasets, while recording how many deletes ran at the same time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deleted: List[str] = []
+        self.failing_deletes = set()
+        self.max_concurrent_deletes = 0
+        self._concurrent_deletes = 0
+        self._lock = threading.Lock()
+
+    def create(self, name: str, category: DataCategory, domain: DataDomain, is_read_only: bool,
+               initial_data=None, expires_on: Optional[datetime] = None) -> Dataset:
+        dataset = MockDataset(name=name, category=category, data_domain=domain, dataset_type=DatasetType.FILESYSTEM,
+                              access_location=name, is_read_only=is_read_only, expires=expires_on, manager=self)
+        self.datasets[name] = dataset
+        return dataset
+
+    def delete(self, dataset: Dataset, **kwargs) -> bool:
+        with self._lock:
+            self._concurrent_deletes += 1
+            self.max_concurrent_deletes = max(self.max_concurrent_deletes, self._concurrent_deletes)
+        try:
+            if dataset.name in self.failing_deletes:
+                return False
+            self.datasets.pop(dataset.name)
+            self.deleted.append(dataset.name)
+            return True
+        finally:
+            with self._lock:
+                self._concurrent_deletes -= 1
+
+
+def create_domain() -> DataDomain:
+    return DataDomain(data_format=DataFormat.BMI_CONFIG,
+                      discrete_restrictions=[DiscreteRestriction(variable=StandardDatasetIndex.DATA_ID, values=["1"])])
+
+
+class TestTempDatasetExpiryIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.manager = DeletingDatasetManager()
+        self.domain = create_domain()
+
+    def create(self, name: str, expires: Optional[datetime]) -> Dataset:
+        return self.manager.create(name=name, category=DataCategory.CONFIG, domain=self.domain, is_read_only=False,
+                                   expires_on=expires)
+
+    def test_pop_due_in_order(self):
+        index = TempDatasetExpiryIndex(clock=self.clock)
+        for i in random.Random(7).sample(range(20), 20):
+            index.track(self.create(f"ds-{i}", self.clock() + timedelta(minutes=i + 1)))
+        index.track(self.create("permanent", None))
+
+        self.assertEqual(len(index), 20)
+        self.assertNotIn("permanent", index)
+        self.assertEqual(index.next_expiry, self.clock() + timedelta(minutes=1))
+        self.assertEqual(index.seconds_until_next_expiry(), 60.0)
+        self.assertEqual(index.pop_due(), [])
+
+        self.clock.advance(minutes=5)
+        self.assertEqual(index.pop_due(limit=3), ["ds-0", "ds-1", "ds-2"])
+        self.assertEqual(index.seconds_until_next_expiry(), 0.0)
+        self.assertEqual(index.pop_due(), ["ds-3", "ds-4"])
+        self.assertEqual(len(index), 15)
+
+    def test_outdated_entries(self):
+        index = TempDatasetExpiryIndex(clock=self.clock)
+        first = self.create("first", self.clock() + timedelta(minutes=1))
+        second = self.create("second", self.clock() + timedelta(minutes=2))
+        index.track(first)
+        index.track(second)
+
+        self.assertFalse(index.track(first))
+        first.extend_life(timedelta(minutes=10))
+        self.assertTrue(index.track(first))
+        self.assertTrue(index.untrack("second"))
+        self.assertFalse(index.untrack("second"))
+
+        self.clock.advance(minutes=5)
+        self.assertEqual(index.pop_due(), [])
+        self.assertEqual(index.next_expiry, first.expires)
+
+        first.expires = None
+        index.track(first)
+        self.assertIsNone(index.next_expiry)
+        self.assertIsNone(index.seconds_until_next_expiry())
+
+
+class TestTempDataTaskManager(unittest.TestCase):
+
+    DATASET_COUNT = 50_000
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.clock = FakeClock()
+        self.domain = create_domain()
+        self.manager = DeletingDatasetManager()
+        self.collection = DatasetManagerCollection()
+        self.collection.add(self.manager)
+        self.tracker = ActiveOperationTracker()
+        self.task_manager = TempDataTaskManager(dataset_manager_collection=self.collection,
+                                                safe_to_exec_tracker=self.tracker, lease=timedelta(hours=1),
+                                                max_parallel_deletes=8, clock=self.clock)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def create(self, name: str, expires: Optional[datetime]) -> Dataset:
+        if expires is None:
+            return self.manager.create(name=name, category=DataCategory.CONFIG, domain=self.domain,
+                                       is_read_only=False)
+        return self.manager.create_temporary(name=name, category=DataCategory.CONFIG, domain=self.domain,
+                                             is_read_only=False, expires_on=expires)
+
+    def sweep(self) -> set:
+        return self.loop.run_until_complete(self.task_manager._sweep_due_datasets())
+
+    def test_sweep_many_datasets(self):
+        start = self.clock()
+        expires: Dict[str, datetime] = dict()
+        for i in random.Random(11).sample(range(self.DATASET_COUNT), self.DATASET_COUNT):
+            expires[f"temp-{i}"] = start + timedelta(seconds=i + 1)
+            self.create(f"temp-{i}", expires[f"temp-{i}"])
+        for i in range(100):
+            self.create(f"permanent-{i}", None)
+
+        self.task_manager._index_temp_datasets()
+
+        # Sweeps must only consult the index, never all known datasets
+        self.collection.known_datasets = None
+
+        user = JobDatasetUser(uuid4())
+        in_use = {f"temp-{i}" for i in range(0, self.DATASET_COUNT, 1000)}
+        for name in in_use:
+            user.link_to_dataset(self.manager.datasets[name])
+
+        self.assertEqual(self.sweep(), set())
+
+        self.clock.advance(seconds=self.DATASET_COUNT // 2)
+        due = {name for name, expire_time in expires.items() if expire_time <= self.clock()}
+        deleted = self.sweep()
+
+        self.assertEqual(len(due), self.DATASET_COUNT // 2)
+        self.assertEqual(deleted, due - in_use)
+        self.assertEqual(len(self.manager.deleted), len(deleted))
+        self.assertLessEqual(self.manager.max_concurrent_deletes, 8)
+        self.assertTrue(all(f"permanent-{i}" in self.manager.datasets for i in range(100)))
+
+        # In-use datasets that were due are leased more time
+        for name in in_use & due:
+            self.assertEqual(self.manager.datasets[name].expires, self.clock() + timedelta(hours=1))
+        self.assertEqual(self.task_manager._expiry_index.next_expiry, start + timedelta(seconds=len(due) + 1))
+
+        # Everything else expires over time, with in-use datasets kept until they are no longer used
+        self.clock.advance(days=1)
+        self.sweep()
+        self.assertEqual(set(self.manager.datasets), in_use | {f"permanent-{i}" for i in range(100)})
+
+        for name in in_use:
+            user.unlink_to_dataset(self.manager.datasets[name])
+        self.assertEqual(self.sweep(), set())
+        self.clock.advance(hours=1)
+        self.assertEqual(self.sweep(), in_use)
+        self.assertEqual(len(self.task_manager._expiry_index), 0)
+
+    def test_lifetime_changes(self):
+        self.task_manager._index_temp_datasets()
+        extended = self.create("extended", self.clock() + timedelta(minutes=5))
+        failing = self.create("failing", self.clock() + timedelta(minutes=5))
+        self.manager.failing_deletes.add("failing")
+
+        # Expire times changed through a dataset are picked up through the manager
+        extended.extend_life(timedelta(hours=2))
+        self.clock.advance(minutes=10)
+        self.assertEqual(self.sweep(), set())
+        self.assertIn("extended", self.manager.datasets)
+
+        # Failed deletes are retried after a lease
+        self.assertEqual(failing.expires, self.clock() + timedelta(hours=1))
+
+        self.manager.failing_deletes.clear()
+        self.clock.advance(hours=1)
+        self.assertEqual(self.sweep(), {"failing"})
+        self.clock.advance(hours=1)
+        self.assertEqual(self.sweep(), {"extended"})
+
+        # Nothing is removed while other operations are underway
+        self.create("blocked", self.clock())
+        self.tracker.acquire()
+        task = self.loop.create_task(self.task_manager._sweep_due_datasets())
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        self.assertIn("blocked", self.manager.datasets)
+        task.cancel()
+        self.tracker.release()
+
+    def test_wakes_for_new_datasets(self):
+        self.create("later", self.clock() + timedelta(days=1))
+        task = self.loop.create_task(self.task_manager.start())
+
+        async def wait_for_deletion(name: str):
+            while name not in self.manager.deleted:
+                await asyncio.sleep(0.01)
+
+        # Without the change to the index waking it, the task would sleep until tomorrow
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        self.create("now", self.clock())
+        self.loop.run_until_complete(asyncio.wait_for(wait_for_deletion("now"), timeout=5))
+        self.assertIn("later", self.manager.datasets)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            self.loop.run_until_complete(task)
+
+
+if __name__ == '__main__':
+    unittest.main()
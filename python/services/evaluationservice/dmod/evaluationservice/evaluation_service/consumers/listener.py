@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import asyncio
 import inspect
 import logging
 import os
@@ -9,11 +10,11 @@ from urllib.parse import parse_qs
 
 from django.contrib.sessions.backends.db import SessionStore
 from django.contrib.auth.models import User
-from asgiref.sync import async_to_sync
-
 import redis
-import redis.client as redis_client
 
+from dmod.redis.pubsub import Subscription
+
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.db.models import QuerySet
 
@@ -483,9 +484,9 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.redis_connection: redis.Redis = utilities.get_runner_connection()
-        self.publisher_and_subscriber: typing.Optional[redis_client.PubSub] = self.redis_connection.pubsub()
+        self.subscription: typing.Optional[Subscription] = None
         self.subscribed_to_channel = False
-        self.listener: typing.Optional[redis.client.PubSubWorkerThread] = None
+        self.listener: typing.Optional[asyncio.Task] = None
         self.connection_group_id: typing.Optional[str] = None
         self.channel_name: typing.Optional[str] = None
         self.template_manager: SpecificationTemplateManager = SpecificationTemplateManager()
@@ -502,10 +503,22 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
 
         return self.__scope
 
-    def receive_subscribed_message(self, message: typing.Union[typing.Dict[str, typing.Any], str, bytes]):
+    async def forward_subscribed_messages(self):
+        """
+        Send every message published to the subscribed channel through the socket until unsubscribed
+        """
+        async for message in self.subscription:
+            try:
+                await self.receive_subscribed_message(message)
+            except Exception as error:
+                SOCKET_LOGGER.error(f"{str(self)}: Could not forward a subscribed message", error)
+
+    async def receive_subscribed_message(self, message: typing.Union[typing.Dict[str, typing.Any], str, bytes]):
         """
         Interprets and transforms messages sent along the redis channel.
 
+        Batches of events are unpacked so that each event is sent through the socket on its own.
+
         Args:
             message: A message that was published from redis
         """
@@ -557,6 +570,12 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
             message: typing.Dict[str, typing.Any] = message['data']
             request_id = get_request_id(message, request_id)
 
+        if isinstance(message, bytes):
+            try:
+                message = message.decode()
+            except UnicodeDecodeError:
+                pass
+
         # If it looks like the passed message might be a string or bytes representation of a dict, attempt to
         # convert it to a dict
         if isinstance(message, (str, bytes)) and utilities.string_might_be_json(message):
@@ -576,10 +595,13 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
             deserialized_message = deserialized_message['data']
             request_id = get_request_id(deserialized_message, request_id)
 
-        # The caller requires this function to be synchronous, whereas `send_message` is async;
-        # we're stuck using async_to_sync here as a result
-        async_send = async_to_sync(self.send_message)
-        async_send(
+        # Communicators publish events that occur close together as a single batch; clients expect them one at a time
+        if isinstance(deserialized_message, typing.Mapping) and deserialized_message.get("event") == "batch":
+            for event in deserialized_message.get("data") or []:
+                await self.receive_subscribed_message(event)
+            return
+
+        await self.send_message(
             deserialized_message,
             event="subscribed_message_received",
             request_id=request_id,
@@ -609,15 +631,8 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
             if not self.connection_group_id:
                 raise ValueError("No channel name was passed; no channel may be subscribed to")
 
-            self.publisher_and_subscriber = self.redis_connection.pubsub()
-
-            self.publisher_and_subscriber.subscribe(
-                **{
-                    self.connection_group_id: self.receive_subscribed_message
-                }
-            )
-
-            self.listener = self.publisher_and_subscriber.run_in_thread(sleep_time=0.001)
+            self.subscription = await utilities.get_runner_multiplexer().subscribe(self.connection_group_id)
+            self.listener = asyncio.get_running_loop().create_task(self.forward_subscribed_messages())
 
             await self.channel_layer.group_add(
                 self.connection_group_id,
@@ -863,6 +878,48 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
             request_id=payload.get(REQUEST_ID_KEY)
         )
 
+    @required_parameters()
+    async def search_templates(self, payload: typing.Dict[str, typing.Any] = None):
+        """
+        Sends the templates that best match a free text query through the socket, best matches first
+
+        Args:
+            payload: The arguments sent through the socket; may include 'query', 'specification_type', 'author',
+                'limit', and 'offset'
+        """
+        if payload is None:
+            payload = {}
+
+        try:
+            limit = payload.get("limit")
+            offset = payload.get("offset")
+            ranked_templates = await sync_to_async(self.template_manager.find_templates)(
+                query=payload.get("query"),
+                specification_type=payload.get("specification_type"),
+                author=payload.get("author"),
+                limit=int(limit) if limit is not None else None,
+                offset=int(offset) if offset is not None else None
+            )
+
+            message = {
+                "templates": [
+                    {
+                        "name": ranked_template.template.name,
+                        "specification_type": ranked_template.template.specification_type,
+                        "description": ranked_template.template.description,
+                        "author": ranked_template.template.author_name,
+                        "score": ranked_template.score
+                    }
+                    for ranked_template in ranked_templates
+                ]
+            }
+
+            await self.send_message(result=message, event="search_templates", request_id=payload.get(REQUEST_ID_KEY))
+        except Exception as exception:
+            message = f"{str(self)}: Could not search for templates"
+            SOCKET_LOGGER.error(message, exception)
+            await self.send_error(event="search_templates", message=message, request_id=payload.get(REQUEST_ID_KEY))
+
     @required_parameters(specification_type=REQUIRED_PARAMETER_TYPES.text)
     async def get_templates(self, payload: typing.Dict[str, typing.Any] = None):
         message = {
@@ -1137,19 +1194,19 @@ class LaunchConsumer(AsyncWebsocketConsumer, ActionDescriber):
             SOCKET_LOGGER.error(f"{str(self)}: Could not tell the client that the socket is disconnecting", error)
 
         try:
-            if self.listener and self.listener.is_alive():
-                self.listener.stop()
+            if self.listener and not self.listener.done():
+                self.listener.cancel()
             SOCKET_LOGGER.debug(f"{str(self)}:  listener closed")
         except Exception as disconnection_error:
-            message = f"{str(self)}: Listener thread could not be killed"
+            message = f"{str(self)}: Listener could not be stopped"
             SOCKET_LOGGER.error(
                 message,
                 disconnection_error
             )
 
         try:
-            if self.publisher_and_subscriber:
-                self.publisher_and_subscriber.unsubscribe()
+            if self.subscription:
+                await self.subscription.close()
             SOCKET_LOGGER.debug(f"{str(self)}: Redis Channel disconnected")
         except Exception as e:
             SOCKET_LOGGER.error(msg=f"{str(self)}: Could not unsubscribe from redis channel", exc_info=e)
@@ -1213,8 +1270,8 @@ class ChannelConsumer(AsyncWebsocketConsumer):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.redis_connection: redis.Redis = utilities.get_channel_connection()
-        self.publisher_and_subscriber: typing.Optional[redis_client.PubSub] = None
-        self.listener: typing.Optional[redis.client.PubSubWorkerThread] = None
+        self.subscription: typing.Optional[Subscription] = None
+        self.listener: typing.Optional[asyncio.Task] = None
         self.connection_group_id: typing.Optional[str] = None
         self.channel_name: typing.Optional[str] = None
         self.__scope: typing.Optional[ConcreteScope] = None
@@ -1226,7 +1283,17 @@ class ChannelConsumer(AsyncWebsocketConsumer):
 
         return self.__scope
 
-    def receive_subscribed_message(self, message):
+    async def forward_subscribed_messages(self):
+        """
+        Send every message published to the subscribed channel through the socket until unsubscribed
+        """
+        async for message in self.subscription:
+            try:
+                await self.receive_subscribed_message(message)
+            except Exception as error:
+                SOCKET_LOGGER.error(f"{str(self)}: Could not forward a subscribed message", error)
+
+    async def receive_subscribed_message(self, message):
         if isinstance(message, (str, bytes)):
             deserialized_message = json.loads(message)
         else:
@@ -1241,9 +1308,7 @@ class ChannelConsumer(AsyncWebsocketConsumer):
             logger=SOCKET_LOGGER
         )
 
-        # The caller requires this function to be synchronous, whereas `send_message` is async;
-        # we're stuck using async_to_sync here as a result
-        async_to_sync(self.send_message)(response)
+        await self.send_message(response)
 
     async def connect(self):
         self.channel_name = self.scope_data.keyword_arguments.get("channel_name")
@@ -1252,15 +1317,8 @@ class ChannelConsumer(AsyncWebsocketConsumer):
         if not self.connection_group_id:
             raise ValueError("No channel name was passed; no channel may be subscribed to")
 
-        self.publisher_and_subscriber = self.redis_connection.pubsub()
-
-        self.publisher_and_subscriber.subscribe(
-            **{
-                self.connection_group_id: self.receive_subscribed_message
-            }
-        )
-
-        self.listener = self.publisher_and_subscriber.run_in_thread(sleep_time=0.001)
+        self.subscription = await utilities.get_channel_multiplexer().subscribe(self.connection_group_id)
+        self.listener = asyncio.get_running_loop().create_task(self.forward_subscribed_messages())
 
         await self.channel_layer.group_add(
             self.connection_group_id,
@@ -1351,19 +1409,19 @@ class ChannelConsumer(AsyncWebsocketConsumer):
             SOCKET_LOGGER.error(f"{str(self)}: Could not tell the client that the socket is disconnecting", error)
 
         try:
-            if self.listener and self.listener.is_alive():
-                self.listener.stop()
+            if self.listener and not self.listener.done():
+                self.listener.cancel()
             SOCKET_LOGGER.debug(f"{str(self)}:  listener closed")
         except Exception as disconnection_error:
-            message = f"{str(self)}: Listener thread could not be killed"
+            message = f"{str(self)}: Listener could not be stopped"
             SOCKET_LOGGER.error(
                 message,
                 disconnection_error
             )
 
         try:
-            if self.publisher_and_subscriber:
-                self.publisher_and_subscriber.unsubscribe()
+            if self.subscription:
+                await self.subscription.close()
             SOCKET_LOGGER.debug(f"{str(self)}: Redis Channel disconnected")
         except Exception as e:
             SOCKET_LOGGER.error(message=f"{str(self)}: Could not unsubscribe from redis channel", exception=e)
@@ -0,0 +1,358 @@
+"""
+An in-memory cache of geometry datasets that lets map views query the same layer repeatedly without rereading it
+"""
+from __future__ import annotations
+
+import os
+import json
+import math
+import typing
+import threading
+
+from collections import OrderedDict
+
+import numpy
+import pandas
+import shapely
+import geopandas
+
+from shapely.strtree import STRtree
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import models
+
+
+BoundingBox = typing.Sequence[float]
+"""A bounding box in the form of (min x, min y, max x, max y)"""
+
+DEFAULT_CACHE_SIZE: typing.Final[int] = int(os.environ.get("EVALUATION_GEOMETRY_CACHE_SIZE", 4))
+"""The number of geometry datasets that may be held in memory at once"""
+
+TILE_SIZE: typing.Final[int] = 256
+"""The width and height of a map tile, in pixels"""
+
+MAX_ZOOM: typing.Final[int] = 22
+"""The deepest zoom level that simplified geometries will be produced for"""
+
+NULL_VALUES: typing.Final[typing.Tuple[str, ...]] = ("nan", "null", "na", "none")
+"""Query values that stand for a missing value"""
+
+RECORD_SEPARATOR: typing.Final[str] = "\x1e"
+"""The character that starts each record of a GeoJSON text sequence (RFC 8142)"""
+
+
+def is_pertinent_column(column_name: str) -> bool:
+    """
+    Args:
+        column_name: The name of a column within a geometry dataset
+
+    Returns:
+        Whether the column should be exposed to clients
+    """
+    return column_name.lower() in ("name", "geometry") or column_name.lower().endswith("id")
+
+
+def get_simplification_tolerance(zoom: int) -> float:
+    """
+    Get how far geometry may be simplified while remaining accurate to a pixel at the given zoom level
+
+    Args:
+        zoom: The web map zoom level
+
+    Returns:
+        The width of a pixel in degrees at the given zoom level
+    """
+    return 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def get_tile_bounds(zoom: int, x: int, y: int) -> typing.Tuple[float, float, float, float]:
+    """
+    Get the area covered by a web mercator (XYZ) map tile
+
+    Args:
+        zoom: The zoom level of the tile
+        x: The column of the tile
+        y: The row of the tile, counting down from the north
+
+    Returns:
+        The bounding box of the tile in longitude and latitude
+    """
+    tile_count = 2 ** zoom
+
+    def latitude(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tile_count))))
+
+    return (
+        x / tile_count * 360.0 - 180.0,
+        latitude(y + 1),
+        (x + 1) / tile_count * 360.0 - 180.0,
+        latitude(y),
+    )
+
+
+class GeometryLayer:
+    """
+    A geometry dataset held in memory along with the indexes needed to query it quickly
+
+    Bounding box queries go through an STRtree spatial index and equality queries on id and name columns go through
+    prebuilt hash indexes. Simplified copies of the geometry are built the first time each zoom level is requested.
+    """
+    def __init__(self, frame: geopandas.GeoDataFrame):
+        pertinent_columns = [column_name for column_name in frame.keys() if is_pertinent_column(column_name)]
+        self.__frame = frame[pertinent_columns].reset_index(drop=True)
+        self.__tree = STRtree(self.__frame.geometry.values)
+        self.__column_indexes: typing.Dict[str, typing.Dict[typing.Any, numpy.ndarray]] = {
+            column_name: self.__frame.groupby(column_name, sort=False).indices
+            for column_name in pertinent_columns
+            if column_name != self.__frame.geometry.name
+        }
+        self.__simplified: typing.Dict[int, geopandas.GeoSeries] = dict()
+        self.__lock = threading.Lock()
+
+    @property
+    def frame(self) -> geopandas.GeoDataFrame:
+        """
+        The full, unsimplified layer
+        """
+        return self.__frame
+
+    @property
+    def indexed_columns(self) -> typing.Sequence[str]:
+        """
+        The names of the columns that may be searched by value
+        """
+        return list(self.__column_indexes)
+
+    @property
+    def index_column(self) -> typing.Optional[str]:
+        """
+        The column that identifies each geometry, if there is one
+        """
+        for column_name in ("id", "name"):
+            if column_name in self.__column_indexes:
+                return column_name
+        return None
+
+    def __len__(self) -> int:
+        return len(self.__frame)
+
+    def convert_value(self, column_name: str, value: str) -> typing.Any:
+        """
+        Convert a value from a query into the type of the given column
+
+        Args:
+            column_name: The column that will be searched
+            value: The value from the query
+
+        Returns:
+            The value in a form that may be compared to the values in the column
+        """
+        column_type = self.__frame[column_name].dtype
+
+        if pandas.api.types.is_integer_dtype(column_type):
+            return int(float(value))
+        elif pandas.api.types.is_float_dtype(column_type):
+            return float(value)
+
+        return value
+
+    def find_positions(self, column_name: str, value: typing.Optional[str]) -> numpy.ndarray:
+        """
+        Find the rows whose value in the given column matches the given value
+
+        Args:
+            column_name: The column to search
+            value: The value to look for; a value such as 'null' or 'none' matches missing values
+
+        Returns:
+            The positions of the matching rows
+        """
+        if value is None or value.lower().strip() in NULL_VALUES:
+            return numpy.flatnonzero(self.__frame[column_name].isnull().values)
+
+        try:
+            value = self.convert_value(column_name, value)
+        except ValueError:
+            return numpy.empty(0, dtype=numpy.intp)
+
+        return self.__column_indexes[column_name].get(value, numpy.empty(0, dtype=numpy.intp))
+
+    def get_simplified_geometry(self, zoom: int) -> geopandas.GeoSeries:
+        """
+        Get the geometry of the layer simplified for display at the given zoom level
+
+        Args:
+            zoom: The web map zoom level
+
+        Returns:
+            Geometry that is accurate to about a pixel at the given zoom level
+        """
+        zoom = max(0, min(int(zoom), MAX_ZOOM))
+
+        with self.__lock:
+            if zoom not in self.__simplified:
+                self.__simplified[zoom] = self.__frame.geometry.simplify(
+                    get_simplification_tolerance(zoom),
+                    preserve_topology=True
+                )
+            return self.__simplified[zoom]
+
+    def query(
+        self,
+        bbox: BoundingBox = None,
+        filters: typing.Mapping[str, typing.Optional[str]] = None,
+        geometry_name: str = None,
+        zoom: int = None
+    ) -> geopandas.GeoDataFrame:
+        """
+        Find the geometry that matches the given criteria
+
+        Args:
+            bbox: Only include geometry whose bounds intersect this bounding box
+            filters: Column values that must be matched; keys that aren't indexed columns are ignored
+            geometry_name: The identifier of the geometry to return
+            zoom: The zoom level to simplify geometry for; geometry is not simplified if not given
+
+        Returns:
+            The matching geometry, indexed by id or name if the layer has either
+        """
+        positions: typing.Optional[numpy.ndarray] = None
+
+        if bbox is not None:
+            positions = numpy.sort(self.__tree.query(shapely.box(*bbox)))
+
+        criteria = dict(filters or dict())
+        index_column = self.index_column
+
+        if geometry_name and index_column:
+            criteria[index_column] = geometry_name
+        elif geometry_name:
+            positions = numpy.empty(0, dtype=numpy.intp)
+
+        for column_name, value in criteria.items():
+            if column_name not in self.__column_indexes:
+                continue
+
+            matches = self.find_positions(column_name, value)
+            positions = matches if positions is None else numpy.intersect1d(positions, matches, assume_unique=True)
+
+        if positions is None:
+            positions = numpy.arange(len(self.__frame))
+
+        selection = self.__frame.take(positions)
+
+        if zoom is not None:
+            selection[selection.geometry.name] = self.get_simplified_geometry(zoom).take(positions).values
+
+        if index_column:
+            selection = selection.set_index(index_column)
+
+        return selection
+
+    @staticmethod
+    def iterate_features(selection: geopandas.GeoDataFrame) -> typing.Iterator[str]:
+        """
+        Serialize geometry one feature at a time as a GeoJSON text sequence
+
+        Args:
+            selection: Geometry returned from `query`
+
+        Returns:
+            Each feature as a record of a GeoJSON text sequence
+        """
+        for feature in selection.iterfeatures(na="null"):
+            yield f"{RECORD_SEPARATOR}{json.dumps(feature)}\n"
+
+
+class GeometryCache:
+    """
+    A least recently used cache of geometry layers, keyed by dataset
+
+    An entry is reloaded when the file behind its dataset changes on disk or when its dataset record is changed
+    """
+    def __init__(self, size: int = DEFAULT_CACHE_SIZE, loader: typing.Callable[[str], geopandas.GeoDataFrame] = None):
+        self.__size = max(size, 1)
+        self.__loader = loader or geopandas.read_file
+        self.__layers: typing.OrderedDict[int, typing.Tuple[typing.Tuple, GeometryLayer]] = OrderedDict()
+        self.__lock = threading.RLock()
+        self.__loads = 0
+
+    @property
+    def loads(self) -> int:
+        """
+        The number of times that a dataset has been read from disk
+        """
+        return self.__loads
+
+    @staticmethod
+    def get_fingerprint(dataset: models.StoredDataset) -> typing.Tuple:
+        """
+        Args:
+            dataset: The dataset that will be read
+
+        Returns:
+            Values that will change when the data behind the dataset changes
+        """
+        stats = os.stat(dataset.path)
+        return dataset.path, dataset.dataset_format, stats.st_mtime_ns, stats.st_size
+
+    def get_layer(self, dataset: models.StoredDataset) -> GeometryLayer:
+        """
+        Get the in-memory layer for a dataset, reading it if needed
+
+        Args:
+            dataset: The dataset to get the geometry of
+
+        Returns:
+            The indexed geometry of the dataset
+        """
+        fingerprint = self.get_fingerprint(dataset)
+
+        with self.__lock:
+            entry = self.__layers.get(dataset.pk)
+
+            if entry is not None and entry[0] == fingerprint:
+                self.__layers.move_to_end(dataset.pk)
+                return entry[1]
+
+            layer = GeometryLayer(self.__loader(dataset.path))
+            self.__loads += 1
+            self.__layers[dataset.pk] = (fingerprint, layer)
+            self.__layers.move_to_end(dataset.pk)
+
+            while len(self.__layers) > self.__size:
+                self.__layers.popitem(last=False)
+
+            return layer
+
+    def invalidate(self, dataset_id: int = None):
+        """
+        Drop cached geometry
+
+        Args:
+            dataset_id: The dataset to drop; every dataset is dropped if not given
+        """
+        with self.__lock:
+            if dataset_id is None:
+                self.__layers.clear()
+            else:
+                self.__layers.pop(dataset_id, None)
+
+    def __contains__(self, dataset_id: int) -> bool:
+        return dataset_id in self.__layers
+
+    def __len__(self) -> int:
+        return len(self.__layers)
+
+
+GEOMETRY_CACHE = GeometryCache()
+"""The geometry cache shared by every request in this process"""
+
+
+@receiver(post_save, sender=models.StoredDataset)
+@receiver(post_delete, sender=models.StoredDataset)
+def _invalidate_stored_dataset(sender, instance: models.StoredDataset, **kwargs):
+    GEOMETRY_CACHE.invalidate(instance.pk)
@@ -7,21 +7,30 @@ import os
 import typing
 import sqlite3
 import re
+import threading
 
 from dmod.core.common import DBAPIConnection
 from collections import defaultdict
 
 from django.contrib.auth.models import User
+from django.db.models import Count
+from django.db.models import Max
 from dmod.evaluations import specification
 from dmod.evaluations.specification import TemplateDetails
 from dmod.evaluations.specification.template import GetSpecificationTypeProtocol
 from dmod.evaluations.specification.template import TemplateManager
+from dmod.evaluations.specification.search import TemplateSearchIndex
 
 from .models import SpecificationTemplate
 from .models import SpecificationTemplateCommunicator
 
 VALUE_OPERATION = re.compile("^[a-zA-Z0-9_]+__[a-zA-Z_]+$")
 
+_SEARCH_INDEX: typing.Optional[typing.Tuple[typing.Tuple, TemplateSearchIndex]] = None
+"""The most recently built search index along with the state of the template table it was built from"""
+
+_SEARCH_INDEX_LOCK = threading.Lock()
+
 
 class SpecificationTemplateManager(TemplateManager):
     """
@@ -70,6 +79,28 @@ class SpecificationTemplateManager(TemplateManager):
 
         return filtered_templates
 
+    def get_search_index(self) -> TemplateSearchIndex:
+        """
+        Get a search index over every stored template, rebuilding it if templates have been added, changed, or removed
+        since it was last built
+
+        Returns:
+            An index reflecting the current state of the stored templates
+        """
+        global _SEARCH_INDEX
+
+        table_state = SpecificationTemplateCommunicator.aggregate(
+            count=Count("pk"),
+            last_modified=Max("template_last_modified")
+        )
+        version = (table_state['count'], table_state['last_modified'])
+
+        with _SEARCH_INDEX_LOCK:
+            if _SEARCH_INDEX is None or _SEARCH_INDEX[0] != version:
+                templates = SpecificationTemplateCommunicator.select_related("author")
+                _SEARCH_INDEX = version, TemplateSearchIndex(template.to_details() for template in templates)
+            return _SEARCH_INDEX[1]
+
     def get_templates(self, specification_type: str) -> typing.Sequence[SpecificationTemplate]:
         specification_type = specification_type.strip()
         return SpecificationTemplateCommunicator.filter(template_specification_type=specification_type)
@@ -0,0 +1,175 @@
+"""
+Tests to ensure that communicator events are published in compact batches and may be caught up on through a stream
+"""
+import json
+import time
+import typing
+
+from unittest import mock
+
+import fakeredis
+
+from django.test import SimpleTestCase
+
+from utilities import batching
+from utilities import communication
+
+from evaluation_service.consumers import listener
+
+
+LOCATION_COUNT = 2000
+"""The number of per-location updates written during a simulated evaluation"""
+
+
+class PublishedMessages:
+    """
+    Records everything published through a redis connection
+    """
+    def __init__(self, connection: fakeredis.FakeRedis):
+        self.messages: typing.List[bytes] = []
+        self.__publish = connection.publish
+        connection.publish = self
+
+    def __call__(self, channel, message):
+        self.messages.append(message.encode() if isinstance(message, str) else message)
+        return self.__publish(channel, message)
+
+    @property
+    def byte_count(self) -> int:
+        return sum(len(message) for message in self.messages)
+
+    def events(self) -> typing.List[dict]:
+        events = []
+
+        for message in self.messages:
+            decoded = json.loads(message)
+            events.extend(decoded["data"] if decoded["event"] == "batch" else [decoded])
+
+        return events
+
+
+class EventBatchingTest(SimpleTestCase):
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.connection_patch = mock.patch.object(
+            communication,
+            "get_redis_connection",
+            side_effect=lambda *args, **kwargs: fakeredis.FakeRedis(server=self.server)
+        )
+        self.connection_patch.start()
+
+    def tearDown(self):
+        self.connection_patch.stop()
+
+    def run_evaluation(self, evaluation_id: str, **kwargs) -> typing.Tuple[PublishedMessages, communication.RedisCommunicator]:
+        communicator = communication.RedisCommunicator(evaluation_id, batch_delay=60, **kwargs)
+        published = PublishedMessages(getattr(communicator, "_RedisCommunicator__connection"))
+
+        for location_index in range(LOCATION_COUNT):
+            communicator.write(
+                reason="location_scores",
+                data={"location": f"location-{location_index}", "scores": {"pearson": 0.5, "kge": -0.25}}
+            )
+
+        communicator.update(complete=True)
+        return published, communicator
+
+    def test_batches_reduce_messages_and_bytes(self):
+        unbatched, _ = self.run_evaluation("unbatched", batch_size=1)
+        batched, communicator = self.run_evaluation("batched", batch_size=100)
+
+        # Every location update plus the final status update
+        self.assertEqual(len(unbatched.messages), LOCATION_COUNT + 1)
+        self.assertEqual(len(batched.messages), LOCATION_COUNT // 100 + 1)
+        self.assertEqual(
+            [(event["event"], event["data"].get("location")) for event in batched.events()],
+            [(event["event"], event["data"].get("location")) for event in unbatched.events()]
+        )
+
+        # Batches only add a small envelope to the events they carry
+        self.assertLess(batched.byte_count, unbatched.byte_count * 1.05)
+
+        # Compare against events that were published one at a time and indented by four, like they used to be
+        indented_byte_count = sum(
+            len(json.dumps({**event, "data": json.dumps(event["data"], indent=4)}, indent=4))
+            for event in unbatched.events()
+        )
+        self.assertLess(batched.byte_count, indented_byte_count * 0.75)
+
+    async def test_consumer_unpacks_batches(self):
+        published, _ = self.run_evaluation("forwarded", batch_size=100)
+        self.assertEqual(json.loads(published.messages[0])["event"], "batch")
+
+        with mock.patch.object(listener.utilities, "get_runner_connection", return_value=None):
+            consumer = listener.LaunchConsumer()
+
+        sent: typing.List[dict] = []
+
+        async def send(text_data: str = None, **kwargs):
+            sent.append(json.loads(text_data))
+
+        consumer.send = send
+
+        for message in published.messages:
+            await consumer.receive_subscribed_message({"type": "message", "channel": b"forwarded", "data": message})
+
+        # Every event is sent on its own, under its own name, rather than as a batch
+        self.assertEqual(len(sent), LOCATION_COUNT + 1)
+        self.assertEqual([message["event"] for message in sent], [event["event"] for event in published.events()])
+        self.assertEqual(
+            [message["data"].get("location") for message in sent[:-1]],
+            [f"location-{location_index}" for location_index in range(LOCATION_COUNT)]
+        )
+
+    def test_late_subscribers_catch_up(self):
+        published, communicator = self.run_evaluation("catch-up", batch_size=250, event_encoding="msgpack")
+
+        offset, events = communicator.read_events()
+        self.assertEqual(events, published.events())
+
+        communicator.write(reason="info", data={"info": "one more"})
+        communicator.flush()
+
+        next_offset, new_events = communication.read_events(
+            fakeredis.FakeRedis(server=self.server),
+            "catch-up",
+            offset=offset
+        )
+        self.assertEqual([event["data"] for event in new_events], [{"info": "one more"}])
+        self.assertNotEqual(next_offset, offset)
+
+        self.assertEqual(communicator.read_events(offset=next_offset), (next_offset, []))
+
+    def test_batches_are_sent_after_a_delay(self):
+        sent: typing.List[typing.Sequence[dict]] = []
+        batcher = batching.EventBatcher(sent.append, max_events=10, max_delay=0.05)
+
+        batcher.add({"event": "one"})
+        batcher.add({"event": "two"})
+        self.assertEqual(sent, [])
+
+        deadline = time.monotonic() + 5
+        while not sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(sent, [[{"event": "one"}, {"event": "two"}]])
+        self.assertEqual(len(batcher), 0)
+
+        for index in range(25):
+            batcher.add({"event": index})
+
+        self.assertEqual([len(batch) for batch in sent], [2, 10, 10])
+        self.assertEqual(batcher.flush(), 5)
+        self.assertEqual(batcher.flush(), 0)
+
+    def test_encodings(self):
+        events = [{"event": "metric", "data": {"value": 1.5, "name": "pearson"}}] * 3
+
+        for encoding in batching.SUPPORTED_ENCODINGS:
+            encoded = batching.encode_events(events, encoding)
+            self.assertEqual(batching.decode_events(encoded, encoding.encode()), events)
+
+        self.assertNotIn(b" ", batching.encode_events(events))
+
+        with self.assertRaises(ValueError):
+            batching.encode_events(events, "xml")
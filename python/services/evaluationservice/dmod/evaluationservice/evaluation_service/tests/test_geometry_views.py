@@ -0,0 +1,179 @@
+"""
+Tests to ensure that geometry is served from memory and that the cache notices when its data changes
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import tempfile
+
+from http import HTTPStatus
+
+import numpy
+import shapely
+import geopandas
+
+from django.test import TestCase
+
+from evaluation_service import models
+from evaluation_service import choices
+from evaluation_service.geometry_cache import GEOMETRY_CACHE
+from evaluation_service.geometry_cache import GeometryLayer
+from evaluation_service.geometry_cache import RECORD_SEPARATOR
+from evaluation_service.geometry_cache import get_tile_bounds
+
+
+BENCHMARK_POLYGON_COUNT = 100_000
+"""The number of polygons in the layer used to compare cached queries to reading from disk"""
+
+
+def create_grid(columns: int, rows: int, cell_size: float = 0.01) -> geopandas.GeoDataFrame:
+    """
+    Args:
+        columns: The number of cells from west to east
+        rows: The number of cells from south to north
+        cell_size: The width and height of each cell in degrees
+
+    Returns:
+        A layer of square polygons with 'id', 'name', and 'huc_id' columns
+    """
+    x, y = numpy.meshgrid(numpy.arange(columns) * cell_size, numpy.arange(rows) * cell_size)
+    x, y = x.ravel() - 90.0, y.ravel() + 30.0
+    count = len(x)
+
+    return geopandas.GeoDataFrame(
+        {
+            "id": [f"cat-{index}" for index in range(count)],
+            "name": [f"Cell {index}" for index in range(count)],
+            "huc_id": numpy.arange(count) % 10,
+            "area_sqkm": numpy.full(count, 1.0),
+        },
+        geometry=shapely.box(x, y, x + cell_size, y + cell_size),
+        crs="EPSG:4326"
+    )
+
+
+class GeometryViewTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grid.geojson")
+        create_grid(10, 10).to_file(self.path, driver="GeoJSON")
+
+        self.dataset = models.StoredDataset.objects.create(
+            name="Grid",
+            path=self.path,
+            dataset_type=choices.StoredDatasetType.geometry(),
+            dataset_format="geojson"
+        )
+        GEOMETRY_CACHE.invalidate()
+
+    def tearDown(self):
+        GEOMETRY_CACHE.invalidate()
+        self.directory.cleanup()
+
+    def get_features(self, path: str, **query) -> dict:
+        response = self.client.get(f"/evaluation_service/geometry/{self.dataset.pk}{path}", data=query)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return json.loads(response.content)
+
+    def test_dataset_is_read_once(self):
+        loads = GEOMETRY_CACHE.loads
+
+        everything = self.get_features("")
+        self.assertEqual(len(everything["features"]), 100)
+        self.assertNotIn("area_sqkm", everything["features"][0]["properties"])
+
+        bounded = self.get_features("", bbox="[-89.995, 30.005, -89.975, 30.015]")
+        self.assertEqual(sorted(feature["id"] for feature in bounded["features"]), [
+            "cat-0", "cat-1", "cat-10", "cat-11", "cat-12", "cat-2"
+        ])
+
+        filtered = self.get_features("", huc_id="3")
+        self.assertEqual(len(filtered["features"]), 10)
+        self.assertTrue(all(feature["properties"]["huc_id"] == 3 for feature in filtered["features"]))
+
+        named = self.get_features("/cat-42")
+        self.assertEqual([feature["id"] for feature in named["features"]], ["cat-42"])
+
+        self.assertEqual(GEOMETRY_CACHE.loads - loads, 1)
+
+    def test_cache_is_invalidated(self):
+        self.get_features("")
+        loads = GEOMETRY_CACHE.loads
+
+        create_grid(5, 5).to_file(self.path, driver="GeoJSON")
+        stats = os.stat(self.path)
+        os.utime(self.path, ns=(stats.st_atime_ns, stats.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(len(self.get_features("")["features"]), 25)
+        self.assertEqual(GEOMETRY_CACHE.loads - loads, 1)
+
+        self.dataset.name = "Renamed Grid"
+        self.dataset.save()
+        self.assertNotIn(self.dataset.pk, GEOMETRY_CACHE)
+
+    def test_stream_geometry(self):
+        response = self.client.get(f"/evaluation_service/geometry/{self.dataset.pk}/stream", data={"huc_id": "3"})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["Content-Type"], "application/geo+json-seq")
+
+        records = b"".join(response.streaming_content).decode().split(RECORD_SEPARATOR)
+        self.assertEqual(records[0], "")
+
+        features = [json.loads(record) for record in records[1:]]
+        self.assertEqual(len(features), 10)
+        self.assertTrue(all(feature["type"] == "Feature" for feature in features))
+
+    def test_get_geometry_tile(self):
+        west, south, east, north = get_tile_bounds(1, 0, 0)
+        self.assertEqual((west, east), (-180.0, 0.0))
+        self.assertAlmostEqual(south, 0.0)
+        self.assertAlmostEqual(north, 85.0511287798)
+
+        response = self.client.get(f"/evaluation_service/geometry/{self.dataset.pk}/tiles/1/0/0")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        features = b"".join(response.streaming_content).decode().split(RECORD_SEPARATOR)[1:]
+        self.assertEqual(len(features), 100)
+
+        response = self.client.get(f"/evaluation_service/geometry/{self.dataset.pk}/tiles/1/1/0")
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+        response = self.client.get(f"/evaluation_service/geometry/{self.dataset.pk}/tiles/1/2/0")
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_simplified_geometry(self):
+        layer = GeometryLayer(geopandas.GeoDataFrame(
+            {"id": ["circle"]},
+            geometry=[shapely.Point(0, 0).buffer(1, quad_segs=256)],
+            crs="EPSG:4326"
+        ))
+
+        coarse = layer.query(zoom=2).geometry.iloc[0]
+        fine = layer.query(zoom=22).geometry.iloc[0]
+        original = layer.query().geometry.iloc[0]
+
+        self.assertLess(shapely.get_num_coordinates(coarse), shapely.get_num_coordinates(fine))
+        self.assertEqual(shapely.get_num_coordinates(fine), shapely.get_num_coordinates(original))
+        self.assertIs(layer.get_simplified_geometry(2), layer.get_simplified_geometry(2))
+
+    def test_repeated_bounding_box_queries(self):
+        path = os.path.join(self.directory.name, "benchmark.gpkg")
+        create_grid(400, BENCHMARK_POLYGON_COUNT // 400).to_file(path, driver="GPKG")
+
+        bounding_boxes = [
+            (-89.995 + offset * 0.05, 30.005 + offset * 0.02, -89.795 + offset * 0.05, 30.205 + offset * 0.02)
+            for offset in range(20)
+        ]
+
+        read_start = time.perf_counter()
+        expected = [len(geopandas.read_file(path, bbox=bounding_box)) for bounding_box in bounding_boxes[:3]]
+        read_seconds = (time.perf_counter() - read_start) / 3
+
+        layer = GeometryLayer(geopandas.read_file(path))
+        query_start = time.perf_counter()
+        found = [len(layer.query(bbox=bounding_box)) for bounding_box in bounding_boxes]
+        query_seconds = (time.perf_counter() - query_start) / len(bounding_boxes)
+
+        self.assertEqual(found[:3], expected)
+        self.assertLess(query_seconds * 3, read_seconds)
@@ -0,0 +1,323 @@
+"""
+Tests to ensure that identical evaluations launched through the runner are only computed once
+"""
+import os
+import json
+import time
+import queue
+import typing
+import tempfile
+import threading
+import multiprocessing
+
+from concurrent import futures
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+import runner
+import worker
+import writing
+
+from utilities import streams
+from utilities.launches import LaunchCache
+from utilities.launches import get_evaluation_fingerprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeWorkerPool(futures.Executor):
+    """
+    An executor that records submissions and hands back futures that the test completes
+    """
+    def __init__(self):
+        self.submissions: typing.List[typing.Tuple[typing.Callable, typing.Dict[str, typing.Any]]] = []
+        self.futures: typing.List[futures.Future] = []
+
+    def submit(self, fn, /, *args, **kwargs) -> futures.Future:
+        self.submissions.append((fn, kwargs))
+        future = futures.Future()
+        self.futures.append(future)
+        return future
+
+
+class FakeObjectManager:
+    def __init__(self):
+        self.scopes: typing.List[str] = []
+        self.monitored: typing.List[typing.Tuple[str, futures.Future]] = []
+
+    def establish_scope(self, name: str):
+        self.scopes.append(name)
+        return None
+
+    def monitor_operation(self, name: str, operation: futures.Future):
+        self.monitored.append((name, operation))
+
+    def free(self, scope_name: str, fail_on_missing_scope: bool = True):
+        pass
+
+
+class FakeConnection:
+    """
+    Records the stream messages that the runner deletes
+    """
+    def __init__(self):
+        self.deleted: typing.List[str] = []
+        self.message_deleted = threading.Event()
+
+    def xdel(self, stream_name: str, message_id: str) -> int:
+        self.deleted.append(message_id)
+        self.message_deleted.set()
+        return 1
+
+
+class TestRunnerLaunches(SimpleTestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.observation_path = os.path.join(self.temporary_directory.name, "observations.csv")
+
+        with open(self.observation_path, "w") as observation_file:
+            observation_file.write("date,value\n2024-01-01,1.0\n")
+
+        self.instructions = {
+            "observations": [
+                {
+                    "name": "Observations",
+                    "backend": {"backend_type": "file", "address": self.observation_path, "format": "csv"}
+                }
+            ],
+            "scheme": {"name": "Test Scheme", "metrics": [{"name": "Pearson Correlation Coefficient", "weight": 1}]}
+        }
+
+        self.clock = FakeClock()
+        self.launch_cache = LaunchCache(result_ttl=60, clock=self.clock)
+        self.worker_pool = FakeWorkerPool()
+        self.object_manager = FakeObjectManager()
+
+        self.communicators: typing.Dict[str, mock.MagicMock] = {}
+        communicator_patch = mock.patch.object(
+            runner.utilities,
+            "get_communicators",
+            side_effect=lambda communicator_id, **kwargs: self.communicators.setdefault(
+                communicator_id, mock.MagicMock()
+            )
+        )
+        communicator_patch.start()
+        self.addCleanup(communicator_patch.stop)
+
+        self.output_directory = os.path.join(self.temporary_directory.name, "output")
+        output_patch = mock.patch.dict(os.environ, {"EVALUATION_OUTPUT_PATH": self.output_directory})
+        output_patch.start()
+        self.addCleanup(output_patch.stop)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def launch(self, evaluation_id: str, instructions: typing.Union[str, dict] = None) -> runner.JobRecord:
+        message = streams.StreamMessage(
+            stream_name="evaluations",
+            group_name="runners",
+            consumer_name="runner",
+            message_id=f"{evaluation_id}-message",
+            payload={
+                "purpose": "launch",
+                "evaluation_id": evaluation_id,
+                "instructions": instructions or self.instructions
+            }
+        )
+        return runner.launch_evaluation(
+            message,
+            self.worker_pool,
+            object_manager=self.object_manager,
+            launch_cache=self.launch_cache
+        )
+
+    def complete_evaluation(self, job: futures.Future, evaluation_id: str) -> typing.Dict[str, typing.Any]:
+        """
+        Finish a submitted evaluation the way the worker would, with written output
+        """
+        results = writing.get_destination_parameters(evaluation_id=evaluation_id)
+
+        with open(results['destination'], "w") as output_file:
+            output_file.write(evaluation_id)
+
+        results.update(success=True, evaluation_id=evaluation_id)
+        job.set_result(results)
+        return results
+
+    def assert_republished(self, record: runner.JobRecord, original_id: str):
+        """
+        Check that a record that reused another evaluation's results has them under its own ID
+        """
+        self.assertTrue(record.job.done())
+        results = record.job.result()
+        self.assertTrue(results['success'])
+        self.assertEqual(results['evaluation_id'], record.evaluation_id)
+        self.assertEqual(results['destination'], writing.get_destination_parameters(record.evaluation_id)['destination'])
+
+        with open(results['destination']) as output_file:
+            self.assertEqual(output_file.read(), original_id)
+
+        communicators = self.communicators[record.evaluation_id]
+        communicators.update.assert_any_call(complete=True)
+        self.assertNotIn(mock.call(failed=True), communicators.update.call_args_list)
+
+    def test_launch_runs_once(self):
+        record = self.launch("first-evaluation")
+
+        self.assertEqual(len(self.worker_pool.submissions), 1)
+        submitted_function, submitted_arguments = self.worker_pool.submissions[0]
+        self.assertIs(submitted_function, worker.evaluate)
+        self.assertEqual(submitted_arguments['evaluation_id'], "first-evaluation")
+        self.assertIs(record.job, self.worker_pool.futures[0])
+        self.assertEqual([name for name, _ in self.object_manager.monitored], ["first-evaluation"])
+
+    def test_identical_launch_attaches_to_running_job(self):
+        first_record = self.launch("first-evaluation")
+
+        # Formatting and key order shouldn't make a difference
+        reordered_instructions = json.dumps(dict(reversed(list(self.instructions.items()))), indent=2)
+        second_record = self.launch("second-evaluation", reordered_instructions)
+
+        self.assertEqual(len(self.worker_pool.submissions), 1)
+        self.assertEqual(second_record.evaluation_id, "second-evaluation")
+        self.assertEqual(self.object_manager.scopes, ["first-evaluation"])
+        self.assertFalse(second_record.job.done())
+
+        self.complete_evaluation(first_record.job, "first-evaluation")
+        self.assertEqual(first_record.job.result()['evaluation_id'], "first-evaluation")
+        self.assert_republished(second_record, "first-evaluation")
+
+    def test_attached_launch_reports_failure(self):
+        first_record = self.launch("first-evaluation")
+        second_record = self.launch("second-evaluation")
+
+        first_record.job.set_exception(ValueError("Evaluation failed"))
+
+        self.assertFalse(second_record.job.result()['success'])
+        self.assertEqual(second_record.job.result()['evaluation_id'], "second-evaluation")
+        self.communicators["second-evaluation"].update.assert_any_call(failed=True)
+        self.communicators["second-evaluation"].update.assert_any_call(complete=True)
+
+    def test_completed_launch_is_served_from_cache(self):
+        self.launch("first-evaluation")
+        self.complete_evaluation(self.worker_pool.futures[0], "first-evaluation")
+
+        real_open = open
+
+        def open_anything_but_sources(path, *args, **kwargs):
+            if os.path.abspath(path) == os.path.abspath(self.observation_path):
+                raise AssertionError("Sources should not be read")
+            return real_open(path, *args, **kwargs)
+
+        with mock.patch("builtins.open", side_effect=open_anything_but_sources):
+            record = self.launch("second-evaluation")
+
+        self.assertEqual(len(self.worker_pool.submissions), 1)
+        self.assert_republished(record, "first-evaluation")
+
+    def test_cached_result_expires(self):
+        self.launch("first-evaluation")
+        self.worker_pool.futures[0].set_result({"success": True, "evaluation_id": "first-evaluation"})
+
+        self.clock.now += 61
+        record = self.launch("second-evaluation")
+
+        self.assertEqual(len(self.worker_pool.submissions), 2)
+        self.assertFalse(record.job.done())
+
+    def test_failed_launch_is_not_cached(self):
+        self.launch("first-evaluation")
+        self.worker_pool.futures[0].set_result({"success": False, "evaluation_id": "first-evaluation"})
+        self.launch("second-evaluation")
+
+        self.worker_pool.futures[1].set_exception(ValueError("Evaluation failed"))
+        self.launch("third-evaluation")
+
+        self.assertEqual(len(self.worker_pool.submissions), 3)
+
+    def test_changed_inputs_launch_again(self):
+        self.launch("first-evaluation")
+        self.worker_pool.futures[0].set_result({"success": True, "evaluation_id": "first-evaluation"})
+
+        with open(self.observation_path, "a") as observation_file:
+            observation_file.write("2024-01-02,2.0\n")
+
+        self.launch("second-evaluation")
+
+        self.assertEqual(len(self.worker_pool.submissions), 2)
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            get_evaluation_fingerprint(self.instructions),
+            get_evaluation_fingerprint(json.dumps(self.instructions, indent=4))
+        )
+
+        changed_instructions = json.loads(json.dumps(self.instructions))
+        changed_instructions['scheme']['metrics'][0]['weight'] = 2
+        self.assertNotEqual(get_evaluation_fingerprint(self.instructions), get_evaluation_fingerprint(changed_instructions))
+
+
+class TestMonitorRunningJobs(SimpleTestCase):
+    JOB_COUNT: typing.Final[int] = 2000
+
+    def setUp(self):
+        self.connection = FakeConnection()
+        self.active_jobs: queue.Queue[runner.JobRecord] = queue.Queue()
+        self.job_slots = threading.BoundedSemaphore(self.JOB_COUNT)
+        self.stop_signal = multiprocessing.Event()
+        self.monitor = threading.Thread(
+            target=runner.monitor_running_jobs,
+            kwargs={
+                "connection": self.connection,
+                "active_job_queue": self.active_jobs,
+                "stop_signal": self.stop_signal,
+                "object_manager": FakeObjectManager(),
+                "job_slots": self.job_slots,
+            },
+            daemon=True
+        )
+        self.monitor.start()
+
+    def tearDown(self):
+        self.stop_signal.set()
+        self.monitor.join(timeout=5)
+
+    def test_running_jobs_are_not_polled(self):
+        jobs: typing.List[futures.Future] = []
+
+        for index in range(self.JOB_COUNT):
+            self.job_slots.acquire()
+            job = futures.Future()
+            jobs.append(job)
+            self.active_jobs.put(
+                runner.JobRecord(
+                    stream_name="evaluations",
+                    group_name="runners",
+                    consumer_name="runner",
+                    message_id=f"message-{index}",
+                    evaluation_id=f"evaluation-{index}",
+                    job=job
+                )
+            )
+
+        # Give the monitor time to take in every job
+        time.sleep(0.5)
+        self.assertEqual(self.active_jobs.qsize(), 0)
+
+        cpu_time_before = time.process_time()
+        time.sleep(1.0)
+        self.assertLess(time.process_time() - cpu_time_before, 0.1)
+
+        jobs[7].set_result({"success": True})
+        self.assertTrue(self.connection.message_deleted.wait(timeout=1))
+        self.assertEqual(self.connection.deleted, ["message-7"])
+
+        # The finished job's slot should have been handed back
+        self.assertTrue(self.job_slots.acquire(timeout=1))
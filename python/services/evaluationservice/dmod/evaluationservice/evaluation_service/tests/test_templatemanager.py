@@ -1,9 +1,12 @@
 import unittest
 from pathlib import Path
 
+from django.contrib.auth.models import User
 from django.test import TestCase
 
+from dmod.evaluations.specification import BasicTemplateDetails
 from dmod.evaluations.specification import TemplateManager
+from evaluation_service import models
 from evaluation_service import specification
 
 
@@ -67,3 +70,55 @@ class SpecificationTemplateManager(TestCase):
             manager: The manager whose contents to test
         """
         ...
+
+
+class SpecificationTemplateSearch(TestCase):
+    """
+    Tests to ensure that stored templates may be searched and that searches reflect changes to what is stored
+    """
+    @classmethod
+    def setUpTestData(cls):
+        for wrapper in models.get_model_wrappers():
+            wrapper.disable_concurrency()
+
+        cls.author = User.objects.create_user(username="search_test_user", email="", password="TestPassword")
+
+        for name, description in [
+            ("Peak Streamflow", "Thresholds for peak flows"),
+            ("Daily Stage", "Stage thresholds gathered every day"),
+            ("Streamflow Locations", "Where to find streamflow"),
+        ]:
+            details = BasicTemplateDetails(
+                name=name,
+                specification_type="ThresholdSpecification",
+                configuration={"name": name},
+                description=description
+            )
+            models.SpecificationTemplate.from_template_details(cls.author, details).save()
+
+    def test_find_templates(self):
+        manager = specification.SpecificationTemplateManager()
+
+        # 'Streamflow Locations' mentions streamflow in both its name and description, so it should rank first
+        results = manager.find_templates("stream")
+        self.assertEqual(
+            [result.template.name for result in results],
+            ["Streamflow Locations", "Peak Streamflow"]
+        )
+        self.assertEqual(results[0].template.author_name, "search_test_user")
+
+        self.assertEqual([result.template.name for result in manager.find_templates("stage day")], ["Daily Stage"])
+        self.assertEqual(len(manager.find_templates(author="search_test", limit=2)), 2)
+
+        index = manager.get_search_index()
+        self.assertIs(manager.get_search_index(), index)
+
+        new_template = BasicTemplateDetails(
+            name="Hourly Streamflow",
+            specification_type="ThresholdSpecification",
+            configuration={"name": "Hourly Streamflow"}
+        )
+        models.SpecificationTemplate.from_template_details(self.author, new_template).save()
+
+        self.assertIsNot(manager.get_search_index(), index)
+        self.assertIn("Hourly Streamflow", [result.template.name for result in manager.find_templates("hour")])
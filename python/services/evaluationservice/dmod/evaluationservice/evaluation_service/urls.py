@@ -24,6 +24,12 @@ urlpatterns = [
     re_path(f'output/(?P<evaluation_name>{CHANNEL_NAME_PATTERN})/?$', views.helpers.GetOutput.as_view(), name="Output"),
     re_path('geometry/?$', views.GetGeometryDatasets.as_view(), name="GeometryList"),
     re_path(r"geometry/(?P<dataset_id>\d+)/?$", views.GetGeometry.as_view(), name="GetGeometry"),
+    re_path(r"geometry/(?P<dataset_id>\d+)/stream/?$", views.StreamGeometry.as_view(), name="StreamGeometry"),
+    re_path(
+        r"geometry/(?P<dataset_id>\d+)/tiles/(?P<zoom>\d+)/(?P<x>\d+)/(?P<y>\d+)/?$",
+        views.GetGeometryTile.as_view(),
+        name="GetGeometryTile"
+    ),
     re_path(
         f"geometry/(?P<dataset_id>\d+)/(?P<geometry_name>{SAFE_STRING_NAME})/?$",
         views.GetGeometry.as_view(),
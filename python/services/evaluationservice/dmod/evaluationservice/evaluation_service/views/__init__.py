@@ -21,6 +21,8 @@ from .helpers import Metrics
 from .helpers import Schema
 from .geometry import GetGeometry
 from .geometry import GetGeometryDatasets
+from .geometry import StreamGeometry
+from .geometry import GetGeometryTile
 from .library import GetLibrary
 from .library import GetLibraryOptions
 from .library import LibrarySelector
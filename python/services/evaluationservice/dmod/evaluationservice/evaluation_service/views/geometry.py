@@ -14,6 +14,8 @@ from django.http import HttpRequest
 from django.http import HttpResponseRedirect
 from django.http import JsonResponse
 from django.http import HttpResponseServerError
+from django.http import HttpResponseBadRequest
+from django.http import StreamingHttpResponse
 
 from rest_framework.views import APIView
 
@@ -25,12 +27,16 @@ import utilities
 from service import application_values
 from evaluation_service import models
 from evaluation_service import choices
+from evaluation_service.geometry_cache import GEOMETRY_CACHE
+from evaluation_service.geometry_cache import GeometryLayer
+from evaluation_service.geometry_cache import get_tile_bounds
 
 
 EVALUATION_ID_PATTERN = r"[a-zA-Z0-9\.\-_]+"
 
 EVALUATION_TEMPLATE_PATH = os.path.join(application_values.STATIC_RESOURCES_PATH, "evaluation_template.json")
 
+GEOJSON_SEQUENCE_CONTENT_TYPE = "application/geo+json-seq"
 
 BBOX_PATTERN = re.compile(r"(?<=(\[|\())? *-?\d+(\.\d*)? *, *-?\d+(\.\d*)? *, *-?\d+(\.\d*)? *, *-?\d+(\.\d*)? *(?=(\)|\]|))")
 """
@@ -47,61 +53,82 @@ This will match on strings like:
 """
 
 
-class GetGeometry(APIView):
-    def _find_geometry(
-        self,
-        query: typing.Dict,
-        dataset_id: int,
-        geometry_name: str = None
-    ) -> typing.Union[geopandas.GeoDataFrame, HttpResponse]:
-        dataset = get_object_or_404(models.StoredDataset, pk=dataset_id)
+RESERVED_QUERY_KEYS: typing.Final[typing.Tuple[str, ...]] = ("geometry", "bbox", "zoom")
+"""Query keys that control how geometry is returned rather than which values to filter on"""
 
-        if not os.path.exists(dataset.path):
-            return HttpResponseServerError(f"The data for {dataset.name} is not available")
 
-        bounding_box = None
-        if query.get("bbox") is not None:
-            bounding_box_match = BBOX_PATTERN.search(query.get("bbox"))
+def parse_bounding_box(value: typing.Optional[str]) -> typing.Optional[typing.List[float]]:
+    """
+    Args:
+        value: A bounding box from a query, such as "[-90.1, 30.2, -89.5, 31.0]"
+
+    Returns:
+        The bounding box as (min x, min y, max x, max y) if one could be read
+    """
+    if value is None:
+        return None
+
+    bounding_box_match = BBOX_PATTERN.search(value)
 
-            if bounding_box_match:
-                bounding_box = [float(val.strip()) for val in bounding_box_match.group().split(",")]
+    if bounding_box_match:
+        return [float(val.strip()) for val in bounding_box_match.group().split(",")]
 
-        geometry = geopandas.read_file(filename=dataset.path, bbox=bounding_box)
+    return None
 
-        pertinent_columns = [
-            column_name
-            for column_name in geometry.keys()
-            if column_name.lower() in ("name", "geometry")
-               or column_name.lower().endswith("id")
-        ]
 
-        geometry = geometry[pertinent_columns]
+def parse_zoom(value: typing.Optional[str]) -> typing.Optional[int]:
+    """
+    Args:
+        value: A web map zoom level from a query
 
-        for query_key, query_value in query.items():
-            if query_key == "geometry":
-                continue
+    Returns:
+        The zoom level if one was given and could be read
+    """
+    try:
+        return int(float(value)) if value not in (None, "") else None
+    except ValueError:
+        return None
 
-            if query_key in pertinent_columns:
-                if query_value is None or query_value.lower().strip() in ("nan", "null", "na", "none"):
-                    geometry = geometry[geometry[query_key].isnull()]
-                elif pertinent_columns[query_key].dtype == int:
-                    value = int(float(query_value))
-                    geometry = geometry[geometry[query_key] == value]
-                elif pertinent_columns[query_key].dtype == float:
-                    value = float(query_value)
-                    geometry = geometry[geometry[query_key] == value]
-                else:
-                    geometry = geometry[geometry[query_key] == query_value]
 
-        if "id" in geometry:
-            geometry.set_index("id", inplace=True)
-        elif "name" in geometry:
-            geometry.set_index("name", inplace=True)
+class GetGeometry(APIView):
+    """
+    Returns geometry from a stored dataset as a single GeoJSON document
+
+    Datasets are read once and kept in memory, so repeated queries (such as those made while panning a map) only
+    search indexes. Supports `bbox` and `zoom` parameters along with equality filters on id and name columns.
+    """
+    def _get_layer(self, dataset_id: int) -> typing.Union[GeometryLayer, HttpResponse]:
+        dataset = get_object_or_404(models.StoredDataset, pk=dataset_id)
+
+        if not os.path.exists(dataset.path):
+            return HttpResponseServerError(f"The data for {dataset.name} is not available")
+
+        return GEOMETRY_CACHE.get_layer(dataset)
+
+    def _find_geometry(
+        self,
+        query: typing.Dict,
+        dataset_id: int,
+        geometry_name: str = None,
+        bounding_box: typing.Sequence[float] = None
+    ) -> typing.Union[geopandas.GeoDataFrame, HttpResponse]:
+        layer = self._get_layer(dataset_id)
+
+        if isinstance(layer, HttpResponse):
+            return layer
 
-        if geometry_name:
-            geometry = geometry.filter(items=[geometry_name], axis=0)
+        filters = {
+            query_key: query_value
+            for query_key, query_value in query.items()
+            if query_key not in RESERVED_QUERY_KEYS
+        }
 
-        return geometry.copy()
+        return layer.query(
+            bbox=bounding_box or parse_bounding_box(query.get("bbox")),
+            filters=filters,
+            geometry_name=geometry_name,
+            zoom=parse_zoom(query.get("zoom"))
+        )
 
     def get(self, request: HttpRequest, dataset_id: int, geometry_name: str = None) -> HttpResponse:
         data = self._find_geometry(request.GET, dataset_id, geometry_name)
@@ -118,6 +145,51 @@ class GetGeometry(APIView):
         return HttpResponse(data.to_json().encode(), headers={"Content-Type": "application/json"})
 
 
+class StreamGeometry(GetGeometry):
+    """
+    Streams geometry from a stored dataset as a GeoJSON text sequence (RFC 8142), one feature at a time
+
+    Clients may start drawing features before the whole response has arrived and the service never has to build the
+    entire document in memory.
+    """
+    def _stream(self, data: typing.Union[geopandas.GeoDataFrame, HttpResponse]) -> HttpResponse:
+        if isinstance(data, HttpResponse):
+            return data
+
+        return StreamingHttpResponse(
+            GeometryLayer.iterate_features(data),
+            content_type=GEOJSON_SEQUENCE_CONTENT_TYPE
+        )
+
+    def get(self, request: HttpRequest, dataset_id: int, geometry_name: str = None) -> HttpResponse:
+        return self._stream(self._find_geometry(request.GET, dataset_id, geometry_name))
+
+    def post(self, request: HttpRequest, dataset_id: int, geometry_name: str = None) -> HttpResponse:
+        return self._stream(self._find_geometry(request.POST, dataset_id, geometry_name))
+
+
+class GetGeometryTile(StreamGeometry):
+    """
+    Streams the geometry within a web map (XYZ) tile, simplified for the tile's zoom level, as a GeoJSON text sequence
+    """
+    def _find_tile(self, query: typing.Dict, dataset_id: int, zoom: int, x: int, y: int) -> HttpResponse:
+        zoom, x, y = int(zoom), int(x), int(y)
+
+        if not 0 <= x < 2 ** zoom or not 0 <= y < 2 ** zoom:
+            return HttpResponseBadRequest(f"There is no tile at {x}, {y} at zoom level {zoom}")
+
+        query = {key: value for key, value in query.items() if key not in RESERVED_QUERY_KEYS}
+        query["zoom"] = str(zoom)
+
+        return self._stream(self._find_geometry(query, dataset_id, bounding_box=get_tile_bounds(zoom, x, y)))
+
+    def get(self, request: HttpRequest, dataset_id: int, zoom: int, x: int, y: int) -> HttpResponse:
+        return self._find_tile(request.GET, dataset_id, zoom, x, y)
+
+    def post(self, request: HttpRequest, dataset_id: int, zoom: int, x: int, y: int) -> HttpResponse:
+        return self._find_tile(request.POST, dataset_id, zoom, x, y)
+
+
 class GetGeometryDatasets(APIView):
     @staticmethod
     def _load_geometry_names() -> typing.List[typing.Dict[str, typing.Union[str, int]]]:
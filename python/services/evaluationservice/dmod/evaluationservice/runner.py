@@ -14,6 +14,8 @@ import json
 import signal
 import dataclasses
 import threading
+import time
+import shutil
 
 from argparse import ArgumentParser
 
@@ -24,15 +26,20 @@ from functools import partial
 
 import utilities
 from dmod.metrics import CommunicatorGroup
+from dmod.core import telemetry
 from dmod.core.context import DMODObjectManager
 
 from dmod.core.context import get_object_manager
 
 import service
 import worker
+import writing
+from service.application_values import COMMON_DATETIME_FORMAT
 from service.service_logging import get_logger
 
 from utilities.common import ErrorCounter
+from utilities.launches import LaunchCache
+from utilities.launches import get_evaluation_fingerprint
 from utilities import streams
 
 CT = typing.TypeVar("CT")
@@ -54,6 +61,17 @@ The exit code when the runner halts because of an error. 1 is used since that is
 all error code.
 """
 
+EVALUATION_LAUNCHES = telemetry.counter(
+    "dmod_evaluation_launches_total",
+    "Evaluations requested of the runner, by whether they were launched, attached to a running evaluation, or cached",
+    ("origin",)
+)
+
+EVALUATION_SECONDS = telemetry.histogram(
+    "dmod_evaluation_duration_seconds",
+    "Time from submitting an evaluation to the worker pool until it finishes"
+)
+
 
 def get_concurrency_executor_type(**kwargs) -> typing.Callable[[], futures.Executor]:
     """
@@ -301,6 +319,13 @@ Held at the process level so that the signal handler may use it for cleanup oper
 """
 
 
+LAUNCH_CACHE = LaunchCache()
+"""
+Process-local record of running and recently completed evaluations, used to avoid running identical evaluations
+more than once
+"""
+
+
 @dataclasses.dataclass
 class JobRecord:
     """
@@ -409,91 +434,237 @@ class Cleanupable(typing.Generic[CT]):
         return f"{self.method.__qualname__}({self.item})"
 
 
+def republish_evaluation(
+    evaluation_id: str,
+    reused_job: futures.Future,
+    verbosity: typing.Optional[str] = None
+) -> typing.Dict[str, typing.Any]:
+    """
+    Make the outcome of a reused evaluation available under the ID of the evaluation that reused it
+
+    The reused evaluation only publishes progress and writes output under its own ID, so clients following the new ID
+    would otherwise never see it complete. Its output is copied to where output for the new ID belongs and the state
+    and completion of the new evaluation are published through communicators for the new ID.
+
+    Args:
+        evaluation_id: The ID of the evaluation that reused the results of another
+        reused_job: The finished job of the evaluation whose results are reused
+        verbosity: How verbose the new evaluation's communicators should be
+
+    Returns:
+        A description of the output written for the new evaluation, in the form that `worker.evaluate` returns
+    """
+    republished_results = {
+        "success": False,
+        "evaluation_id": evaluation_id
+    }
+
+    communicators: CommunicatorGroup = utilities.get_communicators(
+        communicator_id=evaluation_id,
+        verbosity=verbosity,
+        host=service.REDIS_HOST,
+        port=service.REDIS_PORT,
+        password=service.REDIS_PASSWORD,
+        include_timestamp=False
+    )
+
+    error_key = utilities.key_separator().join([utilities.redis_prefix(), evaluation_id, "ERRORS"])
+    message_key = utilities.key_separator().join([utilities.redis_prefix(), evaluation_id, "MESSAGES"])
+
+    communicators.update(
+        created_at=utilities.now().strftime(COMMON_DATETIME_FORMAT),
+        failed=False,
+        complete=False,
+        error_key=error_key,
+        message_key=message_key
+    )
+
+    try:
+        if reused_job.cancelled():
+            raise futures.CancelledError("The reused evaluation was cancelled")
+
+        if reused_job.exception() is not None:
+            raise reused_job.exception()
+
+        reused_results = reused_job.result()
+        original_id = reused_results.get("evaluation_id")
+        communicators.info(f"{evaluation_id} reuses the results of the identical evaluation {original_id}", publish=True)
+
+        if not reused_results.get("success"):
+            raise ValueError(f"The identical evaluation {original_id} did not succeed")
+
+        original_destination = reused_results.get("destination")
+        destination_parameters = writing.get_destination_parameters(
+            evaluation_id=evaluation_id,
+            output_format=reused_results.get("output_format")
+        )
+
+        if original_destination and os.path.isdir(original_destination):
+            shutil.copytree(original_destination, destination_parameters['destination'], dirs_exist_ok=True)
+        elif original_destination and os.path.exists(original_destination):
+            shutil.copyfile(original_destination, destination_parameters['destination'])
+
+        republished_results = {**reused_results, **destination_parameters, "evaluation_id": evaluation_id}
+        communicators.info(f"Data from {evaluation_id} was written.")
+    except BaseException as exception:
+        communicators.error(f"{exception.__class__.__name__}: {exception}", exception, publish=True)
+        communicators.update(failed=True)
+        communicators.sunset(60*3)
+    finally:
+        communicators.update(complete=True)
+        communicators.info(f"{evaluation_id} is complete", publish=True)
+
+    return republished_results
+
+
+def follow_evaluation(
+    evaluation_id: str,
+    reused_job: futures.Future,
+    verbosity: typing.Optional[str] = None
+) -> futures.Future:
+    """
+    Create a job for an evaluation that completes with the results of another once they have been republished under
+    its own ID
+
+    Args:
+        evaluation_id: The ID of the evaluation that reuses the results of another
+        reused_job: The job of the evaluation whose results are reused
+        verbosity: How verbose the new evaluation's communicators should be
+
+    Returns:
+        A future for the republished results of the reused evaluation
+    """
+    following_job = futures.Future()
+    following_job.set_running_or_notify_cancel()
+
+    def republish(finished_job: futures.Future):
+        try:
+            following_job.set_result(republish_evaluation(evaluation_id, finished_job, verbosity=verbosity))
+        except BaseException as exception:
+            service.error(f"Could not republish results for {evaluation_id}", exception=exception)
+            following_job.set_exception(exception)
+
+    # Called immediately if the reused evaluation has already finished
+    reused_job.add_done_callback(republish)
+    return following_job
+
+
 def launch_evaluation(
     stream_message: streams.StreamMessage,
     worker_pool: futures.Executor,
     object_manager: DMODObjectManager,
+    launch_cache: LaunchCache = None,
 ) -> typing.Optional[JobRecord]:
     """
     Launch an evaluation based on a message received through a redis stream
 
+    Evaluations are addressed by the content of their instructions and input data. If an identical evaluation is
+    already running, the new record will follow that evaluation's job. If an identical evaluation completed
+    recently, its stored results will be used without running the evaluation again. Either way, the reused results
+    are republished under the new evaluation's ID once they are available.
+
     Args:
         stream_message: The message received through a redis stream
         worker_pool: The pool that handles the creation of other processes
         object_manager: A shared object creator and tracker
+        launch_cache: Running and completed evaluations to reuse. Defaults to the process-wide cache
 
     Returns:
         A record of the evaluation job that was created
     """
+    if launch_cache is None:
+        launch_cache = LAUNCH_CACHE
+
     payload = stream_message.payload
     evaluation_id = payload.get('evaluation_id')
-    scope = object_manager.establish_scope(evaluation_id)
 
-    service.debug(f"Launching an evaluation for {evaluation_id}...")
     instructions = payload.get("instructions")
 
     if not instructions:
         raise ValueError(f"Cannot launch an evaluation with no instructions: {stream_message}")
 
+    evaluation_fingerprint = get_evaluation_fingerprint(instructions)
+
     if isinstance(instructions, dict):
         instructions = json.dumps(instructions, indent=4)
 
-    try:
-        # Build communicators that will communicate evaluation updates outside of the evaluation process
-        communicators: CommunicatorGroup = utilities.get_communicators(
-            communicator_id=evaluation_id,
+    def launch() -> futures.Future:
+        """
+        Submit the evaluation to the worker pool
+        """
+        service.debug(f"Launching an evaluation for {evaluation_id}...")
+        scope = object_manager.establish_scope(evaluation_id)
+
+        try:
+            # Build communicators that will communicate evaluation updates outside of the evaluation process
+            communicators: CommunicatorGroup = utilities.get_communicators(
+                communicator_id=evaluation_id,
+                verbosity=payload.get("verbosity"),
+                object_manager=scope,
+                host=service.REDIS_HOST,
+                port=service.REDIS_PORT,
+                password=service.REDIS_PASSWORD,
+                include_timestamp=False
+            )
+            service.debug(f"Communicators have been created for the evaluation named '{evaluation_id}'")
+        except Exception as communicator_exception:
+            service.error(
+                message=f"Could not create communicators for evaluation: {evaluation_id} due to "
+                        f"{communicator_exception}",
+                exception=communicator_exception
+            )
+            raise
+
+        arguments = WorkerProcessArguments(
+            evaluation_id=evaluation_id,
+            instructions=instructions,
             verbosity=payload.get("verbosity"),
-            object_manager=scope,
-            host=service.REDIS_HOST,
-            port=service.REDIS_PORT,
-            password=service.REDIS_PASSWORD,
-            include_timestamp=False
-        )
-        service.debug(f"Communicators have been created for the evaluation named '{evaluation_id}'")
-    except Exception as exception:
-        service.error(
-            message=f"Could not create communicators for evaluation: {evaluation_id} due to {exception}",
-            exception=exception
+            start_delay=payload.get("start_delay"),
+            communicators=communicators
         )
-        return None
 
-    arguments = WorkerProcessArguments(
-        evaluation_id=payload['evaluation_id'],
-        instructions=instructions,
-        verbosity=payload.get("verbosity"),
-        start_delay=payload.get("start_delay"),
-        communicators=communicators
-    )
+        service.debug(f"Submitting the evaluation job for {evaluation_id}...")
+        submitted_at = time.perf_counter()
+        submitted_job = worker_pool.submit(worker.evaluate, **arguments.kwargs)
+        submitted_job.add_done_callback(lambda _: EVALUATION_SECONDS.observe(time.perf_counter() - submitted_at))
+        return submitted_job
 
     try:
-        service.debug(f"Submitting the evaluation job for {evaluation_id}...")
-        evaluation_job: futures.Future = worker_pool.submit(
-            worker.evaluate,
-            **arguments.kwargs
-        )
+        evaluation_job, launch_origin = launch_cache.get_or_launch(evaluation_fingerprint, launch)
     except Exception as exception:
         service.error(f"Could not launch evaluation {evaluation_id} due to {exception}", exception=exception)
         return None
 
-    new_job: futures.Future = worker_pool.submit(worker.evaluate, **arguments.kwargs)
+    EVALUATION_LAUNCHES.labels(launch_origin).inc()
 
-    service.info(f"Evaluation for {evaluation_id} has been launched.")
+    if launch_origin == "attached":
+        service.info(
+            f"Evaluation for {evaluation_id} is identical to one that is already running and will follow its results."
+        )
+    elif launch_origin == "cached":
+        service.info(f"Evaluation for {evaluation_id} is identical to one that recently completed; reusing results.")
+    else:
+        service.info(f"Evaluation for {evaluation_id} has been launched.")
+
+    if launch_origin != "launched":
+        evaluation_job = follow_evaluation(evaluation_id, evaluation_job, verbosity=payload.get("verbosity"))
 
     job_record = JobRecord(
         stream_name=stream_message.stream_name,
         group_name=stream_message.group_name,
         consumer_name=stream_message.consumer_name,
         message_id=stream_message.message_id,
-        evaluation_id=payload['evaluation_id'],
-        job=new_job
+        evaluation_id=evaluation_id,
+        job=evaluation_job
     )
 
-    service.debug(f"Preparing to monitor objects for {evaluation_id}...")
-    try:
-        object_manager.monitor_operation(evaluation_id, evaluation_job)
-    except BaseException as exception:
-        service.error(f"Could not monitor {evaluation_id} due to: {exception}")
-        traceback.print_exc()
+    if launch_origin == "launched":
+        service.debug(f"Preparing to monitor objects for {evaluation_id}...")
+        try:
+            object_manager.monitor_operation(evaluation_id, evaluation_job)
+        except BaseException as exception:
+            service.error(f"Could not monitor {evaluation_id} due to: {exception}")
+            traceback.print_exc()
 
     return job_record
 
@@ -547,21 +718,24 @@ def monitor_running_jobs(
     connection: redis.Redis,
     active_job_queue: queue.Queue[JobRecord],
     stop_signal: multiprocessing.Event,
-    object_manager: DMODObjectManager
+    object_manager: DMODObjectManager,
+    job_slots: threading.Semaphore = None,
 ):
     """
-    Poll a queue of jobs and close ones that are marked as complete
+    Wait on a queue of jobs and close them once they are complete
+
+    Each record passes through the queue when it is launched and once more when its job completes, courtesy of a done
+    callback on the job, so jobs that are still running are never polled.
 
     Meant to be run in a separate thread
 
     Args:
         connection: A connection to redis that will be used to acknowledge completed jobs
-        active_job_queue: A queue of jobs to poll
+        active_job_queue: A queue of launched jobs and jobs that have just completed
         stop_signal: A signal used to stop the reading loop
         object_manager: An object manager that may hold scope for a running job
+        job_slots: A semaphore limiting how many jobs may run at once. Released each time a job is closed
     """
-    record: typing.Optional[JobRecord] = None
-
     encountered_errors = ErrorCounter(limit=EXCEPTION_LIMIT)
     """
     A collection of errors that may bear repeats of of individual types of errors.
@@ -577,25 +751,26 @@ def monitor_running_jobs(
 
     while not stop_signal.is_set():
         try:
+            # The timeout only exists so that the stop signal is checked regularly
             record = active_job_queue.get(block=True, timeout=1)
 
             if not record.job.done():
-                active_job_queue.put(record)
+                # Hand the record back once the job finishes. The callback will be called immediately if the job
+                #   finished since it was checked
+                record.job.add_done_callback(partial(_requeue_record, active_job_queue, record))
                 continue
 
             marked_complete = record.mark_complete(connection=connection, object_manager=object_manager)
 
+            if job_slots is not None:
+                job_slots.release()
+
             if not marked_complete:
                 service.error(
                     f"Evaluation '{record.evaluation_id}', recognized by the '{record.consumer_name}' consumer "
                     f"within the '{record.group_name}' group on the '{record.stream_name}' stream as coming from "
                     f"message '{record.message_id}', could not be marked as complete"
                 )
-
-            record = None
-        except TimeoutError:
-            if record and not record.job.cancelled():
-                active_job_queue.put(record)
         except queue.Empty:
             # There are plenty of times when this might be empty and that's fine. In this case we just want
             pass
@@ -603,7 +778,16 @@ def monitor_running_jobs(
             encountered_errors.add_error(error=exception)
             service.error(exception)
 
-        record = None
+
+def _requeue_record(active_job_queue: queue.Queue[JobRecord], record: JobRecord, _: futures.Future):
+    """
+    Done callback that places the record of a completed job back into the queue of active jobs
+
+    Args:
+        active_job_queue: The queue that the job monitor reads from
+        record: The record for the completed job
+    """
+    active_job_queue.put_nowait(record)
 
 
 def get_consumer_name() -> str:
@@ -640,8 +824,11 @@ def listen(
     stop_signal: multiprocessing.Event = multiprocessing.Event()
     """Tells this function and the associated monitoring thread to stop polling"""
 
-    active_jobs: queue.Queue[JobRecord] = queue.Queue(maxsize=job_limit)
-    """A queue of active jobs to poll"""
+    active_jobs: queue.Queue[JobRecord] = queue.Queue()
+    """A queue of launched and newly completed jobs for the monitor to act upon"""
+
+    job_slots: threading.Semaphore = threading.BoundedSemaphore(job_limit)
+    """Limits the number of jobs that may be active at once. Released by the monitor each time a job is closed"""
 
     service.info(
         f"Listening for evaluation jobs on '{stream_parameters.stream_name}' through the "
@@ -678,7 +865,8 @@ def listen(
                     "connection": connection,
                     "active_job_queue": active_jobs,
                     "stop_signal": stop_signal,
-                    "object_manager": object_manager
+                    "object_manager": object_manager,
+                    "job_slots": job_slots,
                 },
                 daemon=True
             )
@@ -713,9 +901,10 @@ def listen(
                         )
 
                         if possible_record:
-                            # This will block until another entry may be put into the queue - this will prevent one
+                            # This will block until another job may be active - this will prevent one
                             # instance of the runner from trying to hoard all of the messages and allow other
                             # instances to try and carry the load
+                            job_slots.acquire()
                             active_jobs.put(possible_record)
                         else:
                             # Since this message isn't considered one for the runner, acknowledge that it's been seen
@@ -826,6 +1015,10 @@ def main(*args):
 
     Cleanupable.schedule_for_cleanup(redis_parameters, cleanup_redis)
 
+    if service.RUNNER_METRICS_PORT is not None:
+        telemetry.start_http_server(service.RUNNER_METRICS_PORT)
+        service.info(f"Serving runner metrics on port {service.RUNNER_METRICS_PORT}")
+
     try:
         listen(stream_parameters=redis_parameters, job_limit=arguments.limit)
         exit_code = SUCCESSFUL_EXIT
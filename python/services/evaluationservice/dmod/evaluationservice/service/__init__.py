@@ -22,6 +22,7 @@ from .application_values import RUNNER_PORT
 from .application_values import RUNNER_USERNAME
 from .application_values import RUNNER_PASSWORD
 from .application_values import RUNNER_DB
+from .application_values import RUNNER_METRICS_PORT
 
 from .application_values import CHANNEL_HOST
 from .application_values import CHANNEL_PORT
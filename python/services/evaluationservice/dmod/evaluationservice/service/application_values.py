@@ -207,6 +207,11 @@ RUNNER_PASSWORD = get_redis_password(
 
 RUNNER_DB: typing.Final[int] = int(os.environ.get("RUNNER_DB", REDIS_DB))
 
+RUNNER_METRICS_PORT: typing.Optional[int] = (
+    int(os.environ.get("RUNNER_METRICS_PORT")) if "RUNNER_METRICS_PORT" in os.environ else None
+)
+"""The port on which the runner serves its metrics for scraping, if any"""
+
 CHANNEL_HOST = os.environ.get("CHANNEL_HOST", REDIS_HOST)
 """The host of the redis service used for communicating job information"""
 
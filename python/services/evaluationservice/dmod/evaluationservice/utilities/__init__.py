@@ -12,9 +12,13 @@ from .communication import RedisCommunicator
 from .communication import get_redis_connection
 from .communication import get_runner_connection
 from .communication import get_channel_connection
+from .communication import get_runner_multiplexer
+from .communication import get_channel_multiplexer
 
 from .communication import redis_prefix
 from .communication import get_channel_key
+from .communication import get_event_stream_key
+from .communication import read_events
 from .communication import get_evaluation_pointers
 from .communication import get_evaluation_key
 from .common import key_separator
@@ -0,0 +1,182 @@
+"""
+Provides a way to coalesce many small communicator events into fewer, compactly encoded messages
+"""
+from __future__ import annotations
+
+import json
+import typing
+import threading
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+Event = typing.Dict[str, typing.Any]
+"""A single event written by a communicator"""
+
+EventBatchHandler = typing.Callable[[typing.Sequence[Event]], typing.Any]
+"""A function that receives every event in a batch once the batch is complete"""
+
+JSON_ENCODING: typing.Final[str] = "json"
+"""Events are encoded as a compact JSON array"""
+
+MSGPACK_ENCODING: typing.Final[str] = "msgpack"
+"""Events are encoded as a msgpack array"""
+
+SUPPORTED_ENCODINGS: typing.Final[typing.Sequence[str]] = (JSON_ENCODING, MSGPACK_ENCODING)
+"""The names of every supported way to encode events"""
+
+
+def get_available_encoding(encoding: str = None) -> str:
+    """
+    Get the name of the encoding to use, falling back to JSON if msgpack was requested but is not installed
+
+    Args:
+        encoding: The name of the desired encoding
+
+    Returns:
+        The name of an encoding that may be used
+    """
+    encoding = (encoding or JSON_ENCODING).lower()
+
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(f"'{encoding}' is not a supported event encoding. Use one of: {', '.join(SUPPORTED_ENCODINGS)}")
+
+    if encoding == MSGPACK_ENCODING and msgpack is None:
+        return JSON_ENCODING
+
+    return encoding
+
+
+def encode_events(events: typing.Sequence[Event], encoding: str = None) -> bytes:
+    """
+    Encode events without any extra whitespace
+
+    Args:
+        events: The events to encode
+        encoding: How to encode the events; JSON by default
+
+    Returns:
+        The encoded events
+    """
+    encoding = get_available_encoding(encoding)
+
+    if encoding == MSGPACK_ENCODING:
+        return msgpack.packb(list(events), default=str)
+
+    return json.dumps(list(events), separators=(",", ":"), default=str).encode()
+
+
+def decode_events(payload: typing.Union[bytes, str], encoding: str = None) -> typing.List[Event]:
+    """
+    Decode events that were encoded with `encode_events`
+
+    Args:
+        payload: The encoded events
+        encoding: How the events were encoded; JSON by default
+
+    Returns:
+        The decoded events
+    """
+    if isinstance(encoding, bytes):
+        encoding = encoding.decode()
+
+    encoding = (encoding or JSON_ENCODING).lower()
+
+    if encoding == MSGPACK_ENCODING:
+        if msgpack is None:
+            raise ValueError("Events were encoded with msgpack, but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+
+    return json.loads(payload)
+
+
+class EventBatcher:
+    """
+    Collects events and hands them off in batches
+
+    A batch is handed off once it holds `max_events` events or once `max_delay` seconds have passed since its first
+    event arrived, whichever comes first. Events are handed off one at a time if `max_events` is 1 or less.
+
+    The timer that hands off a partial batch is not a daemon so that a process can't exit with events still held.
+    """
+    def __init__(self, handler: EventBatchHandler, max_events: int = None, max_delay: float = None):
+        """
+        Constructor
+
+        Args:
+            handler: The function that will receive each batch
+            max_events: The most events that may be held before they are handed off
+            max_delay: The most seconds that an event may be held before it is handed off
+        """
+        self.__handler = handler
+        self.__max_events = max(int(max_events or 1), 1)
+        self.__max_delay = max(float(max_delay or 0), 0.0)
+        self.__events: typing.List[Event] = []
+        self.__lock = threading.RLock()
+        self.__timer: typing.Optional[threading.Timer] = None
+        self.__batches = 0
+
+    @property
+    def max_events(self) -> int:
+        """
+        The most events that may be held before they are handed off
+        """
+        return self.__max_events
+
+    @property
+    def max_delay(self) -> float:
+        """
+        The most seconds that an event may be held before it is handed off
+        """
+        return self.__max_delay
+
+    @property
+    def batches(self) -> int:
+        """
+        The number of batches that have been handed off
+        """
+        return self.__batches
+
+    def add(self, event: Event):
+        """
+        Add an event to the current batch, handing the batch off if it is full
+
+        Args:
+            event: The event to add
+        """
+        with self.__lock:
+            self.__events.append(event)
+
+            if len(self.__events) >= self.__max_events or self.__max_delay <= 0:
+                self.flush()
+            elif self.__timer is None:
+                self.__timer = threading.Timer(self.__max_delay, self.flush)
+                self.__timer.daemon = False
+                self.__timer.start()
+
+    def flush(self) -> int:
+        """
+        Hand off every held event right away
+
+        Returns:
+            The number of events that were handed off
+        """
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+
+            if not self.__events:
+                return 0
+
+            events = self.__events
+            self.__events = []
+            self.__batches += 1
+            self.__handler(events)
+            return len(events)
+
+    def __len__(self) -> int:
+        return len(self.__events)
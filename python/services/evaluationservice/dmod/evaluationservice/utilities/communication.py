@@ -14,10 +14,18 @@ import redis
 from dmod.metrics import communication
 from dmod.core.common import to_json
 from dmod.core.context import DMODObjectManager
+from dmod.redis.pubsub import BackgroundListener
+from dmod.redis.pubsub import PubSubMultiplexer
+from dmod.redis.pubsub import get_multiplexer
+from dmod.redis.pubsub import listen_in_background
 
 from service import application_values
 
 from . import common
+from .batching import EventBatcher
+from .batching import decode_events
+from .batching import encode_events
+from .batching import get_available_encoding
 from .message import make_message_serializable
 
 
@@ -77,6 +85,19 @@ def get_channel_key(evaluation_id: str) -> str:
     return evaluation_id
 
 
+def get_event_stream_key(evaluation_id: str) -> str:
+    """
+    Gets the name of the capped stream that holds every batch of events written for an evaluation
+
+    Args:
+        evaluation_id: The ID for the evaluation
+
+    Returns:
+        The name of the stream that events for this evaluation are written to
+    """
+    return make_key(get_evaluation_key(evaluation_id), "EVENTS")
+
+
 def get_evaluation_key(evaluation_id: str) -> str:
     """
     Quantifies the key in redis for the given evaluation within the context of the application
@@ -123,6 +144,90 @@ def unchecked_lifespan() -> int:
     return int(timedelta(hours=18).total_seconds())
 
 
+def event_batch_size() -> int:
+    """
+    Returns:
+        The most events that a communicator will hold before publishing them together
+    """
+    size = os.environ.get("EVALUATION_EVENT_BATCH_SIZE")
+
+    if size:
+        return int(float(size))
+
+    return 100
+
+
+def event_batch_delay() -> float:
+    """
+    Returns:
+        The most seconds that a communicator will hold an event before publishing it
+    """
+    seconds = os.environ.get("EVALUATION_EVENT_BATCH_DELAY")
+
+    if seconds:
+        return float(seconds)
+
+    return 0.25
+
+
+def event_stream_length() -> int:
+    """
+    Returns:
+        The approximate number of batches that an evaluation's event stream will hold before dropping the oldest
+    """
+    length = os.environ.get("EVALUATION_EVENT_STREAM_LENGTH")
+
+    if length:
+        return int(float(length))
+
+    return 10000
+
+
+def default_event_encoding() -> str:
+    """
+    Returns:
+        How batches of events should be encoded within event streams; either 'json' or 'msgpack'
+    """
+    return get_available_encoding(os.environ.get("EVALUATION_EVENT_ENCODING"))
+
+
+def read_events(
+    connection: redis.Redis,
+    evaluation_id: str,
+    offset: typing.Union[str, bytes] = None,
+    count: int = None
+) -> typing.Tuple[typing.Optional[str], typing.List[typing.Dict[str, typing.Any]]]:
+    """
+    Read the events for an evaluation that were written after the given offset
+
+    Subscribers that join after an evaluation started may use this to catch up on what they missed. Passing the
+    returned offset on the next call will read only what was written since.
+
+    Args:
+        connection: A connection to the redis instance holding the event stream
+        evaluation_id: The ID of the evaluation to read events for
+        offset: The ID of the last batch that was read; everything still in the stream is read if not given
+        count: The most batches to read
+
+    Returns:
+        The ID of the last batch that was read (or the given offset if there was nothing new) and each event in order
+    """
+    if isinstance(offset, bytes):
+        offset = offset.decode()
+
+    minimum = f"({offset}" if offset else "-"
+    batches = connection.xrange(get_event_stream_key(evaluation_id), min=minimum, max="+", count=count)
+
+    events: typing.List[typing.Dict[str, typing.Any]] = []
+    last_id = offset
+
+    for batch_id, fields in batches:
+        last_id = batch_id.decode() if isinstance(batch_id, bytes) else batch_id
+        events.extend(decode_events(fields[b"events"], fields.get(b"encoding")))
+
+    return last_id, events
+
+
 def get_redis_connection(
     host: str = None,
     port: int = None,
@@ -212,6 +317,66 @@ def get_channel_connection(
     )
 
 
+def get_runner_multiplexer(
+    host: str = None,
+    port: int = None,
+    db: str = None,
+    password: str = None,
+    username: str = None
+) -> PubSubMultiplexer:
+    """
+    Gets the shared pubsub multiplexer for the runner's redis instance within the running event loop. If fields are
+    not supplied, values fall back to environment configuration
+
+    Args:
+        host: The optional host to connect to
+        port: The optional port to connect to
+        username: The optional username to connect to
+        password: The optional password to use when connecting to the instance
+        db: The optional database to connect to
+
+    Returns:
+        A multiplexer that every consumer within the event loop may subscribe through
+    """
+    return get_multiplexer(
+        host=host or application_values.RUNNER_HOST,
+        port=port or application_values.RUNNER_PORT,
+        username=username or application_values.RUNNER_USERNAME,
+        password=password or application_values.RUNNER_PASSWORD,
+        db=db or application_values.RUNNER_DB,
+    )
+
+
+def get_channel_multiplexer(
+    host: str = None,
+    port: int = None,
+    db: str = None,
+    password: str = None,
+    username: str = None
+) -> PubSubMultiplexer:
+    """
+    Gets the shared pubsub multiplexer for the redis instance that serves channel information within the running
+    event loop. If fields are not supplied, values fall back to environment configuration
+
+    Args:
+        host: The optional host to connect to
+        port: The optional port to connect to
+        username: The optional username to connect to
+        password: The optional password to use when connecting to the instance
+        db: The optional database to connect to
+
+    Returns:
+        A multiplexer that every consumer within the event loop may subscribe through
+    """
+    return get_multiplexer(
+        host=host or application_values.CHANNEL_HOST,
+        port=port or application_values.CHANNEL_PORT,
+        username=username or application_values.CHANNEL_USERNAME,
+        password=password or application_values.CHANNEL_PASSWORD,
+        db=db or application_values.CHANNEL_DB,
+    )
+
+
 def get_retry_delay() -> int:
     """
     Returns:
@@ -317,12 +482,17 @@ class RedisCommunicator(communication.Communicator):
         retry_count = 0
         latest_error = None
         remaining_lifespan = int(seconds or default_sunset())
+
+        # Make sure nothing is left waiting to be published once this communicator's resources are set to expire
+        self.flush()
+
         while not self.__has_sunset and retry_count < get_maximum_retries():
             pipeline = self.__connection.pipeline()
             try:
                 pipeline.expire(self.__core_key, remaining_lifespan)
                 pipeline.expire(self.__error_key, remaining_lifespan)
                 pipeline.expire(self.__info_key, remaining_lifespan)
+                pipeline.expire(self.__event_stream_key, remaining_lifespan)
                 pipeline.execute()
                 self.__has_sunset = True
                 self.info(f"Resources associated with {self.__core_key} have been sunset for {remaining_lifespan}")
@@ -448,17 +618,17 @@ class RedisCommunicator(communication.Communicator):
         """
         Writes data to the communicator's channel
 
-        Takes the form of:
+        Events are held briefly and published together in batches. Each event takes the form of:
 
         {
             "event": reason,
             "time": YYYY-mm-dd HH:MMz,
-            "data": json string
+            "data": data
         }
 
         Args:
             reason: The reason for data being written to the channel
-            data: The data to write to the channel; will be converted to a string
+            data: The data to write to the channel
         """
         # First convert all submitted values into a form that can safely be converted to a string
         data = make_message_serializable(data)
@@ -466,11 +636,10 @@ class RedisCommunicator(communication.Communicator):
         message = {
             "event": reason,
             "time": common.now().strftime(application_values.COMMON_DATETIME_FORMAT),
-            "data": to_json(data, indent=4)
+            "data": data
         }
 
-        # Publish and indent by 4 for later readability
-        self.__connection.publish(self.__channel_name, to_json(message, indent=4))
+        self.__batcher.add(message)
 
         try:
             for handler in self._handlers.get('write', []):
@@ -479,6 +648,75 @@ class RedisCommunicator(communication.Communicator):
             # Leave room for a breakpoint
             raise
 
+    def flush(self) -> int:
+        """
+        Publish every event that is waiting to be sent right away
+
+        Returns:
+            The number of events that were published
+        """
+        return self.__batcher.flush()
+
+    def _publish_events(self, events: typing.Sequence[typing.Dict[str, typing.Any]]):
+        """
+        Publish a batch of events to the channel and record it in the capped event stream
+
+        A batch of a single event is published as the event itself. Larger batches are published as:
+
+        {
+            "event": "batch",
+            "time": YYYY-mm-dd HH:MMz,
+            "offset": ID of the batch within the event stream,
+            "data": [event, event, ...]
+        }
+
+        Args:
+            events: The events to publish
+        """
+        stream_fields = {
+            "count": len(events),
+            "encoding": self.__event_encoding,
+            "events": encode_events(events, self.__event_encoding)
+        }
+
+        pipeline = self.__connection.pipeline(transaction=False)
+
+        try:
+            pipeline.xadd(self.__event_stream_key, stream_fields, maxlen=self.__event_stream_length, approximate=True)
+            pipeline.expire(self.__event_stream_key, unchecked_lifespan())
+            offset, _ = pipeline.execute()
+        finally:
+            pipeline.reset()
+
+        if len(events) == 1:
+            message = events[0]
+        else:
+            message = {
+                "event": "batch",
+                "time": common.now().strftime(application_values.COMMON_DATETIME_FORMAT),
+                "offset": offset.decode() if isinstance(offset, bytes) else offset,
+                "data": events
+            }
+
+        self.__connection.publish(self.__channel_name, json.dumps(message, separators=(",", ":"), default=str))
+
+    def read_events(
+        self,
+        offset: typing.Union[str, bytes] = None,
+        count: int = None
+    ) -> typing.Tuple[typing.Optional[str], typing.List[typing.Dict[str, typing.Any]]]:
+        """
+        Read the events that this communicator has published after the given offset
+
+        Args:
+            offset: The ID of the last batch that was read; everything still in the stream is read if not given
+            count: The most batches to read
+
+        Returns:
+            The ID of the last batch that was read and each event in order
+        """
+        return read_events(self.__connection, self.communicator_id, offset=offset, count=count)
+
     def read(self) -> typing.Any:
         """
         Wait the communicator's set timeout for message to the channel
@@ -486,6 +724,14 @@ class RedisCommunicator(communication.Communicator):
         Returns:
             A deserialized message if one was received, Nothing otherwise
         """
+        if self.__listener is not None:
+            # Received messages are handed straight to the 'receive' handlers, so there is nothing left to read
+            return None
+
+        if self.__publisher_and_subscriber is None:
+            self.__publisher_and_subscriber = self.__connection.pubsub()
+            self.__publisher_and_subscriber.subscribe(self.__channel_name)
+
         message = self.__publisher_and_subscriber.get_message(ignore_subscribe_messages=True, timeout=self.__timeout)
         if message:
             if message.get('type') == 'message' and message.get('data'):
@@ -524,8 +770,31 @@ class RedisCommunicator(communication.Communicator):
         handlers: typing.Dict[str, MessageHandlers] = None,
         include_timestamp: bool = None,
         timestamp_format: str = None,
+        batch_size: int = None,
+        batch_delay: float = None,
+        event_encoding: str = None,
         **kwargs
     ):
+        """
+        Constructor
+
+        Args:
+            communicator_id: The ID of the evaluation that this communicates for
+            verbosity: The minimum significance of messages that will be recorded
+            host: The host of the redis instance to communicate through
+            port: The port of the redis instance to communicate through
+            password: The password for the redis instance
+            timeout: The number of seconds to wait when reading from the channel
+            on_receive: Handlers for messages received through the channel
+            handlers: Handlers for each type of event
+            include_timestamp: Whether to add timestamps to info and error messages
+            timestamp_format: How to format timestamps
+            batch_size: The most events to hold before publishing them together; events are published one at a time
+                if this is 1
+            batch_delay: The most seconds to hold an event before publishing it
+            event_encoding: How to encode batches within the event stream; either 'json' or 'msgpack'
+            **kwargs: Additional arguments for the redis connection
+        """
         super().__init__(
             communicator_id=communicator_id,
             verbosity=verbosity,
@@ -541,16 +810,32 @@ class RedisCommunicator(communication.Communicator):
         self.__password = password
         self.__connection = get_redis_connection(host=host, port=port, password=password, **kwargs)
         self.__publisher_and_subscriber = None
-        self.__listener = None
+        self.__listener: typing.Optional[BackgroundListener] = None
         self.__timeout = timeout or 0
         self.__has_sunset = False
         self.__include_timestamp = include_timestamp if include_timestamp is not None else False
         self.__timestamp_format = timestamp_format or application_values.COMMON_DATETIME_FORMAT
+        self.__event_stream_key = get_event_stream_key(communicator_id)
+        self.__event_stream_length = event_stream_length()
+        self.__event_encoding = get_available_encoding(event_encoding) if event_encoding else default_event_encoding()
+        self.__batcher = EventBatcher(
+            handler=self._publish_events,
+            max_events=batch_size if batch_size is not None else event_batch_size(),
+            max_delay=batch_delay if batch_delay is not None else event_batch_delay()
+        )
 
         if 'receive' in self._handlers:
-            self.__publisher_and_subscriber = self.__connection.pubsub()
-            self.__publisher_and_subscriber.subscribe(**{self.__channel_name: self._process_received_message})
-            self.__listener = self.__publisher_and_subscriber.run_in_thread(sleep_time=1)
+            # Every communicator in the process listens through one shared connection and event loop thread rather
+            # than each holding a connection and a polling thread of its own
+            connection_arguments = self.__connection.get_connection_kwargs()
+            self.__listener = listen_in_background(
+                self.__channel_name,
+                self._process_received_message,
+                **{
+                    key: connection_arguments.get(key)
+                    for key in ("host", "port", "username", "password", "db")
+                }
+            )
 
         pipeline = self.__connection.pipeline()
 
@@ -569,6 +854,17 @@ class RedisCommunicator(communication.Communicator):
         )
 
     def __del__(self):
+        try:
+            self.flush()
+        except Exception as e:
+            self.error(f"Events for {self.__core_key} could not be published", e)
+
+        try:
+            if self.__listener is not None:
+                self.__listener.stop(timeout=5)
+        except Exception as e:
+            self.error(f"The listener for {self.__core_key} could not be stopped", e)
+
         try:
             if self.__publisher_and_subscriber:
                 self.__publisher_and_subscriber.close()
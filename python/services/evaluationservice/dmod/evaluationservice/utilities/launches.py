@@ -0,0 +1,252 @@
+"""
+Tools used to make sure that identical evaluations are only computed once
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import typing
+import hashlib
+import threading
+
+from concurrent import futures
+
+from dmod.evaluations.util import get_matching_paths
+
+DEFAULT_RESULT_TTL_SECONDS: typing.Final[float] = float(os.environ.get("EVALUATION_RESULT_TTL_SECONDS", 60 * 60))
+"""The number of seconds that the results of a completed evaluation may be served in place of a new evaluation"""
+
+DEFAULT_RESULT_LIMIT: typing.Final[int] = int(os.environ.get("EVALUATION_RESULT_LIMIT", 128))
+"""The maximum number of completed evaluation results to hold at once"""
+
+LaunchOrigin = typing.Literal["launched", "attached", "cached"]
+"""Describes whether a future came from a new launch, an identical running launch, or a stored result"""
+
+
+def _get_source_fingerprints(definition: typing.Any) -> typing.List[typing.Tuple[str, ...]]:
+    """
+    Find the signatures of every piece of local data that a definition refers to
+
+    Only the metadata of each file is considered - no data is read
+
+    Args:
+        definition: The parsed evaluation definition or some part of it
+
+    Returns:
+        Tuples describing each local file that the definition refers to
+    """
+    fingerprints: typing.List[typing.Tuple[str, ...]] = []
+
+    if isinstance(definition, typing.Mapping):
+        address = definition.get("address")
+        backend_type = definition.get("backend_type")
+
+        if isinstance(address, str) and isinstance(backend_type, str) and backend_type.lower() == "file":
+            try:
+                matching_paths = sorted(str(path) for path in get_matching_paths(address))
+            except Exception as exception:
+                # The address might not compile as a pattern - the evaluation itself will report on that
+                matching_paths = []
+                fingerprints.append((address, f"unmatched: {exception}"))
+
+            for path in matching_paths:
+                try:
+                    stats = os.stat(path)
+                    fingerprints.append((path, str(stats.st_size), str(stats.st_mtime_ns)))
+                except OSError:
+                    fingerprints.append((path, "missing"))
+
+        for value in definition.values():
+            fingerprints.extend(_get_source_fingerprints(value))
+    elif isinstance(definition, (list, tuple)):
+        for value in definition:
+            fingerprints.extend(_get_source_fingerprints(value))
+
+    return fingerprints
+
+
+def get_evaluation_fingerprint(instructions: typing.Union[str, bytes, typing.Mapping[str, typing.Any]]) -> str:
+    """
+    Create a content address for a set of evaluation instructions
+
+    Instructions are normalized so that formatting and key order do not matter. The size and modification time of
+    every local file the instructions read from are included so that changes to input data yield a new address.
+
+    Args:
+        instructions: The raw or parsed instructions for an evaluation
+
+    Returns:
+        A hash that will be the same for every identical evaluation
+    """
+    if isinstance(instructions, (str, bytes)):
+        try:
+            definition = json.loads(instructions)
+        except ValueError:
+            # Instructions that aren't JSON can't be normalized, so the raw text has to stand in for them
+            definition = instructions.decode() if isinstance(instructions, bytes) else instructions
+    else:
+        definition = instructions
+
+    normalized_definition = json.dumps(definition, sort_keys=True, separators=(",", ":"), default=str)
+    source_fingerprints = sorted(_get_source_fingerprints(definition))
+
+    hasher = hashlib.sha256(normalized_definition.encode())
+    hasher.update(json.dumps(source_fingerprints).encode())
+    return hasher.hexdigest()
+
+
+def _default_should_store(result: typing.Any) -> bool:
+    """
+    Whether the result of an evaluation is fit to be served to later identical requests
+
+    Args:
+        result: The output of an evaluation
+
+    Returns:
+        True if the evaluation reported success
+    """
+    return isinstance(result, typing.Mapping) and bool(result.get("success"))
+
+
+class LaunchCache:
+    """
+    Tracks running and recently completed evaluations by their content address so that identical evaluations are
+    launched once and their results are reused
+    """
+    def __init__(
+        self,
+        result_ttl: float = None,
+        result_limit: int = None,
+        should_store: typing.Callable[[typing.Any], bool] = None,
+        clock: typing.Callable[[], float] = None
+    ):
+        """
+        Args:
+            result_ttl: The number of seconds that a completed result may be served
+            result_limit: The maximum number of completed results to hold
+            should_store: A function that determines whether a result may be reused
+            clock: The function used to tell the current time in seconds
+        """
+        self.__result_ttl = DEFAULT_RESULT_TTL_SECONDS if result_ttl is None else result_ttl
+        self.__result_limit = DEFAULT_RESULT_LIMIT if result_limit is None else result_limit
+        self.__should_store = should_store or _default_should_store
+        self.__clock = clock or time.monotonic
+        self.__lock = threading.RLock()
+        self.__running: typing.Dict[str, futures.Future] = {}
+        self.__results: typing.Dict[str, typing.Tuple[float, typing.Any]] = {}
+
+    def _get_stored_result(self, key: str) -> typing.Tuple[bool, typing.Any]:
+        """
+        Find an unexpired result for the given content address. Must be called while holding the lock
+
+        Args:
+            key: The content address of an evaluation
+
+        Returns:
+            Whether a result was found and the result itself
+        """
+        stored = self.__results.get(key)
+
+        if stored is None:
+            return False, None
+
+        expiration, result = stored
+
+        if expiration <= self.__clock():
+            del self.__results[key]
+            return False, None
+
+        return True, result
+
+    def _store_result(self, key: str, result: typing.Any):
+        """
+        Hold onto a result so that it may be served later. Must be called while holding the lock
+
+        Args:
+            key: The content address of the evaluation that produced the result
+            result: The output of the evaluation
+        """
+        if self.__result_limit <= 0 or self.__result_ttl <= 0:
+            return
+
+        now = self.__clock()
+
+        for expired_key in [stored_key for stored_key, (expiration, _) in self.__results.items() if expiration <= now]:
+            del self.__results[expired_key]
+
+        # Dictionaries preserve insertion order, so the first entries are the oldest
+        while len(self.__results) >= self.__result_limit:
+            del self.__results[next(iter(self.__results))]
+
+        self.__results[key] = (now + self.__result_ttl, result)
+
+    def _on_launch_complete(self, key: str, future: futures.Future):
+        """
+        Move a finished launch out of the collection of running launches and store its result if it's reusable
+
+        Args:
+            key: The content address of the evaluation
+            future: The finished launch
+        """
+        with self.__lock:
+            if self.__running.get(key) is future:
+                del self.__running[key]
+
+            if future.cancelled() or future.exception() is not None:
+                return
+
+            result = future.result()
+
+            if self.__should_store(result):
+                self._store_result(key, result)
+
+    def get_or_launch(
+        self,
+        key: str,
+        launch: typing.Callable[[], futures.Future]
+    ) -> typing.Tuple[futures.Future, LaunchOrigin]:
+        """
+        Get a future for the evaluation with the given content address, only launching it if no identical evaluation
+        is running and there is no stored result for it
+
+        Args:
+            key: The content address of the evaluation
+            launch: A function that launches the evaluation and returns its future
+
+        Returns:
+            The future for the evaluation and where it came from
+        """
+        with self.__lock:
+            found_result, result = self._get_stored_result(key)
+
+            if found_result:
+                cached_future = futures.Future()
+                cached_future.set_result(result)
+                return cached_future, "cached"
+
+            running_future = self.__running.get(key)
+
+            if running_future is not None:
+                return running_future, "attached"
+
+            new_future = launch()
+            self.__running[key] = new_future
+
+        # Added outside of the lock since the callback is called immediately if the launch has already finished
+        new_future.add_done_callback(lambda finished_future: self._on_launch_complete(key, finished_future))
+        return new_future, "launched"
+
+    def is_running(self, key: str) -> bool:
+        """
+        Whether an evaluation with the given content address is currently running
+        """
+        with self.__lock:
+            return key in self.__running
+
+    def clear(self):
+        """
+        Forget all stored results. Running launches are left alone
+        """
+        with self.__lock:
+            self.__results.clear()
@@ -93,6 +93,8 @@ def main():
     # TODO: for now, just use this type, though look at making configureable or parameterized somehow
     monitor = RedisDockerSwarmMonitor(resource_pool=resource_pool, redis_host=redis_host, redis_port=redis_port,
                                       redis_pass=redis_pass)
+    # Watch Docker events so monitoring checks run as soon as job services change
+    monitor.start_event_watcher()
 
     # Init monitor service
     handler = MonitorService(monitor=monitor)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from abc import ABC, abstractmethod
-from asyncio import CancelledError, sleep
+from asyncio import CancelledError, get_running_loop, sleep
 from websockets import WebSocketServerProtocol
 from websockets.exceptions import ConnectionClosed
 from dmod.scheduler.job import Job, JobStatus
@@ -44,8 +44,9 @@ class MonitorService(ABC):
     """
     Core abstract class for monitor service, handling main service logic but abstracting connection details.
 
-    The ::method:`exec_monitoring` method can be used to construct an async looping task to continuously monitor (in a
-    poll/sleep manner) for changes.  Alternatively, ::method:`run_monitor_check` can run the logic for monitoring and
+    The ::method:`exec_monitoring` method can be used to construct an async looping task to continuously monitor for
+    changes, running a check whenever the monitor signals possible changes (see ::method:`Monitor.wait_for_changes`) or
+    after the reconciliation interval passes.  Alternatively, ::method:`run_monitor_check` can run the logic for monitoring and
     queueing changes a single time.
 
     Connection details are abstracted, but certain things must be done by implementation when handling connections.
@@ -67,6 +68,9 @@ class MonitorService(ABC):
     _JOBS_OF_INTEREST_CONFIG_KEY = 'jobs_of_interest'
     """ The config key value for use in metadata messages to indicate the list of jobs of interest. """
 
+    _RECONCILE_INTERVAL_SECONDS = 60
+    """ Maximum seconds between monitoring checks when the monitor has not signaled any changes. """
+
     @staticmethod
     def _generate_update_msg(monitored_change: MonitoredChange) -> UpdateMessage:
         return UpdateMessage(object_id=str(monitored_change.job.job_id),
@@ -297,9 +301,11 @@ class MonitorService(ABC):
         ----------
         ::method:`run_monitor_check`
         """
+        loop = get_running_loop()
         while True:
             self.run_monitor_check()
-            await sleep(60)
+            # Wait in a worker thread, since monitors block until notified of changes or the interval passes
+            await loop.run_in_executor(None, self._monitor.wait_for_changes, self._RECONCILE_INTERVAL_SECONDS)
 
     @abstractmethod
     def get_connection_object(self, connection_id: str):
@@ -12,6 +12,7 @@ from dmod.communication import AbstractInitRequest, DatasetManagementMessage, Da
 from dmod.communication.dataset_management_message import DatasetQuery, QueryType
 from dmod.core.meta_data import DataCategory, DataDomain, DataFormat, DataRequirement, DiscreteRestriction, \
     StandardDatasetIndex
+from dmod.core import telemetry
 from dmod.core.exception import DmodRuntimeError
 from dmod.core.dataset import Dataset
 from dmod.externalrequests.maas_request_handlers import DataServiceClient
@@ -26,6 +27,9 @@ logging.basicConfig(
     datefmt="%H:%M:%S"
 )
 
+_PARTITION_REQUESTS = telemetry.counter('dmod_partition_requests_total', 'Partitioning requests handled, by success',
+                                        ('success',))
+
 
 class ServiceManager(HydrofabricFilesManager, WebSocketInterface):
     """
@@ -466,7 +470,9 @@ class ServiceManager(HydrofabricFilesManager, WebSocketInterface):
                 await websocket.send(str(response))
                 raise TypeError(err_msg)
             else:
-                response = await self._async_process_request(request)
+                with telemetry.span('partitioner_service.partition'):
+                    response = await self._async_process_request(request)
+                _PARTITION_REQUESTS.labels(str(response.success).lower()).inc()
                 await websocket.send(str(response))
 
         except TypeError as te:
@@ -1 +1 @@
-__version__ = '0.12.0'
+__version__ = '0.14.0'
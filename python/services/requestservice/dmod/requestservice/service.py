@@ -3,7 +3,7 @@
 import asyncio
 import json
 import logging
-from typing import List
+from typing import Dict, List, Optional, Sequence
 from typing import Type
 from typing import Union
 
@@ -11,11 +11,13 @@ import websockets
 from websockets import WebSocketServerProtocol
 
 from dmod.access import DummyAuthUtil, RedisBackendSessionManager
-from dmod.communication import AbstractInitRequest, InvalidMessageResponse, MessageEventType, NGENRequest, NWMRequest, \
-    NgenCalibrationRequest, PartitionRequest, WebSocketSessionsInterface, SessionInitMessage, \
-    UnsupportedMessageTypeResponse
+from dmod.communication import AbstractInitRequest, CORRELATION_ID_KEY, DEPENDS_ON_KEY, InvalidMessageResponse, \
+    ManagementAction, MessageEventType, NGENRequest, NWMRequest, NgenCalibrationRequest, PartitionRequest, Response, \
+    WebSocketSessionsInterface, SessionInitMessage, UnsupportedMessageTypeResponse
 from dmod.communication.dataset_management_message import MaaSDatasetManagementMessage
+from dmod.communication.message import ErrorResponse
 from dmod.communication.maas_request.job_message import JobControlRequest, JobInfoRequest, JobListRequest
+from dmod.core import telemetry
 from dmod.externalrequests import AuthHandler, DatasetRequestHandler, ModelExecRequestHandler, \
     NgenCalibrationRequestHandler, PartitionRequestHandler, EvaluationRequestHandler, ExistingJobRequestHandler
 
@@ -27,6 +29,12 @@ logging.basicConfig(
     datefmt="%H:%M:%S"
 )
 
+_REQUESTS_RECEIVED = telemetry.counter('dmod_request_service_requests_total',
+                                       'Requests handled by the request service, other than session init requests',
+                                       ('event_type',))
+_REQUESTS_IN_FLIGHT = telemetry.gauge('dmod_request_service_requests_in_flight',
+                                      'Requests with correlation ids currently being handled concurrently')
+
 
 class RequestService(WebSocketSessionsInterface):
     """
@@ -60,6 +68,9 @@ class RequestService(WebSocketSessionsInterface):
     ]
     """ Parseable request types, which are all authenticated ::class:`ExternalRequest` subtypes for this implementation. """
 
+    _MAX_CONCURRENT_REQUESTS = 8
+    """ The maximum number of requests with correlation ids handled concurrently for a single connection. """
+
     @classmethod
     def get_parseable_request_types(cls) -> List[Type[AbstractInitRequest]]:
         """
@@ -172,77 +183,222 @@ class RequestService(WebSocketSessionsInterface):
     def session_manager(self):
         return self._session_manager
 
+    @staticmethod
+    def _requires_exclusive_socket(req_message: Optional[AbstractInitRequest], event_type: MessageEventType) -> bool:
+        """
+        Whether a request must be handled while no other request on the same connection is being handled.
+
+        This is the case for requests whose handling exchanges further messages over the websocket (e.g., data
+        transfers), and for session init requests, which change the state of the connection for later requests.
+
+        Parameters
+        ----------
+        req_message : Optional[AbstractInitRequest]
+            The deserialized request, if it could be deserialized.
+        event_type : MessageEventType
+            The event type of the request.
+
+        Returns
+        -------
+        bool
+            Whether the request must be handled while no other request on the same connection is being handled.
+        """
+        if event_type == MessageEventType.SESSION_INIT:
+            return True
+        if isinstance(req_message, (LaunchEvaluationMessage, OpenEvaluationMessage)):
+            return True
+        return isinstance(req_message, MaaSDatasetManagementMessage) and req_message.management_action in {
+            ManagementAction.REQUEST_DATA, ManagementAction.ADD_DATA}
+
+    @staticmethod
+    def _serialize_response(response: Response, correlation_id: Optional[str]) -> str:
+        """
+        Serialize a response, adding the correlation id of its request if there is one.
+
+        Parameters
+        ----------
+        response : Response
+            The response to serialize.
+        correlation_id : Optional[str]
+            The correlation id of the request, if it has one.
+
+        Returns
+        -------
+        str
+            The serialized response.
+        """
+        if correlation_id is None:
+            return str(response)
+        serial_response = response.to_dict()
+        serial_response[CORRELATION_ID_KEY] = correlation_id
+        return json.dumps(serial_response, sort_keys=True)
+
+    async def _get_response(self, req_message: Optional[AbstractInitRequest], event_type: MessageEventType, data: dict,
+                            websocket: WebSocketServerProtocol) -> Response:
+        """
+        Handle a deserialized request, other than a session init request, and return the response to it.
+
+        Parameters
+        ----------
+        req_message : Optional[AbstractInitRequest]
+            The deserialized request, or ``None`` if the received data could not be deserialized.
+        event_type : MessageEventType
+            The event type of the request.
+        data : dict
+            The received data, in JSON form.
+        websocket : WebSocketServerProtocol
+            The websocket over which the request was received.
+
+        Returns
+        -------
+        Response
+            The response to the request.
+        """
+        _REQUESTS_RECEIVED.labels(event_type.name).inc()
+        with telemetry.span(f"request_service.{event_type.name.lower()}"):
+            if isinstance(req_message, LaunchEvaluationMessage) or isinstance(req_message, OpenEvaluationMessage):
+                if self._evaluation_service_handler is None:
+                    msg = (f"{self.__class__.__name__} could not initialize evaluation handler due to "
+                           f"{self._eval_handler_exception.__class__.__name__}: {self._eval_handler_exception!s}")
+                    raise RuntimeError(msg)
+                response = await self._evaluation_service_handler.handle_request(
+                    request=req_message,
+                    socket=websocket,
+                    path=websocket.path
+                )
+                logging.debug('************************* Handled request response: {}'.format(str(response)))
+            elif event_type == MessageEventType.INVALID:
+                response = InvalidMessageResponse(data=req_message)
+            # Handle data management messages for creating datasets and adding data
+            elif event_type == MessageEventType.DATASET_MANAGEMENT:
+                response = await self._data_service_handler.handle_request(request=req_message,
+                                                                           upstream_websocket=websocket)
+            elif event_type == MessageEventType.MODEL_EXEC_REQUEST:
+                response = await self._model_exec_request_handler.handle_request(request=req_message)
+                logging.debug('************************* Handled request response: {}'.format(str(response)))
+
+                # TODO loop here to handle a series of multiple requests, as job goes from requested to allocated to
+                #  scheduled to finished (and of course, the messages for output data)
+                #  try while except connectionClosed; let server tell us when to stop listening
+            elif event_type == MessageEventType.PARTITION_REQUEST:
+                response = await self._partition_request_handler.handle_request(request=req_message)
+                logging.debug('************************* Handled request response: {}'.format(str(response)))
+            elif event_type == MessageEventType.CALIBRATION_REQUEST:
+                logging.debug('Handled calibration request')
+                response = await self._calibration_request_handler.handle_request(request=req_message)
+                logging.debug('Processed calibration request; response was: {}'.format(str(response)))
+            elif event_type == MessageEventType.SCHEDULER_REQUEST:
+                response = await self._existing_job_request_handler.handle_request(request=req_message)
+                logging.debug('Handled existing jobs request')
+            # FIXME: add another message type for closing a session
+            else:
+                msg = 'Received valid ' + event_type.name + ' request, but listener does not currently support'
+                response = UnsupportedMessageTypeResponse(actual_event_type=event_type,
+                                                          listener_type=self.__class__,
+                                                          data=data)
+                logging.error(msg)
+                logging.error(response.message)
+        return response
+
+    async def _handle_correlated_request(self, req_message: Optional[AbstractInitRequest],
+                                         event_type: MessageEventType, data: dict, websocket: WebSocketServerProtocol,
+                                         correlation_id: str, dependencies: Sequence[asyncio.Task]):
+        """
+        Handle a request with a correlation id, once the requests it depends on are handled, and send its response.
+
+        Since other requests are handled concurrently, errors are sent back as an ::class:`ErrorResponse` for the
+        request, rather than ending the connection.
+
+        Parameters
+        ----------
+        req_message : Optional[AbstractInitRequest]
+            The deserialized request, or ``None`` if the received data could not be deserialized.
+        event_type : MessageEventType
+            The event type of the request.
+        data : dict
+            The received data, in JSON form.
+        websocket : WebSocketServerProtocol
+            The websocket over which the request was received.
+        correlation_id : str
+            The correlation id of the request, added to its response.
+        dependencies : Sequence[asyncio.Task]
+            The tasks handling requests on the same connection that must finish before this request is handled.
+        """
+        if dependencies:
+            await asyncio.wait(dependencies)
+        try:
+            response = await self._get_response(req_message=req_message, event_type=event_type, data=data,
+                                                websocket=websocket)
+        except Exception as e:
+            logging.error(f"Unexpected exception handling request {correlation_id} - {e.__class__.__name__}: {e!s}")
+            response = ErrorResponse(message=f"{e.__class__.__name__} handling request: {e!s}")
+        try:
+            await websocket.send(self._serialize_response(response, correlation_id))
+        except websockets.exceptions.ConnectionClosed:
+            logging.info(f"Connection closed before response to request {correlation_id} could be sent")
+
     async def listener(self, websocket: WebSocketServerProtocol):
         """
         Async function listening for incoming information on websocket.
+
+        Requests tagged with a correlation id (see ::data:`CORRELATION_ID_KEY`) are handled concurrently, up to
+        ::attribute:`_MAX_CONCURRENT_REQUESTS` at a time, with each response tagged with the id of its request and sent
+        as soon as it is ready.  Such a request that lists the correlation ids of earlier requests that it depends on
+        (see ::data:`DEPENDS_ON_KEY`) is only handled after those.  Requests without correlation ids, and those that
+        need the websocket to themselves (see ::method:`_requires_exclusive_socket`), are handled one at a time, after
+        all earlier requests.
         """
         session = None
         client_ip = websocket.remote_address[0]
+        in_flight: Dict[str, asyncio.Task] = dict()
+        slots = asyncio.Semaphore(self._MAX_CONCURRENT_REQUESTS)
+
+        def finish(task: asyncio.Task, correlation_id: str):
+            slots.release()
+            _REQUESTS_IN_FLIGHT.dec()
+            if in_flight.get(correlation_id) is task:
+                del in_flight[correlation_id]
+
         try:
             async for message in websocket:
                 data = json.loads(message)
-                logging.info(f"Got payload: {data}")
+                correlation_id = data.pop(CORRELATION_ID_KEY, None)
+                depends_on = data.pop(DEPENDS_ON_KEY, None) or []
                 req_message = await self.deserialized_message(message_data=data)
                 event_type = MessageEventType.INVALID if req_message is None else req_message.get_message_event_type()
-
-                if isinstance(req_message, LaunchEvaluationMessage) or isinstance(req_message, OpenEvaluationMessage):
-                    if self._evaluation_service_handler is None:
-                        msg = (f"{self.__class__.__name__} could not initialize evaluation handler due to "
-                               f"{self._eval_handler_exception.__class__.__name__}: {self._eval_handler_exception!s}")
-                        raise RuntimeError(msg)
-                    response = await self._evaluation_service_handler.handle_request(
-                        request=req_message,
-                        socket=websocket,
-                        path=websocket.path
-                    )
-                    logging.debug('************************* Handled request response: {}'.format(str(response)))
-                    await websocket.send(str(response))
-                elif event_type == MessageEventType.INVALID:
-                    response = InvalidMessageResponse(data=req_message)
-                    await websocket.send(str(response))
-                elif event_type == MessageEventType.SESSION_INIT:
+                logging.debug(f"Got {event_type.name} message ({len(message)} characters)"
+                              f"{'' if correlation_id is None else f' with correlation id {correlation_id}'}")
+
+                if correlation_id is not None and not self._requires_exclusive_socket(req_message, event_type):
+                    # Wait for a free slot before reading anything else, so a busy connection can't grow unbounded
+                    await slots.acquire()
+                    correlation_id = str(correlation_id)
+                    depends_on = {str(depends_on)} if isinstance(depends_on, str) else {str(c) for c in depends_on}
+                    # A reused correlation id implicitly depends on the earlier request with the same id
+                    dependencies = [in_flight[c] for c in depends_on | {correlation_id} if c in in_flight]
+                    task = asyncio.create_task(self._handle_correlated_request(
+                        req_message=req_message, event_type=event_type, data=data, websocket=websocket,
+                        correlation_id=correlation_id, dependencies=dependencies))
+                    in_flight[correlation_id] = task
+                    _REQUESTS_IN_FLIGHT.inc()
+                    task.add_done_callback(lambda t, cid=correlation_id: finish(t, cid))
+                    continue
+
+                # Otherwise, handle the request here, once all earlier requests on this connection are handled
+                if in_flight:
+                    await asyncio.wait(list(in_flight.values()))
+
+                if event_type == MessageEventType.SESSION_INIT:
                     response = await self._auth_handler.handle_request(request=req_message, client_ip=client_ip)
                     if response is not None and response.success:
                         session = response.data
                         result = await self.register_websocket_session(websocket, session)
                         logging.debug('************************* Attempt to register session-websocket: {}'.format(
                             str(result)))
-                    await websocket.send(str(response))
-                # Handle data management messages for creating datasets and adding data
-                elif event_type == MessageEventType.DATASET_MANAGEMENT:
-                    response = await self._data_service_handler.handle_request(request=req_message,
-                                                                               upstream_websocket=websocket)
-                    await websocket.send(str(response))
-                elif event_type == MessageEventType.MODEL_EXEC_REQUEST:
-                    response = await self._model_exec_request_handler.handle_request(request=req_message)
-                    logging.debug('************************* Handled request response: {}'.format(str(response)))
-                    await websocket.send(str(response))
-
-                    # TODO loop here to handle a series of multiple requests, as job goes from requested to allocated to
-                    #  scheduled to finished (and of course, the messages for output data)
-                    #  try while except connectionClosed; let server tell us when to stop listening
-                elif event_type == MessageEventType.PARTITION_REQUEST:
-                    response = await self._partition_request_handler.handle_request(request=req_message)
-                    logging.debug('************************* Handled request response: {}'.format(str(response)))
-                    await websocket.send(str(response))
-                elif event_type == MessageEventType.CALIBRATION_REQUEST:
-                    logging.debug('Handled calibration request')
-                    response = await self._calibration_request_handler.handle_request(request=req_message)
-                    logging.debug('Processed calibration request; response was: {}'.format(str(response)))
-                    await websocket.send(str(response))
-                elif event_type == MessageEventType.SCHEDULER_REQUEST:
-                    response = await self._existing_job_request_handler.handle_request(request=req_message)
-                    logging.debug('Handled existing jobs request')
-                    await websocket.send(str(response))
-                # FIXME: add another message type for closing a session
                 else:
-                    msg = 'Received valid ' + event_type.name + ' request, but listener does not currently support'
-                    response = UnsupportedMessageTypeResponse(actual_event_type=event_type,
-                                                              listener_type=self.__class__,
-                                                              data=data)
-                    logging.error(msg)
-                    logging.error(response.message)
-                    await websocket.send(str(response))
+                    response = await self._get_response(req_message=req_message, event_type=event_type, data=data,
+                                                         websocket=websocket)
+                await websocket.send(self._serialize_response(response, correlation_id))
 
         except websockets.exceptions.ConnectionClosed as e:
             logging.info("Connection Closed at Consumer ({})".format(str(e)))
@@ -251,9 +407,10 @@ class RequestService(WebSocketSessionsInterface):
         except Exception as e:
             logging.info('Unexpected exception - {}'.format(str(e)))
         finally:
+            for task in in_flight.values():
+                task.cancel()
             if session is not None:
                 await self.unregister_websocket_session(session=session)
 
-
 if __name__ == '__main__':
     raise RuntimeError('Module {} called directly; use main package entrypoint instead')
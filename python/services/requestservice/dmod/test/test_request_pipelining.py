@@ -0,0 +1,147 @@
+import asyncio
+import json
+import time
+import unittest
+from typing import List, Optional
+
+import websockets
+
+from dmod.communication import CORRELATION_ID_KEY, DEPENDS_ON_KEY, ManagementAction
+from dmod.communication.dataset_management_message import DatasetQuery, MaaSDatasetManagementMessage, \
+    MaaSDatasetManagementResponse, QueryType
+from dmod.communication.maas_request.job_message import JobInfoRequest, JobInfoResponse, JobListRequest, \
+    JobListResponse
+from ..requestservice.service import RequestService
+
+
+class MockWebSocket:
+    """
+    Mock of a server-side websocket connection, fed incoming frames through a queue and recording sent frames.
+    """
+
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent: List[dict] = []
+        self.sent_times: List[float] = []
+        self.remote_address = ('127.0.0.1', 12345)
+        self.path = '/'
+
+    def feed(self, frame: Optional[dict]):
+        """ Queue an incoming frame, or ``None`` to close the connection. """
+        self.incoming.put_nowait(None if frame is None else json.dumps(frame))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        frame = await self.incoming.get()
+        if frame is None:
+            raise StopAsyncIteration
+        return frame
+
+    async def send(self, data: str):
+        self.sent.append(json.loads(data))
+        self.sent_times.append(time.perf_counter())
+
+    async def recv(self) -> str:
+        raise websockets.exceptions.ConnectionClosedOK(None, None)
+
+
+class MockHandler:
+    """
+    Mock request handler that takes a given amount of time before returning the response for a request.
+    """
+
+    def __init__(self, create_response, delay: float = 0.0):
+        self.create_response = create_response
+        self.delay = delay
+        self.started: List[str] = []
+        self.finished: List[str] = []
+
+    async def handle_request(self, request, **kwargs):
+        self.started.append(request.__class__.__name__)
+        await asyncio.sleep(self.delay)
+        self.finished.append(request.__class__.__name__)
+        return self.create_response(request)
+
+
+class TestRequestServicePipelining(unittest.IsolatedAsyncioTestCase):
+
+    SLOW_SECONDS = 0.5
+
+    def setUp(self) -> None:
+        # Avoid init, which starts a server and connects to backing services
+        self.service = RequestService.__new__(RequestService)
+        self.service._data_service_handler = MockHandler(
+            lambda r: MaaSDatasetManagementResponse(success=True, reason='Queried', action=r.management_action),
+            delay=self.SLOW_SECONDS)
+        self.service._existing_job_request_handler = MockHandler(self._create_job_response, delay=0.01)
+        self.websocket = MockWebSocket()
+
+    @staticmethod
+    def _create_job_response(request):
+        if isinstance(request, JobListRequest):
+            return JobListResponse(success=True, reason='Listed', job_list=[])
+        return JobInfoResponse(success=True, reason='Retrieved', job_id=request.job_id, job_state={'status': 'x'})
+
+    def _dataset_query(self, **tags) -> dict:
+        message = MaaSDatasetManagementMessage(action=ManagementAction.QUERY, session_secret='secret',
+                                               dataset_name='big', query=DatasetQuery(query_type=QueryType.LIST_FILES))
+        return dict(message.to_dict(), **tags)
+
+    def _job_info(self, job_id: str, **tags) -> dict:
+        return dict(JobInfoRequest(job_id=job_id, session_secret='secret').to_dict(), **tags)
+
+    async def _run_listener(self, *frames: dict):
+        for frame in frames:
+            self.websocket.feed(frame)
+        listener = asyncio.create_task(self.service.listener(self.websocket))
+        deadline = time.perf_counter() + 5
+        while len(self.websocket.sent) < len(frames) and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+        self.websocket.feed(None)
+        await asyncio.wait_for(listener, 5)
+
+    async def test_listener_0_a(self):
+        """ Test that a quick request is answered while an earlier slow one on the same connection is in flight. """
+        start = time.perf_counter()
+        await self._run_listener(self._dataset_query(**{CORRELATION_ID_KEY: 'slow'}),
+                                 self._job_info('1', **{CORRELATION_ID_KEY: 'fast-1'}),
+                                 self._job_info('2', **{CORRELATION_ID_KEY: 'fast-2'}))
+
+        self.assertEqual([r[CORRELATION_ID_KEY] for r in self.websocket.sent], ['fast-1', 'fast-2', 'slow'])
+        self.assertEqual([r.get('job_id') for r in self.websocket.sent[:2]], ['1', '2'])
+        self.assertTrue(all(r['success'] for r in self.websocket.sent))
+        self.assertLess(self.websocket.sent_times[1] - start, self.SLOW_SECONDS / 2)
+
+    async def test_listener_0_b(self):
+        """ Test that a request declaring a dependency is not handled until the earlier request is. """
+        await self._run_listener(self._dataset_query(**{CORRELATION_ID_KEY: 'slow'}),
+                                 self._job_info('1', **{CORRELATION_ID_KEY: 'after', DEPENDS_ON_KEY: ['slow']}),
+                                 self._job_info('2', **{CORRELATION_ID_KEY: 'fast'}))
+
+        self.assertEqual([r[CORRELATION_ID_KEY] for r in self.websocket.sent], ['fast', 'slow', 'after'])
+
+    async def test_listener_0_c(self):
+        """ Test that requests without correlation ids are still handled strictly in order, after earlier requests. """
+        await self._run_listener(self._dataset_query(**{CORRELATION_ID_KEY: 'slow'}),
+                                 self._job_info('1'),
+                                 self._job_info('2', **{CORRELATION_ID_KEY: 'fast'}))
+
+        self.assertEqual([r.get(CORRELATION_ID_KEY) for r in self.websocket.sent], ['slow', None, 'fast'])
+
+    async def test_listener_0_d(self):
+        """ Test that the number of requests handled concurrently for a connection is bounded. """
+        frames = [self._dataset_query(**{CORRELATION_ID_KEY: f'slow-{i}'})
+                  for i in range(RequestService._MAX_CONCURRENT_REQUESTS + 2)]
+        start = time.perf_counter()
+        await self._run_listener(*frames)
+
+        self.assertEqual(len(self.websocket.sent), len(frames))
+        # Those beyond the bound wait for a slot, taking a second round of the slow handler
+        self.assertGreater(time.perf_counter() - start, 2 * self.SLOW_SECONDS)
+        self.assertLess(time.perf_counter() - start, 3 * self.SLOW_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,15 +7,15 @@ logging.basicConfig(
 )
 
 from websockets import WebSocketServerProtocol
-from typing import Awaitable, Callable, Dict, List, Type, TypeVar
+from typing import Awaitable, Callable, Dict, List, Optional, Type, TypeVar
 from dmod.core.exception import DmodRuntimeError
 from dmod.core.serializable import BasicResultIndicator
 from dmod.communication import AbstractInitRequest, InvalidMessageResponse, Message, SchedulerRequestMessage, \
     SchedulerRequestResponse, UpdateMessage, UpdateMessageResponse, WebSocketInterface
 from dmod.communication.maas_request.job_message import (JobControlAction, JobControlRequest, JobControlResponse,
                                                          JobInfoRequest, JobInfoResponse, JobListRequest,
-                                                         JobListResponse)
-from dmod.scheduler.job import Job, JobExecStep, JobManager, JobStatus
+                                                         JobListResponse, JobWatchRequest, JobWatchResponse)
+from dmod.scheduler.job import Job, JobChange, JobExecStep, JobManager, JobStatus, JobWatcher, RequestedJob
 import json
 
 import asyncio
@@ -39,36 +39,27 @@ class SchedulerHandler(WebSocketInterface):
     """
 
     @staticmethod
-    async def _update_client_on_requested_job(previous_job_state: Job, updated_job_state: Job,
-                                              websocket: WebSocketServerProtocol):
+    async def _update_client_on_job_change(change: JobChange, websocket: WebSocketServerProtocol):
         """
-        Send an update message back to the client that initiated a scheduler request when the associated job updates it
-        state, and await a valid response to the update message.
+        Send an update message back to a client watching a job when the job's status changes, and await a valid
+        response to the update message.
+
+        The update includes the version of the change, so that a client that loses its connection may resume receiving
+        updates from where it left off, via a ::class:`JobWatchRequest`.
 
         Note that if an invalid response comes back, either because it isn't a response at all or the digest is wrong,
         an error is logged, but processing otherwise continues.
 
         Parameters
         ----------
-        previous_job_state : Job
-            An object representing the updated job in its prior state.
-        updated_job_state : Job
-            An object representing the updated job in its updated state.
+        change : JobChange
+            The change to the job's status.
         websocket : WebSocketServerProtocol
             The websocket for client communication.
         """
-        updates = dict()
-        # For now, the only relevant change should be a change in status
-        if updated_job_state.status != previous_job_state.status:
-            updates['status'] = str(updated_job_state.status)
-
-        # Exit without doing anything if no relevant updates were made
-        if len(updates) == 0:
-            return
-
-        # Otherwise, send update message over socket and await response
         # TODO: should any retries be considered?
-        update_message = UpdateMessage(previous_job_state.job_id, previous_job_state.__class__, updates)
+        update_message = UpdateMessage(object_id=change.job_id, object_type=RequestedJob,
+                                       updated_data={'status': change.status, 'version': str(change.version)})
         await websocket.send(str(update_message))
         # Then wait for the next message
         response_raw = await websocket.recv()
@@ -105,10 +96,11 @@ class SchedulerHandler(WebSocketInterface):
         --------
         listener
         """
-        # TODO: add something for reconnecting to monitor progress of job after being disconnected
+        # Note that JobWatchRequest must be tried before JobInfoRequest, which would otherwise also parse its messages
         return {
             SchedulerRequestMessage: instance._handle_scheduler_request,
             JobControlRequest: instance._handle_job_control_request,
+            JobWatchRequest: instance._handle_job_watch_request,
             JobInfoRequest: instance._handle_job_info_request,
             JobListRequest: instance._handle_job_list_request,
             UpdateMessage: instance._handle_update_message
@@ -136,6 +128,55 @@ class SchedulerHandler(WebSocketInterface):
         """
         super().__init__(*args, **kwargs)
         self._job_manager = job_mgr
+        self._job_watcher: Optional[JobWatcher] = None
+        """ Watcher shared by all connections following job changes, created lazily within the running event loop. """
+
+    @property
+    def job_watcher(self) -> JobWatcher:
+        """
+        The watcher shared by all connections for following changes to jobs, created when first needed.
+
+        Returns
+        -------
+        JobWatcher
+            The watcher shared by all connections for following changes to jobs.
+        """
+        if self._job_watcher is None:
+            self._job_watcher = self._job_manager.create_job_watcher()
+        return self._job_watcher
+
+    async def _send_job_updates(self, job_id: str, after_version: int, websocket: WebSocketServerProtocol,
+                                last_status: Optional[str] = None):
+        """
+        Send an update message through the websocket for each change to a job's status, for as long as it is active.
+
+        Changes are pushed by the shared ::attribute:`job_watcher` as soon as the job is saved with a new status, rather
+        than polled for.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job of interest.
+        after_version : int
+            The version of the last change the client has already received, after which changes should be sent.
+        websocket : WebSocketServerProtocol
+            The websocket connection.
+        last_status : Optional[str]
+            The name of the status the client already knows the job to have, if any, for which no update is needed.
+        """
+        async with await self.job_watcher.watch(job_id, after_version=after_version) as subscription:
+            # Changes after the given version are delivered even if they happened before the watch, so if there are none
+            # by now, a job that isn't active has nothing further to send
+            if subscription.qsize() == 0 and len(self._job_manager.get_job_changes(job_id, after_version)) == 0 \
+                    and not self._job_manager.retrieve_job(job_id).status.is_active:
+                return
+            async for message in subscription:
+                change: JobChange = message['data']
+                if change.status != last_status:
+                    await self._update_client_on_job_change(change=change, websocket=websocket)
+                    last_status = change.status
+                if not change.job_status.is_active:
+                    return
 
     async def _handle_job_control_request(self, message: JobControlRequest, websocket: WebSocketServerProtocol):
         try:
@@ -200,29 +241,31 @@ class SchedulerHandler(WebSocketInterface):
         response = SchedulerRequestResponse(job_id=job.job_id, success=True, reason='Job Request Processed', data={'job_id': job.job_id})
         await websocket.send(str(response))
 
-        loop_iterations = 0
-        # Check for job state changes that trigger info (or data) messages back through websocket
-        # Loop for as long as the job is in some active state
-        while job.status.is_active:
-            # Sleep after first time through the loop, though more briefly the first few times to catch initial updates
-            # Have sleep logic at top of loop so loop condition is checked immediately after any chance for it to change
-            if loop_iterations == 1:
-                await asyncio.sleep(0.25)
-            elif 0 < loop_iterations < 5:
-                await asyncio.sleep(0.5)
-            else:
-                await asyncio.sleep(60)
-            loop_iterations += 1
-
-            # Refresh data for job
-            job_refreshed_copy = self._job_manager.retrieve_job(job.job_id)
-            # If the job was updated ...
-            if job_refreshed_copy.last_updated != job.last_updated:
-                # Send an update message as needed
-                await self._update_client_on_requested_job(previous_job_state=job, updated_job_state=job_refreshed_copy,
-                                                           websocket=websocket)
-                # Update to use the fresh copy of the job
-                job = job_refreshed_copy
+        # Send updates as the job's status changes, for as long as the job is in some active state
+        await self._send_job_updates(job_id=job.job_id, after_version=0, websocket=websocket,
+                                     last_status=job.status.name)
+
+    async def _handle_job_watch_request(self, message: JobWatchRequest, websocket: WebSocketServerProtocol):
+        """
+        Resume sending updates on changes to a job's status, after the last version the client received.
+
+        Parameters
+        ----------
+        message : JobWatchRequest
+            The initial message over the websocket, requesting updates on changes to a job.
+        websocket : WebSocketServerProtocol
+            The websocket connection.
+        """
+        if not self._job_manager.does_job_exist(message.job_id):
+            response = JobWatchResponse(success=False, reason="Job Not Found", job_id=message.job_id,
+                                        after_version=message.after_version,
+                                        message=f"No job with id {message.job_id} exists to watch.")
+            await websocket.send(str(response))
+            return
+        response = JobWatchResponse(success=True, reason="Watching Job", job_id=message.job_id,
+                                    after_version=message.after_version)
+        await websocket.send(str(response))
+        await self._send_job_updates(job_id=message.job_id, after_version=message.after_version, websocket=websocket)
 
     async def _handle_update_message(self, message: UpdateMessage, websocket: WebSocketServerProtocol):
         # Only accept updates to Job objects, so verify the type
@@ -178,7 +178,9 @@ def main():
         result = exec_cli_op(cli, args)
 
     else:
-        app.run(host=args.host, port=args.port)
+        # Index upstream closures before serving, so request threads share one index instead of traversing the graph
+        subset_handler.upstream_index
+        app.run(host=args.host, port=args.port, threaded=True)
         result = True
 
     if not result: